@@ -0,0 +1,84 @@
+"""Benchmark for workflow/scripts/osemosys_global/demand/regression.py
+
+Builds synthetic historical GDP, urbanization and demand observations for a
+number of regions and times the batched regression of all regions against
+fitting sklearn's LinearRegression region by region, as the regression was
+previously done. The largest difference of the coefficients is reported.
+
+Usage:
+    python benchmarks/benchmark_demand_regression.py [--regions N] [--years N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+DEMAND = (
+    Path(__file__).parents[1] / "workflow" / "scripts" / "osemosys_global" / "demand"
+)
+sys.path.insert(0, str(DEMAND))
+
+from regression import fit_linear_regressions  # noqa: E402
+
+FEATURES = ["WB_GDPppp", "WB_Urb"]
+
+
+def synthetic_observations(num_regions: int, num_years: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    regions = np.repeat([f"R{x:04d}" for x in range(num_regions)], num_years)
+    df = pd.DataFrame(
+        {
+            "WB_GDPppp": rng.random(len(regions)) * 50000,
+            "WB_Urb": rng.random(len(regions)) * 100,
+        },
+        index=pd.Index(regions, name="child_object"),
+    )
+    df["ember_Elec"] = (
+        0.1 * df["WB_GDPppp"]
+        + 20 * df["WB_Urb"]
+        + rng.normal(0, 100, len(regions))
+    )
+    return df
+
+
+def fit_loop(df: pd.DataFrame) -> pd.DataFrame:
+    rows = {}
+    for region in df.index.unique():
+        df_region = df.loc[region]
+        lr = LinearRegression().fit(df_region[FEATURES], df_region["ember_Elec"])
+        rows[region] = [lr.intercept_, *lr.coef_]
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["intercept", "coef_GDPppp", "coef_Urb"]
+    )
+
+
+def main(num_regions: int, num_years: int) -> None:
+
+    df = synthetic_observations(num_regions, num_years)
+
+    start = time.perf_counter()
+    expected = fit_loop(df)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    lr = fit_linear_regressions(df, FEATURES, "ember_Elec")
+    batched = time.perf_counter() - start
+
+    diff = (lr[expected.columns] - expected).abs() / expected.abs()
+    print(f"Fitted {num_regions} regions of {num_years} years")
+    print(f"Region by region: {loop * 1000:.1f} ms")
+    print(f"Batched: {batched * 1000:.1f} ms ({loop / batched:.0f}x)")
+    print(f"Largest relative difference: {diff.to_numpy().max():.1e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--regions", type=int, default=200)
+    parser.add_argument("--years", type=int, default=30)
+    args = parser.parse_args()
+    sys.exit(main(args.regions, args.years))
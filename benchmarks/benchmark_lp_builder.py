@@ -0,0 +1,279 @@
+"""Benchmark for workflow/scripts/osemosys_global/lp_builder.py
+
+Writes synthetic parameter CSVs with roughly the dimensions of a global
+OSeMOSYS Global run and times writing the LP file from them. Peak memory is
+reported as the maximum resident set size of the process. With --glpsol, the
+data file is also written and glpsol is timed on it in a child process.
+
+Usage:
+    python benchmarks/benchmark_lp_builder.py [--countries N] [--glpsol] [--keep]
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from osemosys_global.lp_builder import write_lp
+from osemosys_global.write_data_file import (
+    read_data,
+    read_otoole_config,
+    write_data_file,
+)
+
+RESOURCES = Path(__file__).parents[1] / "resources"
+
+TECHS = [
+    "BIO", "CCG", "COA", "COG", "CSP", "GEO", "HYD", "OCG", "OIL",
+    "OTH", "PET", "SPV", "URN", "WAS", "WAV", "WOF", "WON",
+]
+SEASONS = range(1, 5)
+DAYPARTS = range(1, 7)
+TIMESLICES = [f"S{s}D{d}" for s in SEASONS for d in DAYPARTS]
+
+
+def _country_codes(num_countries: int) -> list[str]:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    codes = []
+    for a in letters:
+        for b in letters:
+            codes.append(f"C{a}{b}")
+            if len(codes) == num_countries:
+                return codes
+    return codes
+
+
+def _per_year(df: pd.DataFrame, years: list[int]) -> pd.DataFrame:
+    df = df.merge(pd.DataFrame({"YEAR": years}), how="cross")
+    return df[[x for x in df.columns if x != "VALUE"] + ["VALUE"]]
+
+
+def write_synthetic_csvs(
+    csv_dir: str,
+    num_countries: int = 160,
+    nodes_per_country: int = 2,
+    start_year: int = 2021,
+    end_year: int = 2050,
+) -> None:
+    """Writes synthetic set and parameter CSVs in the layout read by otoole"""
+
+    years = list(range(start_year, end_year + 1))
+    nodes = [
+        f"{country}{node:02d}"
+        for country in _country_codes(num_countries)
+        for node in range(1, nodes_per_country + 1)
+    ]
+    pwr = pd.DataFrame(
+        [(f"PWR{tech}{node}01", tech, node) for node in nodes for tech in TECHS],
+        columns=["TECHNOLOGY", "TECH", "NODE"],
+    )
+    min_techs = [f"MIN{tech}{node}" for node in nodes for tech in TECHS]
+    trn_techs = [f"TRN{node}" for node in nodes]
+    sto_techs = [f"PWRSDS{node}01" for node in nodes]
+    storages = [f"SDS{node}" for node in nodes]
+    fuels = [f"ELC{node}01" for node in nodes] + [f"ELC{node}02" for node in nodes]
+    fuels += [f"{tech}{node}" for node in nodes for tech in TECHS]
+
+    tables = {
+        "REGION": ["GLOBAL"],
+        "YEAR": years,
+        "TIMESLICE": TIMESLICES,
+        "SEASON": list(SEASONS),
+        "DAYTYPE": [1],
+        "DAILYTIMEBRACKET": list(DAYPARTS),
+        "MODE_OF_OPERATION": [1, 2],
+        "TECHNOLOGY": pwr["TECHNOLOGY"].tolist() + min_techs + trn_techs + sto_techs,
+        "FUEL": fuels,
+        "EMISSION": ["CO2"],
+        "STORAGE": storages,
+    }
+    for name, values in tables.items():
+        df = pd.DataFrame({"VALUE": values})
+        df.to_csv(Path(csv_dir, f"{name}.csv"), index=False)
+
+    def write(name: str, df: pd.DataFrame) -> None:
+        df = df.copy()
+        df.insert(0, "REGION", "GLOBAL")
+        df.to_csv(Path(csv_dir, f"{name}.csv"), index=False)
+
+    timeslices = pd.DataFrame(
+        [(f"S{s}D{d}", s, d) for s in SEASONS for d in DAYPARTS],
+        columns=["TIMESLICE", "SEASON", "DAILYTIMEBRACKET"],
+    )
+    df = _per_year(timeslices[["TIMESLICE"]].assign(VALUE=1 / len(TIMESLICES)), years)
+    df.to_csv(Path(csv_dir, "YearSplit.csv"), index=False)
+    for name, column in (
+        ("Conversionls", "SEASON"),
+        ("Conversionlh", "DAILYTIMEBRACKET"),
+    ):
+        df = timeslices[["TIMESLICE", column]].assign(VALUE=1)
+        df.to_csv(Path(csv_dir, f"{name}.csv"), index=False)
+    pd.DataFrame({"TIMESLICE": TIMESLICES, "DAYTYPE": 1, "VALUE": 1}).to_csv(
+        Path(csv_dir, "Conversionld.csv"), index=False
+    )
+    df = pd.DataFrame({"DAILYTIMEBRACKET": list(DAYPARTS), "VALUE": 1 / 24})
+    df = _per_year(df, years)
+    df.to_csv(Path(csv_dir, "DaySplit.csv"), index=False)
+
+    oar = pd.concat(
+        [
+            pd.DataFrame({
+                "TECHNOLOGY": pwr["TECHNOLOGY"], "FUEL": "ELC" + pwr["NODE"] + "01",
+                "MODE_OF_OPERATION": 1, "VALUE": 1.0,
+            }),
+            pd.DataFrame({
+                "TECHNOLOGY": min_techs,
+                "FUEL": [f"{tech}{node}" for node in nodes for tech in TECHS],
+                "MODE_OF_OPERATION": 1, "VALUE": 1.0,
+            }),
+            pd.DataFrame({
+                "TECHNOLOGY": trn_techs, "FUEL": [f"ELC{x}02" for x in nodes],
+                "MODE_OF_OPERATION": 1, "VALUE": 0.95,
+            }),
+            pd.DataFrame({
+                "TECHNOLOGY": sto_techs, "FUEL": [f"ELC{x}01" for x in nodes],
+                "MODE_OF_OPERATION": 2, "VALUE": 1.0,
+            }),
+        ]
+    )
+    write("OutputActivityRatio", _per_year(oar, years))
+
+    iar = pd.concat(
+        [
+            pd.DataFrame({
+                "TECHNOLOGY": pwr["TECHNOLOGY"], "FUEL": pwr["TECH"] + pwr["NODE"],
+                "MODE_OF_OPERATION": 1, "VALUE": 2.5,
+            }),
+            pd.DataFrame({
+                "TECHNOLOGY": trn_techs + sto_techs,
+                "FUEL": [f"ELC{x}01" for x in nodes] * 2,
+                "MODE_OF_OPERATION": 1, "VALUE": 1.0,
+            }),
+        ]
+    )
+    write("InputActivityRatio", _per_year(iar, years))
+
+    df = pd.DataFrame(
+        {
+            "TECHNOLOGY": min_techs,
+            "EMISSION": "CO2",
+            "MODE_OF_OPERATION": 1,
+            "VALUE": 0.1,
+        }
+    )
+    write("EmissionActivityRatio", _per_year(df, years))
+
+    rng = np.random.default_rng(0)
+    df = pwr[["TECHNOLOGY"]].merge(pd.DataFrame({"TIMESLICE": TIMESLICES}), how="cross")
+    df["VALUE"] = rng.uniform(0.1, 0.9, len(df)).round(3)
+    write("CapacityFactor", _per_year(df, years))
+
+    df = pd.DataFrame({"FUEL": [f"ELC{x}02" for x in nodes], "VALUE": 100.0})
+    write("SpecifiedAnnualDemand", _per_year(df, years))
+    df = df[["FUEL"]].merge(pd.DataFrame({"TIMESLICE": TIMESLICES}), how="cross")
+    df["VALUE"] = 1 / len(TIMESLICES)
+    write("SpecifiedDemandProfile", _per_year(df, years))
+
+    df = pd.DataFrame({"TECHNOLOGY": pwr["TECHNOLOGY"], "VALUE": 1000.0})
+    write("CapitalCost", _per_year(df, years))
+    df = pd.DataFrame({"TECHNOLOGY": pwr["TECHNOLOGY"], "VALUE": 30.0})
+    write("FixedCost", _per_year(df, years))
+    df = pd.DataFrame({"TECHNOLOGY": min_techs, "MODE_OF_OPERATION": 1, "VALUE": 3.0})
+    write("VariableCost", _per_year(df, years))
+    write(
+        "OperationalLife", pd.DataFrame({"TECHNOLOGY": pwr["TECHNOLOGY"], "VALUE": 30})
+    )
+    write(
+        "CapacityToActivityUnit",
+        pd.DataFrame({"TECHNOLOGY": tables["TECHNOLOGY"], "VALUE": 31.536}),
+    )
+    df = pd.DataFrame(
+        {"TECHNOLOGY": pwr["TECHNOLOGY"], "YEAR": start_year, "VALUE": 1.0}
+    )
+    write("ResidualCapacity", df)
+
+    df = pd.DataFrame({"STORAGE": storages, "MODE_OF_OPERATION": 1, "VALUE": 1})
+    df.insert(0, "TECHNOLOGY", sto_techs)
+    write("TechnologyToStorage", df)
+    write("TechnologyFromStorage", df.assign(MODE_OF_OPERATION=2))
+    df = pd.DataFrame({"STORAGE": storages, "VALUE": 20.0})
+    write("CapitalCostStorage", _per_year(df, years))
+    write("OperationalLifeStorage", pd.DataFrame({"STORAGE": storages, "VALUE": 15}))
+
+    pd.DataFrame({"REGION": ["GLOBAL"], "VALUE": [0.05]}).to_csv(
+        Path(csv_dir, "DiscountRate.csv"), index=False
+    )
+    pd.DataFrame({"REGION": ["GLOBAL"], "VALUE": [1]}).to_csv(
+        Path(csv_dir, "DepreciationMethod.csv"), index=False
+    )
+
+
+def _peak_rss() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def main(num_countries: int, nodes_per_country: int, glpsol: bool, keep: bool) -> None:
+
+    tmp_dir = tempfile.mkdtemp()
+    csv_dir = os.path.join(tmp_dir, "data")
+    os.mkdir(csv_dir)
+
+    start = time.perf_counter()
+    write_synthetic_csvs(csv_dir, num_countries, nodes_per_country)
+    print(f"Wrote parameter CSVs in {time.perf_counter() - start:.1f}s")
+
+    config = read_otoole_config(str(RESOURCES / "otoole.yaml"))
+    data = read_data(csv_dir, config)
+
+    rss_before = _peak_rss()
+    lp_file = os.path.join(tmp_dir, "native.lp")
+    start = time.perf_counter()
+    write_lp(data, config, lp_file)
+    elapsed = time.perf_counter() - start
+
+    size = os.path.getsize(lp_file) / 1e6
+    print(f"Wrote {size:.0f} MB LP file in {elapsed:.1f}s")
+    print(f"Peak RSS: {_peak_rss():.0f} MB (before writing: {rss_before:.0f} MB)")
+
+    if glpsol:
+        if shutil.which("glpsol") is None:
+            print("glpsol is not installed")
+        else:
+            data_file = os.path.join(tmp_dir, "data.txt")
+            write_data_file(data, config, data_file)
+
+            start = time.perf_counter()
+            subprocess.run(
+                [
+                    "glpsol", "-m", str(RESOURCES / "osemosys_fast_preprocessed.txt"),
+                    "-d", data_file, "--wlp", os.path.join(tmp_dir, "glpsol.lp"),
+                ],
+                check=True,
+                capture_output=True,
+            )
+            elapsed = time.perf_counter() - start
+            rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1e3
+            print(f"glpsol wrote the LP file in {elapsed:.1f}s, peak RSS: {rss:.0f} MB")
+
+    if keep:
+        print(f"Files kept in {tmp_dir}")
+    else:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", type=int, default=160)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--glpsol", action="store_true")
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    sys.exit(main(args.countries, args.nodes, args.glpsol, args.keep))
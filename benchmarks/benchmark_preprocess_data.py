@@ -0,0 +1,175 @@
+"""Benchmark for resources/preprocess_data.py
+
+Writes a synthetic otoole data file with roughly the dimensions of a global
+OSeMOSYS Global run and times the pre-processing of it. Peak memory is
+reported as the maximum resident set size of the process.
+
+Usage:
+    python benchmarks/benchmark_preprocess_data.py [--countries N] [--keep]
+"""
+
+import argparse
+import importlib.util
+import os
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PREPROCESS = Path(__file__).parents[1] / "resources" / "preprocess_data.py"
+
+TECHS = [
+    "BIO", "CCG", "COA", "COG", "CSP", "GEO", "HYD", "OCG", "OIL",
+    "OTH", "PET", "SPV", "URN", "WAS", "WAV", "WOF", "WON",
+]
+TIMESLICES = [f"S{s}D{d}" for s in range(1, 5) for d in range(1, 7)]
+
+
+def _load_preprocess():
+    spec = importlib.util.spec_from_file_location("preprocess_data", PREPROCESS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _country_codes(num_countries: int) -> list[str]:
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    codes = []
+    for a in letters:
+        for b in letters:
+            codes.append(f"C{a}{b}")
+            if len(codes) == num_countries:
+                return codes
+    return codes
+
+
+def write_synthetic_data_file(
+    path: str,
+    num_countries: int = 160,
+    nodes_per_country: int = 2,
+    start_year: int = 2021,
+    end_year: int = 2050,
+) -> None:
+    """Writes a synthetic data file in the layout produced by otoole
+
+    Parameters and sets are written in alphabetical order, as otoole does, so
+    set declarations appear after the activity ratio parameters.
+    """
+
+    years = list(range(start_year, end_year + 1))
+    nodes = [
+        f"{country}{node:02d}"
+        for country in _country_codes(num_countries)
+        for node in range(1, nodes_per_country + 1)
+    ]
+    pwr_techs = [f"PWR{tech}{node}01" for node in nodes for tech in TECHS]
+    sto_techs = [f"PWRSDS{node}01" for node in nodes]
+    storages = [f"SDS{node}" for node in nodes]
+    fuels = [f"ELC{node}01" for node in nodes] + [f"ELC{node}02" for node in nodes]
+    fuels += [f"{tech}{node}" for node in nodes for tech in TECHS]
+
+    with open(path, "w") as f:
+        f.write("# Model file written by *otoole*\n")
+
+        f.write("param default -1 : CapacityFactor :=\n")
+        for tech in pwr_techs:
+            for ts in TIMESLICES:
+                for year in years:
+                    f.write(f"GLOBAL {tech} {ts} {year} 0.35\n")
+        f.write(";\n")
+
+        f.write("set EMISSION :=\nCO2\n;\n")
+
+        f.write("param default 0 : EmissionActivityRatio :=\n")
+        for tech in pwr_techs:
+            for year in years:
+                f.write(f"GLOBAL {tech} CO2 1 {year} 0.1\n")
+        f.write(";\n")
+
+        f.write("set FUEL :=\n")
+        f.writelines(f"{fuel}\n" for fuel in fuels)
+        f.write(";\n")
+
+        f.write("param default 0 : InputActivityRatio :=\n")
+        for node, tech in ((node, tech) for node in nodes for tech in TECHS):
+            for year in years:
+                f.write(f"GLOBAL PWR{tech}{node}01 {tech}{node} 1 {year} 2.5\n")
+        for node in nodes:
+            for year in years:
+                f.write(f"GLOBAL PWRSDS{node}01 ELC{node}01 2 {year} 1\n")
+        f.write(";\n")
+
+        f.write("set MODE_OF_OPERATION :=\n1\n2\n;\n")
+
+        f.write("param default 0 : OutputActivityRatio :=\n")
+        for node, tech in ((node, tech) for node in nodes for tech in TECHS):
+            for year in years:
+                f.write(f"GLOBAL PWR{tech}{node}01 ELC{node}01 1 {year} 1\n")
+        for node in nodes:
+            for year in years:
+                f.write(f"GLOBAL PWRSDS{node}01 ELC{node}01 1 {year} 1\n")
+        f.write(";\n")
+
+        f.write("set STORAGE :=\n")
+        f.writelines(f"{storage}\n" for storage in storages)
+        f.write(";\n")
+
+        f.write("set TECHNOLOGY :=\n")
+        f.writelines(f"{tech}\n" for tech in pwr_techs + sto_techs)
+        f.write(";\n")
+
+        f.write("param default 0 : TechnologyFromStorage :=\n")
+        for node in nodes:
+            f.write(f"GLOBAL PWRSDS{node}01 SDS{node} 1 1\n")
+        f.write(";\n")
+
+        f.write("param default 0 : TechnologyToStorage :=\n")
+        for node in nodes:
+            f.write(f"GLOBAL PWRSDS{node}01 SDS{node} 2 1\n")
+        f.write(";\n")
+
+        f.write("set YEAR :=\n")
+        f.writelines(f"{year}\n" for year in years)
+        f.write(";\n")
+
+        f.write("end;\n")
+
+
+def main(num_countries: int, nodes_per_country: int, keep: bool) -> None:
+
+    preprocess_data = _load_preprocess()
+
+    tmp_dir = tempfile.mkdtemp()
+    data_infile = os.path.join(tmp_dir, "benchmark.txt")
+    data_outfile = os.path.join(tmp_dir, "PreProcessed_benchmark.txt")
+
+    start = time.perf_counter()
+    write_synthetic_data_file(data_infile, num_countries, nodes_per_country)
+    size = os.path.getsize(data_infile) / 1e6
+    print(f"Wrote {size:.0f} MB data file in {time.perf_counter() - start:.1f}s")
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+    start = time.perf_counter()
+    preprocess_data.main(data_infile, data_outfile)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+    print(f"Pre-processed data file in {elapsed:.1f}s")
+    print(f"Peak RSS: {rss_after:.0f} MB (before pre-processing: {rss_before:.0f} MB)")
+
+    if keep:
+        print(f"Data files kept in {tmp_dir}")
+    else:
+        os.remove(data_infile)
+        os.remove(data_outfile)
+        os.rmdir(tmp_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--countries", type=int, default=160)
+    parser.add_argument("--nodes", type=int, default=2)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    sys.exit(main(args.countries, args.nodes, args.keep))
@@ -19,6 +19,13 @@ are added to the sets ``MODExTECHNOLOGYperSTORAGEto`` and ``MODExTECHNOLOGYperST
 5. All values for technology-mode combinations are added to the sets
 ``MODEperTECHNOLOGY``.
 
+ The data file is read in a single streaming pass. Lines are copied to the
+output file as they are read, while only the unique set members and
+commodity-technology-mode combinations are held in memory. As otoole writes
+sets and parameters in alphabetical order, set declarations can appear after
+the activity ratio parameters, so the derived sets are appended once the end
+of the file is reached.
+
  In order to start a model run with a pre-processed data file, the following sets
 need to be introduced to its associated OSeMOSYS model file::
 
@@ -32,262 +39,235 @@ need to be introduced to its associated OSeMOSYS model file::
 
 import sys
 from collections import defaultdict
-
-
-def main(data_infile, data_outfile):
-
-    lines = []
-
-    with open(data_infile, "r") as f1:
-        for line in f1:
-            if not line.startswith(("set MODEper", "set MODEx", "end;")):
-                lines.append(line)
-
-    with open(data_outfile, "w") as f2:
-        f2.writelines(lines)
-
-    parsing = False
-    parsing_year = False
-    parsing_tech = False
-    parsing_fuel = False
-    parsing_mode = False
-    parsing_storage = False
-    parsing_emission = False
-
-    year_list = []
-    fuel_list = []
-    tech_list = []
-    storage_list = []
-    mode_list = []
-    emission_list = []
-
-    data_all = []
-    data_out = []
-    data_inp = []
-    output_table = []
-    storage_to = []
-    storage_from = []
-    emission_table = []
-
-    params_to_check = [
-        "OutputActivityRatio",
-        "InputActivityRatio",
-        "TechnologyToStorage",
-        "TechnologyFromStorage",
-        "EmissionActivityRatio",
-    ]
-
-    with open(data_infile, "r") as f:
-        for line in f:
-            if parsing_year:
-                year_list += [line.strip()] if line.strip() not in ["", ";"] else []
-            if parsing_fuel:
-                fuel_list += [line.strip()] if line.strip() not in ["", ";"] else []
-            if parsing_tech:
-                tech_list += [line.strip()] if line.strip() not in ["", ";"] else []
-            if parsing_storage:
-                storage_list += [line.strip()] if line.strip() not in ["", ";"] else []
-            if parsing_mode:
-                mode_list += [line.strip()] if line.strip() not in ["", ";"] else []
-            if parsing_emission:
-                emission_list += [line.strip()] if line.strip() not in ["", ";"] else []
-
-            if line.startswith("set YEAR"):
-                if len(line.split("=")[1]) > 1:
-                    year_list = line.split(" ")[3:-1]
-                else:
-                    parsing_year = True
-            if line.startswith(
-                "set COMMODITY"
-            ):  # Extracts list of COMMODITIES from data file. Some models use FUEL instead.
-                if len(line.split("=")[1]) > 1:
-                    fuel_list = line.split(" ")[3:-1]
-                else:
-                    parsing_fuel = True
-            if line.startswith(
-                "set FUEL"
-            ):  # Extracts list of FUELS from data file. Some models use COMMODITIES instead.
-                if len(line.split("=")[1]) > 1:
-                    fuel_list = line.split(" ")[3:-1]
-                else:
-                    parsing_fuel = True
-            if line.startswith("set TECHNOLOGY"):
-                if len(line.split("=")[1]) > 1:
-                    tech_list = line.split(" ")[3:-1]
-                else:
-                    parsing_tech = True
-            if line.startswith("set STORAGE"):
-                if len(line.split("=")[1]) > 1:
-                    storage_list = line.split(" ")[3:-1]
-                else:
-                    parsing_storage = True
-            if line.startswith("set MODE_OF_OPERATION"):
-                if len(line.split("=")[1]) > 1:
-                    mode_list = line.split(" ")[3:-1]
-                else:
-                    parsing_mode = True
-            if line.startswith("set EMISSION"):
-                if len(line.split("=")[1]) > 1:
-                    emission_list = line.split(" ")[3:-1]
-                else:
-                    parsing_emission = True
-
-            if line.startswith(";"):
-                parsing_year = False
-                parsing_tech = False
-                parsing_fuel = False
-                parsing_mode = False
-                parsing_storage = False
-                parsing_emission = False
-
-    with open(data_infile, "r") as f:
-        for line in f:
-            details = line.split(" ")
-            if line.startswith(";"):
-                parsing = False
-            if parsing:
-                if len(details) > 1:
-                    if param_current == "OutputActivityRatio":
-                        tech = details[1].strip()
-                        fuel = details[2].strip()
-                        mode = details[3].strip()
-                        year = details[4].strip()
-                        value = details[5].strip()
-
-                        if float(value) != 0.0:
-                            data_out.append(tuple([fuel, tech, mode]))
-                            output_table.append(tuple([tech, fuel, mode, year, value]))
-                            data_all.append(tuple([tech, mode]))
-
-                    if param_current == "InputActivityRatio":
-                        tech = details[1].strip()
-                        fuel = details[2].strip()
-                        mode = details[3].strip()
-                        value = details[5].strip()
-                        if float(value) != 0.0:
-                            data_inp.append(tuple([fuel, tech, mode]))
-                            data_all.append(tuple([tech, mode]))
-
+from typing import TextIO
+
+# data file set name -> key used to store the set members
+SETS_TO_CHECK = {
+    "YEAR": "YEAR",
+    "COMMODITY": "FUEL",  # Some models use COMMODITY instead of FUEL
+    "FUEL": "FUEL",
+    "TECHNOLOGY": "TECHNOLOGY",
+    "STORAGE": "STORAGE",
+    "MODE_OF_OPERATION": "MODE_OF_OPERATION",
+    "EMISSION": "EMISSION",
+}
+
+PARAMS_TO_CHECK = [
+    "OutputActivityRatio",
+    "InputActivityRatio",
+    "TechnologyToStorage",
+    "TechnologyFromStorage",
+    "EmissionActivityRatio",
+]
+
+# lines from a previous pre-processing run that are regenerated
+SKIP_LINES = ("set MODEper", "set MODEx", "end;")
+
+
+def _new_mapping() -> defaultdict:
+    """Mapping of set element to an insertion ordered, de-duplicated, list"""
+    return defaultdict(dict)
+
+
+def stream_data_file(f_in: TextIO, f_out: TextIO) -> tuple[dict, dict]:
+    """Copies the data file while collecting set members and activity combinations
+
+    Arguments
+    ---------
+    f_in: TextIO
+        OSeMOSYS data file to read
+    f_out: TextIO
+        Handle the data file lines are copied to
+
+    Returns
+    -------
+    tuple[dict, dict]
+        Set members keyed by set name and the mode/technology combinations
+        keyed by the set they will be written to
+    """
+
+    intern = sys.intern
+
+    sets = {name: {} for name in set(SETS_TO_CHECK.values())}
+    mappings = {
+        "MODExTECHNOLOGYperFUELout": _new_mapping(),
+        "MODExTECHNOLOGYperFUELin": _new_mapping(),
+        "MODEperTECHNOLOGY": _new_mapping(),
+        "MODExTECHNOLOGYperSTORAGEto": _new_mapping(),
+        "MODExTECHNOLOGYperSTORAGEfrom": _new_mapping(),
+        "MODExTECHNOLOGYperEMISSION": _new_mapping(),
+    }
+
+    fuel_out = mappings["MODExTECHNOLOGYperFUELout"]
+    fuel_in = mappings["MODExTECHNOLOGYperFUELin"]
+    tech_modes = mappings["MODEperTECHNOLOGY"]
+    storage_to = mappings["MODExTECHNOLOGYperSTORAGEto"]
+    storage_from = mappings["MODExTECHNOLOGYperSTORAGEfrom"]
+    emission = mappings["MODExTECHNOLOGYperEMISSION"]
+
+    set_current = None
+    param_current = None
+
+    for line in f_in:
+
+        if line.startswith(SKIP_LINES):
+            continue
+        f_out.write(line)
+
+        if line.startswith(";"):
+            set_current = None
+            param_current = None
+            continue
+
+        if set_current:
+            member = line.strip()
+            if member:
+                sets[set_current][intern(member)] = None
+            continue
+
+        if param_current:
+            details = line.split()
+            if len(details) < 5:
+                continue
+
+            tech = intern(details[1])
+            other = intern(details[2])
+            mode = intern(details[3])
+
+            if param_current in ("TechnologyToStorage", "TechnologyFromStorage"):
+                # Storage rows do not contribute to MODEperTECHNOLOGY
+                if float(details[4]) > 0.0:
                     if param_current == "TechnologyToStorage":
-                        tech = details[1].strip()
-                        storage = details[2].strip()
-                        mode = details[3].strip()
-                        value = details[4].strip()
-                        if float(value) > 0.0:
-                            storage_to.append(tuple([storage, tech, mode]))
-                            data_all.append(tuple([storage, mode]))
-
-                    if param_current == "TechnologyFromStorage":
-                        tech = details[1].strip()
-                        storage = details[2].strip()
-                        mode = details[3].strip()
-                        value = details[4].strip()
-                        if float(value) > 0.0:
-                            storage_from.append(tuple([storage, tech, mode]))
-                            data_all.append(tuple([storage, mode]))
-
-                    if param_current == "EmissionActivityRatio":
-                        tech = details[1].strip()
-                        emission = details[2].strip()
-                        mode = details[3].strip()
-                        value = details[5].strip()
-                        if float(value) != 0.0:
-                            emission_table.append(tuple([emission, tech, mode]))
-                            data_all.append(tuple([tech, mode]))
-
-            if any(param in line for param in params_to_check):
-                param_current = details[-2]
-                parsing = True
-
-    data_out = list(set(data_out))
-    data_inp = list(set(data_inp))
-    data_all = list(set(data_all))
-    storage_to = list(set(storage_to))
-    storage_from = list(set(storage_from))
-    emission_table = list(set(emission_table))
-
-    dict_out = defaultdict(list)
-    dict_inp = defaultdict(list)
-    dict_all = defaultdict(list)
-    dict_stt = defaultdict(list)
-    dict_stf = defaultdict(list)
-    dict_emi = defaultdict(list)
-
-    for fuel, tech, mode in data_out:
-        dict_out[fuel].append((mode, tech))
-
-    for fuel, tech, mode in data_inp:
-        dict_inp[fuel].append((mode, tech))
-
-    for tech, mode in data_all:
-        if mode not in dict_all[tech]:
-            dict_all[tech].append(mode)
-
-    for storage, tech, mode in storage_to:
-        dict_stt[storage].append((mode, tech))
-
-    for storage, tech, mode in storage_from:
-        dict_stf[storage].append((mode, tech))
-
-    for emission, tech, mode in emission_table:
-        dict_emi[emission].append((mode, tech))
-
-    def file_output_function(if_dict, str_dict, set_list, set_name, extra_char):
-        for each in set_list:
-            if each in if_dict.keys():
-                line = set_name + str(each) + "]:=" + str(str_dict[each]) + extra_char
-                if set_list == tech_list:
-                    line = (
-                        line.replace(",", "")
-                        .replace(":=[", ":= ")
-                        .replace("]*", "")
-                        .replace("'", "")
+                        storage_to[other][(mode, tech)] = None
+                    else:
+                        storage_from[other][(mode, tech)] = None
+                continue
+
+            if float(details[5]) == 0.0:
+                continue
+
+            if param_current == "OutputActivityRatio":
+                fuel_out[other][(mode, tech)] = None
+            elif param_current == "InputActivityRatio":
+                fuel_in[other][(mode, tech)] = None
+            else:
+                emission[other][(mode, tech)] = None
+            tech_modes[tech][mode] = None
+            continue
+
+        if line.startswith("set "):
+            details = line.split()
+            name = details[1]
+            if name in SETS_TO_CHECK:
+                set_name = SETS_TO_CHECK[name]
+                members = details[3:]
+                if members and members[-1] == ";":
+                    # Set declared on a single line
+                    sets[set_name].update(
+                        (intern(member), None) for member in members[:-1]
                     )
                 else:
-                    line = (
-                        line.replace("),", ")")
-                        .replace("[(", " (")
-                        .replace(")]", ")")
-                        .replace("'", "")
-                    )
-            else:
-                line = set_name + str(each) + "]:="
+                    set_current = set_name
+
+        elif line.startswith("param "):
+            name = line.split()[-2]
+            if name in PARAMS_TO_CHECK:
+                param_current = name
+
+    return sets, mappings
+
+
+def write_mode_sets(
+    f_out: TextIO,
+    set_name: str,
+    set_list: list[str],
+    mapping: dict,
+    is_tech: bool = False,
+) -> None:
+    """Writes one indexed pre-processing set for each member of a base set
+
+    Arguments
+    ---------
+    f_out: TextIO
+        Handle to write to
+    set_name: str
+        Name of the indexed set, such as "MODExTECHNOLOGYperFUELout"
+    set_list: list[str]
+        Members of the indexing set
+    mapping: dict
+        Combinations to write per member of the indexing set
+    is_tech: bool
+        Writes modes only (for MODEperTECHNOLOGY) rather than (mode, tech)
+        tuples
+    """
+
+    for each in set_list:
+        combinations = mapping.get(each)
+        if not combinations:
+            line = f"set {set_name}[{each}]:="
+        elif is_tech:
+            line = f"set {set_name}[{each}]:= " + " ".join(combinations)
+        else:
+            line = f"set {set_name}[{each}]:= " + " ".join(
+                f"({mode}, {tech})" for mode, tech in combinations
+            )
+        f_out.write(line + ";\n")
+
 
-            file_out.write(line + ";" + "\n")
+def main(data_infile, data_outfile):
 
-    # Append lines at the end of the data file
-    with open(data_outfile, "w") as file_out:  # 'a' to open in 'append' mode
+    with open(data_infile, "r") as f_in, open(data_outfile, "w") as f_out:
 
-        file_out.writelines(lines)
+        sets, mappings = stream_data_file(f_in, f_out)
 
-        file_output_function(
-            dict_out, dict_out, fuel_list, "set MODExTECHNOLOGYperFUELout[", ""
+        fuel_list = list(sets["FUEL"])
+        tech_list = list(sets["TECHNOLOGY"])
+        storage_list = list(sets["STORAGE"])
+        emission_list = list(sets["EMISSION"])
+
+        write_mode_sets(
+            f_out,
+            "MODExTECHNOLOGYperFUELout",
+            fuel_list,
+            mappings["MODExTECHNOLOGYperFUELout"],
         )
-        file_output_function(
-            dict_inp, dict_inp, fuel_list, "set MODExTECHNOLOGYperFUELin[", ""
+        write_mode_sets(
+            f_out,
+            "MODExTECHNOLOGYperFUELin",
+            fuel_list,
+            mappings["MODExTECHNOLOGYperFUELin"],
         )
-        file_output_function(
-            dict_all, dict_all, tech_list, "set MODEperTECHNOLOGY[", "*"
+        write_mode_sets(
+            f_out,
+            "MODEperTECHNOLOGY",
+            tech_list,
+            mappings["MODEperTECHNOLOGY"],
+            is_tech=True,
         )
 
         if len(storage_list) > 0:
-            file_output_function(
-                dict_stt, dict_stt, storage_list, "set MODExTECHNOLOGYperSTORAGEto[", ""
+            write_mode_sets(
+                f_out,
+                "MODExTECHNOLOGYperSTORAGEto",
+                storage_list,
+                mappings["MODExTECHNOLOGYperSTORAGEto"],
             )
-            file_output_function(
-                dict_stf,
-                dict_stf,
+            write_mode_sets(
+                f_out,
+                "MODExTECHNOLOGYperSTORAGEfrom",
                 storage_list,
-                "set MODExTECHNOLOGYperSTORAGEfrom[",
-                "",
+                mappings["MODExTECHNOLOGYperSTORAGEfrom"],
             )
 
         if len(emission_list) > 0:
-            file_output_function(
-                dict_emi, dict_emi, emission_list, "set MODExTECHNOLOGYperEMISSION[", ""
+            write_mode_sets(
+                f_out,
+                "MODExTECHNOLOGYperEMISSION",
+                emission_list,
+                mappings["MODExTECHNOLOGYperEMISSION"],
             )
 
-        file_out.write("end;")
+        f_out.write("end;")
 
 
 if __name__ == "__main__":
@@ -7,4 +7,53 @@
     - https://docs.pytest.org/en/stable/writing_plugins.html
 """
 
-# import pytest
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+SCRIPTS = Path(__file__).parents[1] / "workflow" / "scripts" / "osemosys_global"
+
+
+def load_script(stage: str, name: str) -> ModuleType:
+    """Loads a module of a stage script directory by its file path
+
+    The scripts of a stage import each other by flat module names, ie.
+    ``from data import ...``, which are the same across the powerplant,
+    demand, emissions, ... stages. The module is loaded with the stage
+    directory first on ``sys.path`` and with none of the cached flat modules
+    of other stages, and ``sys.path`` and ``sys.modules`` are restored after,
+    so tests of different stages can be collected in any order.
+
+    Arguments
+    ---------
+    stage: str
+        Directory of the stage scripts, ie. "powerplant"
+    name: str
+        Name of the module, ie. "variable_costs"
+
+    Returns
+    -------
+    ModuleType
+        The loaded module
+    """
+
+    directory = SCRIPTS / stage
+    flat_names = {x.stem for x in directory.glob("*.py")}
+    cached = {x: sys.modules.pop(x) for x in list(sys.modules) if x in flat_names}
+
+    spec = importlib.util.spec_from_file_location(
+        f"{stage}_{name}", directory / f"{name}.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+
+    sys.path.insert(0, str(directory))
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        sys.path.remove(str(directory))
+        for x in flat_names:
+            sys.modules.pop(x, None)
+        sys.modules.update(cached)
+
+    return module
@@ -0,0 +1,113 @@
+"""Module for testing the demand projection"""
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from pytest import fixture, importorskip
+
+from conftest import load_script
+from osemosys_global.plexos_world import PlexosWorld
+
+importorskip("wbgapi")
+projection = load_script("demand", "projection")
+
+STEP_YEARS = list(range(2010, 2105, 5))
+CONTINENTS = {"AS": "Asia", "EU": "Europe"}
+
+
+@fixture
+def inputs():
+    rng = np.random.default_rng(0)
+    nodes = ["AS-IND", "AS-IND-NO", "AS-IND-SO", "AS-BTN", "EU-KOS"]
+    countries = {"IND": "Asia", "BTN": "Asia", "KOS": "Europe"}
+    scenarios = ["SSP1", "SSP2", "SSP5"]
+
+    memberships = pd.DataFrame(
+        {
+            "parent_class": "Node",
+            "child_class": "Region",
+            "collection": "Region.Region",
+            "parent_object": nodes,
+            "child_object": [CONTINENTS[x[:2]] for x in nodes],
+        }
+    )
+    plexos = PlexosWorld(memberships, pd.DataFrame())
+
+    demand = pd.DataFrame(rng.random((8760, len(nodes))) * 100, columns=nodes)
+    demand["AS-IND-NO"] = demand["AS-IND"] * 0.25
+    demand["AS-IND-SO"] = demand["AS-IND"] * 0.75
+    demand.insert(0, "Datetime", range(8760))
+
+    def iamc(scale):
+        index = [x for _ in scenarios for x in countries]
+        df = pd.DataFrame(
+            rng.random((len(index), len(STEP_YEARS))) * scale,
+            index=index,
+            columns=STEP_YEARS,
+        )
+        df.insert(0, "child_object", [countries[x] for x in index])
+        df.insert(1, "Scenario", np.repeat(scenarios, len(countries)))
+        return df
+
+    td_losses = pd.DataFrame(
+        rng.random((len(countries), len(STEP_YEARS))) * 10, columns=STEP_YEARS
+    )
+    td_losses.insert(0, "Country", list(countries))
+
+    lr = pd.DataFrame(
+        {
+            "coef_GDPppp": [0.1, 0.2],
+            "coef_Urb": [20.0, -5.0],
+            "intercept": [-500.0, 100.0],
+        },
+        index=pd.Index(["Asia", "Europe"], name="child_object"),
+    )
+
+    return dict(
+        lr=lr,
+        plexos=plexos,
+        plexos_demand=demand,
+        iamc_gdp=iamc(1000),
+        iamc_pop=iamc(100),
+        iamc_urb=iamc(100),
+        td_losses=td_losses,
+    )
+
+
+def test_node_projections_scenarios(inputs):
+    ensemble = projection.perform_node_projections(**inputs)
+    assert ensemble["Scenario"].unique().tolist() == ["SSP1", "SSP2", "SSP5"]
+    assert len(ensemble) == 5 * 3
+
+    # all scenarios at once are the same as each scenario on its own
+    for scenario, df in ensemble.groupby("Scenario"):
+        single = {
+            k: v[v["Scenario"] == scenario] if k.startswith("iamc") else v
+            for k, v in inputs.items()
+        }
+        assert_frame_equal(projection.perform_node_projections(**single), df)
+
+
+def test_interpolate_yearly_demand():
+    rng = np.random.default_rng(0)
+    steps = pd.DataFrame(rng.random((4, len(STEP_YEARS))), columns=STEP_YEARS)
+    steps.iloc[1, 3:6] = np.nan
+    steps.iloc[2, :2] = np.nan
+    steps.iloc[3, -3:] = np.nan
+    meta = pd.DataFrame(
+        {
+            "Country": "IND",
+            "PLEXOS_Countries": "AS-IND",
+            "Share_%_Country_Demand": 1.0,
+            "Unit": "GWh",
+            "Scenario": "SSP2",
+        },
+        index=steps.index,
+    )
+
+    df = projection._interpolate_yearly_demand(pd.concat([meta, steps], axis=1))
+
+    all_years = list(range(2010, 2101))
+    expected = steps.reindex(columns=all_years).interpolate(method="linear", axis=1)
+    assert df.columns.tolist() == meta.columns.tolist() + all_years
+    np.testing.assert_array_equal(df[all_years].to_numpy(), expected.to_numpy())
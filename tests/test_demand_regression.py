@@ -0,0 +1,72 @@
+"""Module for testing the demand regression"""
+
+import numpy as np
+import pandas as pd
+from pytest import fixture, importorskip, mark
+
+from conftest import load_script
+
+importorskip("wbgapi")
+regression = load_script("demand", "regression")
+
+
+@fixture
+def observations():
+    rng = np.random.default_rng(0)
+    regions = np.repeat(["Asia", "Europe", "Africa"], 20)
+    df = pd.DataFrame(
+        {
+            "Year": np.tile(np.arange(2000, 2020), 3),
+            "WB_GDPppp": rng.random(60) * 50000,
+            "WB_Urb": rng.random(60) * 100,
+        },
+        index=pd.Index(regions, name="child_object"),
+    )
+    df["ember_Elec"] = (
+        0.1 * df["WB_GDPppp"] + 20 * df["WB_Urb"] + rng.normal(0, 100, 60)
+    )
+    # constant urbanization, so the coefficients are not unique
+    df.loc["Africa", "WB_Urb"] = 50.0
+    return df.sample(frac=1, random_state=0)
+
+
+def _fit_loop(df, features):
+    linear_model = importorskip("sklearn.linear_model")
+    rows = {}
+    for region in df.index.unique():
+        df_region = df.loc[region]
+        lr = linear_model.LinearRegression().fit(
+            df_region[features], df_region["ember_Elec"]
+        )
+        rows[region] = [lr.intercept_, *lr.coef_] + [
+            lr.score(df_region[features], df_region["ember_Elec"])
+        ]
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=["intercept", *features, "R2"]
+    )
+
+
+@mark.parametrize("features", [["WB_GDPppp"], ["WB_GDPppp", "WB_Urb"]])
+def test_fit_linear_regressions(observations, features):
+    lr = regression.fit_linear_regressions(observations, features, "ember_Elec")
+    expected = _fit_loop(observations, features)
+
+    assert lr.index.tolist() == observations.index.unique().tolist()
+    assert lr.columns.tolist() == ["intercept"] + [
+        x.replace("WB_", "coef_") for x in features
+    ] + ["R2"]
+    np.testing.assert_allclose(lr.to_numpy(), expected.to_numpy(), rtol=1e-8)
+
+
+def test_fit_linear_regressions_degenerate():
+    df = pd.DataFrame(
+        {"WB_GDPppp": [1.0, 2.0, 3.0], "ember_Elec": [2.0, 2.0, 2.0]},
+        index=["A", "A", "B"],
+    )
+    lr = regression.fit_linear_regressions(df, ["WB_GDPppp"], "ember_Elec")
+
+    # a constant target is fitted exactly, a single observation is not scored
+    assert lr.loc["A", "coef_GDPppp"] == 0
+    assert lr.loc["A", "R2"] == 1
+    assert lr.loc["B", "intercept"] == 2
+    assert np.isnan(lr.loc["B", "R2"])
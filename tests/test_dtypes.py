@@ -0,0 +1,82 @@
+"""Module for testing the datatype policy"""
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+import osemosys_global.dtypes as dtypes
+import osemosys_global.param_io as param_io
+
+DF = pd.DataFrame(
+    {
+        "REGION": ["GLOBAL"] * 4,
+        "TECHNOLOGY": ["PWRCOAIND01", "PWRCOAIND01", "PWRSPVIND01", "PWRSPVIND01"],
+        "MODE_OF_OPERATION": [1, 2, 1, 2],
+        "YEAR": [2021, 2021, 2022, 2022],
+        "VALUE": [0.1, 2.5, 0.3333, 31.536],
+    }
+)
+
+
+def test_compact_dtypes():
+    df = dtypes.compact_dtypes(DF)
+
+    assert isinstance(df["TECHNOLOGY"].dtype, pd.CategoricalDtype)
+    assert df["YEAR"].dtype == "int16"
+    assert df["MODE_OF_OPERATION"].dtype == "int16"
+    assert df["VALUE"].dtype == "float32"
+    assert df.to_csv(index=False) == DF.to_csv(index=False)
+
+    assert_frame_equal(dtypes.expand_dtypes(df), DF)
+
+
+def test_compact_dtypes_unsafe():
+    df = DF.assign(VALUE=[1 / 3, 2.5, 0.1, 0.2], YEAR=[2021, 2022, np.nan, 2021])
+    df = dtypes.compact_dtypes(df)
+    assert df["VALUE"].dtype == "float64"
+    assert df["YEAR"].dtype == "float64"
+
+    assert dtypes.float32_safe(pd.Series([0.1, 0.25, 1e-5, np.nan]))
+    assert not dtypes.float32_safe(pd.Series([1234.5678]))
+
+
+def test_code_dictionary():
+    codes = dtypes.CodeDictionary()
+    first = codes.encode(pd.Series(["b", "a", None], name="FUEL"), "FUEL")
+    second = codes.encode(pd.Series(["c", "a"], name="FUEL"), "FUEL")
+
+    assert first.cat.categories.tolist() == ["b", "a"]
+    assert second.cat.categories.tolist() == ["b", "a", "c"]
+    assert pd.isna(first[2])
+
+    df = pd.concat([codes.align(first.to_frame()), second.to_frame()])
+    assert isinstance(df["FUEL"].dtype, pd.CategoricalDtype)
+    assert df["FUEL"].tolist()[:2] == ["b", "a"]
+
+
+def test_memory_report():
+    df = pd.concat([DF] * 1000, ignore_index=True)
+    report = dtypes.memory_report({"CapacityFactor": df})
+
+    assert report.loc[0, "rows"] == 4000
+    assert report.loc[0, "compact_mb"] < report.loc[0, "plain_mb"]
+    assert report.loc[0, "reduction"] > 0.5
+
+
+def test_read_table_compact(tmp_path):
+    path = param_io.table_path(tmp_path, "InputActivityRatio")
+    param_io.write_table(DF, path)
+
+    df = param_io.read_table(path, compact=True)
+    assert isinstance(df["REGION"].dtype, pd.CategoricalDtype)
+    assert df["VALUE"].dtype == "float32"
+    assert_frame_equal(dtypes.expand_dtypes(df), DF)
+
+
+def test_write_table_compact(tmp_path):
+    df = DF.assign(VALUE=[0.0001, 0.5, 1e-6, 2.0])
+    path = param_io.table_path(tmp_path, "CapacityFactor")
+    param_io.write_table(dtypes.compact_dtypes(df), path)
+
+    with open(path) as f:
+        assert f.read() == df.to_csv(index=False)
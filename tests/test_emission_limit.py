@@ -0,0 +1,53 @@
+"""Module for testing the AnnualEmissionLimit trajectories"""
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from conftest import load_script
+
+emissions = load_script("emissions", "emission_limit")
+
+EMISSION_SET = pd.DataFrame({"VALUE": ["CO2IND", "CO2BTN"]})
+
+EMBER = pd.DataFrame(
+    {
+        "REGION": "GLOBAL",
+        "EMISSION": ["CO2BTN", "CO2BTN", "CO2IND"],
+        "YEAR": [2017, 2018, 2018],
+        "VALUE": [5.0, 6.0, 50.0],
+    }
+)
+
+
+def test_add_emission_limits():
+    emission_limit = [
+        ["CO2", "IND", "LINEAR", 2025, 0],
+        ["CO2", "IND", "POINT", 2021, 10],
+        ["CO2", "BTN", "LINEAR", 2022, 0],
+        ["CO2", "IND", "POINT", 2023, 4],
+    ]
+
+    actual = emissions.add_emission_limits(
+        EMISSION_SET, emission_limit, EMBER, 2020, 2026, "GLOBAL"
+    )
+
+    expected = pd.DataFrame(
+        {
+            "REGION": "GLOBAL",
+            "EMISSION": ["CO2BTN"] * 7 + ["CO2IND"] * 6,
+            "YEAR": list(range(2020, 2027)) + list(range(2021, 2027)),
+            # BTN is interpolated from the latest EMBER year before the horizon,
+            # IND holds each POINT limit up to the next limit
+            "VALUE": [4.0, 2.0, 0, 0, 0, 0, 0, 10, 10, 4, 2, 0, 0],
+        }
+    )
+
+    assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_add_emission_limits_without_limits():
+    for emission_limit in (None, [], [["CH4", "IND", "POINT", 2022, 1]]):
+        actual = emissions.add_emission_limits(
+            EMISSION_SET, emission_limit, EMBER, 2020, 2026, "GLOBAL"
+        )
+        assert actual.empty
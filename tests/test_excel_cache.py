@@ -0,0 +1,79 @@
+"""Module for testing the cache of parsed Excel sheets"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from pytest import fixture, importorskip
+
+import osemosys_global.excel_cache as excel_cache
+
+importorskip("openpyxl")
+
+
+@fixture
+def workbook(tmp_path):
+    path = tmp_path / "iamc_db_POP_Countries.xlsx"
+    data = pd.DataFrame(
+        {
+            "Model": ["IIASA-WiC POP", "NCAR", "NCAR"],
+            "Region": ["IND", None, "BTN"],
+            2010: [1.5, 2.5, np.nan],
+            2015: [1, 2, 3],
+        }
+    )
+    # a column of text and numbers is stored as JSON text
+    mixed = pd.DataFrame({"VALUE": [1, "not found", 2.5, None]})
+    # a column of text and dates can not be stored
+    dates = pd.DataFrame({"VALUE": [datetime.datetime(2020, 1, 1), "not found"]})
+    with pd.ExcelWriter(path) as writer:
+        data.to_excel(writer, sheet_name="data", index=False)
+        mixed.to_excel(writer, sheet_name="mixed", index=False)
+        dates.to_excel(writer, sheet_name="dates", index=False)
+    return str(path)
+
+
+def test_read_excel(tmp_path, workbook):
+    importorskip("pyarrow")
+    cache_dir = str(tmp_path / "cache")
+
+    for sheet in ("data", "mixed", "dates"):
+        expected = pd.read_excel(workbook, sheet_name=sheet)
+        first = excel_cache.read_excel(workbook, sheet, cache_dir=cache_dir)
+        second = excel_cache.read_excel(workbook, sheet, cache_dir=cache_dir)
+        assert_frame_equal(first, expected)
+        assert_frame_equal(second, expected)
+        assert second.columns.tolist() == expected.columns.tolist()
+
+    suffixes = sorted(x.suffix for x in (tmp_path / "cache").iterdir())
+    assert suffixes == [".parquet", ".parquet"]
+
+    # read arguments are part of the key
+    df = excel_cache.read_excel(workbook, "data", cache_dir=cache_dir, nrows=1)
+    assert len(df) == 1
+    assert len(list((tmp_path / "cache").iterdir())) == 3
+
+
+def test_cache_key_format_version(workbook, monkeypatch):
+    key = excel_cache.cache_key(workbook, "data")
+    monkeypatch.setattr(excel_cache, "FORMAT_VERSION", excel_cache.FORMAT_VERSION + 1)
+    assert excel_cache.cache_key(workbook, "data") != key
+
+
+def test_read_excel_changed_workbook(tmp_path, workbook):
+    cache_dir = str(tmp_path / "cache")
+    excel_cache.read_excel(workbook, "data", cache_dir=cache_dir)
+
+    pd.DataFrame({"Model": ["OECD Env-Growth"]}).to_excel(
+        workbook, sheet_name="data", index=False
+    )
+    df = excel_cache.read_excel(workbook, "data", cache_dir=cache_dir)
+    assert df["Model"].tolist() == ["OECD Env-Growth"]
+
+
+def test_read_excel_uncached(tmp_path, workbook):
+    df = excel_cache.read_excel(workbook, "data", cache_dir=None)
+    assert_frame_equal(df, pd.read_excel(workbook, sheet_name="data"))
+    converters = {"Model": str.upper}
+    assert excel_cache.cache_key(workbook, "data", converters=converters) is None
@@ -0,0 +1,50 @@
+"""Module for testing the user defined fuel limits"""
+
+import pandas as pd
+from pandas.testing import assert_series_equal
+
+from conftest import load_script
+
+fuel_limits = load_script("powerplant", "fuel_limits")
+
+REGIONS = pd.Series(["GLOBAL"])
+
+FUEL_LIMITS = pd.DataFrame(
+    {
+        "FUEL": ["COA", "COA", "COA", "GAS", "GAS", "OIL", "URN"],
+        "COUNTRY": ["IND", "IND", "IND", "BTN", "BTN", "BTN", "BTN"],
+        "VALUE": [10, 40, 40.25, 5, 7, 3, 0.0005],
+        "YEAR": [2020, 2023, 2024, 2022, 2024, 2022, 2022],
+    }
+)
+
+
+def test_get_user_fuel_limits():
+    actual = fuel_limits.get_user_fuel_limits(REGIONS, FUEL_LIMITS)
+
+    # each technology is interpolated within its own years only, a single
+    # year is kept as it is and limits of 0.001 or less are dropped
+    expected = pd.Series(
+        [10.0, 20.0, 30.0, 40.0, 40.2, 5.0, 6.0, 7.0, 3.0],
+        index=pd.MultiIndex.from_tuples(
+            [
+                ("GLOBAL", "MINCOAIND", 2020),
+                ("GLOBAL", "MINCOAIND", 2021),
+                ("GLOBAL", "MINCOAIND", 2022),
+                ("GLOBAL", "MINCOAIND", 2023),
+                ("GLOBAL", "MINCOAIND", 2024),
+                ("GLOBAL", "MINGASBTN", 2022),
+                ("GLOBAL", "MINGASBTN", 2023),
+                ("GLOBAL", "MINGASBTN", 2024),
+                ("GLOBAL", "MINOILBTN", 2022),
+            ],
+            names=["REGION", "TECHNOLOGY", "YEAR"],
+        ),
+        name="VALUE",
+    )
+    assert_series_equal(actual, expected, check_index_type=False)
+
+
+def test_get_user_fuel_limits_empty():
+    for limits in (None, FUEL_LIMITS.iloc[:0], FUEL_LIMITS.iloc[-1:]):
+        assert fuel_limits.get_user_fuel_limits(REGIONS, limits).empty
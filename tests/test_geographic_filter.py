@@ -0,0 +1,98 @@
+"""Module for testing the geographic filter"""
+
+import osemosys_global.geographic_filter as geographic_filter
+import pandas as pd
+from pytest import fixture
+
+GEO_SCOPE = ["IND", "BTN", "INT"]
+
+
+@fixture
+def oar():
+    return pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", "ELCINDWE01", 1],
+            ["GLOBAL", "PWRCOACHNXX01", "ELCCHNXX01", 1],
+            ["GLOBAL", "PWRHYDINDNO01", "ELCINDNO01", 1],
+            ["GLOBAL", "TRNINDWEBTNXX", "ELCBTNXX01", 1],
+            ["GLOBAL", "TRNINDWECHNXX", "ELCCHNXX01", 1],
+            ["GLOBAL", "MINCOAINT", "COAINT", 1],
+            ["GLOBAL", "MINCOACHN", "COA", 1],
+        ],
+        columns=["REGION", "TECHNOLOGY", "FUEL", "VALUE"],
+    )
+
+
+def test_filter_param(oar):
+    df = geographic_filter.filer(oar, "OutputActivityRatio", GEO_SCOPE, ["INDNO"])
+    assert df.TECHNOLOGY.to_list() == ["PWRCOAINDWE01", "TRNINDWEBTNXX", "MINCOAINT"]
+
+
+def test_filter_sets():
+    techs = pd.DataFrame({"VALUE": ["PWRCOAINDWE01", "PWRCOACHNXX01", "TRNBTNXXINDWE"]})
+    df = geographic_filter.filer(techs, "TECHNOLOGY", GEO_SCOPE, [])
+    assert df.VALUE.to_list() == ["PWRCOAINDWE01", "TRNBTNXXINDWE"]
+
+    fuels = pd.DataFrame({"VALUE": ["ELCINDWE01", "ELCCHNXX01", "GAS", "T01"]})
+    df = geographic_filter.filer(fuels, "FUEL", GEO_SCOPE, [], {"T01": []})
+    assert df.VALUE.to_list() == ["ELCINDWE01", "GAS", "T01"]
+
+    storages = pd.DataFrame({"VALUE": ["SDSINDWE", "SDSCHNXX", "SDSBTNXX"]})
+    df = geographic_filter.filer(storages, "STORAGE", GEO_SCOPE, ["BTNXX"])
+    assert df.VALUE.to_list() == ["SDSINDWE"]
+
+
+def test_code_index_cache():
+    index = geographic_filter.CodeIndex(GEO_SCOPE, [])
+    values = pd.Series(["PWRCOAINDWE01", "PWRCOACHNXX01", None, "PWRCOAINDWE01"])
+    assert index.mask(values, "TECHNOLOGY").tolist() == [True, False, False, True]
+    assert index._lookup["TECHNOLOGY"] == {
+        "PWRCOAINDWE01": True,
+        "PWRCOACHNXX01": False,
+    }
+
+
+def test_filter_files(tmp_path, oar):
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    oar.to_csv(in_dir / "OutputActivityRatio.csv", index=False)
+    oar[["TECHNOLOGY"]].rename(columns={"TECHNOLOGY": "VALUE"}).to_csv(
+        in_dir / "TECHNOLOGY.csv", index=False
+    )
+
+    geographic_filter.filter_files(
+        [str(x) for x in in_dir.glob("*.csv")], str(tmp_path), GEO_SCOPE, [], workers=2
+    )
+
+    df = pd.read_csv(tmp_path / "TECHNOLOGY.csv")
+    assert df.VALUE.to_list() == [
+        "PWRCOAINDWE01",
+        "PWRHYDINDNO01",
+        "TRNINDWEBTNXX",
+        "MINCOAINT",
+    ]
+
+
+def test_filter_files_year_invariant(tmp_path):
+    in_dir = tmp_path / "in"
+    in_dir.mkdir()
+    pd.DataFrame(
+        [
+            ["GLOBAL", "PWRSPVINDWE01", "S1D1", 0.5],
+            ["GLOBAL", "PWRSPVCHNXX01", "S1D1", 0.4],
+        ],
+        columns=["REGION", "TECHNOLOGY", "TIMESLICE", "VALUE"],
+    ).to_csv(in_dir / "CapacityFactor.csv", index=False)
+
+    geographic_filter.filter_files(
+        [str(in_dir / "CapacityFactor.csv")],
+        str(tmp_path),
+        GEO_SCOPE,
+        [],
+        years=[2021, 2022],
+    )
+
+    df = pd.read_csv(tmp_path / "CapacityFactor.csv")
+    assert df.columns.tolist() == ["REGION", "TECHNOLOGY", "TIMESLICE", "YEAR", "VALUE"]
+    assert df.TECHNOLOGY.unique().tolist() == ["PWRSPVINDWE01"]
+    assert df.YEAR.tolist() == [2021, 2022]
@@ -0,0 +1,79 @@
+"""Module for testing the powerplant investment constraints"""
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from conftest import load_script
+
+constraints = load_script("powerplant", "investment_constraints")
+
+COLUMNS = ["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
+
+MAX_CAPACITY = pd.DataFrame([["GLOBAL", "PWRSPVINDWE01", 2025, 100.0]], columns=COLUMNS)
+
+# min capacity is passed in with other column names
+MIN_CAPACITY = pd.DataFrame(
+    [["GLOBAL", "PWRSPVINDWE01", 2025, 1.0]], columns=["r", "t", "y", "v"]
+)
+
+RESIDUAL_CAPACITY = pd.DataFrame(
+    [
+        ["GLOBAL", "PWRCCGINDWE00", 2025, 3.0],
+        ["GLOBAL", "PWRCOAINDWE00", 2025, 3.0],
+    ],
+    columns=COLUMNS,
+)
+
+
+def test_set_fossil_capacity_constraints():
+    fossil_targets = [
+        ["INDWE", "CCG", 2025, 2026, "MAX", 10],
+        ["INDNE", "OCG", 2025, 2025, "ABS", 4],
+        ["BTNXX", "COA", 2026, 2026, "MIN", 2],
+    ]
+
+    max_capacity, min_capacity = constraints.set_fossil_capacity_constraints(
+        [],
+        fossil_targets,
+        MAX_CAPACITY.copy(),
+        MIN_CAPACITY.copy(),
+        RESIDUAL_CAPACITY,
+        "GLOBAL",
+    )
+
+    # residual capacity of the '00' technology is substracted, and targets with
+    # residual capacity are only kept in years with residual capacity
+    expected_max = pd.DataFrame(
+        [
+            ["GLOBAL", "PWRSPVINDWE01", 2025, 100.0],
+            ["GLOBAL", "PWRCCGINDWE01", 2025, 7.0],
+            ["GLOBAL", "PWROCGINDNE01", 2025, 4.0],
+        ],
+        columns=COLUMNS,
+    )
+    expected_min = pd.DataFrame(
+        [
+            ["GLOBAL", "PWRSPVINDWE01", 2025, 1.0],
+            ["GLOBAL", "PWROCGINDNE01", 2025, 4.0],
+            ["GLOBAL", "PWRCOABTNXX01", 2026, 2.0],
+        ],
+        columns=COLUMNS,
+    )
+    assert_frame_equal(max_capacity, expected_max, check_dtype=False)
+    assert_frame_equal(min_capacity, expected_min, check_dtype=False)
+
+
+def test_set_fossil_capacity_constraints_without_targets():
+    for fossil_targets in (None, []):
+        max_capacity, min_capacity = constraints.set_fossil_capacity_constraints(
+            [],
+            fossil_targets,
+            MAX_CAPACITY.copy(),
+            MIN_CAPACITY.copy(),
+            RESIDUAL_CAPACITY,
+            "GLOBAL",
+        )
+
+        assert_frame_equal(max_capacity, MAX_CAPACITY)
+        assert list(min_capacity.columns) == COLUMNS
+        assert min_capacity.values.tolist() == MIN_CAPACITY.values.tolist()
@@ -0,0 +1,380 @@
+"""Module for testing the native LP writer"""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+from pytest import approx, fixture, mark, raises
+
+from osemosys_global.lp_builder import write_lp
+from osemosys_global.write_data_file import (
+    read_data,
+    read_otoole_config,
+    write_data_file,
+)
+
+RESOURCES = Path(__file__).parents[1] / "resources"
+OTOOLE_CONFIG = RESOURCES / "otoole.yaml"
+MODEL_FILE = RESOURCES / "osemosys_fast_preprocessed.txt"
+
+YEARS = [2021, 2022, 2023]
+TIMESLICES = [f"S{ls}D{ld}H{lh}" for ls in (1, 2) for ld in (1, 2) for lh in (1, 2)]
+
+TECHS = ["MINCOA", "PWRCOA", "PWRSPV", "PWRSDS", "TRNELC"]
+
+
+def _frame(rows: list[tuple], columns: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=columns)
+
+
+def _per_year(rows: list[tuple], years: list[int] = YEARS) -> list[tuple]:
+    return [(*x[:-1], y, x[-1]) for x in rows for y in years]
+
+
+@fixture
+def csv_dir(tmp_path):
+    r = "GLOBAL"
+    tables = {
+        "REGION": [r],
+        "YEAR": YEARS,
+        "TIMESLICE": TIMESLICES,
+        "SEASON": [1, 2],
+        "DAYTYPE": [1, 2],
+        "DAILYTIMEBRACKET": [1, 2],
+        "MODE_OF_OPERATION": [1, 2],
+        "TECHNOLOGY": TECHS,
+        "FUEL": ["COA", "ELC01", "ELC02", "RNW"],
+        "EMISSION": ["CO2"],
+        "STORAGE": ["SDS"],
+    }
+    data = {
+        x: _frame([(v,) for v in values], ["VALUE"]) for x, values in tables.items()
+    }
+
+    def param(name, columns, rows):
+        data[name] = _frame(rows, columns + ["VALUE"])
+
+    param(
+        "YearSplit", ["TIMESLICE", "YEAR"], _per_year([(x, 0.125) for x in TIMESLICES])
+    )
+    param(
+        "Conversionls",
+        ["TIMESLICE", "SEASON"],
+        [(x, int(x[1]), 1) for x in TIMESLICES],
+    )
+    param(
+        "Conversionld",
+        ["TIMESLICE", "DAYTYPE"],
+        [(x, int(x[3]), 1) for x in TIMESLICES],
+    )
+    param(
+        "Conversionlh",
+        ["TIMESLICE", "DAILYTIMEBRACKET"],
+        [(x, int(x[5]), 1) for x in TIMESLICES],
+    )
+    param("DaySplit", ["DAILYTIMEBRACKET", "YEAR"], _per_year([(1, 0.2), (2, 0.3)]))
+    param(
+        "DaysInDayType",
+        ["SEASON", "DAYTYPE", "YEAR"],
+        _per_year([(1, 1, 5), (1, 2, 2), (2, 1, 5), (2, 2, 2)]),
+    )
+    param("DiscountRate", ["REGION"], [(r, 0.05)])
+
+    ratio = ["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR"]
+    param(
+        "OutputActivityRatio",
+        ratio,
+        _per_year(
+            [
+                (r, "MINCOA", "COA", 1, 1),
+                (r, "PWRCOA", "ELC01", 1, 1),
+                (r, "PWRSPV", "ELC01", 1, 1),
+                (r, "PWRSPV", "RNW", 1, 1),
+                (r, "PWRSDS", "ELC01", 2, 1),
+                (r, "TRNELC", "ELC02", 1, 0.95),
+            ]
+        ),
+    )
+    param(
+        "InputActivityRatio",
+        ratio,
+        _per_year(
+            [
+                (r, "PWRCOA", "COA", 1, 2.5),
+                (r, "PWRSDS", "ELC01", 1, 1),
+                (r, "TRNELC", "ELC01", 1, 1),
+            ]
+        ),
+    )
+    param(
+        "EmissionActivityRatio",
+        ["REGION", "TECHNOLOGY", "EMISSION", "MODE_OF_OPERATION", "YEAR"],
+        _per_year([(r, "MINCOA", "CO2", 1, 0.1)]),
+    )
+    param(
+        "EmissionsPenalty",
+        ["REGION", "EMISSION", "YEAR"],
+        _per_year([(r, "CO2", 25)]),
+    )
+    param(
+        "AnnualEmissionLimit",
+        ["REGION", "EMISSION", "YEAR"],
+        [(r, "CO2", 2023, 40)],
+    )
+
+    param(
+        "SpecifiedAnnualDemand",
+        ["REGION", "FUEL", "YEAR"],
+        [(r, "ELC02", 2021, 100), (r, "ELC02", 2022, 110), (r, "ELC02", 2023, 120)],
+    )
+    param(
+        "SpecifiedDemandProfile",
+        ["REGION", "FUEL", "TIMESLICE", "YEAR"],
+        _per_year(
+            [(r, "ELC02", x, 0.1 + 0.05 * (i % 2)) for i, x in enumerate(TIMESLICES)]
+        ),
+    )
+    param(
+        "AccumulatedAnnualDemand",
+        ["REGION", "FUEL", "YEAR"],
+        [(r, "RNW", 2023, 5)],
+    )
+
+    tech_year = ["REGION", "TECHNOLOGY", "YEAR"]
+    param(
+        "CapitalCost",
+        tech_year,
+        _per_year([(r, "PWRCOA", 1500), (r, "PWRSPV", 900), (r, "TRNELC", 300)]),
+    )
+    param("FixedCost", tech_year, _per_year([(r, "PWRCOA", 40), (r, "PWRSPV", 15)]))
+    param(
+        "VariableCost",
+        ["REGION", "TECHNOLOGY", "MODE_OF_OPERATION", "YEAR"],
+        _per_year([(r, "MINCOA", 1, 3), (r, "PWRCOA", 1, 0.5)]),
+    )
+    param(
+        "OperationalLife",
+        ["REGION", "TECHNOLOGY"],
+        [(r, "PWRCOA", 2), (r, "PWRSPV", 25), (r, "TRNELC", 40), (r, "MINCOA", 1)],
+    )
+    param(
+        "ResidualCapacity",
+        tech_year,
+        [(r, "PWRCOA", 2021, 10), (r, "PWRCOA", 2022, 5), (r, "TRNELC", 2021, 20)],
+    )
+    param(
+        "CapacityToActivityUnit",
+        ["REGION", "TECHNOLOGY"],
+        [(r, x, 31.536) for x in ("PWRCOA", "PWRSPV", "PWRSDS", "TRNELC")],
+    )
+    param(
+        "CapacityFactor",
+        ["REGION", "TECHNOLOGY", "TIMESLICE", "YEAR"],
+        _per_year(
+            [(r, "PWRSPV", x, 0.5 if x.endswith("H1") else 0) for x in TIMESLICES]
+        ),
+    )
+    param("AvailabilityFactor", tech_year, _per_year([(r, "PWRCOA", 0.9)]))
+    param("CapacityOfOneTechnologyUnit", tech_year, _per_year([(r, "PWRCOA", 0.5)]))
+    param("TotalAnnualMaxCapacity", tech_year, [(r, "PWRSPV", 2023, 8)])
+    param("TotalAnnualMinCapacity", tech_year, [(r, "PWRSPV", 2022, 1)])
+    param("TotalAnnualMaxCapacityInvestment", tech_year, [(r, "PWRCOA", 2023, 0)])
+    param(
+        "TotalTechnologyAnnualActivityUpperLimit", tech_year, [(r, "MINCOA", 2021, 500)]
+    )
+    param(
+        "TotalTechnologyModelPeriodActivityUpperLimit",
+        ["REGION", "TECHNOLOGY"],
+        [(r, "MINCOA", 1200)],
+    )
+
+    param("ReserveMargin", ["REGION", "YEAR"], _per_year([(r, 1.15)]))
+    param(
+        "ReserveMarginTagFuel",
+        ["REGION", "FUEL", "YEAR"],
+        _per_year([(r, "ELC01", 1)]),
+    )
+    param(
+        "ReserveMarginTagTechnology",
+        tech_year,
+        _per_year([(r, "PWRCOA", 1), (r, "PWRSPV", 0.3)]),
+    )
+    param("RETagTechnology", tech_year, _per_year([(r, "PWRSPV", 1)]))
+    param("RETagFuel", ["REGION", "FUEL", "YEAR"], _per_year([(r, "ELC01", 1)]))
+    param("REMinProductionTarget", ["REGION", "YEAR"], [(r, 2023, 0.2)])
+
+    storage = ["REGION", "TECHNOLOGY", "STORAGE", "MODE_OF_OPERATION"]
+    param("TechnologyToStorage", storage, [(r, "PWRSDS", "SDS", 1, 1)])
+    param("TechnologyFromStorage", storage, [(r, "PWRSDS", "SDS", 2, 1)])
+    param(
+        "CapitalCostStorage", ["REGION", "STORAGE", "YEAR"], _per_year([(r, "SDS", 20)])
+    )
+    param("OperationalLifeStorage", ["REGION", "STORAGE"], [(r, "SDS", 2)])
+    param(
+        "MinStorageCharge", ["REGION", "STORAGE", "YEAR"], _per_year([(r, "SDS", 0.1)])
+    )
+    param(
+        "ResidualStorageCapacity",
+        ["REGION", "STORAGE", "YEAR"],
+        [(r, "SDS", 2021, 3)],
+    )
+    param("DiscountRateStorage", ["REGION", "STORAGE"], [(r, "SDS", 0.08)])
+    param("DepreciationMethod", ["REGION"], [(r, 1)])
+
+    for name, df in data.items():
+        df.to_csv(tmp_path / f"{name}.csv", index=False)
+    return tmp_path
+
+
+@fixture
+def model_data(csv_dir):
+    config = read_otoole_config(str(OTOOLE_CONFIG))
+    return read_data(str(csv_dir), config), config
+
+
+def _parse_lp(lp_file: Path) -> tuple[dict, dict, set, set]:
+    """Reads the objective and rows of an LP file into coefficient dicts"""
+
+    text = lp_file.read_text()
+    text = re.sub(r"\\\*.*?\*\\", "", text, flags=re.S)
+    body, _, tail = text.partition("\nBounds\n")
+    if not tail:
+        body, _, tail = text.partition("\nGenerals\n")
+        tail = "\nGenerals\n" + tail
+    objective, _, constraints = body.partition("Subject To")
+
+    def terms(expression: str) -> dict[str, float]:
+        out = {}
+        tokens = expression.split()
+        sign, coef = 1.0, None
+        for token in tokens:
+            if token in "+-":
+                sign = 1.0 if token == "+" else -1.0
+            elif re.fullmatch(r"[0-9.eE+-]+", token):
+                coef = float(token)
+            else:
+                value = sign * (1.0 if coef is None else coef)
+                out[token] = out.get(token, 0.0) + value
+                sign, coef = 1.0, None
+        return {k: v for k, v in out.items() if v != 0}
+
+    _, _, objective = objective.partition(":")
+    rows = {}
+    for name, expression in re.findall(
+        r"^ ?(\S+):(.*?)(?=^ ?\S+:|\Z)", constraints, flags=re.S | re.M
+    ):
+        lhs, sense, rhs = re.split(r"\s(<=|>=|=)\s", expression.strip())
+        rows[name] = (terms(lhs), sense, float(rhs))
+
+    bounds, _, generals = tail.partition("Generals")
+    free = set(re.findall(r"(\S+) free", bounds))
+    integer = set(generals.split()) - {"End"}
+    return terms(objective), rows, free, integer
+
+
+def test_write_lp(model_data, tmp_path):
+    data, config = model_data
+    lp_file = tmp_path / "model.lp"
+    write_lp(data, config, str(lp_file))
+
+    objective, rows, free, integer = _parse_lp(lp_file)
+
+    # capacity of new solar and residual coal, with activity of each mode
+    row = rows["CAa4_Constraint_Capacity(GLOBAL,S1D1H1,PWRSPV,2022)"]
+    assert row[0] == approx(
+        {
+            "RateOfActivity(GLOBAL,S1D1H1,PWRSPV,1,2022)": 1,
+            "NewCapacity(GLOBAL,PWRSPV,2021)": -0.5 * 31.536,
+            "NewCapacity(GLOBAL,PWRSPV,2022)": -0.5 * 31.536,
+        }
+    )
+    assert row[1:] == ("<=", 0)
+
+    # coal plants have an operational life of two years
+    row = rows["CAa2_TotalAnnualCapacity(GLOBAL,PWRCOA,2023)"]
+    assert set(row[0]) == {
+        "NewCapacity(GLOBAL,PWRCOA,2022)",
+        "NewCapacity(GLOBAL,PWRCOA,2023)",
+        "TotalCapacityAnnual(GLOBAL,PWRCOA,2023)",
+    }
+    assert rows["CAa2_TotalAnnualCapacity(GLOBAL,PWRCOA,2022)"][2] == approx(-5)
+
+    row = rows["EBa11_EnergyBalanceEachTS5(GLOBAL,S1D1H2,ELC02,2022)"]
+    assert row[0] == approx(
+        {"RateOfActivity(GLOBAL,S1D1H2,TRNELC,1,2022)": 0.95 * 0.125}
+    )
+    assert row[1:] == (">=", approx(110 * 0.15))
+
+    # storage levels carry over from the previous day type
+    row = rows["S11_and_S12_StorageLevelDayTypeStart(GLOBAL,SDS,2,2,2021)"]
+    assert row[0] == approx(
+        {
+            "StorageLevelDayTypeStart(GLOBAL,SDS,2,1,2021)": 1,
+            "StorageLevelDayTypeStart(GLOBAL,SDS,2,2,2021)": -1,
+            "RateOfActivity(GLOBAL,S2D1H1,PWRSDS,1,2021)": 0.2 * 5,
+            "RateOfActivity(GLOBAL,S2D1H1,PWRSDS,2,2021)": -0.2 * 5,
+            "RateOfActivity(GLOBAL,S2D1H2,PWRSDS,1,2021)": 0.3 * 5,
+            "RateOfActivity(GLOBAL,S2D1H2,PWRSDS,2,2021)": -0.3 * 5,
+        }
+    )
+
+    # only rows with a limit set
+    assert "TCC1_TotalAnnualMaxCapacityConstraint(GLOBAL,PWRSPV,2023)" in rows
+    assert "TCC1_TotalAnnualMaxCapacityConstraint(GLOBAL,PWRSPV,2022)" not in rows
+    assert "E8_AnnualEmissionsLimit(GLOBAL,CO2,2023)" in rows
+    assert "E8_AnnualEmissionsLimit(GLOBAL,CO2,2022)" not in rows
+    assert "CAa5_TotalNewCapacity(GLOBAL,PWRSPV,2021)" not in rows
+
+    assert objective["NewCapacity(GLOBAL,PWRSPV,2021)"] > 0
+    assert objective["DiscountedSalvageValue(GLOBAL,PWRSPV,2021)"] == -1
+    assert "NetChargeWithinDay(GLOBAL,SDS,1,1,1,2021)" in free
+    assert "NumberOfNewTechnologyUnits(GLOBAL,PWRCOA,2021)" in integer
+
+
+def test_write_lp_chunks(model_data, tmp_path):
+    data, config = model_data
+    write_lp(data, config, str(tmp_path / "full.lp"))
+    write_lp(data, config, str(tmp_path / "chunked.lp"), chunk_size=1)
+
+    full = _parse_lp(tmp_path / "full.lp")
+    chunked = _parse_lp(tmp_path / "chunked.lp")
+    assert chunked[0] == approx(full[0])
+    assert chunked[1] == full[1]
+
+
+def test_write_lp_invalid(model_data, tmp_path):
+    data, config = model_data
+    data["YearSplit"]["VALUE"] = 0.1
+    with raises(ValueError):
+        write_lp(data, config, str(tmp_path / "model.lp"))
+
+
+@mark.skipif(shutil.which("glpsol") is None, reason="glpsol is not installed")
+def test_write_lp_matches_glpsol(model_data, tmp_path):
+    data, config = model_data
+    data_file = tmp_path / "data.txt"
+    write_data_file(data, config, str(data_file))
+
+    expected = tmp_path / "glpsol.lp"
+    subprocess.run(
+        ["glpsol", "-m", str(MODEL_FILE), "-d", str(data_file), "--wlp", str(expected)],
+        check=True,
+        capture_output=True,
+    )
+    actual = tmp_path / "native.lp"
+    write_lp(data, config, str(actual))
+
+    objective, rows, free, integer = _parse_lp(actual)
+    expected_objective, expected_rows, expected_free, expected_integer = _parse_lp(
+        expected
+    )
+
+    assert objective == approx(expected_objective)
+    assert rows.keys() == expected_rows.keys()
+    for name, (terms, sense, rhs) in expected_rows.items():
+        assert rows[name][0] == approx(terms), name
+        assert rows[name][1:] == (sense, approx(rhs, abs=1e-9)), name
+    assert free == expected_free
+    assert integer == expected_integer
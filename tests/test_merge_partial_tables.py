@@ -0,0 +1,136 @@
+"""Module for testing the merging of partial parameter tables"""
+
+import pandas as pd
+from pytest import fixture, mark, importorskip, raises
+from pandas.testing import assert_frame_equal
+
+from osemosys_global.dtypes import expand_dtypes
+from osemosys_global.merge_partial_tables import merge_partial_tables, merge_tables
+from osemosys_global.param_io import table_path, write_table
+
+COLUMNS = ["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
+
+PARTIAL = {
+    "powerplant": pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", 2021, 1.0],
+            ["GLOBAL", "PWRSDSINDWE01", 2021, 2.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2021, 3.0],
+        ],
+        columns=COLUMNS,
+    ),
+    "transmission": pd.DataFrame(
+        [
+            ["GLOBAL", "TRNINDWEINDNE", 2021, 4.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2022, 4.5],
+        ],
+        columns=COLUMNS,
+    ),
+    "storage": pd.DataFrame(
+        [
+            ["GLOBAL", "PWRSDSINDWE01", 2021, 5.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2021, 6.0],
+        ],
+        columns=COLUMNS,
+    ),
+}
+
+DATA_DIRS = list(PARTIAL)
+
+
+@fixture
+def data_dirs(tmp_path):
+    for data_dir in DATA_DIRS:
+        (tmp_path / data_dir).mkdir()
+    return [str(tmp_path / x) for x in DATA_DIRS]
+
+
+def _write(data_dirs, name, tables, data_format="csv"):
+    for data_dir, df in zip(data_dirs, tables):
+        if df is not None:
+            write_table(df, table_path(data_dir, name, data_format))
+
+
+def _plain(df):
+    return expand_dtypes(df).reset_index(drop=True)
+
+
+@mark.parametrize("data_format", ["csv", "parquet"])
+def test_merge_partial_tables(data_dirs, data_format):
+    if data_format == "parquet":
+        importorskip("pyarrow")
+    _write(data_dirs, "CapitalCost", PARTIAL.values(), data_format)
+
+    actual = merge_partial_tables(data_dirs, "CapitalCost", data_format)
+
+    # duplicates keep the entry of the last rule, powerplant -> transmission -> storage,
+    # at the position of the last entry
+    expected = pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", 2021, 1.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2022, 4.5],
+            ["GLOBAL", "PWRSDSINDWE01", 2021, 5.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2021, 6.0],
+        ],
+        columns=COLUMNS,
+    )
+    assert_frame_equal(_plain(actual), expected, check_dtype=False)
+
+
+def test_merge_partial_tables_sets(data_dirs):
+    sets = [
+        pd.DataFrame({"VALUE": ["PWRCOAINDWE01", "PWRSDSINDWE01"]}),
+        pd.DataFrame({"VALUE": ["TRNINDWEINDNE"]}),
+        pd.DataFrame({"VALUE": ["PWRSDSINDWE01", "SDSINDWE01"]}),
+    ]
+    _write(data_dirs, "TECHNOLOGY", sets)
+
+    actual = merge_partial_tables(data_dirs, "TECHNOLOGY")
+
+    assert _plain(actual)["VALUE"].tolist() == [
+        "PWRCOAINDWE01",
+        "TRNINDWEINDNE",
+        "PWRSDSINDWE01",
+        "SDSINDWE01",
+    ]
+
+
+def test_merge_partial_tables_missing(data_dirs):
+    # the transmission rule writes no table
+    _write(data_dirs, "CapitalCost", [PARTIAL["powerplant"], None, PARTIAL["storage"]])
+
+    actual = merge_partial_tables(data_dirs, "CapitalCost")
+
+    expected = pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", 2021, 1.0],
+            ["GLOBAL", "PWRSDSINDWE01", 2021, 5.0],
+            ["GLOBAL", "TRNINDWEINDNE", 2021, 6.0],
+        ],
+        columns=COLUMNS,
+    )
+    assert_frame_equal(_plain(actual), expected, check_dtype=False)
+
+
+def test_merge_partial_tables_empty(data_dirs):
+    empty = pd.DataFrame(columns=COLUMNS)
+    _write(data_dirs, "CapitalCost", [empty, PARTIAL["transmission"], empty])
+
+    actual = merge_partial_tables(data_dirs, "CapitalCost")
+    assert_frame_equal(_plain(actual), PARTIAL["transmission"], check_dtype=False)
+
+    _write(data_dirs, "ResidualCapacity", [empty, None, empty])
+
+    actual = merge_partial_tables(data_dirs, "ResidualCapacity")
+    assert list(actual.columns) == COLUMNS
+    assert actual.empty
+
+
+def test_merge_partial_tables_not_found(data_dirs):
+    with raises(FileNotFoundError):
+        merge_partial_tables(data_dirs, "CapitalCost")
+
+
+def test_merge_tables_empty():
+    tables = [pd.DataFrame(), pd.DataFrame(columns=COLUMNS)]
+    assert merge_tables(tables, "CapitalCost").empty
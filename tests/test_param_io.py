@@ -0,0 +1,118 @@
+"""Module for testing intermediate data read/write helpers"""
+
+import itertools
+
+import osemosys_global.param_io as param_io
+import pandas as pd
+from pytest import mark, importorskip, raises
+from pandas.testing import assert_frame_equal
+
+DF = pd.DataFrame(
+    [
+        ["GLOBAL", "PWRCOAINDWE01", 2021, 1.0],
+        ["GLOBAL", "PWRCOAINDWE01", 2022, 2.5],
+        ["GLOBAL", "PWRSPVINDWE01", 2021, 0],
+    ],
+    columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"],
+)
+
+
+def test_table_path():
+    assert (
+        param_io.table_path("results/data", "TECHNOLOGY")
+        == "results/data/TECHNOLOGY.csv"
+    )
+    assert (
+        param_io.table_path("results/data", "TECHNOLOGY", "parquet")
+        == "results/data/TECHNOLOGY.parquet"
+    )
+
+
+def test_table_path_invalid():
+    with raises(ValueError):
+        param_io.table_path("results/data", "TECHNOLOGY", "xlsx")
+
+
+@mark.parametrize("data_format", ["csv", "parquet"])
+def test_round_trip(tmp_path, data_format):
+    if data_format == "parquet":
+        importorskip("pyarrow")
+    path = param_io.table_path(tmp_path, "CapitalCost", data_format)
+    param_io.write_table(DF, path)
+    assert_frame_equal(param_io.read_table(path), DF)
+
+
+@mark.parametrize("data_format", ["csv", "parquet"])
+def test_round_trip_index(tmp_path, data_format):
+    if data_format == "parquet":
+        importorskip("pyarrow")
+    path = param_io.table_path(tmp_path, "CapitalCost", data_format)
+    series = DF.set_index(["REGION", "TECHNOLOGY", "YEAR"])["VALUE"]
+    param_io.write_table(series, path, index=True)
+    assert_frame_equal(param_io.read_table(path), DF)
+
+
+def test_product_chunks():
+    df = pd.DataFrame(
+        [["S1D1", "PWRSPV", 0.5], ["S1D2", "PWRSPV", 0.25], ["S1D1", "PWRWON", 0.1]],
+        columns=["TIMESLICE", "TECHNOLOGY", "VALUE"],
+    )
+    years = [2021, 2022]
+    chunks = list(param_io.product_chunks(df, ["TIMESLICE", "TECHNOLOGY"], years))
+
+    # one year's worth of rows per chunk
+    assert [len(x) for x in chunks] == [4, 4]
+
+    expected = pd.DataFrame(
+        list(itertools.product(["S1D1", "S1D2"], ["PWRSPV", "PWRWON"], years)),
+        columns=["TIMESLICE", "TECHNOLOGY", "YEAR"],
+    ).join(df.set_index(["TIMESLICE", "TECHNOLOGY"]), on=["TIMESLICE", "TECHNOLOGY"])
+    assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+    empty = list(param_io.product_chunks(df.iloc[:0], ["TIMESLICE"], years))
+    assert len(empty) == 1 and empty[0].empty
+
+
+@mark.parametrize("data_format", ["csv", "parquet"])
+def test_write_chunks(tmp_path, data_format):
+    if data_format == "parquet":
+        importorskip("pyarrow")
+    path = param_io.table_path(tmp_path, "CapitalCost", data_format)
+    chunks = [DF.iloc[:0], DF.iloc[:2], DF.iloc[2:]]
+
+    assert param_io.write_chunks(iter(chunks), path) == 3
+    assert_frame_equal(param_io.read_table(path), DF)
+
+    assert param_io.write_chunks(iter([DF.iloc[:0]]), path) == 0
+    assert param_io.read_table(path).columns.tolist() == DF.columns.tolist()
+
+
+def test_year_chunks():
+    df = pd.DataFrame(
+        [["S1D1", "PWRSPV", 0.5], ["S1D2", "PWRSPV", 0.25], ["S1D1", "PWRWON", 0.1]],
+        columns=["TIMESLICE", "TECHNOLOGY", "VALUE"],
+    )
+    years = [2021, 2022]
+    invariant = pd.concat(
+        param_io.product_chunks(df, ["TIMESLICE", "TECHNOLOGY"], None),
+        ignore_index=True,
+    )
+    assert invariant.columns.tolist() == ["TIMESLICE", "TECHNOLOGY", "VALUE"]
+    assert param_io.is_year_invariant("CapacityFactor", invariant)
+
+    # expanding when written gives the rows of the expanded product
+    expanded = pd.concat(
+        param_io.year_chunks(invariant, years, chunk_rows=3), ignore_index=True
+    )
+    expected = pd.concat(
+        param_io.product_chunks(df, ["TIMESLICE", "TECHNOLOGY"], years),
+        ignore_index=True,
+    )
+    assert_frame_equal(expanded, expected)
+    assert not param_io.is_year_invariant("CapacityFactor", expanded)
+
+    empty = list(param_io.year_chunks(invariant.iloc[:0], years))
+    assert len(empty) == 1 and empty[0].empty
+
+    with raises(ValueError):
+        next(param_io.year_chunks(expanded, years))
@@ -0,0 +1,98 @@
+"""Module for testing the PLEXOS-World object model"""
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from pytest import fixture, importorskip
+
+import osemosys_global.plexos_world as plexos_world
+from osemosys_global.plexos_world import PlexosWorld
+
+MEMBERSHIPS = pd.DataFrame(
+    {
+        "parent_class": ["Generator", "Node", "Generator", "Battery", "Generator"],
+        "child_class": ["Node", "Region", "Fuel", "Node", "Node"],
+        "collection": ["Nodes", "Region", "Fuels", "Nodes", "Nodes"],
+        "parent_object": [
+            "IND_Coal_1",
+            "AS-IND-NO",
+            "IND_Coal_1",
+            "BAT1",
+            "BTN_Hydro_2",
+        ],
+        "child_object": ["AS-IND-NO", "AS-IND", "IND Coal", "AS-IND-NO", "AS-BTN"],
+    }
+)
+
+PROPERTIES = pd.DataFrame(
+    {
+        "child_class": ["Generator", "Node", "Generator"],
+        "child_object": ["IND_Coal_1", "AS-IND-NO", "BTN_Hydro_2"],
+        "property": ["Max Capacity", "Load", "Max Capacity"],
+        "value": [500.0, 12.5, 120.0],
+    }
+)
+
+
+@fixture
+def workbook(tmp_path):
+    importorskip("openpyxl")
+    path = tmp_path / "PLEXOS_World_2015_Gold_V1.1.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        MEMBERSHIPS.to_excel(writer, sheet_name="Memberships", index=False)
+        PROPERTIES.to_excel(writer, sheet_name="Properties", index=False)
+    return str(path)
+
+
+def test_memberships():
+    plexos = PlexosWorld(MEMBERSHIPS, PROPERTIES)
+
+    assert plexos.collections == ["Nodes", "Region", "Fuels"]
+    assert_frame_equal(
+        plexos.memberships("Nodes"),
+        MEMBERSHIPS.iloc[[0, 3, 4]].reset_index(drop=True),
+    )
+    assert_frame_equal(
+        plexos.memberships(["Region", "Nodes"], parent_class="Generator"),
+        MEMBERSHIPS.iloc[[0, 4]].reset_index(drop=True),
+    )
+    assert plexos.memberships("Lines").empty
+
+
+def test_properties():
+    plexos = PlexosWorld(MEMBERSHIPS, PROPERTIES)
+
+    assert plexos.classes == ["Generator", "Node"]
+    assert_frame_equal(
+        plexos.properties("Generator"),
+        PROPERTIES.iloc[[0, 2]].reset_index(drop=True),
+    )
+    assert plexos.properties("Line").empty
+
+
+def test_from_workbook(tmp_path, workbook):
+    cache_dir = str(tmp_path / "cache")
+
+    first = PlexosWorld.from_workbook(workbook, cache_dir=cache_dir)
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 1
+    second = PlexosWorld.from_workbook(workbook, cache_dir=cache_dir)
+
+    for plexos in (first, second):
+        assert_frame_equal(
+            plexos.memberships("Fuels"), MEMBERSHIPS.iloc[[2]].reset_index(drop=True)
+        )
+        assert_frame_equal(
+            plexos.properties("Node"), PROPERTIES.iloc[[1]].reset_index(drop=True)
+        )
+
+
+def test_from_workbook_schema_version(tmp_path, workbook, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    PlexosWorld.from_workbook(workbook, cache_dir=str(cache_dir))
+
+    # snapshots of another schema version are not read
+    version = plexos_world.SCHEMA_VERSION + 1
+    monkeypatch.setattr(plexos_world, "SCHEMA_VERSION", version)
+    plexos = PlexosWorld.from_workbook(workbook, cache_dir=str(cache_dir))
+
+    assert len(list(cache_dir.glob("*.pkl"))) == 2
+    assert plexos.classes == ["Generator", "Node"]
@@ -0,0 +1,38 @@
+"""Module for testing the powerplant data helpers"""
+
+import pandas as pd
+from pytest import mark
+
+from conftest import load_script
+
+data = load_script("powerplant", "data")
+
+NODES = pd.Series(
+    ["INDWE", "INDNE", "BTNXX", "NPLXX", "INDKA"], index=[10, 11, 12, 13, 14]
+)
+
+
+@mark.parametrize(
+    "geographic_scope, remove_nodes, expected",
+    [
+        # countries keep all of their nodes
+        (["IND"], [], ["INDWE", "INDNE", "INDKA"]),
+        (["IND", "BTN"], None, ["INDWE", "INDNE", "BTNXX", "INDKA"]),
+        # INT holds the international fuels and has no nodes
+        (["IND", "INT"], [], ["INDWE", "INDNE", "INDKA"]),
+        (["INT"], [], ["INDWE", "INDNE", "BTNXX", "NPLXX", "INDKA"]),
+        # empty scopes keep all nodes
+        ([], [], ["INDWE", "INDNE", "BTNXX", "NPLXX", "INDKA"]),
+        (None, None, ["INDWE", "INDNE", "BTNXX", "NPLXX", "INDKA"]),
+        # removed nodes are dropped with and without a scope
+        (["IND", "BTN"], ["INDNE", "BTNXX"], ["INDWE", "INDKA"]),
+        ([], ["INDNE"], ["INDWE", "BTNXX", "NPLXX", "INDKA"]),
+        # removing nodes outside of the scope has no effect
+        (["BTN"], ["INDNE"], ["BTNXX"]),
+    ],
+)
+def test_in_geographic_scope(geographic_scope, remove_nodes, expected):
+    actual = data.in_geographic_scope(NODES, geographic_scope, remove_nodes)
+
+    assert actual.index.equals(NODES.index)
+    assert NODES[actual].tolist() == expected
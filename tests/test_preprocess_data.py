@@ -0,0 +1,76 @@
+"""Module for testing the data file preprocessor"""
+
+import importlib.util
+from pathlib import Path
+
+from pytest import fixture
+
+PREPROCESS = Path(__file__).parents[1] / "resources" / "preprocess_data.py"
+
+DATA_FILE = """# Model file written by *otoole*
+param default 0 : InputActivityRatio :=
+GLOBAL PWRCOAINDWE01 COAINDWE 1 2021 2.5
+GLOBAL PWRCOAINDWE01 COAINDWE 1 2022 2.5
+GLOBAL PWRSDSINDWE01 ELCINDWE01 2 2021 1
+;
+param default 0 : OutputActivityRatio :=
+GLOBAL PWRCOAINDWE01 ELCINDWE01 1 2021 1
+GLOBAL PWRSDSINDWE01 ELCINDWE01 1 2021 1
+GLOBAL PWRSDSINDWE01 ELCINDWE01 2 2021 0
+;
+set FUEL :=
+COAINDWE
+ELCINDWE01
+ELCINDWE02
+;
+set MODE_OF_OPERATION := 1 2 ;
+set STORAGE :=
+SDSINDWE01
+;
+set TECHNOLOGY :=
+PWRCOAINDWE01
+PWRSDSINDWE01
+;
+param default 0 : TechnologyToStorage :=
+GLOBAL PWRSDSINDWE01 SDSINDWE01 2 1
+;
+set MODEperTECHNOLOGY[PWRCOAINDWE01]:= 1;
+end;
+"""
+
+
+@fixture
+def preprocess_data():
+    spec = importlib.util.spec_from_file_location("preprocess_data", PREPROCESS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_preprocess_data(preprocess_data, tmp_path):
+    data_infile = tmp_path / "data.txt"
+    data_outfile = tmp_path / "PreProcessed_data.txt"
+    data_infile.write_text(DATA_FILE)
+
+    preprocess_data.main(data_infile, data_outfile)
+
+    actual = data_outfile.read_text().splitlines()
+    copied = [
+        x for x in DATA_FILE.splitlines() if not x.startswith(("set MODEper", "end;"))
+    ]
+
+    assert actual[: len(copied)] == copied
+    assert actual[len(copied) :] == [
+        "set MODExTECHNOLOGYperFUELout[COAINDWE]:=;",
+        "set MODExTECHNOLOGYperFUELout[ELCINDWE01]:="
+        " (1, PWRCOAINDWE01) (1, PWRSDSINDWE01);",
+        "set MODExTECHNOLOGYperFUELout[ELCINDWE02]:=;",
+        "set MODExTECHNOLOGYperFUELin[COAINDWE]:= (1, PWRCOAINDWE01);",
+        "set MODExTECHNOLOGYperFUELin[ELCINDWE01]:= (2, PWRSDSINDWE01);",
+        "set MODExTECHNOLOGYperFUELin[ELCINDWE02]:=;",
+        "set MODEperTECHNOLOGY[PWRCOAINDWE01]:= 1;",
+        "set MODEperTECHNOLOGY[PWRSDSINDWE01]:= 2 1;",
+        "set MODExTECHNOLOGYperSTORAGEto[SDSINDWE01]:= (2, PWRSDSINDWE01);",
+        "set MODExTECHNOLOGYperSTORAGEfrom[SDSINDWE01]:=;",
+        "end;",
+    ]
@@ -0,0 +1,63 @@
+"""Module for testing the hourly profile store"""
+
+import numpy as np
+import pandas as pd
+from pytest import raises
+
+from osemosys_global.profile_store import (
+    in_scope,
+    node_codes,
+    read_catalogue,
+    read_profiles,
+    write_profiles,
+)
+
+
+def test_node_codes():
+    columns = ["AS-IND-EA", "AS-BTN", "BTNXX"]
+    assert node_codes(columns) == ["INDEA", "BTNXX", "BTNXX"]
+
+
+def test_in_scope():
+    codes = ["INDEA", "BTNXX", "NPLXX", "IDNSM"]
+    assert in_scope(codes).all()
+    assert in_scope(codes, ["IND", "BTN"]).tolist() == [True, True, False, False]
+    assert in_scope(codes, ["IND"], ["IDNSM"]).tolist() == [True, False, False, True]
+
+
+def test_write_read_profiles(tmp_path):
+    datetime = ["01/01/2015", "01/01/2015 1:00", "01/01/2015 2:00"]
+    default = pd.DataFrame(
+        {
+            "Datetime": datetime,
+            "AS-IND-EA": [0.1, 0.2, 0.3],
+            "AS-NPL": [1.0, 2.0, 3.0],
+            "AS-BTN": [4.0, 5.0, 6.0],
+        }
+    )
+    custom = pd.DataFrame({"Datetime": datetime, "BTNXX": [7.0, 8.0, 9.0]})
+    default.to_csv(tmp_path / "SolarPV 2015.csv", index=False)
+    custom.to_csv(tmp_path / "RE_profiles_SPV.csv", index=False)
+
+    csv_files = [tmp_path / "SolarPV 2015.csv", tmp_path / "RE_profiles_SPV.csv"]
+    store_dir = tmp_path / "profiles"
+    write_profiles(csv_files, store_dir, "SPV")
+
+    catalogue = read_catalogue(store_dir, "SPV")
+    codes = [x["code"] for x in catalogue["nodes"]]
+    assert codes == ["INDEA", "NPLXX", "BTNXX", "BTNXX"]
+
+    expected = pd.concat([default, custom.drop(columns="Datetime")], axis=1)
+    profiles = read_profiles(store_dir, "SPV")
+    pd.testing.assert_frame_equal(profiles, expected, check_dtype=False)
+    assert profiles["AS-NPL"].dtype == np.float32
+
+    profiles = read_profiles(store_dir, "SPV", ["BTN", "IND"])
+    assert profiles.columns.tolist() == ["Datetime", "AS-IND-EA", "AS-BTN", "BTNXX"]
+    np.testing.assert_allclose(profiles["AS-IND-EA"], [0.1, 0.2, 0.3], rtol=1e-6)
+
+    assert read_profiles(store_dir, "SPV", ["CHN"]).columns.tolist() == ["Datetime"]
+
+    custom.iloc[:2].to_csv(tmp_path / "RE_profiles_SPV.csv", index=False)
+    with raises(ValueError):
+        write_profiles(csv_files, store_dir, "SPV")
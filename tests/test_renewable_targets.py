@@ -0,0 +1,239 @@
+"""Module for testing the renewable energy targets"""
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from pytest import fixture, raises
+
+from conftest import load_script
+
+renewable_targets = load_script("powerplant", "renewable_targets")
+
+GEOGRAPHIC_SCOPE = ["IND", "BTN"]
+RENEWABLES = ["SPV", "WON"]
+
+RE_TARGETS = {
+    "RE1": ["IND", [], "PCT", 2025, 2026, 50],
+    "RE2": ["INDWE", ["SPV"], "PCT", 2025, 2025, 20],
+    "RE3": ["", [], "PCT", 2026, 2026, 10],
+    "RE4": ["INDNE", ["WON"], "ABS", 2025, 2026, 5],
+}
+
+
+@fixture
+def oar():
+    return pd.DataFrame(
+        {
+            "REGION": "GLOBAL",
+            "TECHNOLOGY": [
+                "PWRSPVINDWE01",
+                "PWRWONINDNE01",
+                "PWRCOAINDWE01",
+                "PWRSPVBTNXX01",
+                "MINCOAIND",
+                "PWRSPVNPLXX01",
+            ],
+            "FUEL": [
+                "ELCINDWE01",
+                "ELCINDNE01",
+                "ELCINDWE01",
+                "ELCBTNXX01",
+                "COAIND",
+                "ELCNPLXX01",
+            ],
+            "MODE_OF_OPERATION": 1,
+            "YEAR": 2025,
+            "VALUE": 1.0,
+        }
+    )
+
+
+@fixture
+def fuel_set():
+    return pd.DataFrame({"VALUE": ["ELCINDWE01", "ELCINDNE01"]})
+
+
+@fixture
+def specified_demand():
+    return pd.DataFrame(
+        {
+            "REGION": "GLOBAL",
+            "FUEL": ["ELCINDWE02", "ELCINDNE02", "ELCBTNXX02", "ELCNPLXX02"] * 2,
+            "YEAR": [2025] * 4 + [2026] * 4,
+            "VALUE": [10.0, 20.0, 30.0, 40.0, 11.0, 21.0, 31.0, 41.0],
+        }
+    )
+
+
+def test_compile_re_targets():
+    actual = renewable_targets.compile_re_targets(RE_TARGETS)
+
+    assert actual["TARGET"].tolist() == ["RE1", "RE2", "RE3", "RE4"]
+    assert actual["GEO"].tolist() == ["IND", "INDWE", "", "INDNE"]
+    assert actual["TECHNOLOGIES"].tolist() == [[], ["SPV"], [], ["WON"]]
+    assert actual["TYPE"].tolist() == ["PCT", "PCT", "PCT", "ABS"]
+
+
+def test_compile_re_targets_empty():
+    for re_targets in (None, {}):
+        actual = renewable_targets.compile_re_targets(re_targets)
+        assert actual.empty
+        assert "GEO" in actual.columns
+
+
+def test_expand_target_years():
+    targets = renewable_targets.compile_re_targets(RE_TARGETS)
+
+    actual = renewable_targets.expand_target_years(targets)
+
+    assert actual["TARGET"].tolist() == ["RE1", "RE1", "RE2", "RE3", "RE4", "RE4"]
+    assert actual["YEAR"].tolist() == [2025, 2026, 2025, 2026, 2025, 2026]
+
+
+def test_get_target_techs(oar):
+    targets = renewable_targets.compile_re_targets(RE_TARGETS)
+
+    actual = renewable_targets._get_target_techs(
+        targets, oar, RENEWABLES, GEOGRAPHIC_SCOPE
+    )
+
+    # country and node targets only match their own techs, whole scope targets
+    # match the techs of the countries in scope. Fossil and MIN techs never match.
+    assert sorted(actual.itertuples(index=False, name=None)) == [
+        (0, "PWRSPVINDWE01"),
+        (0, "PWRWONINDNE01"),
+        (1, "PWRSPVINDWE01"),
+        (2, "PWRSPVBTNXX01"),
+        (2, "PWRSPVINDWE01"),
+        (2, "PWRWONINDNE01"),
+        (3, "PWRWONINDNE01"),
+    ]
+
+
+def test_apply_re_pct_targets(oar, fuel_set, specified_demand):
+    fuels, oar_df, accumulated_demand = renewable_targets.apply_re_pct_targets(
+        RE_TARGETS,
+        GEOGRAPHIC_SCOPE,
+        None,
+        oar,
+        RENEWABLES,
+        fuel_set,
+        specified_demand,
+        "GLOBAL",
+    )
+
+    assert fuels["VALUE"].tolist() == [
+        "ELCINDWE01",
+        "ELCINDNE01",
+        "RE1IND",
+        "RE2INDWE",
+        "RE3",
+    ]
+
+    dummy = oar_df.iloc[len(oar) :]
+    assert list(zip(dummy["TECHNOLOGY"], dummy["FUEL"])) == [
+        ("PWRSPVINDWE01", "RE1IND"),
+        ("PWRWONINDNE01", "RE1IND"),
+        ("PWRSPVINDWE01", "RE2INDWE"),
+        ("PWRSPVINDWE01", "RE3"),
+        ("PWRWONINDNE01", "RE3"),
+        ("PWRSPVBTNXX01", "RE3"),
+    ]
+
+    # share of the SpecifiedAnnualDemand of the country (IND), node (INDWE)
+    # or whole geographic scope (IND and BTN)
+    expected = pd.DataFrame(
+        {
+            "REGION": "GLOBAL",
+            "FUEL": ["RE1IND", "RE1IND", "RE2INDWE", "RE3"],
+            "YEAR": [2025, 2026, 2025, 2026],
+            "VALUE": [15.0, 16.0, 2.0, 6.3],
+        }
+    )
+    assert_frame_equal(
+        accumulated_demand.reset_index(drop=True), expected, check_dtype=False
+    )
+
+
+def test_apply_re_pct_targets_remove_nodes(oar, fuel_set, specified_demand):
+    re_targets = {"RE1": ["IND", [], "PCT", 2025, 2025, 50]}
+
+    _, _, accumulated_demand = renewable_targets.apply_re_pct_targets(
+        re_targets,
+        GEOGRAPHIC_SCOPE,
+        ["INDNE"],
+        oar,
+        RENEWABLES,
+        fuel_set,
+        specified_demand,
+        "GLOBAL",
+    )
+
+    assert accumulated_demand["VALUE"].tolist() == [5.0]
+
+
+def test_apply_re_pct_targets_invalid(oar, fuel_set, specified_demand):
+    re_targets = {"RE1": ["INDW", [], "PCT", 2025, 2025, 50]}
+
+    with raises(ValueError):
+        renewable_targets.apply_re_pct_targets(
+            re_targets,
+            GEOGRAPHIC_SCOPE,
+            None,
+            oar,
+            RENEWABLES,
+            fuel_set,
+            specified_demand,
+            "GLOBAL",
+        )
+
+
+def test_apply_re_pct_targets_empty(oar, fuel_set, specified_demand):
+    for re_targets in (None, {}, {"RE4": RE_TARGETS["RE4"]}):
+        fuels, oar_df, accumulated_demand = renewable_targets.apply_re_pct_targets(
+            re_targets,
+            GEOGRAPHIC_SCOPE,
+            None,
+            oar,
+            RENEWABLES,
+            fuel_set,
+            specified_demand,
+            "GLOBAL",
+        )
+        assert_frame_equal(fuels, fuel_set)
+        assert_frame_equal(oar_df, oar)
+        assert accumulated_demand.empty
+
+
+def test_apply_re_abs_targets():
+    actual = renewable_targets.apply_re_abs_targets(RE_TARGETS, None, "GLOBAL")
+
+    expected = pd.DataFrame(
+        {
+            "REGION": "GLOBAL",
+            "TECHNOLOGY": "PWRWONINDNE01",
+            "YEAR": [2025, 2026],
+            "VALUE": 5,
+        }
+    )
+    assert_frame_equal(actual.reset_index(drop=True), expected, check_dtype=False)
+
+
+def test_apply_re_abs_targets_invalid():
+    # more than one technology
+    with raises(Exception):
+        renewable_targets.apply_re_abs_targets(
+            {"RE1": ["INDNE", ["WON", "SPV"], "ABS", 2025, 2026, 5]}, None, "GLOBAL"
+        )
+
+    # not set at the nodal level
+    with raises(Exception):
+        renewable_targets.apply_re_abs_targets(
+            {"RE1": ["IND", ["WON"], "ABS", 2025, 2026, 5]}, None, "GLOBAL"
+        )
+
+
+def test_apply_re_abs_targets_empty():
+    for re_targets in (None, {}, {"RE1": RE_TARGETS["RE1"]}):
+        actual = renewable_targets.apply_re_abs_targets(re_targets, None, "GLOBAL")
+        assert actual.empty
+        assert list(actual.columns) == ["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
@@ -0,0 +1,53 @@
+"""Module for testing scenario overlays"""
+
+import osemosys_global.scenarios as scenarios
+from pytest import fixture, raises
+
+
+@fixture
+def config():
+    return {
+        "scenario": "India",
+        "startYear": 2021,
+        "geographic_scope": ["IND"],
+        "nodes_to_remove": ["INDNO"],
+        "re_targets": {"T01": ["IND", [], "PCT", 2030, 2040, 60]},
+        "emission_limit": None,
+        "scenarios": {
+            "Bhutan": {"geographic_scope": ["BTN", "IND"], "nodes_to_remove": None},
+            "NetZero": {"emission_limit": [["CO2", "IND", "POINT", 2050, 0]]},
+        },
+    }
+
+
+def test_get_scenarios(config):
+    assert list(scenarios.get_scenarios(config)) == ["India", "Bhutan", "NetZero"]
+    assert list(scenarios.get_scenarios({"scenario": "India"})) == ["India"]
+
+
+def test_invalid_scenarios(config):
+    config["scenarios"]["NetZero"]["startYear"] = 2030
+    with raises(ValueError):
+        scenarios.get_scenarios(config)
+
+    with raises(ValueError):
+        scenarios.get_scenarios({"scenario": "India", "scenarios": {"Net-Zero": {}}})
+
+
+def test_get_scenario_config(config):
+    scenario = scenarios.get_scenario_config(config, "NetZero")
+    assert scenario["emission_limit"] == [["CO2", "IND", "POINT", 2050, 0]]
+    assert scenario["geographic_scope"] == ["IND"]
+
+
+def test_get_base_config(config):
+    base = scenarios.get_base_config(config)
+    assert base["geographic_scope"] == ["BTN", "IND"]
+    assert base["nodes_to_remove"] == []
+    assert base["re_targets"] is None
+
+    config["scenarios"]["Bhutan"]["geographic_scope"] = []
+    assert scenarios.get_base_config(config)["geographic_scope"] == []
+
+    del config["scenarios"]
+    assert scenarios.get_base_config(config) == config
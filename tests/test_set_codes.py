@@ -0,0 +1,51 @@
+"""Module for testing the decoder of the set codes"""
+
+import numpy as np
+import pandas as pd
+
+from osemosys_global.set_codes import code_field, code_slice, decode
+
+TECHNOLOGIES = pd.Series(
+    ["PWRCOAINDNO01", "TRNINDNOBTNXX", None, "MINCOAIND", "PWRCOAINDNO01"],
+    index=[10, 11, 12, 13, 14],
+)
+
+
+def test_decode():
+    df = decode(TECHNOLOGIES)
+
+    assert df.index.equals(TECHNOLOGIES.index)
+    assert all(isinstance(df[x].dtype, pd.CategoricalDtype) for x in df.columns)
+    assert df.loc[10].tolist()[:5] == ["PWR", "COA", "IND", "INDNO", "01"]
+    assert df.loc[11, ["FROM_NODE", "TO_NODE", "TO_COUNTRY"]].tolist() == [
+        "INDNO",
+        "BTNXX",
+        "BTN",
+    ]
+    assert df.loc[[10, 12, 13], "FROM_NODE"].isna().all()
+    assert df.loc[12].isna().all()
+
+
+def test_code_slice():
+    for start, stop in [(0, 3), (3, 6), (3, 9), (6, 11), (8, 13), (3, None)]:
+        expected = TECHNOLOGIES.str[start:stop].fillna("")
+        for values in (TECHNOLOGIES, TECHNOLOGIES.astype("category")):
+            sliced = code_slice(values, start, stop).astype(object).fillna("")
+            assert sliced.tolist() == expected.tolist()
+
+
+def test_code_field():
+    fuels = pd.Index(["ELCINDNO01", "COAIND", "ELCBTNXX02"], name="FUEL")
+
+    nodes = code_field(fuels, "NODE", "FUEL")
+    assert isinstance(nodes, pd.CategoricalIndex)
+    assert nodes.tolist() == ["INDNO", "IND", "BTNXX"]
+
+    # categories not used by any row are not decoded
+    categories = ["PWRSPVBTNXX01", *TECHNOLOGIES.dropna().unique()]
+    techs = TECHNOLOGIES.astype(pd.CategoricalDtype(categories))
+    tech = code_field(techs, "TECH")
+    assert tech.cat.categories.tolist() == ["COA", "IND"]
+    np.testing.assert_array_equal(
+        tech.isin(["COA"]).to_numpy(), [True, False, False, True, True]
+    )
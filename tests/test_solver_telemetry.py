@@ -0,0 +1,160 @@
+"""Module for testing the solver log parsers"""
+
+import sys
+
+import pandas as pd
+from pytest import raises
+
+import osemosys_global.solver_telemetry as telemetry
+
+GUROBI_LOG = """Set parameter Method to value 2
+Gurobi Optimizer version 10.0.1 build v10.0.1rc0 (linux64)
+
+Read LP format model from file results/India/India.lp
+Reading time = 1.25 seconds
+: 120000 rows, 150000 columns, 900000 nonzeros
+Optimize a model with 120000 rows, 150000 columns and 900000 nonzeros
+Model fingerprint: 0x1a2b3c4d
+Presolve removed 80000 rows and 90000 columns
+Presolve time: 0.84s
+Presolved: 40000 rows, 60000 columns, 300000 nonzeros
+Barrier solved model in 42 iterations and 5.10 seconds (4.20 work units)
+Optimal objective 1.23456789e+06
+
+Crossover log...
+
+Solved in 5123 iterations and 6.02 seconds (5.01 work units)
+Optimal objective  1.234567890e+06
+"""
+
+CPLEX_LOG = """Welcome to IBM(R) ILOG(R) CPLEX(R) Interactive Optimizer 22.1.1.0
+Problem 'results/India/India.lp' read.
+Read time = 0.95 sec. (45.12 ticks)
+Problem name         : results/India/India.lp
+Objective sense      : Minimize
+Variables            :  150000  [Nneg: 149000,  Free: 1000]
+Objective nonzeros   :   70000
+Linear constraints   :  120000  [Less: 60000,  Greater: 20000,  Equal: 40000]
+  Nonzeros           :  900000
+Tried aggregator 2 times.
+LP Presolve eliminated 80000 rows and 90000 columns.
+Reduced LP has 40000 rows, 60000 columns, and 300000 nonzeros.
+Presolve time = 0.61 sec. (110.20 ticks)
+
+Dual simplex - Optimal:  Objective =  1.2345678900e+06
+Solution time =    7.45 sec.  Iterations = 8123 (512)
+Deterministic time = 3012.44 ticks  (404.33 ticks/sec)
+"""
+
+CBC_LOG = """Welcome to the CBC MILP Solver
+Version: 2.10.10
+Build Date: Apr 19 2023
+
+command line - cbc results/India/India.lp solve -sec 1500 -solu results/India/India.sol
+Problem India has 120000 rows, 150000 columns and 900000 elements
+seconds was changed from 1e+100 to 1500
+Presolve 40000 (-80000) rows, 60000 (-90000) columns and 300000 (-600000) elements
+Perturbing problem by 0.001% of 1234.5678 - largest nonzero change 0.00012
+0  Obj 0 Primal inf 1234.5 (100)
+8123  Obj 1234567.9
+Optimal - objective value 1234567.9
+After Postsolve, objective 1234567.9, infeasibilities - dual 0 (0), primal 0 (0)
+Optimal objective 1234567.89 - 8123 iterations time 12.35, Presolve 0.77
+Total time (CPU seconds):       12.60   (Wallclock seconds):       12.71
+"""
+
+
+def test_parse_gurobi_log():
+    record = telemetry.parse_log(GUROBI_LOG, "gurobi")
+    assert record["solver_version"] == "10.0.1"
+    assert (record["rows"], record["columns"], record["nonzeros"]) == (
+        120000,
+        150000,
+        900000,
+    )
+    assert record["presolved_rows"] == 40000
+    assert record["read_time"] == 1.25
+    assert record["presolve_time"] == 0.84
+    assert record["barrier_iterations"] == 42
+    assert record["iterations"] == 5123
+    assert record["solve_time"] == 6.02
+    assert record["objective"] == 1.23456789e06
+    assert record["status"] == "optimal"
+
+
+def test_parse_cplex_log():
+    record = telemetry.parse_log(CPLEX_LOG, "cplex")
+    assert record["solver_version"] == "22.1.1.0"
+    assert (record["rows"], record["columns"], record["nonzeros"]) == (
+        120000,
+        150000,
+        900000,
+    )
+    assert record["presolved_nonzeros"] == 300000
+    assert record["read_time"] == 0.95
+    assert record["solve_time"] == 7.45
+    assert record["iterations"] == 8123
+    assert record["status"] == "optimal"
+
+
+def test_parse_cbc_log():
+    record = telemetry.parse_log(CBC_LOG, "cbc")
+    assert record["solver_version"] == "2.10.10"
+    assert (record["rows"], record["columns"], record["nonzeros"]) == (
+        120000,
+        150000,
+        900000,
+    )
+    assert record["presolved_columns"] == 60000
+    assert record["presolve_time"] == 0.77
+    assert record["iterations"] == 8123
+    assert record["solve_time"] == 12.35
+    assert record["objective"] == 1234567.89
+    assert record["status"] == "optimal"
+
+    record = telemetry.parse_log("Problem is infeasible - 12 iterations", "cbc")
+    assert record["status"] == "infeasible"
+
+    with raises(ValueError):
+        telemetry.parse_log(CBC_LOG, "glpk")
+
+
+def test_run_solver(tmp_path):
+    log_file = tmp_path / "logs" / "solve_lp.log"
+    command = [sys.executable, "-c", f"print({CBC_LOG!r})"]
+    record = telemetry.run_solver(command, str(log_file), "cbc")
+
+    assert log_file.read_text().startswith("Welcome to the CBC MILP Solver")
+    assert record["returncode"] == 0
+    assert record["iterations"] == 8123
+    assert record["wall_time"] > 0
+    assert record["peak_memory_mb"] > 0
+
+
+def test_compare_records():
+    history = pd.DataFrame(
+        [
+            ("India", "cbc", 10.0, 500.0, "2024-01-01T00:00:00+00:00"),
+            ("India", "cbc", 20.0, 500.0, "2024-01-02T00:00:00+00:00"),
+            ("Bhutan", "cbc", 5.0, 100.0, "2024-01-02T00:00:00+00:00"),
+        ],
+        columns=["scenario", "solver", "wall_time", "peak_memory_mb", "timestamp"],
+    )
+    records = pd.DataFrame(
+        [
+            ("India", "cbc", 21.0, 510.0, "2024-02-01T00:00:00+00:00"),
+            ("Bhutan", "cbc", 5.0, 150.0, "2024-02-01T00:00:00+00:00"),
+            ("NetZero", "cbc", 8.0, 200.0, "2024-02-01T00:00:00+00:00"),
+        ],
+        columns=["scenario", "solver", "wall_time", "peak_memory_mb", "timestamp"],
+    )
+
+    report = telemetry.compare_records(records, history).set_index("scenario")
+
+    assert report.loc["India", "previous_wall_time"] == 20.0
+    assert report.loc["India", "wall_time_change"] == 0.05
+    assert report["regression"].to_dict() == {
+        "India": False,
+        "Bhutan": True,
+        "NetZero": False,
+    }
@@ -0,0 +1,67 @@
+"""Module for testing the preprocessing stage cache"""
+
+import osemosys_global.stage_cache as stage_cache
+from pytest import fixture
+
+
+@fixture
+def stage(tmp_path):
+    script_dir = tmp_path / "scripts"
+    script_dir.mkdir()
+    (script_dir / "main.py").write_text("print('stage')\n")
+
+    in_file = tmp_path / "input.csv"
+    in_file.write_text("VALUE\n1\n")
+    out_file = tmp_path / "data" / "output.csv"
+    out_file.parent.mkdir()
+
+    def _stage(params):
+        return stage_cache.StageCache(
+            stage="powerplant",
+            params=params,
+            inputs=[in_file],
+            outputs=[out_file],
+            script_dir=str(script_dir),
+            cache_dir=str(tmp_path / "cache"),
+        )
+
+    return _stage, in_file, out_file
+
+
+def test_store_restore(stage):
+    make_cache, _, out_file = stage
+
+    cache = make_cache({"start_year": 2021})
+    assert not cache.restore()
+    out_file.write_text("VALUE\n2\n")
+    cache.store()
+
+    out_file.unlink()
+    assert make_cache({"start_year": 2021}).restore()
+    assert out_file.read_text() == "VALUE\n2\n"
+
+
+def test_key_changes(stage):
+    make_cache, in_file, _ = stage
+
+    key = make_cache({"start_year": 2021}).key
+    assert make_cache({"start_year": 2022}).key != key
+
+    in_file.write_text("VALUE\n3\n")
+    assert make_cache({"start_year": 2021}).key != key
+
+
+def test_report(stage, tmp_path):
+    make_cache, _, out_file = stage
+
+    cache = make_cache({"start_year": 2021})
+    cache.restore()
+    out_file.write_text("VALUE\n2\n")
+    cache.store()
+
+    report = stage_cache.get_report(str(tmp_path / "cache"))
+    assert report.STATUS.to_list() == ["rebuilt"]
+
+    make_cache({"start_year": 2021}).restore()
+    report = stage_cache.get_report(str(tmp_path / "cache"))
+    assert report.STATUS.to_list() == ["reused"]
@@ -0,0 +1,251 @@
+"""Module for testing the hourly timeseries functions"""
+
+import numpy as np
+import pandas as pd
+from pytest import raises
+
+from osemosys_global.timeseries import (
+    DAYS_PER_MONTH,
+    HourlyIndex,
+    RepresentativeMapper,
+    TimesliceHours,
+    TimesliceMapper,
+    cluster_periods,
+    parse_timestamps,
+)
+
+
+def test_parse_timestamps():
+    values = pd.Series(
+        ["31/12/2015 23:00", "01/01/2015", "01/01/2015 1:00", "2/3/2015 13:30"]
+    )
+    parsed = parse_timestamps(values)
+
+    assert parsed["Datetime"].tolist() == [
+        pd.Timestamp("2015-12-31 23:00"),
+        pd.Timestamp("2015-01-01 00:00"),
+        pd.Timestamp("2015-01-01 01:00"),
+        pd.Timestamp("2015-03-02 13:30"),
+    ]
+    assert parsed["Month"].tolist() == [12, 1, 1, 3]
+    assert parsed["Hour"].tolist() == [23, 0, 1, 13]
+    assert parsed["Year"].dtype.kind == "i"
+
+    with raises(ValueError):
+        parse_timestamps(pd.Series(["2015-01-01 00:00"]))
+
+
+def test_hourly_index():
+    hourly_index = HourlyIndex()
+    values = pd.Series(["01/01/2015", "01/01/2015 1:00"])
+
+    first = hourly_index(values)
+    second = hourly_index(values.copy().set_axis([5, 6]))
+    assert second.index.tolist() == [5, 6]
+    assert second["Hour"].tolist() == first["Hour"].tolist()
+    assert len(hourly_index._parsed) == 1
+
+    hourly_index(pd.Series(["01/01/2015 2:00"]))
+    assert len(hourly_index._parsed) == 2
+
+
+SEASONS = {"S1": [1, 2, 3, 4, 5, 6], "S2": [7, 8, 9, 10, 11, 12]}
+DAYPARTS = {"D1": [1, 7], "D2": [7, 13], "D3": [13, 19], "D4": [19, 25]}
+
+
+def test_timeslice_mapper_index():
+    mapper = TimesliceMapper(SEASONS, DAYPARTS)
+    assert mapper.names.tolist() == [
+        "S1D1", "S1D2", "S1D3", "S1D4", "S2D1", "S2D2", "S2D3", "S2D4"
+    ]
+    assert mapper.days.tolist() == [181] * 4 + [184] * 4
+
+    codes = mapper.index([1, 1, 1, 7, 13], [0, 1, 18, 23, 5])
+    assert mapper.names[codes[:4]].tolist() == ["S1D4", "S1D1", "S1D3", "S2D4"]
+    assert codes[4] == -1
+
+    # dayparts and hours in UTC are shifted alike
+    shifted = TimesliceMapper(SEASONS, DAYPARTS, timeshift=5)
+    assert shifted.index([1], [1]).tolist() == codes[1:2].tolist()
+    assert shifted.names[shifted.index([1], [1], shift=False)].tolist() == ["S1D4"]
+
+
+def test_timeslice_mapper_daytype():
+    mapper = TimesliceMapper(SEASONS, DAYPARTS, daytype=True)
+    codes = mapper.index([1, 1], [3, 3], weekdays=[4, 5])
+    assert mapper.names[codes].tolist() == ["S1WDD1", "S1WED1"]
+
+    with raises(ValueError):
+        mapper.index([1], [3])
+
+
+def test_timeslice_mapper_aggregate():
+    mapper = TimesliceMapper(SEASONS, DAYPARTS)
+    hours = pd.date_range("2015-01-01", periods=8760, freq="h")
+    codes = mapper.index(hours.month, hours.hour)
+    values = np.random.default_rng(0).random((8760, 3))
+    values[0, 0] = np.nan
+
+    df = pd.DataFrame(values).assign(TIMESLICE=mapper.names[codes])
+    for how in ("sum", "mean"):
+        expected = df.groupby("TIMESLICE").agg(how)
+        aggregated = mapper.aggregate(codes, values, how)
+        np.testing.assert_allclose(aggregated[mapper.codes(expected.index)], expected)
+
+    assert mapper.counts(codes).sum() == 8760
+
+    frame = mapper.to_frame(mapper.aggregate(codes, values), ["b", "c", "a"], "VALUE")
+    assert frame.columns.tolist() == ["TIMESLICE", "node", "VALUE"]
+    assert frame["node"].tolist()[:3] == ["a", "b", "c"]
+    assert len(frame) == 24
+
+    with raises(ValueError):
+        mapper.aggregate(codes, values, "max")
+
+
+def test_timeslice_mapper_to_hours():
+    hours = pd.date_range("2015-01-01", periods=8760, freq="h")
+    mapper = TimesliceMapper(SEASONS, DAYPARTS)
+    codes = mapper.index(hours.month, hours.hour)
+    saved = TimesliceHours(mapper.month_hours(codes, hours.month, hours.hour))
+    df = pd.DataFrame(
+        {
+            "TIMESLICE": ["S1D1", "S2D4", "S3D1"],
+            "YEAR": [2020, 2021, 2020],
+            "VALUE": [1.0, 2.0, 3.0],
+        }
+    )
+    hourly = saved.to_hours(df)
+
+    # 6 months of 6 hours each, S3D1 is not a timeslice
+    year = hourly["YEAR"]
+    assert (year == 2020).sum() == 36
+    assert (year == 2021).sum() == 36
+    assert set(hourly.loc[year == 2020, "HOUR"]) == set(range(1, 7))
+    assert set(hourly.loc[year == 2021, "HOUR"]) == set(range(19, 25))
+    assert set(hourly.loc[year == 2021, "MONTH"]) == set(range(7, 13))
+    np.testing.assert_allclose(
+        hourly.loc[year == 2020, "VALUE"], 1e6 / (181 * 6 * 3600)
+    )
+
+
+def test_timeslice_mapper_approximation_error():
+    mapper = TimesliceMapper(SEASONS, DAYPARTS)
+    hours = pd.date_range("2015-01-01", periods=8760, freq="h")
+    codes = mapper.index(hours.month, hours.hour)
+    values = np.column_stack([np.ones(8760), np.arange(8760) % 24])
+
+    report = mapper.approximation_error(codes, codes, values, ["flat", "daily"])
+    assert report["column"].tolist() == ["flat", "daily"]
+    np.testing.assert_allclose(report["mean_approximated"], report["mean"])
+    assert report.loc[0, "hourly_nrmse"] == 0
+    assert report.loc[1, "hourly_nrmse"] > report.loc[1, "duration_nrmse"] > 0
+    assert report.loc[1, "peak_approximated"] < report.loc[1, "peak"]
+
+
+def test_cluster_periods():
+    # two kinds of days, alternating with a little noise
+    rng = np.random.default_rng(0)
+    shapes = np.array([np.ones(24), np.linspace(0, 2, 24)])
+    kinds = np.arange(30) % 2
+    matrix = (shapes[kinds] + rng.random((30, 24)) * 0.01).reshape(-1, 1)
+
+    labels, medoids = cluster_periods(np.vstack([matrix, matrix[:5]]), 24, 2)
+    assert len(labels) == 30
+    assert ((labels == labels[0]) == (kinds == 0)).all()
+    assert medoids.tolist() == sorted(medoids.tolist())
+    assert labels[medoids].tolist() == [0, 1]
+
+    with raises(ValueError):
+        cluster_periods(matrix, 24, 31)
+
+
+def test_representative_mapper():
+    hours = pd.Series(pd.date_range("2015-01-01", periods=8760, freq="h"))
+    labels = np.arange(365) % 3
+    mapper = RepresentativeMapper(DAYPARTS, labels, np.array([0, 1, 2]))
+    assert mapper.names[:4].tolist() == ["R01D1", "R01D2", "R01D3", "R01D4"]
+    assert mapper.days.tolist() == [122] * 4 + [122] * 4 + [121] * 4
+
+    codes, sample_codes = mapper.index_periods(hours)
+    assert mapper.counts(codes).tolist() == (mapper.days * 6).tolist()
+    assert mapper.counts(sample_codes).tolist() == [6] * 12
+    assert (sample_codes[72:] == -1).all()
+    assert mapper.names[codes[[1, 25, 49, 73]]].tolist() == [
+        "R01D1", "R02D1", "R03D1", "R01D1"
+    ]
+
+    # hours are assigned by period, the grid lookup is not part of the API
+    assert not hasattr(mapper, "index")
+
+    weekly = RepresentativeMapper.from_profiles(
+        hours, ((np.arange(8760) // 168) % 2)[:, None], DAYPARTS, "week", 2
+    )
+    assert len(weekly.seasons) == 2
+    assert weekly.daytypes[0] == "Y1"
+    codes, sample_codes = weekly.index_periods(hours)
+    # the hours after the last full week belong to the last week
+    assert weekly.counts(codes).sum() == 8760
+    assert (sample_codes >= 0).sum() == 2 * 168
+
+
+def test_days_in_daytype():
+    hours = pd.Series(pd.date_range("2015-01-01", periods=8760, freq="h"))
+    mappers = [
+        TimesliceMapper(SEASONS, DAYPARTS),
+        TimesliceMapper(SEASONS, DAYPARTS, daytype=True),
+        RepresentativeMapper(DAYPARTS, np.arange(365) % 3, np.array([0, 1, 2])),
+        RepresentativeMapper.from_profiles(
+            hours, ((np.arange(8760) // 168) % 2)[:, None], DAYPARTS, "week", 2
+        ),
+    ]
+    expected = [[7.0], [5.0, 2.0], [7.0], [1.0] * 7]
+
+    for mapper, values in zip(mappers, expected):
+        days = mapper.days_in_daytype()
+        assert len(days) == len(mapper.seasons) * len(mapper.daytypes)
+        assert days["DAYTYPE"].max() == len(mapper.daytypes)
+        assert days.loc[days["SEASON"] == 1, "VALUE"].tolist() == values
+        # the days of each season add up to a week
+        assert (days.groupby("SEASON")["VALUE"].sum() == 7).all()
+
+
+def test_timeslice_hours():
+    hours = pd.date_range("2015-01-01", periods=8760, freq="h")
+    df = pd.DataFrame(
+        {
+            "TIMESLICE": ["S1D1", "S2D4", "S3D1", "S1D2"],
+            "YEAR": [2020, 2021, 2020, 2020],
+            "VALUE": [1.0, 2.0, 3.0, 4.0],
+        }
+    )
+
+    # the timeshift moves the dayparts, and so the hours they are spread over
+    spread = []
+    for timeshift in (0, 5):
+        mapper = TimesliceMapper(SEASONS, DAYPARTS, timeshift)
+        codes = mapper.index(hours.month, hours.hour)
+        saved = TimesliceHours(mapper.month_hours(codes, hours.month, hours.hour))
+
+        assert saved.months.tolist() == mapper.months.tolist()
+        spread.append(saved.to_hours(df))
+    columns = ["YEAR", "MONTH", "HOUR", "VALUE"]
+    expected = spread[0].assign(HOUR=(spread[0]["HOUR"] + 4) % 24 + 1)
+    expected = expected.sort_values(columns[:3]).reset_index(drop=True)[columns]
+    actual = spread[1].sort_values(columns[:3]).reset_index(drop=True)[columns]
+    pd.testing.assert_frame_equal(actual, expected)
+
+    # representative days share months and hours, and add up to the energy
+    mapper = RepresentativeMapper(DAYPARTS, np.arange(365) % 3, np.array([0, 1, 2]))
+    codes, _ = mapper.index_periods(pd.Series(hours))
+    saved = TimesliceHours(mapper.month_hours(codes, hours.month, hours.hour))
+    df = pd.DataFrame({"TIMESLICE": mapper.names, "VALUE": 1.0})
+    hourly = saved.to_hours(df)
+
+    assert saved.months.tolist() == list(range(1, 13))
+    assert set(hourly["HOUR"]) == set(range(1, 25))
+    power = hourly.groupby(["MONTH", "HOUR"])["VALUE"].sum()
+    days = pd.Series(DAYS_PER_MONTH, index=range(1, 13))
+    days = days.reindex(power.index.get_level_values("MONTH")).to_numpy()
+    energy = (power * days).sum()
+    np.testing.assert_allclose(energy * 3600 / 1e6, len(mapper.names))
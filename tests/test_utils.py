@@ -0,0 +1,49 @@
+"""Module for testing the shared utility functions"""
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from osemosys_global.utils import interpolate_years
+
+
+def test_interpolate_years():
+    values = np.array(
+        [
+            [1.0, np.nan, np.nan, 4.0],
+            [np.nan, 2.0, np.nan, 6.0],
+            [np.nan, 2.0, 4.0, np.nan],
+        ]
+    )
+
+    actual = interpolate_years(values)
+
+    # years before the first or after the last value take the nearest value
+    expected = np.array(
+        [
+            [1.0, 2.0, 3.0, 4.0],
+            [2.0, 2.0, 4.0, 6.0],
+            [2.0, 2.0, 4.0, 4.0],
+        ]
+    )
+    assert_array_equal(actual, expected)
+
+
+def test_interpolate_years_single_value():
+    values = np.array([[np.nan, 5.0, np.nan], [5.0, np.nan, np.nan]])
+
+    assert_array_equal(interpolate_years(values), np.full((2, 3), 5.0))
+
+
+def test_interpolate_years_without_values():
+    values = np.array([[np.nan, np.nan], [1.0, np.nan]])
+
+    actual = interpolate_years(values)
+
+    assert np.isnan(actual[0]).all()
+    assert_array_equal(actual[1], [1.0, 1.0])
+
+
+def test_interpolate_years_one_dimensional():
+    values = np.array([np.nan, np.nan, 4.0, np.nan, 8.0, np.nan])
+
+    assert_array_equal(interpolate_years(values), [4.0, 4.0, 4.0, 6.0, 8.0, 8.0])
@@ -0,0 +1,75 @@
+"""Module for testing the expansion of fuel prices for variable costs"""
+
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from conftest import load_script
+
+variable_costs = load_script("powerplant", "variable_costs")
+
+CMO = pd.DataFrame(
+    {
+        "FUEL": ["COA", "OIL"],
+        "COUNTRY": "INT",
+        "UNIT": ["$/mt", "$/bbl"],
+        "ENERGY_CONTENT": [29.31, 6.12],
+        "VALUE": [100.0, 50.0],
+    }
+)
+
+
+def test_expand_cmo_data():
+    actual = variable_costs.expand_cmo_data(CMO, [2021, 2022], ["IND", "BTN"], 1.5)
+
+    # international rows first, scaled by the multiplier, then each fuel
+    # repeated for every country
+    expected = pd.DataFrame(
+        [
+            ["COA", "INT", "$/mt", 29.31, 150.0, 150.0],
+            ["OIL", "INT", "$/bbl", 6.12, 75.0, 75.0],
+            ["COA", "IND", "$/mt", 29.31, 100.0, 100.0],
+            ["COA", "BTN", "$/mt", 29.31, 100.0, 100.0],
+            ["OIL", "IND", "$/bbl", 6.12, 50.0, 50.0],
+            ["OIL", "BTN", "$/bbl", 6.12, 50.0, 50.0],
+        ],
+        columns=["FUEL", "COUNTRY", "UNIT", "ENERGY_CONTENT", "2021", "2022"],
+    )
+    assert_frame_equal(actual, expected)
+
+
+def test_expand_cmo_data_without_multiplier():
+    actual = variable_costs.expand_cmo_data(CMO, [2021], ["IND"])
+
+    assert actual["COUNTRY"].tolist() == ["INT", "INT", "IND", "IND"]
+    assert actual["2021"].tolist() == [100.0, 50.0, 100.0, 50.0]
+
+
+def test_expand_merged_data():
+    costs = pd.DataFrame(
+        {
+            "FUEL": ["GAS", "GAS", "COA", "COA", "COA"],
+            "COUNTRY": ["IND", "IND", "BTN", "IND", "IND"],
+            "YEAR": ["2020", "2024", "2022", "2023", "2021"],
+            "VALUE": [1.0, 5.0, 3.0, 4.0, 2.0],
+        }
+    )
+
+    actual = variable_costs.expand_merged_data(costs, [2021, 2022, 2023])
+
+    # sorted by fuel, country and year over the model years and the years of
+    # the data. Values are interpolated and held before the first and after
+    # the last year, fuel and country pairs without data stay missing.
+    years = list(range(2020, 2025))
+    expected = pd.DataFrame(
+        {
+            "FUEL": ["COA"] * 10 + ["GAS"] * 10,
+            "COUNTRY": (["BTN"] * 5 + ["IND"] * 5) * 2,
+            "YEAR": years * 4,
+            "VALUE": [3.0] * 5
+            + [2.0, 2.0, 3.0, 4.0, 4.0]
+            + [np.nan] * 5
+            + [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+    assert_frame_equal(actual, expected)
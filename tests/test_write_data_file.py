@@ -0,0 +1,110 @@
+"""Module for testing the native data file writer against otoole"""
+
+import importlib.util
+from pathlib import Path
+
+import pandas as pd
+from pytest import fixture, importorskip
+
+from osemosys_global.write_data_file import (
+    read_data,
+    read_otoole_config,
+    write_data_file,
+)
+
+RESOURCES = Path(__file__).parents[1] / "resources"
+OTOOLE_CONFIG = RESOURCES / "otoole.yaml"
+PREPROCESS = RESOURCES / "preprocess_data.py"
+
+ACTIVITY = ["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR", "VALUE"]
+
+TABLES = {
+    "REGION": pd.DataFrame({"VALUE": ["GLOBAL"]}),
+    "YEAR": pd.DataFrame({"VALUE": [2021, 2022]}),
+    "MODE_OF_OPERATION": pd.DataFrame({"VALUE": [1, 2]}),
+    "FUEL": pd.DataFrame({"VALUE": ["COAINDWE", "ELCINDWE01", "ELCINDWE02"]}),
+    "TECHNOLOGY": pd.DataFrame({"VALUE": ["PWRCOAINDWE01", "PWRSDSINDWE01"]}),
+    "STORAGE": pd.DataFrame({"VALUE": ["SDSINDWE01"]}),
+    "EMISSION": pd.DataFrame({"VALUE": ["CO2IND"]}),
+    "InputActivityRatio": pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", "COAINDWE", 1, 2021, 2.5],
+            ["GLOBAL", "PWRCOAINDWE01", "COAINDWE", 1, 2022, 2.5],
+            ["GLOBAL", "PWRSDSINDWE01", "ELCINDWE01", 2, 2021, 1],
+        ],
+        columns=ACTIVITY,
+    ),
+    "OutputActivityRatio": pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", "ELCINDWE01", 1, 2021, 1],
+            ["GLOBAL", "PWRSDSINDWE01", "ELCINDWE01", 1, 2021, 1],
+            ["GLOBAL", "PWRSDSINDWE01", "ELCINDWE01", 2, 2021, 0],
+        ],
+        columns=ACTIVITY,
+    ),
+    "EmissionActivityRatio": pd.DataFrame(
+        [["GLOBAL", "PWRCOAINDWE01", "CO2IND", 1, 2021, 0.1]],
+        columns=[
+            "REGION", "TECHNOLOGY", "EMISSION", "MODE_OF_OPERATION", "YEAR", "VALUE"
+        ],
+    ),
+    "TechnologyToStorage": pd.DataFrame(
+        [["GLOBAL", "PWRSDSINDWE01", "SDSINDWE01", 2, 1]],
+        columns=["REGION", "TECHNOLOGY", "STORAGE", "MODE_OF_OPERATION", "VALUE"],
+    ),
+    # Default (0.001) values are omitted, others written with six significant digits
+    "CapitalCost": pd.DataFrame(
+        [
+            ["GLOBAL", "PWRCOAINDWE01", 2021, 1 / 3],
+            ["GLOBAL", "PWRCOAINDWE01", 2022, 0.001],
+            ["GLOBAL", "PWRSDSINDWE01", 2021, 1234567.891],
+        ],
+        columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"],
+    ),
+}
+
+
+@fixture
+def csv_dir(tmp_path):
+    csv_dir = tmp_path / "data"
+    csv_dir.mkdir()
+
+    # otoole expects a CSV for every set and parameter of its config
+    for name, details in read_otoole_config(str(OTOOLE_CONFIG)).items():
+        if name in TABLES:
+            df = TABLES[name]
+        elif details["type"] == "set":
+            df = pd.DataFrame(columns=["VALUE"])
+        else:
+            df = pd.DataFrame(columns=details["indices"] + ["VALUE"])
+        df.to_csv(csv_dir / f"{name}.csv", index=False)
+
+    return csv_dir
+
+
+@fixture
+def preprocess_data():
+    spec = importlib.util.spec_from_file_location("preprocess_data", PREPROCESS)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_write_data_file_matches_otoole(csv_dir, preprocess_data, tmp_path):
+    otoole = importorskip("otoole")
+
+    data_file = tmp_path / "data.txt"
+    expected = tmp_path / "PreProcessed_otoole.txt"
+    otoole.convert(str(OTOOLE_CONFIG), "csv", "datafile", str(csv_dir), str(data_file))
+    preprocess_data.main(data_file, expected)
+
+    actual = tmp_path / "PreProcessed_native.txt"
+    config = read_otoole_config(str(OTOOLE_CONFIG))
+    write_data_file(read_data(str(csv_dir), config), config, str(actual))
+
+    # Only the header comment naming the writer differs
+    expected_header, expected_body = expected.read_bytes().split(b"\n", 1)
+    actual_header, actual_body = actual.read_bytes().split(b"\n", 1)
+
+    assert expected_header.startswith(b"#") and actual_header.startswith(b"#")
+    assert actual_body == expected_body
@@ -1,23 +1,97 @@
 import os
 import shutil
 
+# scenario overlay files
+
+re_targets_overlay_files = [
+    'OutputActivityRatio',
+    'FUEL',
+    'AccumulatedAnnualDemand',
+    'TotalAnnualMinCapacity'
+]
+
+emissions_overlay_files = [
+    'EmissionsPenalty',
+    'AnnualEmissionLimit'
+]
+
+def scenario_overlay_files(wildcards):
+    """Gets the overlay tables of a scenario, if several scenarios are run"""
+    if not MULTI_SCENARIO:
+        return []
+    return expand(
+        'results/{scenario}/overlay/{overlay_file}.{ext}',
+        scenario = wildcards.scenario,
+        overlay_file = re_targets_overlay_files + emissions_overlay_files,
+        ext = DATA_FORMAT
+    )
+
 # RULES
 
+rule scenario_re_targets:
+    message:
+        'Applying renewable targets of {wildcards.scenario}...'
+    input:
+        expand('results/data/{csv}.{ext}', 
+            csv = re_targets_overlay_files + ['SpecifiedAnnualDemand'], ext = DATA_FORMAT),
+    params:
+        res_targets = scenario_config('re_targets'),
+        geographic_scope = scenario_config('geographic_scope'),
+        remove_nodes = scenario_config('nodes_to_remove'),
+        region_name = 'GLOBAL',
+        input_data_dir = 'results/data',
+        overlay_dir = 'results/{scenario}/overlay',
+        data_format = DATA_FORMAT,
+    output:
+        csv_files = expand('results/{{scenario}}/overlay/{output_file}.{ext}', 
+            output_file = re_targets_overlay_files, ext = DATA_FORMAT),
+    log:
+        log = 'results/{scenario}/logs/scenario_re_targets.log'
+    script:
+        '../scripts/osemosys_global/powerplant/scenario_overlay.py'
+
+rule scenario_emissions:
+    message:
+        'Setting emission penalties and limits of {wildcards.scenario}...'
+    input:
+        ember = 'resources/data/default/ember_yearly_electricity_data.csv',
+        emissions = f'results/data/EMISSION.{DATA_FORMAT}',
+    params:
+        start_year = config['startYear'],
+        end_year = config['endYear'],
+        region_name = 'GLOBAL',
+        emission_penalty = scenario_config('emission_penalty'),
+        emission_limit = scenario_config('emission_limit'),
+        input_data_dir = 'results/data',
+        overlay_dir = 'results/{scenario}/overlay',
+        data_format = DATA_FORMAT,
+    output:
+        csv_files = expand('results/{{scenario}}/overlay/{output_file}.{ext}', 
+            output_file = emissions_overlay_files, ext = DATA_FORMAT),
+    log:
+        log = 'results/{scenario}/logs/scenario_emissions.log'
+    script:
+        '../scripts/osemosys_global/emissions/scenario_overlay.py'
+
 rule geographic_filter:
     message:
         'Applying geographic filter...'
     input: 
-        csv_files = expand('results/data/{csv}.csv', csv = OTOOLE_PARAMS),
+        csv_files = expand('results/data/{csv}.{ext}', csv = OTOOLE_PARAMS, ext = DATA_FORMAT),
+        overlay_files = scenario_overlay_files,
     params:
-        geographic_scope = config['geographic_scope'],
-        res_targets = config['re_targets'],
-        nodes_to_remove = config["nodes_to_remove"],
+        geographic_scope = scenario_config('geographic_scope'),
+        res_targets = scenario_config('re_targets'),
+        nodes_to_remove = scenario_config('nodes_to_remove'),
         in_dir = "results/data",
-        out_dir = "results/{scenario}/data"
+        data_format = DATA_FORMAT,
+        out_dir = "results/{scenario}/data",
+        overlay_dir = "results/{scenario}/overlay" if MULTI_SCENARIO else None,
     output:
         csv_files = expand('results/{{scenario}}/data/{csv}.csv', csv = OTOOLE_PARAMS),
     log:
         log = 'results/{scenario}/logs/geographicFilter.log'
+    threads: 4
     script:
         '../scripts/osemosys_global/geographic_filter.py'
 
@@ -56,32 +130,70 @@ rule otoole_convert:
     shell:
         'otoole convert csv datafile {params.csv_dir} {output} {input.otoole_config} 2> {log}'
 
-rule preprocess_data_file:
-    message:
-        'Preprocessing data file...'
-    input:
-        data_file = 'results/{scenario}/{scenario}.txt'
-    output:
-        data_file = 'results/{scenario}/PreProcessed_{scenario}.txt'
-    #conda:
-    #    '../envs/data_processing.yaml'
-    log:
-        log = 'results/{scenario}/logs/preprocess_data_file.log'
-    shell:
-        'python resources/preprocess_data.py {input} {output} 2> {log}'
+if config['data_file_writer'] == 'otoole':
 
-rule create_lp_file:
-    message:
-        'Creating lp file...'
-    input:
-        model_file = 'resources/osemosys_fast_preprocessed.txt',
-        data_file = 'results/{scenario}/PreProcessed_{scenario}.txt'
-    output:
-        lp_file = 'results/{scenario}/{scenario}.lp'
-    log:
-        log = 'results/{scenario}/logs/create_lp_file.log'
-    shell:
-        'glpsol -m {input.model_file} -d {input.data_file} --wlp {output.lp_file} --check 2> {log}'
+    rule preprocess_data_file:
+        message:
+            'Preprocessing data file...'
+        input:
+            data_file = 'results/{scenario}/{scenario}.txt'
+        output:
+            data_file = 'results/{scenario}/PreProcessed_{scenario}.txt'
+        #conda:
+        #    '../envs/data_processing.yaml'
+        log:
+            log = 'results/{scenario}/logs/preprocess_data_file.log'
+        shell:
+            'python resources/preprocess_data.py {input} {output} 2> {log}'
+
+else:
+
+    rule write_data_file:
+        message:
+            'Writing preprocessed data file...'
+        params:
+            csv_dir = 'results/{scenario}/data/'
+        input:
+            otoole_config = 'results/{scenario}/otoole.yaml',
+            csv_files = expand('results/{{scenario}}/data/{csv}.csv', csv = OTOOLE_PARAMS),
+        output:
+            data_file = 'results/{scenario}/PreProcessed_{scenario}.txt'
+        log:
+            log = 'results/{scenario}/logs/write_data_file.log'
+        script:
+            '../scripts/osemosys_global/write_data_file.py'
+
+if config['lp_writer'] == 'native':
+
+    rule create_lp_file:
+        message:
+            'Creating lp file...'
+        params:
+            csv_dir = 'results/{scenario}/data/'
+        input:
+            otoole_config = 'results/{scenario}/otoole.yaml',
+            csv_files = expand('results/{{scenario}}/data/{csv}.csv', csv = OTOOLE_PARAMS),
+        output:
+            lp_file = 'results/{scenario}/{scenario}.lp'
+        log:
+            log = 'results/{scenario}/logs/create_lp_file.log'
+        script:
+            '../scripts/osemosys_global/lp_builder.py'
+
+else:
+
+    rule create_lp_file:
+        message:
+            'Creating lp file...'
+        input:
+            model_file = 'resources/osemosys_fast_preprocessed.txt',
+            data_file = 'results/{scenario}/PreProcessed_{scenario}.txt'
+        output:
+            lp_file = 'results/{scenario}/{scenario}.lp'
+        log:
+            log = 'results/{scenario}/logs/create_lp_file.log'
+        shell:
+            'glpsol -m {input.model_file} -d {input.data_file} --wlp {output.lp_file} --check 2> {log}'
 
 rule solve_lp:
     message:
@@ -90,21 +202,28 @@ rule solve_lp:
         lp_file = 'results/{scenario}/{scenario}.lp'
     output:
         solution = 'results/{scenario}/{scenario}.sol',
+        telemetry_json = 'results/{scenario}/logs/solver_telemetry.json',
+        telemetry_csv = 'results/{scenario}/logs/solver_telemetry.csv',
     params:
+        solver = config['solver'],
         json = 'results/{scenario}/{scenario}.json',
         ilp = 'results/{scenario}/{scenario}.ilp',
         duals = 'results/{scenario}/{scenario}.attr'
     log:
         log = 'results/{scenario}/logs/solve_lp.log'
-    shell: 
-        '''
-        if [ {config[solver]} = gurobi ]
-        then
-          gurobi_cl Method=2 ResultFile={output.solution} ResultFile={params.duals} ResultFile={params.json} ResultFile={params.ilp} {input.lp_file}
-        elif [ {config[solver]} = cplex ]
-        then
-          cplex -c "read {input.lp_file}" "optimize" "write {output.solution}"
-        else
-          cbc {input.lp_file} solve -sec 1500 -solu {output.solution}
-        fi
-        '''
\ No newline at end of file
+    script:
+        '../scripts/osemosys_global/solve_lp.py'
+
+rule solver_report:
+    message:
+        'Summarising solver performance...'
+    input:
+        telemetry = expand('results/{scenario}/logs/solver_telemetry.json', scenario = SCENARIOS)
+    params:
+        history = 'results/logs/solver_history.csv'
+    output:
+        report = 'results/solver_report.csv'
+    log:
+        log = 'results/logs/solver_report.log'
+    script:
+        '../scripts/osemosys_global/solver_report.py'
@@ -63,18 +63,16 @@ rule visualisation:
         centerpoints = 'resources/data/default/centerpoints.csv',
         custom_nodes_centerpoints = 'resources/data/custom/centerpoints.csv',
         color_codes = 'resources/data/custom/color_codes.csv',
+        timeslice_hours = 'results/timeslice_hours.csv',
     params:
         result_input_data = "results/{scenario}/data/",
         result_data = "results/{scenario}/results/",
         scenario_figs_dir = "results/{scenario}/figures/",
-        geographic_scope = config['geographic_scope'],
+        geographic_scope = scenario_config('geographic_scope'),
         results_by_country = config['results_by_country'],
         start_year = config['startYear'],
         end_year = [config['endYear']],
         custom_nodes = config['nodes_to_add'],
-        seasons = config['seasons'],
-        dayparts = config['dayparts'],
-        timeshift = config['timeshift'],
     output:
         expand('results/{{scenario}}/figures/{result_figure}.html', result_figure = RESULT_FIGURES)
     log:
@@ -85,12 +83,9 @@ rule visualisation:
 rule calculate_trade_flows:
     message: 
         "Calculating Trade Flows..."
-    params:
-        seasons = config["seasons"],
-        dayparts = config["dayparts"],
-        timeshift = config["timeshift"],
     input:
         activity_by_mode = "results/{scenario}/results/TotalAnnualTechnologyActivityByMode.csv",
+        timeslice_hours = "results/timeslice_hours.csv",
     output:
         node_trade_flows = "results/{scenario}/result_summaries/TradeFlowsNode.csv",
         country_trade_flows = "results/{scenario}/result_summaries/TradeFlowsCountry.csv",
@@ -48,28 +48,44 @@ transmission_files = [
     'transmission/OutputActivityRatio',
     'transmission/ResidualCapacity',
     'transmission/TECHNOLOGY',
-    'FUEL'
+    'transmission/FUEL'
     ]
     
 storage_files = [
-    'CapitalCost',
+    'storage/CapitalCost',
     'CapitalCostStorage',
+    'storage/FixedCost',
+    'storage/VariableCost',
+    'storage/CapacityToActivityUnit',
+    'storage/OperationalLife',    
+    'OperationalLifeStorage',
+    'storage/TotalAnnualMaxCapacityInvestment',
+    'storage/TotalAnnualMinCapacityInvestment',
+    'storage/InputActivityRatio',
+    'storage/OutputActivityRatio',
+    'storage/ResidualCapacity',
+    'ResidualStorageCapacity',
+    'storage/TECHNOLOGY',
+    'STORAGE',
+    'StorageLevelStart',
+    'TechnologyToStorage',
+    'TechnologyFromStorage'
+    ]
+
+# parameters with partial tables from the powerplant, transmission and storage rules
+merged_files = [
+    'CapitalCost',
     'FixedCost',
     'VariableCost',
     'CapacityToActivityUnit',
-    'OperationalLife',    
-    'OperationalLifeStorage',
+    'OperationalLife',
     'TotalAnnualMaxCapacityInvestment',
     'TotalAnnualMinCapacityInvestment',
     'InputActivityRatio',
     'OutputActivityRatio',
     'ResidualCapacity',
-    'ResidualStorageCapacity',
     'TECHNOLOGY',
-    'STORAGE',
-    'StorageLevelStart',
-    'TechnologyToStorage',
-    'TechnologyFromStorage'
+    'FUEL'
     ]
 
 timeslice_files = [
@@ -84,6 +100,15 @@ timeslice_files = [
     'DAYTYPE',
     'DAILYTIMEBRACKET',
     'DaySplit',
+    'DaysInDayType',
+    ]
+
+profile_names = [
+    'demand',
+    'CSP',
+    'SPV',
+    'WON',
+    'WOF',
     ]
 
 reserves_files = [
@@ -113,7 +138,7 @@ fuel_limit_files = [
 ]
 
 GENERATED_CSVS = (
-    power_plant_files + transmission_files + storage_files + timeslice_files \
+    power_plant_files + transmission_files + storage_files + merged_files + timeslice_files \
     + reserves_files + demand_files + emission_files + fuel_limit_files
 
 )
@@ -144,7 +169,7 @@ rule demand_projections:
         end_year = config['endYear'],
         custom_nodes = config["nodes_to_add"]
     output:
-        csv_files = 'results/data/SpecifiedAnnualDemand.csv',
+        csv_files = f'results/data/SpecifiedAnnualDemand.{DATA_FORMAT}',
     log:
         log = 'results/logs/demand_projections.log'
     script:
@@ -170,20 +195,21 @@ rule powerplant:
         start_year = config['startYear'],
         end_year = config['endYear'],
         region_name = 'GLOBAL',
-        geographic_scope = config['geographic_scope'],
+        geographic_scope = BASE_CONFIG['geographic_scope'],
         custom_nodes = config['nodes_to_add'],
-        remove_nodes = config['nodes_to_remove'],
+        remove_nodes = BASE_CONFIG['nodes_to_remove'],
         user_defined_capacity = config['user_defined_capacity'],
         no_investment_techs = config['no_invest_technologies'],
         availability_factors = config['max_availability_factors'],
-        res_targets = config['re_targets'],
+        res_targets = BASE_CONFIG['re_targets'],
         fossil_capacity_targets = config['fossil_capacity_targets'],
         calibration = config['min_generation_factors'],
         output_data_dir = 'results/data',
+        data_format = DATA_FORMAT,
         input_data_dir = 'resources/data/default',
         powerplant_data_dir = 'results/data/powerplant',
     output:
-        csv_files = expand('results/data/{output_file}.csv', output_file = power_plant_files)
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = power_plant_files, ext = DATA_FORMAT)
     log:
         log = 'results/logs/powerplant.log'
     script:
@@ -195,11 +221,11 @@ rule powerplant_var_costs:
     input:
         cmo_forecasts = 'resources/data/default/CMO-October-2024-Forecasts.xlsx',
         fuel_prices = 'resources/data/custom/fuel_prices.csv',
-        regions = "results/data/REGION.csv",
-        years = "results/data/YEAR.csv",
-        technologies = "results/data/powerplant/TECHNOLOGY.csv",
+        regions = f"results/data/REGION.{DATA_FORMAT}",
+        years = f"results/data/YEAR.{DATA_FORMAT}",
+        technologies = f"results/data/powerplant/TECHNOLOGY.{DATA_FORMAT}",
     output:
-        var_costs = 'results/data/powerplant/VariableCost.csv'
+        var_costs = f'results/data/powerplant/VariableCost.{DATA_FORMAT}'
     log:
         log = 'results/logs/powerplant_var_cost.log'
     script:
@@ -209,12 +235,12 @@ rule fuel_limits:
     message:
         "Generating mining fuel limits..."
     input:
-        region_csv = "results/data/REGION.csv",
-        technology_csv = "results/data/powerplant/TECHNOLOGY.csv",
-        year_csv = "results/data/YEAR.csv",
+        region_csv = f"results/data/REGION.{DATA_FORMAT}",
+        technology_csv = f"results/data/powerplant/TECHNOLOGY.{DATA_FORMAT}",
+        year_csv = f"results/data/YEAR.{DATA_FORMAT}",
         fuel_limit_csv = "resources/data/custom/fuel_limits.csv",
     output:
-        activity_upper_limit_csv = 'results/data/TotalTechnologyAnnualActivityUpperLimit.csv'
+        activity_upper_limit_csv = f'results/data/TotalTechnologyAnnualActivityUpperLimit.{DATA_FORMAT}'
     log:
         log = 'results/logs/powerplant_fuel_limits.log'
     script:
@@ -225,7 +251,6 @@ rule transmission:
         "Generating transmission data..."
     input:
         rules.powerplant.output.csv_files,
-        'results/data/powerplant/VariableCost.csv',
         default_op_life = 'resources/data/custom/operational_life.csv',
         gtd_existing = 'resources/data/default/GTD_existing.csv',
         gtd_planned = 'resources/data/default/GTD_planned.csv',
@@ -244,10 +269,11 @@ rule transmission:
         no_investment_techs = config['no_invest_technologies'],
         transmission_parameters = config['transmission_parameters'],
         output_data_dir = 'results/data',
+        data_format = DATA_FORMAT,
         powerplant_data_dir = 'results/data/powerplant',
         transmission_data_dir = 'results/data/transmission',
     output:
-        csv_files = expand('results/data/{output_file}.csv', output_file = transmission_files)
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = transmission_files, ext = DATA_FORMAT)
     log:
         log = 'results/logs/transmission.log'
     script:
@@ -257,7 +283,7 @@ rule storage:
     message:
         "Generating storage data..."
     input:
-        rules.transmission.output.csv_files,
+        rules.powerplant.output.csv_files,
         default_op_life = 'resources/data/custom/operational_life.csv',
         storage_build_rates = 'resources/data/custom/storage_build_rates.csv',
         gesdb_project_data = 'resources/data/default/GESDB_Project_Data.json',
@@ -273,46 +299,87 @@ rule storage:
         no_investment_techs = config['no_invest_technologies'],
         storage_parameters = config['storage_parameters'],
         output_data_dir = 'results/data',
-        transmission_data_dir = 'results/data/transmission',
+        data_format = DATA_FORMAT,
+        powerplant_data_dir = 'results/data/powerplant',
+        storage_data_dir = 'results/data/storage',
     output:
-        csv_files = expand('results/data/{output_file}.csv', output_file = storage_files)
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = storage_files, ext = DATA_FORMAT)
     log:
         log = 'results/logs/storage.log'
     script:
         "../scripts/osemosys_global/storage/main.py"        
 
+rule merge_partial_tables:
+    message:
+        "Merging powerplant, transmission and storage data..."
+    input:
+        rules.powerplant.output.csv_files,
+        rules.powerplant_var_costs.output.var_costs,
+        rules.transmission.output.csv_files,
+        rules.storage.output.csv_files,
+    params:
+        data_dirs = [
+            'results/data/powerplant',
+            'results/data/transmission',
+            'results/data/storage',
+        ],
+        names = merged_files,
+        data_format = DATA_FORMAT,
+        output_data_dir = 'results/data',
+    output:
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = merged_files, ext = DATA_FORMAT)
+    log:
+        log = 'results/logs/merge_partial_tables.log'
+    script:
+        "../scripts/osemosys_global/merge_partial_tables.py"
+
+rule profile_store:
+    message:
+        'Converting hourly profiles to a memory mapped store...'
+    input:
+        demand = ['resources/data/default/All_Demand_UTC_2015.csv'],
+        csp = ['resources/data/default/CSP 2015.csv', 'resources/data/custom/RE_profiles_CSP.csv'],
+        spv = ['resources/data/default/SolarPV 2015.csv', 'resources/data/custom/RE_profiles_SPV.csv'],
+        won = ['resources/data/default/Won 2015.csv', 'resources/data/custom/RE_profiles_WON.csv'],
+        wof = ['resources/data/default/Woff 2015.csv', 'resources/data/custom/RE_profiles_WOF.csv'],
+    params:
+        store_dir = 'resources/data/profiles',
+    output:
+        profiles = expand('resources/data/profiles/{profile}.{ext}', profile = profile_names, ext = ['f32', 'json']),
+    log:
+        log = 'results/logs/profile_store.log'
+    script:
+        "../scripts/osemosys_global/profile_store.py"
+
 rule timeslice:
     message:
         'Generating timeslice data...'
     input:
-        plexos_demand = 'resources/data/default/All_Demand_UTC_2015.csv',
-        plexos_csp_2015 = 'resources/data/default/CSP 2015.csv',
-        plexos_spv_2015 = 'resources/data/default/SolarPV 2015.csv',
+        profiles = rules.profile_store.output.profiles,
         plexos_hyd_2015 = 'resources/data/default/Hydro_Monthly_Profiles (15 year average).csv',
-        plexos_won_2015 = 'resources/data/default/Won 2015.csv',
-        plexos_wof_2015 = 'resources/data/default/Woff 2015.csv',
         custom_specified_demand_profiles = 'resources/data/custom/specified_demand_profile.csv',
-        custom_csp_profiles = 'resources/data/custom/RE_profiles_CSP.csv',
         custom_hyd_profiles = 'resources/data/custom/RE_profiles_HYD.csv',
-        custom_spv_profiles = 'resources/data/custom/RE_profiles_SPV.csv',
-        custom_wof_profiles = 'resources/data/custom/RE_profiles_WOF.csv',
-        custom_won_profiles = 'resources/data/custom/RE_profiles_WON.csv',                                
     params:
-        start_year = config['startYear'],
-        end_year = config['endYear'],
         region_name = 'GLOBAL',
         output_data_dir = 'results/data',
+        data_format = DATA_FORMAT,
         input_data_dir = 'resources/data/default',
         input_dir = 'resources',
         output_dir = 'results',
         custom_nodes_dir = 'resources/data/custom',
-        geographic_scope = config['geographic_scope'],
+        profile_store_dir = 'resources/data/profiles',
+        geographic_scope = BASE_CONFIG['geographic_scope'],
+        custom_nodes = config['nodes_to_add'],
         seasons = config['seasons'],
         dayparts = config['dayparts'],
         daytype = config['daytype'],        
         timeshift = config['timeshift'],
+        timeslice_mode = config['timeslice_mode'],
+        representative_periods = config['representative_periods'],
     output:
-        csv_files = expand('results/data/{output_file}.csv', output_file=timeslice_files),
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = timeslice_files, ext = DATA_FORMAT),
+        report = 'results/timeslice_report.csv',
+        hours = 'results/timeslice_hours.csv',
     log:
         log = 'results/logs/timeslice.log'    
     script:
@@ -322,16 +389,17 @@ rule reserves:
     message:
         'Generating reserves data...'
     input:
-        rules.storage.output.csv_files,
+        rules.merge_partial_tables.output.csv_files,
     params:
         start_year = config['startYear'],
         end_year = config['endYear'],
         region_name = 'GLOBAL',
         output_data_dir = 'results/data',
+        data_format = DATA_FORMAT,
         reserve_margin = config['reserve_margin'],
         reserve_margin_technologies = config['reserve_margin_technologies']
     output:
-        csv_files = expand('results/data/{output_file}.csv', output_file=reserves_files),
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = reserves_files, ext = DATA_FORMAT),
     log:
         log = 'results/logs/reserves.log'    
     script:
@@ -361,17 +429,18 @@ rule emissions:
     input:
         ember = 'resources/data/default/ember_yearly_electricity_data.csv',    
         emissions_factors = 'resources/data/default/emission_factors.csv',
-        iar = 'results/data/InputActivityRatio.csv',
-        oar = 'results/data/OutputActivityRatio.csv',
+        iar = f'results/data/InputActivityRatio.{DATA_FORMAT}',
+        oar = f'results/data/OutputActivityRatio.{DATA_FORMAT}',
     params:
         start_year = config['startYear'],
         end_year = config['endYear'],
         region_name = 'GLOBAL',
         output_data_dir = 'results/data',
+        data_format = DATA_FORMAT,
         emission_penalty = config['emission_penalty'],
         emission_limit = config['emission_limit'],
     output: 
-        csv_files = expand('results/data/{output_file}.csv', output_file = emission_files),
+        csv_files = expand('results/data/{output_file}.{ext}', output_file = emission_files, ext = DATA_FORMAT),
     log:
         log = 'results/logs/emissions.log'
     script:
@@ -381,11 +450,12 @@ rule create_missing_csv:
     message:
         "Creating empty parameter data"
     params:
-        out_dir = "results/data/"
+        out_dir = "results/data/",
+        data_format = DATA_FORMAT
     input:
         otoole_config = OTOOLE_YAML,
-        csvs = expand("results/data/{full}.csv", full=GENERATED_CSVS)
+        csvs = expand("results/data/{full}.{ext}", full=GENERATED_CSVS, ext=DATA_FORMAT)
     output:
-        csvs = expand("results/data/{empty}.csv", empty=EMPTY_CSVS)
+        csvs = expand("results/data/{empty}.{ext}", empty=EMPTY_CSVS, ext=DATA_FORMAT)
     script:
         "../scripts/osemosys_global/create_missing_csvs.py"
\ No newline at end of file
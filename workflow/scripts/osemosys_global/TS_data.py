@@ -1,14 +1,28 @@
+import numpy as np
 import pandas as pd
+import sys
 import itertools
 import seaborn as sns
 
 sns.set()
 import os
 
-from osemosys_global.utils import apply_timeshift
+from osemosys_global.param_io import (
+    product_chunks,
+    table_path,
+    write_chunks,
+    write_table,
+)
+from osemosys_global.profile_store import in_scope, read_profiles
+from osemosys_global.stage_cache import StageCache
+from osemosys_global.timeseries import (
+    CALENDAR_FIELDS,
+    HourlyIndex,
+    RepresentativeMapper,
+    TimesliceMapper,
+)
 from utils import apply_dtypes
 from constants import SET_DTYPES
-from datetime import datetime
 
 def main(
         demand_df: pd.DataFrame,
@@ -18,45 +32,16 @@ def main(
         won_df: pd.DataFrame,
         wof_df: pd.DataFrame,
         custom_sp_demand_profile: pd.DataFrame,
-        csp_df_custom: pd.DataFrame,
         hyd_df_custom: pd.DataFrame,
-        spv_df_custom: pd.DataFrame,
-        wof_df_custom: pd.DataFrame,
-        won_df_custom: pd.DataFrame,
         seasons_raw: dict,
         dayparts_raw: dict,
         ):
-   
-    seasonsData = []
-    for s, months in seasons_raw.items():
-        for month in months:
-            seasonsData.append([month, s])
-    seasons_df = pd.DataFrame(seasonsData, columns=["month", "season"])
-    seasons_df = seasons_df.sort_values(by=["month"]).reset_index(drop=True)
-    
-    daypartData = []
-    for dp, hr in dayparts_raw.items():
-        daypartData.append([dp, hr[0], hr[1]])
-    dayparts_df = pd.DataFrame(daypartData, columns=["daypart", "start_hour", "end_hour"])
-
-    dayparts_df["start_hour"] = dayparts_df["start_hour"].map(
-        lambda x: apply_timeshift(x, timeshift)
-    )
-    dayparts_df["end_hour"] = dayparts_df["end_hour"].map(
-        lambda x: apply_timeshift(x, timeshift)
-    )
 
-    years = list(range(start_year, end_year + 1))
-    
-    # Read renewable profile files
-    csp_df_custom.drop(["Datetime"], axis=1, inplace=True)
-    csp_df = pd.concat([csp_df, csp_df_custom], axis=1)
+    # timestamps are parsed once and shared by the demand and RE profiles
+    hourly_index = HourlyIndex()
     
+    # Renewable profiles hold the default and custom node columns
     csp_df.name = "CSP"
-
-    spv_df_custom.drop(["Datetime"], axis=1, inplace=True)
-    spv_df = pd.concat([spv_df, spv_df_custom], axis=1)
-    
     spv_df.name = "SPV"
     
     nodes = ["-".join(x.split("-")[1:]) for x in spv_df.columns if x not in ["Datetime"]]
@@ -79,20 +64,13 @@ def main(
     
     hyd_df_processed = pd.DataFrame(columns=["Datetime"])
     hyd_df_processed["Datetime"] = spv_df["Datetime"]
-    hyd_df_processed["MONTH"] = (
-        hyd_df_processed["Datetime"].str.split("/").str[1].astype(int)
-    )
+    hyd_df_processed["MONTH"] = hourly_index(hyd_df_processed["Datetime"])["Month"]
     hyd_df_processed = pd.merge(hyd_df_processed, hyd_df, how="left", on="MONTH")
     hyd_df_processed.drop(columns="MONTH", inplace=True)
     hyd_df_processed.rename(columns=node_region_dict, inplace=True)
     hyd_df_processed.name = "HYD"
     
-    won_df_custom.drop(["Datetime"], axis=1, inplace=True)
-    won_df = pd.concat([won_df, won_df_custom], axis=1)
     won_df.name = "WON"
-    
-    wof_df_custom.drop(["Datetime"], axis=1, inplace=True)
-    wof_df = pd.concat([wof_df, wof_df_custom], axis=1)
     wof_df.name = "WOF"
        
     # ### Create 'output' directory if it doesn't exist
@@ -100,126 +78,92 @@ def main(
         os.makedirs(output_data_dir)
     
     
-    def correct_datetime_formatting(time_str):
-        """start hours are not padded with 00:00"""
-        try:
-            date_obj = datetime.strptime(time_str, "%d/%m/%Y %H:%M")
-        except ValueError:
-            try:
-                date_obj = datetime.strptime(time_str, "%d/%m/%Y")
-                date_obj = date_obj.replace(hour=0, minute=0)
-            except ValueError as ex:
-                print(ex)
-                raise ValueError
-        return date_obj
-    
-    
     # ### Create columns for year, month, day, hour, and day type
     
     # Convert datetime to year, month, day, and hour
-    demand_df["Datetime"] = demand_df.Datetime.map(correct_datetime_formatting)
-    demand_df["Datetime"] = pd.to_datetime(demand_df["Datetime"], format="%d/%m/%Y %H:%M")
-    demand_df["Year"] = demand_df["Datetime"].dt.strftime("%Y").astype(int)
-    demand_df["Month"] = demand_df["Datetime"].dt.strftime("%m").astype(int)
-    demand_df["Day"] = demand_df["Datetime"].dt.strftime("%d").astype(int)
-    demand_df["Hour"] = demand_df["Datetime"].dt.strftime("%H").astype(int)
-    
-    demand_nodes = [x for x in demand_df.columns if x != "Datetime"] + [
+    timestamps = hourly_index(demand_df["Datetime"])
+    demand_df["Datetime"] = timestamps["Datetime"]
+    demand_df[CALENDAR_FIELDS] = timestamps[CALENDAR_FIELDS]
+    
+    demand_nodes = [
+        x for x in demand_df.columns if x not in ["Datetime"] + CALENDAR_FIELDS
+    ] + [
         y for y in custom_sp_demand_profile.iloc[:,3:].columns]
     
     demand_df = pd.merge(
         demand_df, custom_sp_demand_profile, how="left", on=["Month", "Day", "Hour"]
     )
     
-    # Create column for weekday/weekend
-    demand_df["Day-of-week"] = demand_df["Datetime"].dt.dayofweek.astype(str)
-    demand_df.loc[demand_df["Day-of-week"].isin([0,1,2,3,4]), "Day-of-week"] = "WD"
-    demand_df.loc[demand_df["Day-of-week"] != "WD", "Day-of-week"] = "WE"
+    # ### Align the hourly profiles with the demand hours
     
-    # ### Create dictionaries for 'seasons' and 'dayparts'
+    demand_hours = pd.Index(demand_df["Datetime"])
     
-    seasons_dict = dict(zip(list(seasons_df["month"]), list(seasons_df["season"])))
-    
-    dayparts_dict = {
-        i: [j, k]
-        for i, j, k in zip(
-            list(dayparts_df["daypart"]),
-            list(dayparts_df["start_hour"]),
-            list(dayparts_df["end_hour"]),
-        )
-    }
+    def hourly_values(df):
+        hours = demand_hours.get_indexer(hourly_index(df["Datetime"])["Datetime"])
+        nodes = [x for x in df.columns if x != "Datetime"]
+        values = np.full((len(demand_hours), len(nodes)), np.nan)
+        values[hours[hours >= 0]] = df[nodes].to_numpy(dtype=float)[hours >= 0]
+        return nodes, values
     
+    demand_values = demand_df[demand_nodes].to_numpy(dtype=float)
+    hourly_profiles = {"demand": (demand_nodes, demand_values)}
+    for df in [hyd_df_processed, csp_df, spv_df, won_df, wof_df]:
+        hourly_profiles[df.name] = hourly_values(df)
     
-    # ### Create columns with 'seasons' and 'dayparts'
+    # ### Assign each hour to a timeslice
     
-    
-    demand_df["Season"] = demand_df["Month"]
-    demand_df["Season"] = demand_df["Season"].replace(seasons_dict)
-    
-    demand_df["Hour"] = demand_df["Hour"].map(lambda x: apply_timeshift(int(x), timeshift))
-    for daypart in dayparts_dict:
-        if dayparts_dict[daypart][0] > dayparts_dict[daypart][1]:  # loops over 24hrs
-            demand_df.loc[
-                (demand_df["Hour"] >= dayparts_dict[daypart][0])
-                | (demand_df["Hour"] < dayparts_dict[daypart][1]),
-                "Daypart",
-            ] = daypart
-        else:
-            demand_df.loc[
-                (demand_df["Hour"] >= dayparts_dict[daypart][0])
-                & (demand_df["Hour"] < dayparts_dict[daypart][1]),
-                "Daypart",
-            ] = daypart
-    
-    
-    # ### Create column for timeslice with and without day-type
-    
-    
-    if daytype:
-        demand_df["TIMESLICE"] = (
-            demand_df["Season"] + demand_df["Day-of-week"] + demand_df["Daypart"]
+    # Timeslice values are taken from the sampled hours, which are all hours
+    # for the grid of seasons and dayparts, or the hours of the representative
+    # periods
+    if timeslice_mode == "grid":
+        timeslices = TimesliceMapper(seasons_raw, dayparts_raw, timeshift, daytype)
+        ts_codes = timeslices.index(
+            demand_df["Month"], demand_df["Hour"], demand_df["Datetime"].dt.dayofweek
+        )
+        sample_codes = ts_codes
+    elif timeslice_mode == "representative":
+        timeslices = RepresentativeMapper.from_profiles(
+            demand_df["Datetime"],
+            np.hstack([x[1] for x in hourly_profiles.values()]),
+            dayparts_raw,
+            representative_periods["period"],
+            representative_periods["count"],
+            timeshift,
         )
+        ts_codes, sample_codes = timeslices.index_periods(demand_df["Datetime"])
     else:
-        demand_df["TIMESLICE"] = demand_df["Season"] + demand_df["Daypart"]
+        raise ValueError(f"Unknown timeslice mode {timeslice_mode}")
     
-    # ### Calculate YearSplit
     
+    # ### Calculate YearSplit
     
-    yearsplit = (
-        demand_df["TIMESLICE"]
-        .value_counts(normalize=True)
-        .to_frame("VALUE")
-        .round(4)
-        .reset_index()
-        .rename({"index": "TIMESLICE"}, axis=1)
+    ts_counts = timeslices.counts(ts_codes)
+    ts_present = ts_counts > 0
+    yearsplit = pd.DataFrame(
+        {
+            "TIMESLICE": timeslices.names[ts_present],
+            "VALUE": (ts_counts[ts_present] / ts_counts.sum()).round(4),
+        }
     )
     
-    yearsplit_final = pd.DataFrame(
-        list(itertools.product(yearsplit["TIMESLICE"].unique(), years)),
-        columns=["TIMESLICE", "YEAR"],
-    )
-    yearsplit_final = yearsplit_final.join(yearsplit.set_index("TIMESLICE"), on="TIMESLICE")
-    yearsplit_final = apply_dtypes(yearsplit_final, "Year Split")
-    yearsplit_final.to_csv(os.path.join(output_data_dir, "YearSplit.csv"), index=None)
+    # Year invariant, expanded over the model years by the geographic filter
+    yearsplit_final = apply_dtypes(yearsplit, "Year Split")
+    write_table(yearsplit_final, table_path(output_data_dir, "YearSplit", data_format))
     
     
     #  Calculate SpecifiedAnnualDemand and SpecifiedDemandProfile
     # ### Calculate SpecifiedAnnualDemand and SpecifiedDemandProfile
     
-    sp_demand_df = demand_df[
-        [x for x in demand_df.columns if x in demand_nodes or x == "TIMESLICE"]
-    ]
-    
-    sp_demand_df = pd.melt(
-        sp_demand_df,
-        id_vars="TIMESLICE",
-        value_vars=demand_nodes,
-        var_name="node",
-        value_name="demand",
+    # sampled demand is weighted by the hours each timeslice represents
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sample_weight = ts_counts / timeslices.counts(sample_codes)
+    sp_demand_df = timeslices.to_frame(
+        timeslices.aggregate(sample_codes, demand_values, "sum")
+        * sample_weight[:, None],
+        demand_nodes,
+        "demand",
     )
     
-    sp_demand_df = sp_demand_df.groupby(["TIMESLICE", "node"], as_index=False).sum()
-    
     # Calculate SpecifiedAnnualDemand
     total_demand_df = (
         sp_demand_df.drop(columns="TIMESLICE").groupby("node", as_index=False).sum()
@@ -259,14 +203,14 @@ def main(
     # In case custom data is provided only keep the custom data
     sp_demand_df.drop_duplicates(subset=['TIMESLICE', 'FUEL'], keep = 'last', inplace = True)
     
-    # Create master table for SpecifiedDemandProfile
+    # Create master table for SpecifiedDemandProfile, year invariant
     sp_demand_df_final = pd.DataFrame(
         list(
             itertools.product(
-                sp_demand_df["TIMESLICE"].unique(), sp_demand_df["FUEL"].unique(), years
+                sp_demand_df["TIMESLICE"].unique(), sp_demand_df["FUEL"].unique()
             )
         ),
-        columns=["TIMESLICE", "FUEL", "YEAR"],
+        columns=["TIMESLICE", "FUEL"],
     )
     sp_demand_df_final = sp_demand_df_final.join(
         sp_demand_df.set_index(["TIMESLICE", "FUEL"]), on=["TIMESLICE", "FUEL"]
@@ -276,7 +220,7 @@ def main(
     sp_demand_df_final["REGION"] = "GLOBAL"
     
     total_demand_df_final = (
-        sp_demand_df_final.groupby(["REGION", "FUEL", "YEAR"], as_index=False)[
+        sp_demand_df_final.groupby(["REGION", "FUEL"], as_index=False)[
             "total_demand"
         ]
         .agg("mean")
@@ -289,37 +233,25 @@ def main(
     # Generate SpecifiedDemandProfile.csv file
     sp_demand_df_final["VALUE"] = sp_demand_df_final["VALUE"].round(2)
     sp_demand_df_final = sp_demand_df_final[
-        ["REGION", "FUEL", "TIMESLICE", "YEAR", "VALUE"]
+        ["REGION", "FUEL", "TIMESLICE", "VALUE"]
     ].dropna()
     
     # sp_demand_df_final = apply_dtypes(sp_demand_df_final, "SpecifiedDemandProfile")
     sp_demand_df_final.drop_duplicates(
-        subset=["REGION", "TIMESLICE", "FUEL", "YEAR"], keep="last", inplace=True
+        subset=["REGION", "TIMESLICE", "FUEL"], keep="last", inplace=True
     )
     
-    sp_demand_df_final.to_csv(
-        os.path.join(output_data_dir, "SpecifiedDemandProfile.csv"), index=None
-    )
+    write_table(sp_demand_df_final, table_path(output_data_dir, "SpecifiedDemandProfile", data_format))
     
     # CapacityFactor
     
-    datetime_ts_df = demand_df[["Datetime", "TIMESLICE"]]
-    
     def capacity_factor(df):
-        df["Datetime"] = pd.to_datetime(df["Datetime"], format="%d/%m/%Y %H:%M")
-        capfac_df = df.set_index("Datetime").join(
-            datetime_ts_df.set_index("Datetime"), on="Datetime"
-        )
-        capfac_nodes = [x for x in capfac_df.columns if x not in ["Datetime", "TIMESLICE"]]
-        capfac_df = capfac_df.reset_index().drop("Datetime", axis=1)
-        capfac_df = pd.melt(
-            capfac_df,
-            id_vars="TIMESLICE",
-            value_vars=capfac_nodes,
-            var_name="node",
-            value_name="VALUE",
+        capfac_nodes, capfac_values = hourly_profiles[df.name]
+        capfac_df = timeslices.to_frame(
+            timeslices.aggregate(sample_codes, capfac_values, "mean"),
+            capfac_nodes,
+            "VALUE",
         )
-        capfac_df = capfac_df.groupby(["TIMESLICE", "node"], as_index=False).agg("mean")
         capfac_df["VALUE"] = capfac_df["VALUE"].div(100).round(4)
     
         ## Filter out country aggregate values for countries with multiple nodes
@@ -342,88 +274,88 @@ def main(
         # In case custom data is provided only keep the custom data
         capfac_df.drop_duplicates(subset=['TIMESLICE', 'TECHNOLOGY'], keep = 'last', inplace = True)
     
-        # Create master table for CapacityFactor
-        capfac_df_final = pd.DataFrame(
-            list(
-                itertools.product(
-                    capfac_df["TIMESLICE"].unique(), capfac_df["TECHNOLOGY"].unique(), years
-                )
-            ),
-            columns=["TIMESLICE", "TECHNOLOGY", "YEAR"],
-        )
-        capfac_df_final = capfac_df_final.join(
-            capfac_df.set_index(["TIMESLICE", "TECHNOLOGY"]), on=["TIMESLICE", "TECHNOLOGY"]
-        )
-    
-        # Add 'REGION' column and fill 'GLOBAL' throughout
-        capfac_df_final["REGION"] = "GLOBAL"
-    
-        capfac_df_final = capfac_df_final[
-            ["REGION", "TECHNOLOGY", "TIMESLICE", "YEAR", "VALUE"]
-        ]
-    
-        return capfac_df_final
-    
-    capfacs = []
-    for each in [hyd_df_processed, csp_df, spv_df, won_df, wof_df]:
-        capfacs.append(capacity_factor(each))
-    
-    capfac_all_df = pd.concat(capfacs).reset_index(drop=True)
-    
-    capfac_all_df.drop_duplicates(
-        subset=["REGION", "TECHNOLOGY", "TIMESLICE", "YEAR"], keep="last", inplace=True
+        # nodes not following the naming convention have no technology
+        capfac_df = capfac_df.dropna(subset=["TECHNOLOGY"])
+    
+        return capfac_df[["TIMESLICE", "TECHNOLOGY", "VALUE"]]
+    
+    def capacity_factor_chunks():
+        # The timeslice x technology values are year invariant, so they are
+        # only expanded over the model years by the geographic filter.
+        # Technologies are unique to each profile, so the rows of the profiles
+        # are written one after another.
+        for each in [hyd_df_processed, csp_df, spv_df, won_df, wof_df]:
+            capfac_df = capacity_factor(each)
+            for chunk in product_chunks(capfac_df, ["TIMESLICE", "TECHNOLOGY"], None):
+                # Add 'REGION' column and fill 'GLOBAL' throughout
+                chunk["REGION"] = "GLOBAL"
+                yield chunk[["REGION", "TECHNOLOGY", "TIMESLICE", "VALUE"]]
+    
+    write_chunks(
+        capacity_factor_chunks(),
+        table_path(output_data_dir, "CapacityFactor", data_format),
     )
-    capfac_all_df.to_csv(os.path.join(output_data_dir, "CapacityFactor.csv"), index=None)
     
     # Create csv for TIMESLICE
     
     # ## Create csv for TIMESLICE
-    time_slice_list = list(demand_df["TIMESLICE"].unique())
+    time_slice_list = list(pd.unique(timeslices.names[ts_codes[ts_codes >= 0]]))
     time_slice_df = pd.DataFrame(time_slice_list, columns=["VALUE"]).astype(
         SET_DTYPES["TIMESLICE"]
     )
-    time_slice_df.to_csv(os.path.join(output_data_dir, "TIMESLICE.csv"), index=None)
+    write_table(time_slice_df, table_path(output_data_dir, "TIMESLICE", data_format))
     
     demand_nodes = list(set(list(sp_demand_df_final["FUEL"].str[3:8])))
     
     # Create Conversionls, Conversionld, and Conversionlh
     
+    # Season, day type and daypart of each timeslice, numbered from 1
+    time_slice_codes = timeslices.codes(time_slice_list)
+    
+    def conversion(index, size, set_name):
+        df = pd.DataFrame(
+            list(itertools.product(time_slice_list, list(range(1, size + 1)))),
+            columns=["TIMESLICE", set_name],
+        )
+        df["VALUE"] = (
+            np.repeat(index[time_slice_codes] + 1, size) == df[set_name]
+        ).astype(float)
+        return df
+    
     # Conversionls
-    df_ls = pd.DataFrame(
-        list(itertools.product(time_slice_list, list(range(1, len(seasons) + 1)))),
-        columns=["TIMESLICE", "SEASON"],
-    )
-    df_ls.loc[df_ls["TIMESLICE"].str[1:2].astype(int) == df_ls["SEASON"], "VALUE"] = 1
-    df_ls.fillna(0, inplace=True)
-    df_ls.to_csv(os.path.join(output_data_dir, "Conversionls.csv"), index=None)
+    df_ls = conversion(timeslices.season_index, len(timeslices.seasons), "SEASON")
+    write_table(df_ls, table_path(output_data_dir, "Conversionls", data_format))
     
-    df_season_set = pd.DataFrame(list(range(1, len(seasons) + 1)), columns=["VALUE"])
-    df_season_set.to_csv(os.path.join(output_data_dir, "SEASON.csv"), index=None)
+    df_season_set = pd.DataFrame(
+        list(range(1, len(timeslices.seasons) + 1)), columns=["VALUE"]
+    )
+    write_table(df_season_set, table_path(output_data_dir, "SEASON", data_format))
     
     # Conversionld
-    df_ld = pd.DataFrame(
-        list(itertools.product(time_slice_list, [1])), columns=["TIMESLICE", "DAYTYPE"]
+    df_ld = conversion(timeslices.daytype_index, len(timeslices.daytypes), "DAYTYPE")
+    df_ld = df_ld.loc[df_ld["VALUE"] == 1].astype({"VALUE": int})
+    write_table(df_ld, table_path(output_data_dir, "Conversionld", data_format))
+    df_daytype_set = pd.DataFrame(
+        list(range(1, len(timeslices.daytypes) + 1)), columns=["VALUE"]
     )
-    df_ld["VALUE"] = 1
-    df_ld.fillna(0, inplace=True)
-    df_ld.to_csv(os.path.join(output_data_dir, "Conversionld.csv"), index=None)
-    df_daytype_set = pd.DataFrame([1], columns=["VALUE"])
-    df_daytype_set.to_csv(os.path.join(output_data_dir, "DAYTYPE.csv"), index=None)
+    write_table(df_daytype_set, table_path(output_data_dir, "DAYTYPE", data_format))
+    
+    # DaysInDayType, year invariant. The storage balance counts each day type
+    # once per day of the week it stands for, so the days of each season add
+    # up to a week: 5/2 for weekdays/weekends, 1 for each day of a
+    # representative week and 7 otherwise.
+    df_days = timeslices.days_in_daytype()
+    write_table(df_days, table_path(output_data_dir, "DaysInDayType", data_format))
     
     # Conversionlh
-    df_lh = pd.DataFrame(
-        list(itertools.product(time_slice_list, list(range(1, len(dayparts) + 1)))),
-        columns=["TIMESLICE", "DAILYTIMEBRACKET"],
+    df_lh = conversion(
+        timeslices.daypart_index, len(timeslices.dayparts), "DAILYTIMEBRACKET"
     )
-    df_lh.loc[
-        df_lh["TIMESLICE"].str[3:].astype(int) == df_lh["DAILYTIMEBRACKET"], "VALUE"
-    ] = 1
-    df_lh.fillna(0, inplace=True)
-    df_lh.to_csv(os.path.join(output_data_dir, "Conversionlh.csv"), index=None)
-    df_dayparts_set = pd.DataFrame(list(range(1, len(dayparts) + 1)), columns=["VALUE"])
-    df_dayparts_set.to_csv(
-        os.path.join(output_data_dir, "DAILYTIMEBRACKET.csv"), index=None
+    write_table(df_lh, table_path(output_data_dir, "Conversionlh", data_format))
+    df_dayparts_set = pd.DataFrame(
+        list(range(1, len(timeslices.dayparts) + 1)), columns=["VALUE"]
     )
+    write_table(df_dayparts_set, table_path(output_data_dir, "DAILYTIMEBRACKET", data_format))
     
     # Daysplit
     
@@ -432,58 +364,75 @@ def main(
         daysplit[int(dp[1:])] = (hr[1] - hr[0]) / 8760
     
     df_daysplit = pd.DataFrame(
-        itertools.product(list(range(1, len(dayparts) + 1)), years),
-        columns=["DAILYTIMEBRACKET", "YEAR"],
+        list(range(1, len(dayparts) + 1)), columns=["DAILYTIMEBRACKET"]
     )
     df_daysplit["VALUE"] = df_daysplit["DAILYTIMEBRACKET"].map(daysplit)
-    df_daysplit = df_daysplit[["DAILYTIMEBRACKET", "YEAR", "VALUE"]]
     df_daysplit["VALUE"] = df_daysplit["VALUE"].round(4)
-    df_daysplit.to_csv(os.path.join(output_data_dir, "DaySplit.csv"), index=None)
+    write_table(df_daysplit, table_path(output_data_dir, "DaySplit", data_format))
+    
+    # Error of the timeslice approximation against the hourly profiles
+    
+    reports = []
+    for name, (nodes, values) in hourly_profiles.items():
+        reports.append(
+            timeslices.approximation_error(
+                ts_codes, sample_codes, values, nodes
+            ).assign(PROFILE=name)
+        )
+    report = pd.concat(reports).rename(columns={"column": "NODE"})
+    report = report[["PROFILE", "NODE"] + list(report.columns[1:-1])].round(4)
+    report.to_csv(timeslice_report, index=False)
+    
+    # Hours of each timeslice by month and hour, to spread results over the
+    # hours of the year in postprocessing
+    timeslices.month_hours(
+        ts_codes, demand_df["Month"], demand_df["Hour"]
+    ).to_csv(timeslice_hours, index=False)
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():
-        start_year = snakemake.params.start_year
-        end_year = snakemake.params.end_year
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         region_name = snakemake.params.region_name
         geographic_scope = snakemake.params.geographic_scope
+        custom_nodes = snakemake.params.custom_nodes
         output_data_dir = snakemake.params.output_data_dir
+        data_format = snakemake.params.data_format
         input_data_dir = snakemake.params.input_data_dir
         output_dir = snakemake.params.output_dir
         input_dir = snakemake.params.input_dir
         custom_nodes_dir = snakemake.params.input_data_dir
+        profile_store_dir = snakemake.params.profile_store_dir
         daytype = snakemake.params.daytype
         seasons = snakemake.params.seasons
         dayparts = snakemake.params.dayparts
         timeshift = snakemake.params.timeshift
+        timeslice_mode = snakemake.params.timeslice_mode
+        representative_periods = snakemake.params.representative_periods
+        timeslice_report = snakemake.output.report
+        timeslice_hours = snakemake.output.hours
         
-        plexos_demand = pd.read_csv(snakemake.input.plexos_demand)
-        plexos_csp_2015 = pd.read_csv(snakemake.input.plexos_csp_2015)
-        plexos_spv_2015 = pd.read_csv(snakemake.input.plexos_spv_2015)
         plexos_hyd_2015 = pd.read_csv(snakemake.input.plexos_hyd_2015)
-        plexos_won_2015 = pd.read_csv(snakemake.input.plexos_won_2015)
-        plexos_wof_2015 = pd.read_csv(snakemake.input.plexos_wof_2015)
         custom_specified_demand_profiles = pd.read_csv(snakemake.input.custom_specified_demand_profiles)
-        custom_csp_profiles = pd.read_csv(snakemake.input.custom_csp_profiles)
         custom_hyd_profiles = pd.read_csv(snakemake.input.custom_hyd_profiles)
-        custom_spv_profiles = pd.read_csv(snakemake.input.custom_spv_profiles)
-        custom_wof_profiles = pd.read_csv(snakemake.input.custom_wof_profiles)
-        custom_won_profiles = pd.read_csv(snakemake.input.custom_won_profiles)
         
     # The below else statement defines variables if the 'powerplant/main' script is to be run locally
     # outside the snakemake workflow. This is relevant for testing purposes only! User inputs when running 
     # the full workflow need to be defined in the config file. 
             
     else:      
-        start_year = 2021
-        end_year = 2050
         region_name = 'GLOBAL'
         geographic_scope = ['BTN', 'IND']
+        custom_nodes = []
         output_data_dir = 'results/data'
+        data_format = 'csv'
         input_data_dir = 'resources/data/default'
         output_dir = 'results'
         input_dir = 'resources'
         custom_nodes_dir = 'resources/data/custom'
+        profile_store_dir = 'resources/data/profiles'
         daytype = False
         seasons =   {'S1': [1, 2, 3, 4, 5, 6], 
                      'S2': [7, 8, 9, 10, 11, 12]}
@@ -492,37 +441,52 @@ if __name__ == "__main__":
                       'D3': [13, 19],
                       'D4': [19, 25]}
         timeshift = 0
+        timeslice_mode = 'grid'
+        representative_periods = {'period': 'day',
+                                  'count': 12}
+        timeslice_report = 'results/timeslice_report.csv'
+        timeslice_hours = 'results/timeslice_hours.csv'
         
-        plexos_demand = pd.read_csv(os.path.join(input_data_dir, 'All_Demand_UTC_2015.csv'), encoding="latin-1")
-        plexos_csp_2015 = pd.read_csv(os.path.join(input_data_dir, 'CSP 2015.csv'), encoding="latin-1")
-        plexos_spv_2015 = pd.read_csv(os.path.join(input_data_dir, 'SolarPV 2015.csv'), encoding="latin-1")
         plexos_hyd_2015 = pd.read_csv(os.path.join(input_data_dir, 'Hydro_Monthly_Profiles (15 year average).csv'), encoding="latin-1")
-        plexos_won_2015 = pd.read_csv(os.path.join(input_data_dir, 'Won 2015.csv'), encoding="latin-1")
-        plexos_wof_2015 = pd.read_csv(os.path.join(input_data_dir, 'Woff 2015.csv'), encoding="latin-1")
         custom_specified_demand_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'specified_demand_profile.csv'))
-        custom_csp_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'RE_profiles_CSP.csv'), encoding="latin-1")
         custom_hyd_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'RE_profiles_HYD.csv'), encoding="latin-1")
-        custom_spv_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'RE_profiles_SPV.csv'), encoding="latin-1")
-        custom_wof_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'RE_profiles_WOF.csv'), encoding="latin-1")
-        custom_won_profiles = pd.read_csv(os.path.join(custom_nodes_dir, 'RE_profiles_WON.csv'), encoding="latin-1")      
+
+    # Hourly profiles are only read for the nodes in the geographic scope
+    profiles = {
+        x: read_profiles(profile_store_dir, x, geographic_scope, custom_nodes)
+        for x in ["demand", "CSP", "SPV", "WON", "WOF"]
+    }
+    plexos_hyd_2015 = plexos_hyd_2015.loc[
+        in_scope(plexos_hyd_2015["NAME"], geographic_scope, custom_nodes)
+    ]
+    custom_hyd_profiles = custom_hyd_profiles.loc[
+        in_scope(custom_hyd_profiles["NAME"], geographic_scope, custom_nodes)
+    ]
+    custom_specified_demand_profiles = custom_specified_demand_profiles[
+        ["Month", "Day", "Hour"]
+        + [
+            x
+            for x in custom_specified_demand_profiles.columns[3:]
+            if in_scope([x], geographic_scope, custom_nodes)[0]
+        ]
+    ]
 
     # SET INPUT DATA
     input_data = {
-        "demand_df" : plexos_demand,
-        "csp_df" : plexos_csp_2015,
-        "spv_df" : plexos_spv_2015,
+        "demand_df" : profiles["demand"],
+        "csp_df" : profiles["CSP"],
+        "spv_df" : profiles["SPV"],
         "hyd_df" : plexos_hyd_2015,
-        "won_df" : plexos_won_2015,
-        "wof_df" : plexos_wof_2015,
+        "won_df" : profiles["WON"],
+        "wof_df" : profiles["WOF"],
         "custom_sp_demand_profile" : custom_specified_demand_profiles,
-        "csp_df_custom" : custom_csp_profiles,
         "hyd_df_custom" : custom_hyd_profiles,
-        "spv_df_custom" : custom_spv_profiles,
-        "wof_df_custom" : custom_wof_profiles,
-        "won_df_custom" : custom_won_profiles,
         "seasons_raw" : seasons,
         "dayparts_raw": dayparts,
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
@@ -5,6 +5,8 @@ import pandas as pd
 from typing import Any
 from pathlib import Path
 
+from osemosys_global.param_io import table_path, write_table
+
 
 def get_otoole_params(otoole_config: str) -> dict[str, dict[str, Any]]:
     """Gets parameter/result files to be created"""
@@ -26,14 +28,16 @@ if __name__ == "__main__":
     if "snakemake" in globals():
         otoole_yaml = snakemake.input.otoole_config
         out_dir = str(snakemake.params.out_dir)
+        data_format = snakemake.params.data_format
     else:
         otoole_yaml = "resources/otoole/config.yaml"
         out_dir = "results/data"
+        data_format = "csv"
 
     parameters = get_otoole_params(otoole_yaml)
 
     for param, data in parameters.items():
-        p = Path(out_dir, f"{param}.csv")
+        p = Path(table_path(out_dir, param, data_format))
         if not p.exists():
             df = get_empty_df(data)
-            df.to_csv(str(p), index=False)
+            write_table(df, str(p))
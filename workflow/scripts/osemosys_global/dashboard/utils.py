@@ -7,6 +7,8 @@ from shapely.geometry import LineString
 from pathlib import Path 
 import os
 from osemosys_global.configuration import ConfigFile, ConfigPaths
+from osemosys_global.excel_cache import read_excel
+from osemosys_global.set_codes import code_slice, decode
 # from osemosys_global.visualisation.utils import (
 #     load_node_data_demand_center, 
 #     load_node_data_centroid, 
@@ -152,10 +154,11 @@ def parse_pwr_codes(df: pd.DataFrame) -> pd.DataFrame:
     
     if not df.empty:
         df = df.drop(columns=["REGION"])
-        df["CATEGORY"] = df["TECHNOLOGY"].str[3:6]
-        df["REGION_CODE"] = df["TECHNOLOGY"].str[6:11]
-        df["COUNTRY"] = df["TECHNOLOGY"].str[6:9]
-        df["REGION"] = df["TECHNOLOGY"].str[9:11]
+        parts = decode(df["TECHNOLOGY"], fields=["TECH", "NODE", "COUNTRY"])
+        df["CATEGORY"] = parts["TECH"].astype(object)
+        df["REGION_CODE"] = parts["NODE"].astype(object)
+        df["COUNTRY"] = parts["COUNTRY"].astype(object)
+        df["REGION"] = code_slice(df["TECHNOLOGY"], 9, 11).astype(object)
         df = df.drop(columns=["TECHNOLOGY"])
         df = sort_columns(df)
     else:
@@ -180,9 +183,10 @@ def parse_min_codes(df: pd.DataFrame) -> pd.DataFrame:
     
     if not df.empty:
         df = df.drop(columns=["REGION"])
-        df["CATEGORY"] = df["TECHNOLOGY"].str[3:6]
-        df["COUNTRY"] = df["TECHNOLOGY"].str[6:9]
-        df["REGION_CODE"] = df["TECHNOLOGY"].str[6:9]
+        parts = decode(df["TECHNOLOGY"], fields=["TECH", "COUNTRY"])
+        df["CATEGORY"] = parts["TECH"].astype(object)
+        df["COUNTRY"] = parts["COUNTRY"].astype(object)
+        df["REGION_CODE"] = parts["COUNTRY"].astype(object)
         df = df.drop(columns=["TECHNOLOGY"])
         df = sort_columns(df)
     else:
@@ -206,10 +210,11 @@ def parse_fuel_codes(df: pd.DataFrame) -> pd.DataFrame:
     df = df.loc[df["FUEL"].str[-2:]=="02"]
     if not df.empty:
         df = df.drop(columns=["REGION"])
-        df["CATEGORY"] = df["FUEL"].str[0:3]
-        df["REGION_CODE"] = df["FUEL"].str[3:8]
-        df["COUNTRY"] = df["FUEL"].str[3:6]
-        df["REGION"] = df["FUEL"].str[6:8]
+        parts = decode(df["FUEL"], "FUEL", fields=["PREFIX", "NODE", "COUNTRY"])
+        df["CATEGORY"] = parts["PREFIX"].astype(object)
+        df["REGION_CODE"] = parts["NODE"].astype(object)
+        df["COUNTRY"] = parts["COUNTRY"].astype(object)
+        df["REGION"] = code_slice(df["FUEL"], 6, 8).astype(object)
         df = df.drop(columns=["FUEL"])
         df = sort_columns(df)
     else:
@@ -556,7 +561,7 @@ def load_node_data_demand_center(cost_line_expansion_xlsx: str) -> pd.DataFrame:
         else:
             return f"{parts[1]}XX"
         
-    raw = pd.read_excel(cost_line_expansion_xlsx, sheet_name='Centerpoints')
+    raw = read_excel(cost_line_expansion_xlsx, sheet_name='Centerpoints')
     df = pd.DataFrame()
     
     df["NODE"] = raw["Node"].map(lambda x: parse_name(x))
@@ -589,7 +594,7 @@ def load_node_data_centroid(plexos_world_softlink_xlsx: str) -> pd.DataFrame:
         else:
             return f"{parts[1]}XX"
         
-    raw = pd.read_excel(plexos_world_softlink_xlsx, sheet_name='Attributes')
+    raw = read_excel(plexos_world_softlink_xlsx, sheet_name='Attributes')
     temp = raw.loc[raw["class"] == "Node"]
 
     temp = temp.loc[
@@ -632,7 +637,7 @@ def load_line_data(cost_line_expansion_xlsx: str) -> pd.DataFrame:
         return pd.DataFrame(parsed_data, columns=["TECHNOLOGY", "FROM", "TO"])
     
     # get all transmission lines
-    raw = pd.read_excel(cost_line_expansion_xlsx, sheet_name='Interface')
+    raw = read_excel(cost_line_expansion_xlsx, sheet_name='Interface')
     trn = raw.dropna(subset=["From"])
     trn = format_transmission_name(trn)
     
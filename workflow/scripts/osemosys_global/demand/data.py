@@ -3,6 +3,9 @@
 import pandas as pd
 import wbgapi as wb
 from datetime import datetime
+from typing import Optional
+
+from osemosys_global.plexos_world import PlexosWorld
 
 from spatial import get_spatial_mapping_country
 from constants import (
@@ -145,9 +148,21 @@ def _iamc_data_available(
 
 
 def get_iamc_data(
-    plexos: pd.DataFrame, iamc: pd.DataFrame, iamc_missing: pd.DataFrame, metric: str
+    plexos: PlexosWorld,
+    iamc: pd.DataFrame,
+    iamc_missing: pd.DataFrame,
+    metric: str,
+    pathways: Optional[list[str]] = None,
 ) -> pd.DataFrame:
-    """Gets full iamc data"""
+    """Gets full iamc data
+
+    Data of the PATHWAY scenario is taken, unless a list of SSP scenarios is
+    given. Each country then has a row per scenario, which are all projected
+    at once.
+    """
+
+    if pathways is None:
+        pathways = [PATHWAY]
 
     if metric == "gdp":
         model = GDP_PPP_COUNTRIES_SOURCE
@@ -161,13 +176,13 @@ def get_iamc_data(
     spatial_mapping = get_spatial_mapping_country(plexos)
 
     df_original = iamc[
-        (iamc["Model"] == model) & (iamc["Scenario"] == PATHWAY)
+        (iamc["Model"] == model) & (iamc["Scenario"].isin(pathways))
     ].set_index("Region")
 
     if not _iamc_data_available(df_original, iamc_missing, spatial_mapping):
         raise ValueError("Country data for is not available in custom dataset!")
 
-    df_missing = iamc_missing[(iamc_missing["Scenario"] == PATHWAY)]
+    df_missing = iamc_missing[(iamc_missing["Scenario"].isin(pathways))]
 
     df = pd.concat([df_original, df_missing])
 
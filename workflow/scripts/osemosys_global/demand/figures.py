@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from typing import Optional
 from datetime import datetime
+from osemosys_global.plexos_world import PlexosWorld
 
 from regression import perform_regression, get_regression_coefficients
 from projection import perform_country_projection_step, _get_base_data
@@ -75,7 +76,7 @@ def create_regression_plot(df: pd.DataFrame, urbanization: bool) -> tuple:
 
 
 def create_demand_plot(
-    plexos: pd.DataFrame,
+    plexos: PlexosWorld,
     base: pd.DataFrame,
     reg: pd.DataFrame,
     dem: pd.DataFrame,
@@ -1,6 +1,10 @@
 """Creates demand projections"""
 
 import pandas as pd
+import sys
+from osemosys_global.param_io import write_table
+from osemosys_global.plexos_world import PlexosWorld
+from osemosys_global.stage_cache import StageCache
 from read import (
     import_ember_elec,
     import_hourly_demand,
@@ -20,7 +24,7 @@ from custom import (
 
 
 def main(
-    plexos: pd.DataFrame,
+    plexos: PlexosWorld,
     ember: pd.DataFrame,
     plexos_demand: pd.DataFrame,
     iamc_gdp: pd.DataFrame,
@@ -52,6 +56,9 @@ if __name__ == "__main__":
 
     # gets file paths
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_plexos = snakemake.input.plexos
         file_plexos_demand = snakemake.input.plexos_demand
         file_iamc_gdp = snakemake.input.iamc_gdp
@@ -115,4 +122,7 @@ if __name__ == "__main__":
     custom = get_custom_demand_data(all_custom, start_year, end_year)
     df = merge_default_custom_data(df, custom)
 
-    df.to_csv(csv, index=False)
+    write_table(df, csv)
+
+    if "snakemake" in globals():
+        stage_cache.store()
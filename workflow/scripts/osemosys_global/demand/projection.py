@@ -2,6 +2,7 @@
 
 import pandas as pd
 import numpy as np
+from osemosys_global.plexos_world import PlexosWorld
 from regression import get_regression_coefficients
 from constants import START_YEAR, END_YEAR
 from spatial import get_spatial_mapping_country, get_spatial_mapping_node
@@ -16,7 +17,7 @@ from typing import Optional
 
 def perform_node_projections(
     lr: pd.DataFrame,
-    plexos: pd.DataFrame,
+    plexos: PlexosWorld,
     plexos_demand: pd.DataFrame,
     iamc_gdp: pd.DataFrame,
     iamc_pop: pd.DataFrame,
@@ -35,7 +36,7 @@ def perform_node_projections(
 
 def perform_node_projection_step(
     lr: pd.DataFrame,
-    plexos: pd.DataFrame,
+    plexos: PlexosWorld,
     plexos_demand: pd.DataFrame,
     iamc_gdp: pd.DataFrame,
     iamc_pop: pd.DataFrame,
@@ -92,6 +93,24 @@ def _get_year_interval(start: int, end: int) -> range:
     return range(start, end + 5, 5)
 
 
+def _scenario_values(
+    iamc: pd.DataFrame, keys: pd.MultiIndex, years: list[int]
+) -> np.ndarray:
+    """Gets iamc data of the years as an array aligned to the keys
+
+    Rows of the iamc data are identified by their country and scenario, so
+    the data of all SSP scenarios is aligned at once.
+    """
+
+    df = iamc.set_index("Scenario", append=True)[years]
+    return df.reindex(keys).to_numpy(dtype=float)
+
+
+def _scenario_keys(df: pd.DataFrame) -> pd.MultiIndex:
+    """Country and scenario of each row"""
+    return pd.MultiIndex.from_arrays([df.index, df["Scenario"]])
+
+
 def _get_base_data(
     iamc_gdp: pd.DataFrame,
     iamc_pop: pd.DataFrame,
@@ -112,12 +131,14 @@ def _get_base_data(
     # Divides the country level GDP|PPP data (converted from billions to millions)
     # with the population (millions) to get GDP|PPP pp.
 
-    years = _get_year_interval(START_YEAR, END_YEAR)
+    years = list(_get_year_interval(START_YEAR, END_YEAR))
+    keys = _scenario_keys(df)
 
-    for year in years:
-        df[year] = (iamc_gdp[year] * 1000) / iamc_pop[year]
+    gdp = _scenario_values(iamc_gdp, keys, years)
+    pop = _scenario_values(iamc_pop, keys, years)
+    gdp_pp = pd.DataFrame((gdp * 1000) / pop, index=df.index, columns=years)
 
-    return df
+    return pd.concat([df, gdp_pp], axis=1)
 
 
 def _get_electrical_projection_country(
@@ -127,7 +148,8 @@ def _get_electrical_projection_country(
 ) -> pd.DataFrame:
     """Country-level GDP|PPP pp values to project country-level electricity demand pp
 
-    Data is returned as a per-capita value
+    Data is returned as a per-capita value. All countries, scenarios and years
+    are projected as one array.
     """
 
     if isinstance(iamc_urb, pd.DataFrame):
@@ -140,18 +162,22 @@ def _get_electrical_projection_country(
 
     df["Variable"] = "Demand|projected|pp"
 
-    years = _get_year_interval(START_YEAR, END_YEAR)
+    years = list(_get_year_interval(START_YEAR, END_YEAR))
+    keys = _scenario_keys(df)
+
+    gdp_pp = base[years].to_numpy(dtype=float)
+    coef_gdp = df[["coef_GDPppp"]].to_numpy(dtype=float)
+    intercept = df[["intercept"]].to_numpy(dtype=float)
 
     if isinstance(iamc_urb, pd.DataFrame):
-        for year in years:
-            df[year] = (
-                df["coef_GDPppp"] * base[year]
-                + df["coef_Urb"] * iamc_urb[year]
-                + df["intercept"]
-            )
+        coef_urb = df[["coef_Urb"]].to_numpy(dtype=float)
+        urb = _scenario_values(iamc_urb, keys, years)
+        demand_pp = coef_gdp * gdp_pp + coef_urb * urb + intercept
     else:
-        for year in years:
-            df[year] = df["coef_GDPppp"] * base[year] + df["intercept"]
+        demand_pp = coef_gdp * gdp_pp + intercept
+
+    demand_pp = pd.DataFrame(demand_pp, index=df.index, columns=years)
+    df = pd.concat([df, demand_pp], axis=1)
 
     if isinstance(iamc_pop, pd.DataFrame):
         return _convert_per_capita_to_total(df, iamc_pop)
@@ -168,16 +194,20 @@ def _convert_per_capita_to_total(
     population (in millions) to get country-level total projected demand (in GWh).
     """
 
-    df = pd.DataFrame()
-    years = _get_year_interval(START_YEAR, END_YEAR)
-    for year in years:
-        df[year] = df_per_capita[year] * iamc_pop[year]
+    years = list(_get_year_interval(START_YEAR, END_YEAR))
+    keys = _scenario_keys(df_per_capita)
+
+    pop = _scenario_values(iamc_pop, keys, years)
+    total = df_per_capita[years].to_numpy(dtype=float) * pop
+
+    df = pd.DataFrame(total, index=df_per_capita.index, columns=years)
+    df.insert(0, "Scenario", df_per_capita["Scenario"])
 
     return df
 
 
 def _apply_td_losses(
-    plexos: pd.DataFrame,
+    plexos: PlexosWorld,
     plexos_node_demand: pd.DataFrame,
     td_losses: pd.DataFrame,
     projection: pd.DataFrame,
@@ -207,17 +237,14 @@ def _apply_td_losses(
         spatial_mapping.index
     )
 
-    years = _get_year_interval(START_YEAR, END_YEAR)
+    years = list(_get_year_interval(START_YEAR, END_YEAR))
 
-    projection_with_losses = pd.DataFrame()
+    # Losses of the country of each projected row, for every scenario
+    losses = ctry_losses[years].reindex(projection.index).to_numpy(dtype=float)
+    demand = projection[years].to_numpy(dtype=float)
 
     # Add T&D losses to the projected country-level demand.
-    for year in years:
-        projection_with_losses[year] = (
-            (projection[year] * ctry_losses[year] / 100 + projection[year])
-            .round(2)
-            .astype(float)
-        )
+    demand = np.round(demand * losses / 100 + demand, 2)
 
     # Constraints the forecasted final demand to 2015 baseline values as minimum
     # In case of linear regression, smaller countries with signficantly lower
@@ -228,23 +255,23 @@ def _apply_td_losses(
     # not realistic (note: as of now no decoupling of GDP growth and energy
     # demand reduction has been assumed).
 
-    dfs = []
-
-    for country in projection_with_losses.index.unique():
-        ctry_demand = projection_with_losses.loc[country]
-        node_demand = plexos_node_demand[
-            plexos_node_demand.Country.str.contains(country)
-        ]
-
-        total = ctry_demand.clip((node_demand.iloc[0]["Country_Demand_2015"] / 1000))
+    baseline = (
+        plexos_node_demand.drop_duplicates("Country")
+        .set_index("Country")["Country_Demand_2015"]
+        .reindex(projection.index)
+        .to_numpy(dtype=float)[:, None]
+        / 1000
+    )
+    demand = np.where(demand < baseline, baseline, demand)
 
-        dfs.append(pd.DataFrame(total).T)
+    df = pd.DataFrame(demand, index=projection.index, columns=years)
+    df.insert(0, "Scenario", projection["Scenario"])
 
-    return pd.concat(dfs)
+    return df
 
 
 def _downscale_demand(
-    plexos: pd.DataFrame, plexos_node_demand: pd.DataFrame, projection: pd.DataFrame
+    plexos: PlexosWorld, plexos_node_demand: pd.DataFrame, projection: pd.DataFrame
 ) -> pd.DataFrame:
     """Downscales country demand to nodal demand"""
 
@@ -263,9 +290,10 @@ def _downscale_demand(
 
     # Downscales projected country level demand by the 2015 shares of sub-country nodes as proxy.
 
-    years = _get_year_interval(START_YEAR, END_YEAR)
-    for year in years:
-        df[year] = (df[year] * df["Share_%_Country_Demand"]).round(2).astype(float)
+    years = list(_get_year_interval(START_YEAR, END_YEAR))
+    df[years] = (
+        df[years].mul(df["Share_%_Country_Demand"], axis=0).round(2).astype(float)
+    )
 
     df = df.set_index("PLEXOS_Nodes")
 
@@ -283,32 +311,55 @@ def _interpolate_yearly_demand(projection: pd.DataFrame) -> pd.DataFrame:
     """Interpolates data to yearly datapoints
 
     Interpolates 5-yearly values to yearly values and determines final electricity demand
-    per node per year
+    per node per year. All rows are interpolated at once, between the nearest
+    step years with a value, as ``DataFrame.interpolate(method="linear")``.
+    Years after the last value keep the last value.
     """
 
     df = projection.copy()
 
-    step_years = _get_year_interval(START_YEAR, END_YEAR)
-    all_years = range(START_YEAR, END_YEAR + 1)
-
-    for year in all_years:
-        if year not in step_years:
-            df[year] = np.nan
-
-    # Filters columns with numerical dtypes.
-    df_interp = df[all_years].copy()
+    step_years = np.array(_get_year_interval(START_YEAR, END_YEAR))
+    all_years = np.arange(START_YEAR, END_YEAR + 1)
+
+    values = df[list(step_years)].to_numpy(dtype=float)
+    rows, steps = values.shape
+    valid = ~np.isnan(values)
+
+    # Nearest step with a value at or before, and at or after, each step
+    previous = np.maximum.accumulate(np.where(valid, np.arange(steps), -1), axis=1)
+    following = np.minimum.accumulate(
+        np.where(valid, np.arange(steps), steps)[:, ::-1], axis=1
+    )[:, ::-1]
+    previous = np.concatenate([np.full((rows, 1), -1), previous], axis=1)
+    following = np.concatenate([following, np.full((rows, 1), steps)], axis=1)
+
+    # Step at or before each year, and whether the year is a step year
+    position = np.searchsorted(step_years, all_years, side="right") - 1
+    on_step = step_years[position.clip(0)] == all_years
+    low = previous[:, position + 1]
+    high = following[:, np.where(on_step, position, position + 1)]
+
+    padded = np.concatenate([values, np.full((rows, 1), np.nan)], axis=1)
+    x = np.append(step_years, 0).astype(float)
+    low_value = np.take_along_axis(padded, low, axis=1)
+    high_value = np.take_along_axis(padded, high, axis=1)
+    low_year = x[low]
 
     # Linearly interpolates values between years.
-    df_interp = df_interp.interpolate(method="linear", axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (high_value - low_value) / (x[high] - low_year)
+        interpolated = slope * (all_years - low_year) + low_value
+    interpolated = np.where(high == low, low_value, interpolated)
+    interpolated = np.where(high == steps, low_value, interpolated)
+    interpolated[low == -1] = np.nan
+
+    df_interp = pd.DataFrame(interpolated, index=df.index, columns=all_years.tolist())
 
     # Merges dataframes.
 
-    return pd.merge(
-        df[["Country", "PLEXOS_Countries", "Share_%_Country_Demand", "Unit"]],
-        df_interp,
-        left_index=True,
-        right_index=True,
-    )
+    cols = ["Country", "PLEXOS_Countries", "Share_%_Country_Demand", "Unit", "Scenario"]
+
+    return pd.concat([df[cols], df_interp], axis=1)
 
 
 def _get_node_peak_demand_ratio(
@@ -1,14 +1,16 @@
 """Module for reading in data sources"""
 
 import pandas as pd
+from osemosys_global.excel_cache import read_excel
+from osemosys_global.plexos_world import PlexosWorld
 
 
-def import_plexos_2015(f: str) -> pd.DataFrame:
+def import_plexos_2015(f: str) -> PlexosWorld:
     """Imports PLEXOS-World 2015 model file as basis for the spatial mapping.
     
     PLEXOS_World_2015_Gold_V1.1.xlsx
     """
-    return pd.read_excel(f, sheet_name="Memberships")
+    return PlexosWorld.from_workbook(f)
 
 
 def import_iamc(f: str) -> pd.DataFrame:
@@ -19,7 +21,7 @@ def import_iamc(f: str) -> pd.DataFrame:
     iamc_db_POP_Countries.xlsx
     iamc_db_URB_Countries.xlsx
     """
-    return pd.read_excel(f)
+    return read_excel(f)
 
 
 def import_iamc_missing(f: str, metric: str) -> dict[str, pd.DataFrame]:
@@ -37,7 +39,7 @@ def import_iamc_missing(f: str, metric: str) -> dict[str, pd.DataFrame]:
     else:
         raise NotImplementedError
 
-    return pd.read_excel(f, sheet_name=sheet_name).set_index("Region")
+    return read_excel(f, sheet_name=sheet_name).set_index("Region")
 
 
 def import_td_losses(f: str) -> pd.DataFrame:
@@ -47,7 +49,7 @@ def import_td_losses(f: str) -> pd.DataFrame:
     
     T&D Losses.xlsx
     """
-    return pd.read_excel(f)
+    return read_excel(f)
 
 
 def import_hourly_demand(f: str) -> pd.DataFrame:
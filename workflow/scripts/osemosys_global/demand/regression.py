@@ -1,8 +1,9 @@
 """Functions to perform demand regression"""
 
 from typing import Optional
-from sklearn.linear_model import LinearRegression
+import numpy as np
 import pandas as pd
+from osemosys_global.plexos_world import PlexosWorld
 from spatial import get_spatial_mapping_country
 from data import (
     get_historical_gdp_ppp_wb,
@@ -17,7 +18,7 @@ from constants import SPATIAL_RESOLUTION
 
 
 def perform_regression(
-    plexos: pd.DataFrame, ember: pd.DataFrame, urban: Optional[pd.DataFrame] = None
+    plexos: PlexosWorld, ember: pd.DataFrame, urban: Optional[pd.DataFrame] = None
 ) -> pd.DataFrame:
     """Performs the Linear Regression"""
 
@@ -28,20 +29,101 @@ def perform_regression(
     # Groups the entries by <Spatial_Resolution> and calculates the regional linear
     # fit based on all historical values
 
-    dfs = []
+    if urbanization:
+        # If Urbanization is included linear regression occurs with multiple
+        # independent variables (GDPppp and % Urban population) for the
+        # dependent variable (Electricity demand).
+        features = ["WB_GDPppp", "WB_Urb"]
+        score = "R2_GDPppp_Urb/Elec"
+    else:
+        # If Urbanization is not included linear regression occurs with single
+        # independent variables (GDPppp) for the dependent variable (Electricity
+        # demand).
+        features = ["WB_GDPppp"]
+        score = "R2_GDPppp/Elec"
+
+    lr = fit_linear_regressions(df, features, "ember_Elec")
+    lr = lr.rename(columns={"R2": score})
+
+    # entries of each region are kept together, in the order of the regions
+    df = df.loc[lr.index]
+
+    return df.join(lr)
+
+
+def fit_linear_regressions(
+    df: pd.DataFrame, features: list[str], target: str
+) -> pd.DataFrame:
+    """Fits an ordinary least squares regression for each index value
+
+    The least squares problems of all groups are solved at once. Features and
+    target are centered on the means of each group, so only the small normal
+    equations of each group remain, which are solved as one stack. As with
+    sklearn's ``LinearRegression``, the minimum norm coefficients are taken
+    where a group's features are collinear or constant.
+
+    Arguments
+    ---------
+    df: pd.DataFrame
+        Observations, indexed by the group, ie. the region, of each row
+    features: list[str]
+        Columns of the independent variables, ie. ["WB_GDPppp", "WB_Urb"]
+    target: str
+        Column of the dependent variable, ie. "ember_Elec"
+
+    Returns
+    -------
+    pd.DataFrame
+        intercept, coef_* of each feature and R2, indexed by group in order
+        of first appearance
+    """
 
-    for country in df.index.unique():
+    groups, labels = pd.factorize(df.index)
+    size = len(labels)
 
-        df_country = df.loc[country].copy()
+    x = df[features].to_numpy(dtype=float)
+    y = df[target].to_numpy(dtype=float)
 
-        if urbanization:
-            country_lr = _regression_with_urbanization(df_country)
-        else:
-            country_lr = _regression_without_urbanization(df_country)
+    count = np.bincount(groups, minlength=size)
+    x_mean = _group_sums(groups, x, size) / count[:, None]
+    y_mean = np.bincount(groups, y, minlength=size) / count
 
-        dfs.append(country_lr)
+    x_centered = x - x_mean[groups]
+    y_centered = y - y_mean[groups]
 
-    return pd.concat(dfs)
+    # features are scaled to unit length, so the normal equations stay well
+    # conditioned for GDP in the thousands and urbanization in percent
+    scale = np.sqrt(_group_sums(groups, x_centered**2, size))
+    scale[scale == 0] = 1
+    x_scaled = x_centered / scale[groups]
+
+    k = len(features)
+    gram = _group_sums(
+        groups, (x_scaled[:, :, None] * x_scaled[:, None, :]).reshape(-1, k * k), size
+    ).reshape(size, k, k)
+    moment = _group_sums(groups, x_scaled * y_centered[:, None], size)
+
+    coef = (np.linalg.pinv(gram, hermitian=True) @ moment[:, :, None])[:, :, 0]
+    coef = coef / scale
+
+    intercept = y_mean - (x_mean * coef).sum(axis=1)
+
+    residual = y_centered - (x_centered * coef[groups]).sum(axis=1)
+    ss_res = np.bincount(groups, residual**2, minlength=size)
+    ss_tot = np.bincount(groups, y_centered**2, minlength=size)
+
+    # as sklearn's r2_score, a constant target scores 1 if fitted exactly
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.where(ss_res > 0, 0.0, 1.0))
+    r2[count < 2] = np.nan
+
+    lr = pd.DataFrame({"intercept": intercept}, index=labels)
+    for i, feature in enumerate(features):
+        lr[f"coef_{feature.removeprefix('WB_')}"] = coef[:, i]
+    lr["R2"] = r2
+    lr.index.name = df.index.name
+
+    return lr
 
 
 def get_regression_coefficients(lr: pd.DataFrame, urbanization: bool) -> pd.DataFrame:
@@ -65,7 +147,7 @@ def get_regression_coefficients(lr: pd.DataFrame, urbanization: bool) -> pd.Data
 
 
 def _create_regression_dataframe(
-    plexos: pd.DataFrame, ember: pd.DataFrame, urban: Optional[pd.DataFrame] = None
+    plexos: PlexosWorld, ember: pd.DataFrame, urban: Optional[pd.DataFrame] = None
 ) -> pd.DataFrame:
     """
     Creates dataframe to be used in the linear regression
@@ -107,54 +189,8 @@ def _create_regression_dataframe(
     return df.set_index(SPATIAL_RESOLUTION)
 
 
-def _regression_with_urbanization(df: pd.DataFrame) -> pd.DataFrame:
-    """Perform regression with urbanization
-
-    If Urbanization is included linear regression occurs with multiple independent
-    variables (GDPppp and % Urban population) for the dependent variable (Electricity demand).
-    """
-
-    lr = LinearRegression()
-
-    lr.fit(
-        df[["WB_GDPppp", "WB_Urb"]],
-        df["ember_Elec"],
-    )
-
-    (
-        df["intercept"],
-        df["coef_GDPppp"],
-        df["coef_Urb"],
-    ) = [
-        lr.intercept_,
-        float(lr.coef_[0]),
-        float(lr.coef_[1]),
-    ]
-
-    df["R2_GDPppp_Urb/Elec"] = lr.score(
-        df[["WB_GDPppp", "WB_Urb"]],
-        df["ember_Elec"],
-    )
-
-    return df
-
-
-def _regression_without_urbanization(df: pd.DataFrame) -> pd.DataFrame:
-    """Perform regression without urbanization
-
-    If Urbanization is not included linear regression occurs with single independent
-    variables (GDPppp) for the dependent variable (Electricity demand).
-    """
-
-    lr = LinearRegression()
-
-    lr.fit(df[["WB_GDPppp"]], df["ember_Elec"])
-
-    df["intercept"], df["coef_GDPppp"] = [
-        lr.intercept_,
-        float(lr.coef_),
-    ]
-
-    df["R2_GDPppp/Elec"] = lr.score(df[["WB_GDPppp"]], df["ember_Elec"])
+def _group_sums(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """Sums each column of values by group"""
 
-    return df
+    sums = [np.bincount(groups, x, minlength=size) for x in values.T]
+    return np.column_stack(sums).reshape(size, values.shape[1])
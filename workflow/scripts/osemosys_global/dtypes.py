@@ -0,0 +1,269 @@
+"""Datatype policy for set and parameter data
+
+Parameter tables repeat the same few thousand set codes across millions of
+rows. Tables are held compactly as:
+
+- set columns, ie. REGION and TECHNOLOGY, as categoricals sharing the codes
+  of a process wide dictionary
+- years, modes and other integer set columns as int16
+- values as float32, where every value keeps its decimal value
+
+The compact types are applied where tables are read and written, see
+``param_io``. Data is written the same as with the plain types, so compacting
+does not change any output. Frames handed to the processing of a stage are
+cast with ``apply_dtypes``, which keeps set columns as plain strings.
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from osemosys_global.constants import SET_DTYPES
+
+logger = logging.getLogger(__name__)
+
+# set columns held as categoricals
+CATEGORICAL_COLUMNS = [
+    "REGION",
+    "TECHNOLOGY",
+    "FUEL",
+    "TIMESLICE",
+    "STORAGE",
+    "EMISSION",
+]
+
+# set columns held as int16
+INTEGER_COLUMNS = [
+    "YEAR",
+    "MODE_OF_OPERATION",
+    "DAILYTIMEBRACKET",
+    "SEASON",
+    "DAYTYPE",
+]
+
+INTEGER_DTYPE = "int16"
+
+FLOAT_DTYPE = "float32"
+
+
+def apply_dtypes(df: pd.DataFrame, name: Optional[str]) -> pd.DataFrame:
+    """Sets datatypes on dataframe"""
+
+    for col in df.columns:
+        try:
+            df[col] = df[col].astype(SET_DTYPES[col])
+        except KeyError:
+            if name:
+                logger.info(f"Can not set dtype for {name} on {col}")
+            else:
+                logger.info(f"Can not set dtype on {col}")
+    return df
+
+
+class CodeDictionary:
+    """Codes of the set columns, shared by all frames of a process
+
+    Codes are only ever appended, so the categorical codes of a frame stay
+    valid as codes of later frames are added. Frames are aligned to all known
+    codes before they are combined, so concatenated and merged set columns
+    remain categoricals.
+    """
+
+    def __init__(self):
+        self._codes = {}
+
+    def dtype(self, column: str) -> pd.CategoricalDtype:
+        """Categorical dtype of all known codes of a set column"""
+        return pd.CategoricalDtype(self._codes.get(column, pd.Index([], dtype=object)))
+
+    def update(self, column: str, values: pd.Series) -> pd.CategoricalDtype:
+        """Adds the codes of values and gets the dtype of all known codes"""
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.cat.categories
+        values = pd.Index(pd.unique(values.dropna())).astype(str).unique()
+
+        codes = self._codes.get(column, pd.Index([], dtype=object))
+        new = values[~values.isin(codes)]
+        if len(new):
+            self._codes[column] = codes.append(new)
+        return self.dtype(column)
+
+    def encode(self, values: pd.Series, column: str) -> pd.Series:
+        """Casts values of a set column to the shared categorical"""
+
+        dtype = self.update(column, values)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.set_categories(dtype.categories)
+        if not pd.api.types.is_object_dtype(values):
+            values = values.astype(object).where(values.isna(), values.astype(str))
+        return values.astype(dtype)
+
+    def align(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sets the categoricals of a frame to all known codes"""
+
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.CategoricalDtype) and col in self._codes:
+                df[col] = df[col].cat.set_categories(self._codes[col])
+        return df
+
+
+CODES = CodeDictionary()
+
+
+def float32_safe(values: pd.Series) -> bool:
+    """Checks if values keep their shortest decimal representation as float32"""
+
+    uniques = pd.unique(values.dropna().to_numpy(dtype=float))
+    printed = uniques.astype(FLOAT_DTYPE).astype(str).astype(float)
+    return bool(np.array_equal(printed, uniques))
+
+
+def _integer_safe(values: pd.Series) -> bool:
+    if not pd.api.types.is_numeric_dtype(values) or values.isna().any():
+        return False
+    info = np.iinfo(INTEGER_DTYPE)
+    values = values.to_numpy()
+    return bool(
+        (values == np.round(values)).all()
+        and (values >= info.min).all()
+        and (values <= info.max).all()
+    )
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts a frame to the compact types
+
+    Columns that can not be held compactly without changing their values,
+    ie. years with missing values or values needing float64 precision, keep
+    their types.
+
+    Arguments
+    ---------
+    df: pd.DataFrame
+        Set or parameter data
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy of the data with compact types
+    """
+
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = CODES.encode(df[col], col)
+        elif col in INTEGER_COLUMNS:
+            if _integer_safe(df[col]):
+                df[col] = df[col].astype(INTEGER_DTYPE)
+        elif col == "VALUE" and pd.api.types.is_float_dtype(df[col]):
+            if df[col].dtype != FLOAT_DTYPE and float32_safe(df[col]):
+                df[col] = df[col].astype(FLOAT_DTYPE)
+    return df
+
+
+def expand_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts a frame from the compact types back to the plain types
+
+    Set columns are decoded to strings, integers to int64 and float32 values
+    to the float64 values they print as, so the data is the same as if read
+    from a CSV.
+    """
+
+    df = df.copy()
+    for col in df.columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(dtype.categories.dtype)
+        elif dtype == INTEGER_DTYPE:
+            df[col] = df[col].astype("int64")
+        elif dtype == FLOAT_DTYPE:
+            df[col] = _expand_float(df[col])
+    return df
+
+
+def _expand_float(values: pd.Series) -> np.ndarray:
+    codes, uniques = pd.factorize(values)
+    uniques = np.append(np.asarray(uniques).astype(str).astype(float), np.nan)
+    return uniques[codes]
+
+
+def expand_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts float32 columns back to float64, see expand_dtypes
+
+    Small float32 values are written in scientific notation, ie. "1e-04"
+    rather than "0.0001", so values are expanded before writing CSVs.
+    """
+
+    columns = [x for x in df.columns if df[x].dtype == FLOAT_DTYPE]
+    if not columns:
+        return df
+    return df.assign(**{x: _expand_float(df[x]) for x in columns})
+
+
+def memory_usage(df: pd.DataFrame) -> float:
+    """Memory of a frame in MB, including the strings of object columns"""
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def memory_report(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Compares the memory of frames with plain and compact types
+
+    Arguments
+    ---------
+    frames: dict[str, pd.DataFrame]
+        Frames by name, with either plain or compact types
+
+    Returns
+    -------
+    pd.DataFrame
+        Rows, and memory in MB with plain and compact types, per frame
+    """
+
+    report = []
+    for name, df in frames.items():
+        plain = memory_usage(expand_dtypes(df))
+        compact = memory_usage(compact_dtypes(df))
+        report.append(
+            {
+                "name": name,
+                "rows": len(df),
+                "plain_mb": round(plain, 3),
+                "compact_mb": round(compact, 3),
+                "reduction": round(1 - compact / plain, 3) if plain else 0.0,
+            }
+        )
+    return pd.DataFrame(
+        report, columns=["name", "rows", "plain_mb", "compact_mb", "reduction"]
+    )
+
+
+def log_memory_report(frames: dict[str, pd.DataFrame]) -> None:
+    """Logs the memory report of frames, see memory_report"""
+
+    for row in memory_report(frames).itertuples():
+        logger.info(
+            f"{row.name}: {row.rows} rows, {row.plain_mb} MB plain, "
+            f"{row.compact_mb} MB compact ({row.reduction:.0%} less)"
+        )
+
+
+if __name__ == "__main__":
+    import sys
+
+    from osemosys_global.param_io import read_table, table_path
+
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
+
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "results/data"
+    data_format = sys.argv[2] if len(sys.argv) > 2 else "csv"
+    names = sys.argv[3:] or [
+        "CapacityFactor",
+        "InputActivityRatio",
+        "OutputActivityRatio",
+    ]
+
+    frames = {x: read_table(table_path(data_dir, x, data_format)) for x in names}
+    print(memory_report(frames).to_string(index=False))
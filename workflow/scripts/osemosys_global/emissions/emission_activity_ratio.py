@@ -4,6 +4,8 @@ import pandas as pd
 
 from data import get_co2_emission_factors
 
+from osemosys_global.set_codes import decode
+
 def get_ear(emission, emission_factors, ccs_efficiency,
             iar_base, oar_base, tech_to_fuel):
     """Creates emission activity ratio dataframe.
@@ -35,8 +37,9 @@ def get_ear(emission, emission_factors, ccs_efficiency,
 
     # ADD MAPPING OF TECHNOLOGY TO EMISSION ACTIVITY RATIO
 
-    df["TECH_CODE"] = df["TECHNOLOGY"].str[3:6]
-    df["COUNTRY"] = df["TECHNOLOGY"].str[6:9]
+    parts = decode(df["TECHNOLOGY"], fields=["TECH", "COUNTRY"])
+    df["TECH_CODE"] = parts["TECH"].astype(object)
+    df["COUNTRY"] = parts["COUNTRY"].astype(object)
     df["FUEL_NAME"] = df["TECH_CODE"].map(tech_to_fuel)
     df["VALUE"] = df["FUEL_NAME"].map(co2_factors)
     
@@ -1,129 +1,143 @@
 """Function to set AnnualEmissionLimit."""
 
+import numpy as np
 import pandas as pd
-import itertools
 
-from data import get_years
+from osemosys_global.utils import interpolate_years
 
-def add_emission_limits(emissions, emission_limit, ember, 
+LIMIT_COLUMNS = ['EMISSION', 'COUNTRY', 'TYPE', 'YEAR', 'VALUE']
+
+def _order_limits(emission_limit, emissions):
+
+    """Orders emission limits based on emission type, country and year entries.
+
+    Countries are ordered as first listed after sorting, and limits of
+    emissions that are not in the EMISSION set are dropped."""
+
+    limits = pd.DataFrame(emission_limit, columns = LIMIT_COLUMNS)
+    limits = limits.sort_values(by = ['EMISSION', 'COUNTRY', 'YEAR'],
+                                kind = 'stable').reset_index(drop = True)
+
+    countries = pd.unique(limits['COUNTRY'])
+    limits['COUNTRY_ORDER'] = pd.Categorical(limits['COUNTRY'],
+                                             categories = countries).codes
+    limits = limits.sort_values(by = ['EMISSION', 'COUNTRY_ORDER', 'YEAR'],
+                                kind = 'stable').reset_index(drop = True)
+
+    limits['CODE'] = limits['EMISSION'] + limits['COUNTRY']
+    limits = limits.loc[limits['CODE'].isin(emissions['VALUE'])]
+
+    return limits.reset_index(drop = True)
+
+def _ember_baselines(limits, ember, start_year):
+
+    """Gets the historic emissions to set a linear relationship from, for
+    emissions and countries without limits before their first LINEAR limit.
+
+    EMBER years within the horizon are used as they are. If none of the EMBER
+    years exist in the horizon, the latest EMBER year is used as the year
+    before the horizon to be able to set linear interpolation values."""
+
+    first_type = limits.groupby('CODE', sort = False)['TYPE'].first()
+    linear = first_type.index[first_type == 'LINEAR']
+
+    ember_data = ember.loc[ember['EMISSION'].isin(linear),
+                           ['EMISSION', 'YEAR', 'VALUE']]
+    latest_year = ember_data.groupby('EMISSION')['YEAR'].last()
+
+    baselines = ember_data.drop_duplicates(subset = ['EMISSION', 'YEAR'])
+    baselines = baselines.rename(columns = {'EMISSION': 'CODE'})
+    baselines['BEFORE_HORIZON'] = (
+        baselines['CODE'].map(latest_year) < start_year
+        ) & (baselines['CODE'].map(latest_year) == baselines['YEAR'])
+
+    return baselines.loc[(baselines['YEAR'] >= start_year)
+                         | baselines['BEFORE_HORIZON']]
+
+def _limit_values(limits):
+
+    """Expands the limits into the values they set per year.
+
+    A POINT limit holds the value of the previous limit from the previous
+    limit year up to its own year, while a LINEAR limit only sets its own
+    year, so the years in between are interpolated."""
+
+    limits = limits.assign(ORDER = limits.index * 2 + 1)
+
+    prev_year = limits.groupby('CODE', sort = False)['YEAR'].shift()
+    prev_value = limits.groupby('CODE', sort = False)['VALUE'].shift()
+
+    hold = limits.assign(START_YEAR = prev_year, VALUE = prev_value,
+                         ORDER = limits['ORDER'] - 1)
+    hold = hold.loc[(hold['TYPE'] == 'POINT') & prev_year.notna()]
+    hold = hold.loc[hold.index.repeat(
+        (hold['YEAR'] + 1 - hold['START_YEAR']).clip(lower = 0).astype(int))]
+    hold['YEAR'] = (hold.groupby(level = 0).cumcount()
+                    + hold['START_YEAR']).astype(int)
+
+    return pd.concat([hold, limits])[['CODE', 'YEAR', 'VALUE', 'ORDER']]
+
+def add_emission_limits(emissions, emission_limit, ember,
                         start_year, end_year, region_name):
-    
+
+    """Sets the AnnualEmissionLimit trajectories of the emission limits.
+
+    The limits of all emissions and countries are set on one (emission and
+    country, year) grid and interpolated at once. The first column of the
+    grid is the year before the horizon, for EMBER baselines of LINEAR
+    limits."""
+
     # Set empty AnnualEmissionLimit df.
     annual_emission_limit = pd.DataFrame(
         columns=["REGION", "EMISSION", "YEAR", "VALUE"]
-    ) 
-    
+    )
+
     # Check if emission limits exist.
-    if emission_limit:
-        emissions_list = list(emissions["VALUE"])
-        years = get_years(start_year, end_year)
-        
-        # Order emission limits based on emission type, country and year entries.
-        emission_limit_ordered = pd.DataFrame()
-        
-        for el_params in emission_limit:
-            param = pd.DataFrame([el_params], columns = ['EMISSION', 'COUNTRY', 'TYPE', 
-                                                         'YEAR', 'VALUE'])
-            if emission_limit_ordered.empty:
-                emission_limit_ordered = param
-                
-            else:
-                emission_limit_ordered = pd.concat([emission_limit_ordered, param])
-            
-        emission_limit_ordered = emission_limit_ordered.sort_values(
-            by = ['EMISSION', 'COUNTRY', 'YEAR']).reset_index(drop = True)
-
-        # Create dataframe template for adding limits.
-        template = pd.DataFrame(
-            list(itertools.product(emissions_list, years)), columns=["EMISSION", "YEAR"]
+    if not emission_limit:
+        return annual_emission_limit
+
+    limits = _order_limits(emission_limit, emissions)
+
+    if limits.empty:
+        return annual_emission_limit
+
+    codes = pd.Index(pd.unique(limits['CODE']))
+    years = np.arange(start_year, end_year + 1)
+
+    # Values are set in order: EMBER baselines, then the limits in year order.
+    baselines = _ember_baselines(limits, ember, start_year)
+    values = pd.concat([baselines.assign(ORDER = -1), _limit_values(limits)])
+    values['ROW'] = codes.get_indexer(values['CODE'])
+
+    # Map years to grid columns, with the year before the horizon in column 0.
+    year_before = pd.Series(np.nan, index = codes)
+    before = baselines.loc[baselines['BEFORE_HORIZON']]
+    year_before[before['CODE']] = before['YEAR'].to_numpy()
+
+    values['COLUMN'] = np.where(
+        values['YEAR'].between(start_year, end_year),
+        values['YEAR'] - start_year + 1,
+        np.where(values['YEAR'] == year_before.to_numpy()[values['ROW']], 0, -1)
         )
+    values = values.loc[values['COLUMN'] >= 0]
+    values = values.sort_values(by = 'ORDER', kind = 'stable').drop_duplicates(
+        subset = ['ROW', 'COLUMN'], keep = 'last')
+
+    grid = np.full((len(codes), len(years) + 1), np.nan)
+    grid[values['ROW'], values['COLUMN']] = values['VALUE'].to_numpy(dtype = float)
+
+    # Interpolate values for LINEAR targets, holding the last value. Years
+    # before the first value have no limit.
+    started = np.logical_or.accumulate(~np.isnan(grid), axis = 1)
+    grid = np.where(started, interpolate_years(grid), np.nan)[:, 1:]
+
+    row, column = np.nonzero(~np.isnan(grid))
+
+    annual_emission_limit = pd.DataFrame({
+        "REGION": region_name,
+        "EMISSION": codes[row],
+        "YEAR": years[column],
+        "VALUE": grid[row, column],
+    })
 
-        # Loop through emissions       
-        for emission in emission_limit_ordered['EMISSION'].unique():
-            # Loop through countries
-            for country in emission_limit_ordered['COUNTRY'].unique():
-                prev_data_year = None
-                prev_data_value = None
-
-                # Set input limits for given country and emission
-                limits = emission_limit_ordered.loc[(emission_limit_ordered[
-                    'COUNTRY'] == country) & (emission_limit_ordered[
-                        'EMISSION'] == emission)]
-                
-                # Filter template df for given country and emission
-                data = template.copy().loc[template["EMISSION"].isin(
-                    [emission + country])].reset_index(drop = True)
-                     
-                # Loop through limits per country
-                for idx, row in limits.iterrows():
-                    data_type = row.TYPE
-                    data_year = row.YEAR
-                    data_value = row.VALUE
-                    
-                    # Check if a limit for earlier years is set
-                    if not prev_data_year:
-                        # If not check if limit type is LINEAR. If TRUE, set historic
-                        # emission values to be able to set a linear relationship in absence
-                        # of previous year entries.
-                        if data_type == 'LINEAR':
-                            ember_data = ember.copy().loc[
-                                (ember["EMISSION"].isin([emission + country]))]
-
-                            # Check if year for country specific EMBER data exists in horizon.
-                            for year in ember_data["YEAR"].unique():
-                                if year in data["YEAR"].values:
-                                    # Set baseline year data for LINEAR
-                                    data.loc[(data["YEAR"] == year),"VALUE"] = ember_data.loc[
-                                        (ember_data["YEAR"] == year)]['VALUE'].iloc[0]
-                                    
-                            # If none of EMBER data years exist in horizon, pull latest EMBER year
-                            # to be able to set linear interpolation values.
-                            if ember_data["YEAR"].unique()[-1] < data["YEAR"].values[0]:
-                                data.loc[len(data)] = [data['EMISSION'].iloc[-1], 
-                                                       ember_data["YEAR"].unique()[-1]]
-                                
-                                data = data.sort_values(by = ['YEAR']).reset_index(drop = True)
-                                
-                                data.loc[(data["YEAR"] == ember_data["YEAR"].unique()[-1]),"VALUE"
-                                         ] = ember_data.loc[
-                                             (ember_data["YEAR"] == year)]['VALUE'].iloc[0]
-
-                        # Set baseline year data for POINT
-                        data.loc[(data["YEAR"] == data_year),"VALUE"] = data_value     
-                    
-                    else:
-                        # If previous targets exist check if limit type is LINEAR. 
-                        # If TRUE, only set target for target data year. If FALSE,
-                        # set VALUE for all years between previous target year + 1 and 
-                        # the current target year.
-                        if data_type == 'LINEAR':
-                            data.loc[(data["YEAR"] == data_year),"VALUE"] = data_value
-                        else:
-                            data.loc[data["YEAR"].between(prev_data_year, data_year)
-                                     ,"VALUE"] = prev_data_value
-                            
-                            data.loc[(data["YEAR"] == data_year),"VALUE"] = data_value
-                  
-                    prev_data_year = data_year
-                    prev_data_value = data_value
-                    
-                # Once done with a given country reset previous year limits.
-                prev_data_year = None
-                prev_data_value = None
-                
-                # Interpolate values for LINEAR targets.
-                data['VALUE'] = data['VALUE'].interpolate()
-      
-                # Format df
-                data.dropna(axis=0, inplace=True)
-                data["REGION"] = region_name
-                data = data.loc[data["YEAR"].between(start_year, end_year)]
-                data = data[["REGION", "EMISSION", "YEAR", "VALUE"]]
-                
-                if annual_emission_limit.empty:
-                    annual_emission_limit = data
-                    
-                else:
-                    annual_emission_limit = pd.concat([annual_emission_limit, data])
-
-    return annual_emission_limit
\ No newline at end of file
+    return annual_emission_limit
@@ -1,5 +1,7 @@
 import pandas as pd
-import os
+import sys
+from osemosys_global.param_io import table_path, write_table
+from osemosys_global.stage_cache import StageCache
 
 from read import(
     import_emission_factors,
@@ -51,28 +53,28 @@ def main(
                                                    region_name)
 
     # OUTPUT CSV's
-    df_emission_activity_ratio.to_csv(os.path.join(output_data_dir, "EmissionActivityRatio.csv"), 
-                           index = None)
+    write_table(df_emission_activity_ratio, table_path(output_data_dir, "EmissionActivityRatio", data_format))
     
-    df_emissions_set.to_csv(os.path.join(output_data_dir, "EMISSION.csv"), 
-                         index = None)
+    write_table(df_emissions_set, table_path(output_data_dir, "EMISSION", data_format))
     
-    df_emission_penalty.to_csv(os.path.join(output_data_dir, "EmissionsPenalty.csv"), 
-                         index = None)
+    write_table(df_emission_penalty, table_path(output_data_dir, "EmissionsPenalty", data_format))
     
-    df_annual_emission_limit.to_csv(os.path.join(output_data_dir, "AnnualEmissionLimit.csv"), 
-                         index = None)
+    write_table(df_annual_emission_limit, table_path(output_data_dir, "AnnualEmissionLimit", data_format))
 
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_ember = snakemake.input.ember
         file_emission_factors = snakemake.input.emissions_factors         
         start_year = snakemake.params.start_year
         end_year = snakemake.params.end_year
         region_name = snakemake.params.region_name
         output_data_dir = snakemake.params.output_data_dir
+        data_format = snakemake.params.data_format
         file_iar_base = snakemake.input.iar
         file_oar_base = snakemake.input.oar
         emission_penalty = snakemake.params.emission_penalty
@@ -88,8 +90,9 @@ if __name__ == "__main__":
         end_year = 2050
         region_name = 'GLOBAL'
         output_data_dir = 'results/data'
-        file_iar_base = f'{output_data_dir}/InputActivityRatio.csv'
-        file_oar_base = f'{output_data_dir}/OutputActivityRatio.csv'
+        data_format = 'csv'
+        file_iar_base = table_path(output_data_dir, "InputActivityRatio", data_format)
+        file_oar_base = table_path(output_data_dir, "OutputActivityRatio", data_format)
         emission_penalty = [["CO2", "IND", 2020, 2050, 2.1]]
         emission_limit = [["CO2", "IND", "POINT", 2048, 0],
                           ["CO2", "IND", "LINEAR", 2040, 1],
@@ -113,4 +116,7 @@ if __name__ == "__main__":
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
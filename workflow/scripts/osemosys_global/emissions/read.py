@@ -1,6 +1,7 @@
 """Module for reading in data sources"""
 
 import pandas as pd
+from osemosys_global.param_io import read_table
 
 from data import _format_ember_emission_data
 
@@ -16,14 +17,14 @@ def import_iar_base(f: str) -> pd.DataFrame:
     
     InputActivityRatio.csv
     """
-    return pd.read_csv(f)
+    return read_table(f)
 
 def import_oar_base(f: str) -> pd.DataFrame:
     """Imports OutputActivityRatio.csv.
     
     OutputActivityRatio.csv
     """
-    return pd.read_csv(f)
+    return read_table(f)
 
 def _read_ember_data(csv_file: str) -> pd.DataFrame:
     """Reads *.csv ember data from https://ember-climate.org/data-catalogue/yearly-electricity-data/
@@ -0,0 +1,72 @@
+"""Sets the emission penalties and limits of a scenario.
+
+When several scenarios are run, the emissions rule is run once for the shared
+base data. This script sets EmissionsPenalty and AnnualEmissionLimit from the
+scenario config, and the overlay tables replace the base tables in the
+geographic filter of the scenario.
+"""
+
+import pandas as pd
+from osemosys_global.param_io import read_table, table_path, write_table
+
+from read import get_ember_emissions
+
+from emission_penalty import get_emission_penalty
+
+from emission_limit import add_emission_limits
+
+def main(
+        ember: pd.DataFrame,
+        emissions_set: pd.DataFrame,
+):
+
+    # Set scenario emission penalties.
+    df_emission_penalty = get_emission_penalty(emissions_set, emission_penalty,
+                                               start_year, end_year, region_name)
+
+    # Set scenario emission limits.
+    df_annual_emission_limit = add_emission_limits(emissions_set, emission_limit,
+                                                   ember, start_year, end_year,
+                                                   region_name)
+
+    write_table(df_emission_penalty,
+                table_path(overlay_dir, "EmissionsPenalty", data_format))
+
+    write_table(df_annual_emission_limit,
+                table_path(overlay_dir, "AnnualEmissionLimit", data_format))
+
+
+if __name__ == "__main__":
+
+    if "snakemake" in globals():
+        file_ember = snakemake.input.ember
+        start_year = snakemake.params.start_year
+        end_year = snakemake.params.end_year
+        region_name = snakemake.params.region_name
+        input_data_dir = snakemake.params.input_data_dir
+        overlay_dir = snakemake.params.overlay_dir
+        data_format = snakemake.params.data_format
+        emission_penalty = snakemake.params.emission_penalty
+        emission_limit = snakemake.params.emission_limit
+
+    # The below else statement defines variables if the 'emissions/scenario_overlay'
+    # script is to be run locally outside the snakemake workflow. This is relevant
+    # for testing purposes only!
+    else:
+        file_ember = 'resources/data/default/ember_yearly_electricity_data.csv'
+        start_year = 2021
+        end_year = 2050
+        region_name = 'GLOBAL'
+        input_data_dir = 'results/data'
+        overlay_dir = 'results/India/overlay'
+        data_format = 'csv'
+        emission_penalty = [["CO2", "IND", 2020, 2050, 2.1]]
+        emission_limit = [["CO2", "IND", "POINT", 2048, 0],
+                          ["CO2", "IND", "LINEAR", 2040, 1]]
+
+    input_data = {
+    'ember' : get_ember_emissions(file_ember),
+    'emissions_set' : read_table(table_path(input_data_dir, "EMISSION", data_format)),
+    }
+
+    main(**input_data)
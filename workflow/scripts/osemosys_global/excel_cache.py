@@ -0,0 +1,217 @@
+"""Cache of sheets parsed from Excel workbooks
+
+Parsing the PLEXOS, IAMC and other workbooks with ``pd.read_excel`` takes
+seconds to tens of seconds per sheet, on every run. ``read_excel`` stores
+each parsed sheet under a key built from
+
+- the version of the stored format
+- the digest of the workbook
+- the sheet name
+- the other arguments passed to ``pd.read_excel``
+
+and later reads of the same sheet are loaded from the stored file instead.
+Sheets are stored as Parquet, which needs ``pyarrow``. Text columns holding
+other values as well, ie. numbers and "not found", are stored as JSON text.
+Sheets are only stored if they are read back as the same frame, with the
+same column labels and types, and are otherwise read from the workbook on
+every run. Changing a workbook changes its digest, so stale sheets are never
+read. Entries of old workbooks are not removed, the cache directory can be
+deleted at any time.
+"""
+
+import json
+import hashlib
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Optional
+
+import logging
+
+from osemosys_global.stage_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "results/cache/excel"
+
+# part of the cache key, increase when the stored format changes so entries
+# of earlier versions are not read
+FORMAT_VERSION = 2
+
+# digests of workbooks read by this process, by path, size and modified time
+_digests = {}
+
+
+def workbook_digest(path: str) -> str:
+    """Gets the digest of a workbook, computed once per process"""
+
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        _digests[key] = file_digest(path)
+    return _digests[key]
+
+
+def cache_key(path: str, sheet_name: str | int, **kwargs) -> Optional[str]:
+    """Gets the key of a sheet read with the arguments of ``pd.read_excel``
+
+    Returns None if the arguments can not be serialised, ie. for callables,
+    in which case the sheet is not cached.
+    """
+
+    try:
+        arguments = json.dumps(
+            {"sheet_name": sheet_name, **kwargs}, sort_keys=True, default=list
+        )
+    except TypeError:
+        return None
+
+    h = hashlib.sha256()
+    h.update(f"v{FORMAT_VERSION}".encode())
+    h.update(workbook_digest(path).encode())
+    h.update(arguments.encode())
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir: str, path: str, key: str) -> Path:
+    return Path(cache_dir, f"{Path(path).stem}-{key[:16]}.parquet")
+
+
+def _is_mixed(values: pd.Series) -> bool:
+    """Checks if an object column holds other values than text"""
+
+    if values.dtype != object:
+        return False
+    return pd.api.types.infer_dtype(values, skipna=True) not in ("string", "empty")
+
+
+def _to_parquet(df: pd.DataFrame, path: Path) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # column labels are stored as metadata, as Parquet only has string names
+    labels = [[type(x).__name__, x] for x in df.columns]
+    if any(x[0] not in ("str", "int", "float") for x in labels):
+        raise TypeError("Column labels must be strings or numbers")
+
+    df = df.set_axis([str(x) for x in range(df.shape[1])], axis=1)
+
+    # mixed columns are stored as JSON text, as Parquet columns have one type
+    mixed = [i for i, col in enumerate(df.columns) if _is_mixed(df[col])]
+    for i in mixed:
+        df[str(i)] = [json.dumps(x) for x in df[str(i)]]
+
+    table = pa.Table.from_pandas(
+        df, preserve_index=not isinstance(df.index, pd.RangeIndex)
+    )
+    metadata = dict(table.schema.metadata or {})
+    metadata[b"osemosys_global.columns"] = json.dumps(labels).encode()
+    metadata[b"osemosys_global.mixed"] = json.dumps(mixed).encode()
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path)
+    labels = json.loads(table.schema.metadata[b"osemosys_global.columns"])
+    mixed = json.loads(table.schema.metadata[b"osemosys_global.mixed"])
+    df = table.to_pandas()
+
+    for i in mixed:
+        df[str(i)] = pd.Series(
+            [json.loads(x) for x in df[str(i)]], index=df.index, dtype=object
+        )
+
+    # missing values of text columns are read back as None, rather than NaN
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+
+    df.columns = pd.Index([x for _, x in labels], dtype=object).infer_objects()
+    return df
+
+
+def _same_frame(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    return (
+        a.columns.equals(b.columns)
+        and a.columns.dtype == b.columns.dtype
+        and a.index.equals(b.index)
+        and a.dtypes.equals(b.dtypes)
+        and a.equals(b)
+    )
+
+
+def _write_entry(df: pd.DataFrame, parquet_file: Path) -> bool:
+    """Stores a sheet as Parquet, if it is read back as the same frame"""
+
+    parquet_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # written to a temporary file first, so a concurrent job never reads a
+    # partially written entry
+    with tempfile.TemporaryDirectory(dir=parquet_file.parent) as tmp_dir:
+        tmp_file = Path(tmp_dir, parquet_file.name)
+        try:
+            _to_parquet(df, tmp_file)
+            if _same_frame(df, _read_parquet(tmp_file)):
+                os.replace(tmp_file, parquet_file)
+                return True
+        except Exception as e:  # missing pyarrow or a column it can not convert
+            logger.debug(f"Can not store {parquet_file.stem} as Parquet: {e}")
+
+    return False
+
+
+def read_excel(
+    path: str,
+    sheet_name: str | int = 0,
+    cache_dir: Optional[str] = CACHE_DIR,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """Reads a sheet of a workbook through the cache
+
+    Arguments
+    ---------
+    path: str
+        Path to the workbook
+    sheet_name: str | int
+        Name or position of the sheet
+    cache_dir: Optional[str]
+        Directory of the cache. The sheet is read directly if None.
+    **kwargs
+        Passed to ``pd.read_excel``
+
+    Returns
+    -------
+    pd.DataFrame
+        The sheet, the same as returned by ``pd.read_excel``
+    """
+
+    if cache_dir is None or not isinstance(sheet_name, (str, int)):
+        return pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+
+    key = cache_key(path, sheet_name, **kwargs)
+    if key is None:
+        return pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+
+    parquet_file = _entry_path(cache_dir, path, key)
+    if parquet_file.exists():
+        return _read_parquet(parquet_file)
+
+    df = pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+    if _write_entry(df, parquet_file):
+        logger.info(f"Cached sheet {sheet_name} of {Path(path).name}")
+    else:
+        logger.info(f"Can not cache sheet {sheet_name} of {Path(path).name}")
+    return df
+
+
+if __name__ == "__main__":
+    # Parses the sheets of workbooks into the cache, ie. ahead of a run
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
+
+    for workbook in sys.argv[1:]:
+        for sheet in pd.ExcelFile(workbook).sheet_names:
+            read_excel(workbook, sheet_name=sheet)
@@ -1,21 +1,174 @@
 # Filter osemosys_global datapackaged based on user-defined geographic scope
 
+import os
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 from pathlib import Path
 import logging
 
+from osemosys_global.dtypes import expand_floats
+from osemosys_global.param_io import (
+    FORMATS,
+    is_year_invariant,
+    read_table,
+    table_path,
+    write_chunks,
+    year_chunks,
+)
+
 logger = logging.getLogger(__name__)
 
 INT_FUELS = ["COA", "COG", "GAS", "OIL", "PET", "OTH", "URN"]
 
 
+def _keep_technologies(
+    codes: pd.Series, geo_scope: list[str], remove_nodes: list[str], **kwargs
+) -> pd.Series:
+    keep = (
+        codes.str[3:6].isin(geo_scope)
+        | codes.str[6:9].isin(geo_scope)
+        | codes.str[8:11].isin(geo_scope)
+    )
+
+    # Filter out all international TRN techs
+    keep &= ~(
+        codes.str.startswith("TRN")
+        & (~(codes.str[3:6].isin(geo_scope)) | ~(codes.str[8:11].isin(geo_scope)))
+    )
+
+    if remove_nodes:
+        keep &= ~(
+            codes.str[3:8].isin(remove_nodes)
+            | codes.str[6:11].isin(remove_nodes)
+            | codes.str[8:13].isin(remove_nodes)
+        )
+    return keep
+
+
+def _keep_storages(
+    codes: pd.Series, geo_scope: list[str], remove_nodes: list[str], **kwargs
+) -> pd.Series:
+    keep = (
+        codes.str[3:6].isin(geo_scope)
+        | codes.str[6:9].isin(geo_scope)
+        | codes.str[8:11].isin(geo_scope)
+    )
+
+    if remove_nodes:
+        keep &= ~(
+            codes.str[3:8].isin(remove_nodes)
+            | codes.str[6:11].isin(remove_nodes)
+            | codes.str[8:13].isin(remove_nodes)
+        )
+    return keep
+
+
+def _keep_storage_set(
+    codes: pd.Series, geo_scope: list[str], remove_nodes: list[str], **kwargs
+) -> pd.Series:
+    keep = codes.str[3:6].isin(geo_scope)
+
+    if remove_nodes:
+        keep &= ~codes.str[3:8].isin(remove_nodes)
+    return keep
+
+
+def _keep_fuels(
+    codes: pd.Series,
+    geo_scope: list[str],
+    remove_nodes: list[str],
+    res_targets: list[str],
+) -> pd.Series:
+    keep = (
+        codes.str[3:6].isin(geo_scope)
+        | codes.str[6:9].isin(geo_scope)
+        | codes.isin(res_targets)
+        | codes.isin(INT_FUELS)
+    )
+
+    if remove_nodes:
+        keep &= ~(
+            codes.str[3:8].isin(remove_nodes) | codes.str[6:11].isin(remove_nodes)
+        )
+    return keep
+
+
+DECODERS = {
+    "TECHNOLOGY": _keep_technologies,
+    "STORAGE": _keep_storages,
+    "STORAGE_SET": _keep_storage_set,
+    "FUEL": _keep_fuels,
+}
+
+
+class CodeIndex:
+    """Lookup of the set codes kept by the geographic filter
+
+    Each unique code is decoded once, and whether it is kept is cached. The
+    parameter files then only need to be factorized into integer codes to
+    get the row mask, rather than slicing every string of every row.
+
+    Arguments
+    ---------
+    geo_scope: list[str]
+        Country codes to keep, including "INT"
+    remove_nodes: list[str]
+        Node codes to remove
+    res_targets: Optional[dict[str, list]]
+        Renewable targets; the target fuels are kept
+    """
+
+    def __init__(
+        self,
+        geo_scope: list[str],
+        remove_nodes: Optional[list[str]] = None,
+        res_targets: Optional[dict[str, list]] = None,
+    ):
+        self.geo_scope = list(geo_scope)
+        self.remove_nodes = list(remove_nodes) if remove_nodes else []
+        self.res_targets = list(res_targets) if res_targets else []
+        self._lookup = {kind: {} for kind in DECODERS}
+
+    def mask(self, values: pd.Series, kind: str) -> np.ndarray:
+        """Gets the boolean mask of the values to keep
+
+        Arguments
+        ---------
+        values: pd.Series
+            TECHNOLOGY, STORAGE or FUEL codes
+        kind: str
+            One of "TECHNOLOGY", "STORAGE", "STORAGE_SET" or "FUEL"
+        """
+
+        codes, uniques = pd.factorize(values)
+        lookup = self._lookup[kind]
+
+        missing = [x for x in uniques if x not in lookup]
+        if missing:
+            keep = DECODERS[kind](
+                pd.Series(missing, dtype=str),
+                geo_scope=self.geo_scope,
+                remove_nodes=self.remove_nodes,
+                res_targets=self.res_targets,
+            )
+            lookup.update(zip(missing, keep.to_list()))
+
+        keep = np.fromiter(
+            (lookup[x] for x in uniques), dtype=bool, count=len(uniques)
+        )
+        # missing values are factorized to -1, which maps to the appended False
+        return np.append(keep, False)[codes]
+
+
 def filer(
     df: pd.DataFrame,
     name: str,
     geo_scope: list[str],
     remove_nodes: list[str],
     res_targets: Optional[dict[str, list]] = None,
+    index: Optional[CodeIndex] = None,
 ) -> pd.DataFrame:
 
     if df.empty:
@@ -25,129 +178,92 @@ def filer(
     if len(geo_scope) == 1 and geo_scope[0] == "INT":
         return df
 
-    if "TECHNOLOGY" in df.columns:
-        df = df.loc[
-            df["TECHNOLOGY"].str[3:6].isin(geographic_scope)
-            | df["TECHNOLOGY"].str[6:9].isin(geographic_scope)
-            | df["TECHNOLOGY"].str[8:11].isin(geographic_scope)
-        ]
-
-        # Filter out all international TRN techs
-        df = df.loc[
-            ~(
-                df["TECHNOLOGY"].str.startswith("TRN")
-                & (
-                    ~(df["TECHNOLOGY"].str[3:6].isin(geographic_scope))
-                    | ~(df["TECHNOLOGY"].str[8:11].isin(geographic_scope))
-                )
-            )
-        ]
-
-        if remove_nodes:
-            df = df.loc[
-                ~(
-                    df["TECHNOLOGY"].str[3:8].isin(remove_nodes)
-                    | df["TECHNOLOGY"].str[6:11].isin(remove_nodes)
-                    | df["TECHNOLOGY"].str[8:13].isin(remove_nodes)
-                )
-            ]
-
-    if "STORAGE" in df.columns:
-        df = df.loc[
-            df["STORAGE"].str[3:6].isin(geographic_scope)
-            | df["STORAGE"].str[6:9].isin(geographic_scope)
-            | df["STORAGE"].str[8:11].isin(geographic_scope)
-        ]
-
-        if remove_nodes:
-            df = df.loc[
-                ~(
-                    df["STORAGE"].str[3:8].isin(remove_nodes)
-                    | df["STORAGE"].str[6:11].isin(remove_nodes)
-                    | df["STORAGE"].str[8:13].isin(remove_nodes)
-                )
-            ]
-
-    if "FUEL" in df.columns:
-        if res_targets is None:
-            df = df.loc[
-                df["FUEL"].str[3:6].isin(geographic_scope)
-                | df["FUEL"].str[6:9].isin(geographic_scope)
-                | df["FUEL"].isin(INT_FUELS)
-            ]
-
-        else:
-            df = df.loc[
-                df["FUEL"].str[3:6].isin(geographic_scope)
-                | df["FUEL"].str[6:9].isin(geographic_scope)
-                | df["FUEL"].isin(res_targets)
-                | df["FUEL"].isin(INT_FUELS)
-            ]
-
-        if remove_nodes:
-            df = df.loc[
-                ~(
-                    df["FUEL"].str[3:8].isin(remove_nodes)
-                    | df["FUEL"].str[6:11].isin(remove_nodes)
-                )
-            ]
+    if index is None:
+        index = CodeIndex(geo_scope, remove_nodes, res_targets)
+
+    keep = np.ones(len(df), dtype=bool)
+
+    for column in ("TECHNOLOGY", "STORAGE", "FUEL"):
+        if column in df.columns:
+            keep &= index.mask(df[column], column)
 
     if name == "FUEL":
-        if res_targets is None:
-            df = df.loc[
-                df["VALUE"].str[3:6].isin(geographic_scope)
-                | df["VALUE"].str[6:9].isin(geographic_scope)
-                | df["VALUE"].isin(INT_FUELS)
-            ]
-
-        else:
-            df = df.loc[
-                df["VALUE"].str[3:6].isin(geographic_scope)
-                | df["VALUE"].str[6:9].isin(geographic_scope)
-                | df["VALUE"].isin(res_targets)
-                | df["VALUE"].isin(INT_FUELS)
-            ]
-
-        if remove_nodes:
-            df = df.loc[
-                ~(
-                    df["VALUE"].str[3:8].isin(remove_nodes)
-                    | df["VALUE"].str[6:11].isin(remove_nodes)
-                )
-            ]
-
-    if name == "TECHNOLOGY":
-        df = df.loc[
-            df["VALUE"].str[3:6].isin(geographic_scope)
-            | df["VALUE"].str[6:9].isin(geographic_scope)
-            | df["VALUE"].str[8:11].isin(geographic_scope)
-        ]
-        df = df.loc[
-            ~(
-                df["VALUE"].str.startswith("TRN")
-                & (
-                    ~(df["VALUE"].str[3:6].isin(geographic_scope))
-                    | ~(df["VALUE"].str[8:11].isin(geographic_scope))
-                )
-            )
-        ]
+        keep &= index.mask(df["VALUE"], "FUEL")
+    elif name == "TECHNOLOGY":
+        keep &= index.mask(df["VALUE"], "TECHNOLOGY")
+    elif name == "STORAGE":
+        keep &= index.mask(df["VALUE"], "STORAGE_SET")
+
+    return df.loc[keep]
+
+
+# code index and model years of each worker process
+_index = None
+_years = None
+
+
+def _init_worker(
+    geo_scope: list[str],
+    remove_nodes: list[str],
+    res_targets: Optional[dict[str, list]],
+    years: Optional[list[int]] = None,
+) -> None:
+    global _index, _years
+    _index = CodeIndex(geo_scope, remove_nodes, res_targets)
+    _years = years
+
 
-        if remove_nodes:
-            df = df.loc[
-                ~(
-                    df["VALUE"].str[3:8].isin(remove_nodes)
-                    | df["VALUE"].str[6:11].isin(remove_nodes)
-                    | df["VALUE"].str[8:13].isin(remove_nodes)
-                )
-            ]
+def _filter_file(in_file: str, out_dir: str) -> None:
+    df = read_table(in_file, compact=True)
+    stem = Path(in_file).stem
+    df = filer(
+        df,
+        stem,
+        _index.geo_scope,
+        _index.remove_nodes,
+        _index.res_targets,
+        index=_index,
+    )
+    out_file = Path(out_dir, f"{stem}.csv")
+
+    # year invariant parameters are filtered before they are expanded
+    if _years is not None and is_year_invariant(stem, df):
+        write_chunks(year_chunks(df, _years), str(out_file))
+    else:
+        expand_floats(df).to_csv(out_file, index=False)
 
-    if name == "STORAGE":
-        df = df.loc[df["VALUE"].str[3:6].isin(geographic_scope)]
 
-        if remove_nodes:
-            df = df.loc[~df["VALUE"].str[3:8].isin(remove_nodes)]
+def filter_files(
+    in_files: list[str],
+    out_dir: str,
+    geo_scope: list[str],
+    remove_nodes: list[str],
+    res_targets: Optional[dict[str, list]] = None,
+    workers: int = 1,
+    years: Optional[list[int]] = None,
+) -> None:
+    """Applies the geographic filter to parameter files in a worker pool
 
-    return df
+    Filtered data is always written out as csv, as it is read in by otoole.
+    Year invariant parameters are expanded over the model years as they are
+    written, see ``param_io.YEAR_INVARIANT``.
+    """
+
+    init_args = (geo_scope, remove_nodes, res_targets, years)
+
+    if workers <= 1:
+        _init_worker(*init_args)
+        for in_file in in_files:
+            _filter_file(in_file, out_dir)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=init_args
+    ) as pool:
+        # largest files first to balance the workers
+        in_files = sorted(in_files, key=lambda x: Path(x).stat().st_size, reverse=True)
+        for _ in pool.map(_filter_file, in_files, [out_dir] * len(in_files)):
+            pass
 
 
 if __name__ == "__main__":
@@ -157,22 +273,47 @@ if __name__ == "__main__":
         res_targets = snakemake.params.res_targets
         nodes_to_remove = snakemake.params.nodes_to_remove
         in_dir = snakemake.params.in_dir
+        data_format = snakemake.params.data_format
         out_dir = snakemake.params.out_dir
+        overlay_dir = snakemake.params.overlay_dir
+        workers = snakemake.threads
     else:
         geographic_scope = ["IND"]
         res_targets = {"T01": ["", [], "PCT", 2048, 2050, 95]}
         nodes_to_remove = []
         in_dir = "results/data"
+        data_format = "csv"
         out_dir = "results/data/Wrong/data"
+        overlay_dir = None
+        workers = os.cpu_count()
 
     geographic_scope.append("INT")  # for international fuels added by default
 
     if not Path(out_dir).exists():
         Path(out_dir).mkdir(parents=True)
 
-    for each_csv in Path(in_dir).glob("*.csv"):
-        df = pd.read_csv(Path(each_csv))
-        df = filer(df, each_csv.stem, geographic_scope, nodes_to_remove, res_targets)
-        df.to_csv(Path(out_dir, each_csv.name), index=False)
+    in_files = [str(x) for x in Path(in_dir).glob(f"*{FORMATS[data_format]}")]
+
+    # scenario overlay tables replace the shared base tables
+    if overlay_dir:
+        overlays = {
+            x.stem: str(x) for x in Path(overlay_dir).glob(f"*{FORMATS[data_format]}")
+        }
+        in_files = [overlays.get(Path(x).stem, x) for x in in_files]
+
+    year_file = table_path(in_dir, "YEAR", data_format)
+    if overlay_dir:
+        year_file = overlays.get("YEAR", year_file)
+    years = read_table(year_file)["VALUE"].tolist()
+
+    filter_files(
+        in_files,
+        out_dir,
+        geographic_scope,
+        nodes_to_remove,
+        res_targets,
+        workers,
+        years,
+    )
 
     logging.info("Geographic Filter Applied")
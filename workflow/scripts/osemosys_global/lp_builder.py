@@ -0,0 +1,1540 @@
+"""Writes the LP file of a scenario directly from the parameter CSVs
+
+This replaces generating the LP file with ``glpsol --wlp`` from
+``resources/osemosys_fast_preprocessed.txt``. Each constraint family of the
+model file is assembled as sparse coordinate tables with numpy, summed into a
+sparse matrix and written out in the CPLEX LP format. Families are built in
+chunks of years, so memory is bounded by the largest chunk rather than by the
+whole model as in glpsol.
+
+Rows and columns are named and oriented as glpsol writes them, ie.
+``CAa4_Constraint_Capacity(GLOBAL,S1D1,PWRCOAINDWE01,2021)``, and columns
+without a non-zero coefficient are left out. Trade between regions is not
+supported, as ``TradeRoute`` has no second region in the otoole configuration.
+"""
+
+import numpy as np
+from functools import cached_property
+from scipy import sparse
+from typing import Any, Callable, Iterable, NamedTuple, Optional, TextIO, Union
+
+import logging
+
+from osemosys_global.write_data_file import read_data, read_otoole_config
+
+logger = logging.getLogger(__name__)
+
+Table = dict[str, np.ndarray]
+
+# set names, in the order of the model file indices
+R = "REGION"
+T = "TECHNOLOGY"
+L = "TIMESLICE"
+F = "FUEL"
+E = "EMISSION"
+M = "MODE_OF_OPERATION"
+Y = "YEAR"
+LS = "SEASON"
+LD = "DAYTYPE"
+LH = "DAILYTIMEBRACKET"
+S = "STORAGE"
+
+SETS = [R, T, L, F, E, M, Y, LS, LD, LH, S]
+
+# variables of the model file that are referenced in the objective or constraints
+VARIABLES = {
+    "NewStorageCapacity": (R, S, Y),
+    "SalvageValueStorage": (R, S, Y),
+    "StorageLevelYearStart": (R, S, Y),
+    "StorageLevelSeasonStart": (R, S, LS, Y),
+    "StorageLevelDayTypeStart": (R, S, LS, LD, Y),
+    "StorageLevelDayTypeFinish": (R, S, LS, LD, Y),
+    "NetChargeWithinYear": (R, S, LS, LD, LH, Y),
+    "NetChargeWithinDay": (R, S, LS, LD, LH, Y),
+    "StorageLowerLimit": (R, S, Y),
+    "StorageUpperLimit": (R, S, Y),
+    "AccumulatedNewStorageCapacity": (R, S, Y),
+    "CapitalInvestmentStorage": (R, S, Y),
+    "DiscountedCapitalInvestmentStorage": (R, S, Y),
+    "DiscountedSalvageValueStorage": (R, S, Y),
+    "TotalDiscountedStorageCost": (R, S, Y),
+    "NumberOfNewTechnologyUnits": (R, T, Y),
+    "NewCapacity": (R, T, Y),
+    "TotalCapacityAnnual": (R, T, Y),
+    "RateOfActivity": (R, L, T, M, Y),
+    "CapitalInvestment": (R, T, Y),
+    "SalvageValue": (R, T, Y),
+    "DiscountedSalvageValue": (R, T, Y),
+    "OperatingCost": (R, T, Y),
+    "DiscountedTechnologyEmissionsPenalty": (R, T, Y),
+    "AnnualTechnologyEmissionsPenalty": (R, T, Y),
+}
+
+FREE_VARIABLES = [
+    "NetChargeWithinYear",
+    "NetChargeWithinDay",
+    "DiscountedTechnologyEmissionsPenalty",
+    "AnnualTechnologyEmissionsPenalty",
+]
+
+INTEGER_VARIABLES = ["NumberOfNewTechnologyUnits"]
+
+# rows of a family written out in one go
+WRITE_CHUNK = 100_000
+
+# terms per line of a row
+LINE_TERMS = 8
+
+
+def _size(table: Table) -> int:
+    return len(next(iter(table.values())))
+
+
+def _take(table: Table, index: np.ndarray) -> Table:
+    return {k: v[index] for k, v in table.items()}
+
+
+def _cross(table: Table, other: Table) -> Table:
+    """Cartesian product of two tables"""
+
+    n, m = _size(table), _size(other)
+    out = {k: np.repeat(v, m) for k, v in table.items()}
+    out.update({k: np.tile(v, n) for k, v in other.items()})
+    return out
+
+
+def _concat(*tables: Table) -> Table:
+    return {k: np.concatenate([x[k] for x in tables]) for k in tables[0]}
+
+
+def _remap(table: Table, dim: str, src: np.ndarray, dst: np.ndarray) -> Table:
+    """Moves the entries at each src position of a dimension to the dst positions
+
+    An entry is repeated for every pair with its src position, and dropped if
+    there is none.
+    """
+
+    order = np.argsort(src, kind="stable")
+    src, dst = src[order], dst[order]
+
+    start = np.searchsorted(src, table[dim], "left")
+    counts = np.searchsorted(src, table[dim], "right") - start
+
+    index = np.repeat(np.arange(len(counts)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    out = _take(table, index)
+    out[dim] = dst[np.repeat(start, counts) + offset]
+    return out
+
+
+class Space:
+    """Dense index space of a family of rows
+
+    Arguments
+    ---------
+    model: Model
+        Sets of the scenario
+    dims: Iterable[str]
+        Set of each index, in the order of the model file
+    subsets: Optional[dict[str, np.ndarray]]
+        Positions of the set members to include per index, ie. a chunk of
+        years. All members are included by default.
+    """
+
+    def __init__(
+        self,
+        model: "Model",
+        dims: Iterable[str],
+        subsets: Optional[dict[str, np.ndarray]] = None,
+    ):
+        subsets = subsets or {}
+        self.dims = tuple(dims)
+        self.positions = [
+            np.asarray(subsets[x]) if x in subsets else np.arange(len(model.sets[x]))
+            for x in self.dims
+        ]
+        self.shape = tuple(len(x) for x in self.positions)
+        self.size = int(np.prod(self.shape))
+
+        self._local = []
+        for dim, positions in zip(self.dims, self.positions):
+            local = np.full(len(model.sets[dim]), -1)
+            local[positions] = np.arange(len(positions))
+            self._local.append(local)
+
+    @cached_property
+    def grid(self) -> Table:
+        """Set positions of each index of every row"""
+
+        index = np.unravel_index(np.arange(self.size), self.shape)
+        return {d: p[i] for d, p, i in zip(self.dims, self.positions, index)}
+
+    def subsets(self, dims: Iterable[str]) -> dict[str, np.ndarray]:
+        return {d: p for d, p in zip(self.dims, self.positions) if d in dims}
+
+    def contains(self, table: Table) -> np.ndarray:
+        """Mask of the table entries within the space"""
+
+        keep = np.ones(_size(table), dtype=bool)
+        for dim, local in zip(self.dims, self._local):
+            if dim in table:
+                keep &= local[table[dim]] >= 0
+        return keep
+
+    def ravel(self, table: Table) -> np.ndarray:
+        """Rows of table entries, which must be within the space"""
+
+        index = tuple(local[table[d]] for d, local in zip(self.dims, self._local))
+        return np.ravel_multi_index(index, self.shape)
+
+
+class Expression:
+    """Linear expressions over the rows of a space
+
+    Terms are kept as arrays of rows, column keys and coefficients. Duplicate
+    terms are summed when the rows are written.
+    """
+
+    # arrays defer to the operators of expressions
+    __array_ufunc__ = None
+
+    def __init__(
+        self,
+        space: Space,
+        terms: Optional[list[tuple[np.ndarray, np.ndarray, np.ndarray]]] = None,
+        constant: Union[float, np.ndarray] = 0.0,
+    ):
+        self.space = space
+        self.terms = terms or []
+        self.constant = constant
+
+    def _wrap(self, other: Any) -> "Expression":
+        if isinstance(other, Expression):
+            return other
+        return Expression(self.space, constant=other)
+
+    def __add__(self, other: Any) -> "Expression":
+        other = self._wrap(other)
+        return Expression(
+            self.space, self.terms + other.terms, self.constant + other.constant
+        )
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "Expression":
+        return self * -1.0
+
+    def __sub__(self, other: Any) -> "Expression":
+        return self + (-self._wrap(other))
+
+    def __rsub__(self, other: Any) -> "Expression":
+        return self._wrap(other) + (-self)
+
+    def __mul__(self, factor: Union[float, np.ndarray]) -> "Expression":
+        factor = np.asarray(factor, dtype=float)
+        if factor.ndim:
+            terms = [(r, c, v * factor[r]) for r, c, v in self.terms]
+        else:
+            terms = [(r, c, v * factor) for r, c, v in self.terms]
+        return Expression(self.space, terms, self.constant * factor)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor: Union[float, np.ndarray]) -> "Expression":
+        return self * (1 / np.asarray(divisor, dtype=float))
+
+    def where(self, mask: np.ndarray) -> "Expression":
+        """Expressions of the masked rows, others are zero"""
+
+        terms = [(r, c, v) for r, c, v in self.terms]
+        terms = [(r[mask[r]], c[mask[r]], v[mask[r]]) for r, c, v in terms]
+        return Expression(self.space, terms, np.where(mask, self.constant, 0.0))
+
+
+class Row(NamedTuple):
+    """Constraint rows ``lhs sense rhs``, limited to the ``where`` mask"""
+
+    lhs: Union[Expression, float, np.ndarray]
+    sense: str
+    rhs: Union[Expression, float, np.ndarray]
+    where: Optional[np.ndarray] = None
+
+
+class Model:
+    """Sets and parameters of a scenario, with builders of model expressions
+
+    Arguments
+    ---------
+    data: dict[str, pd.DataFrame]
+        Sets and parameters, as read by ``write_data_file.read_data``
+    config: dict[str, dict[str, Any]]
+        Set and parameter definitions of the otoole config
+    """
+
+    def __init__(self, data: dict[str, Any], config: dict[str, dict[str, Any]]):
+
+        if not data["TradeRoute"].empty:
+            raise ValueError("TradeRoute is not supported by the native LP writer")
+
+        self.data = data
+        self.config = config
+
+        self.sets = {x: data[x]["VALUE"].to_numpy() for x in SETS}
+        self.labels = {x: self.sets[x].astype(str).astype(object) for x in SETS}
+
+        self.offsets = {}
+        offset = 0
+        for name, dims in VARIABLES.items():
+            self.offsets[name] = offset
+            offset += int(np.prod(self.shape(dims)))
+        self._starts = np.array(list(self.offsets.values()))
+
+        self._dense = {}
+        self._entries = {}
+        self._derive_parameters()
+
+        oar = self.entries("OutputActivityRatio")
+        iar = self.entries("InputActivityRatio")
+        ear = self.entries("EmissionActivityRatio")
+        self.modes = np.zeros(self.shape((T, M)), dtype=bool)
+        for table in (oar, iar, ear):
+            self.modes[table[T], table[M]] = True
+
+    def shape(self, dims: Iterable[str]) -> tuple[int, ...]:
+        return tuple(len(self.sets[x]) for x in dims)
+
+    def values(self, dim: str, space: Space) -> np.ndarray:
+        """Set members of an index of every row"""
+
+        return self.sets[dim][space.grid[dim]].astype(float)
+
+    def _index(self, dim: str, members: np.ndarray) -> np.ndarray:
+        """Positions of set members, -1 if not in the set"""
+
+        lookup = {x: i for i, x in enumerate(self.sets[dim])}
+        return np.fromiter(
+            (lookup.get(x, -1) for x in members), dtype=int, count=len(members)
+        )
+
+    def dense(self, name: str) -> tuple[tuple[str, ...], np.ndarray]:
+        """Parameter values over all its indices, with the default filled in"""
+
+        if name not in self._dense:
+            details = self.config[name]
+            dims = tuple(details["indices"])
+            values = np.full(self.shape(dims), float(details["default"]))
+
+            df = self.data[name]
+            index = [self._index(x, df[x].to_numpy()) for x in dims]
+            keep = np.all([x >= 0 for x in index], axis=0)
+            values[tuple(x[keep] for x in index)] = df["VALUE"].to_numpy()[keep]
+
+            self._dense[name] = (dims, values)
+        return self._dense[name]
+
+    def entries(self, name: str, positive: bool = False) -> Table:
+        """Non-zero (or positive) parameter values"""
+
+        if (name, positive) not in self._entries:
+            dims = self.config[name]["indices"]
+            df = self.data[name]
+            index = [self._index(x, df[x].to_numpy()) for x in dims]
+            values = df["VALUE"].to_numpy(dtype=float)
+
+            keep = np.all([x >= 0 for x in index], axis=0)
+            keep &= (values > 0) if positive else (values != 0)
+
+            table = {d: x[keep] for d, x in zip(dims, index)}
+            table["VALUE"] = values[keep]
+            self._entries[(name, positive)] = table
+        return {k: v.copy() for k, v in self._entries[(name, positive)].items()}
+
+    def _derive_parameters(self) -> None:
+        """Parameters the model file calculates from other parameters"""
+
+        years = self.sets[Y].astype(float)
+        _, rate = self.dense("DiscountRate")
+        _, life = self.dense("OperationalLife")
+        _, rate_storage = self.dense("DiscountRateStorage")
+        _, cf = self.dense("CapacityFactor")
+        _, year_split = self.dense("YearSplit")
+
+        age = years - years.min()
+        rate_idv = rate[:, None]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._dense["DiscountFactor"] = (
+                (R, Y), (1 + rate[:, None]) ** age[None, :]
+            )
+            self._dense["DiscountFactorMid"] = (
+                (R, Y), (1 + rate[:, None]) ** (age[None, :] + 0.5)
+            )
+            self._dense["CapitalRecoveryFactor"] = (
+                (R, T),
+                (1 - (1 + rate_idv) ** -1) / (1 - (1 + rate_idv) ** -life),
+            )
+            self._dense["PvAnnuity"] = (
+                (R, T),
+                (1 - (1 + rate[:, None]) ** -life)
+                * (1 + rate[:, None])
+                / rate[:, None],
+            )
+            self._dense["DiscountFactorStorage"] = (
+                (R, S, Y), (1 + rate_storage[:, :, None]) ** age[None, None, :]
+            )
+
+        # annual capacity factor of the planned maintenance constraint
+        self._dense["AnnualCapacityFactor"] = (
+            (R, T, Y), np.einsum("rtly,ly->rty", cf, year_split)
+        )
+
+    def check(self) -> None:
+        """Checks of the model file, as run by ``glpsol --check``"""
+
+        _, year_split = self.dense("YearSplit")
+        total = year_split.sum(axis=0)
+        if ((total < 0.98) | (total > 1.02)).any():
+            raise ValueError("YearSplit does not sum to one in every year")
+
+        _, period = self.dense("TotalTechnologyModelPeriodActivityLowerLimit")
+        _, annual = self.dense("TotalTechnologyAnnualActivityLowerLimit")
+        if ((period != 0) & (period < annual.sum(axis=2))).any():
+            raise ValueError(
+                "TotalTechnologyModelPeriodActivityLowerLimit is below the sum "
+                "of TotalTechnologyAnnualActivityLowerLimit"
+            )
+
+    def lookup(self, name: str, table: Table) -> np.ndarray:
+        """Parameter values at the table entries"""
+
+        dims, values = self.dense(name)
+        return values[tuple(table[x] for x in dims)]
+
+    def param(self, name: str, space: Space) -> np.ndarray:
+        """Parameter values at every row"""
+
+        return self.lookup(name, space.grid)
+
+    def spaces(self, dims: Iterable[str], chunk_size: int) -> Iterable[Space]:
+        """Spaces of a family of rows, in chunks of years"""
+
+        dims = tuple(dims)
+        if Y not in dims:
+            yield Space(self, dims)
+            return
+
+        per_year = int(np.prod(self.shape(x for x in dims if x != Y)))
+        step = max(1, chunk_size // max(per_year, 1))
+        years = np.arange(len(self.sets[Y]))
+        for start in range(0, len(years), step):
+            yield Space(self, dims, {Y: years[start : start + step]})
+
+    def shift(self, space: Space, dim: str, step: int) -> np.ndarray:
+        """Positions of the member ``step`` after the member of every row"""
+
+        return self._index(dim, self.sets[dim][space.grid[dim]] + step)
+
+    def is_first(self, space: Space, dim: str) -> np.ndarray:
+        """Mask of rows at the first member of a set"""
+
+        return self.values(dim, space) == self.sets[dim].min()
+
+    def shift_table(self, table: Table, dim: str, step: int) -> Table:
+        """Moves table entries to the member ``step`` after their member"""
+
+        src = np.arange(len(self.sets[dim]))
+        dst = self._index(dim, self.sets[dim] + step)
+        return _remap(table, dim, src[dst >= 0], dst[dst >= 0])
+
+    def pairs(self, dim: str, op: Callable) -> tuple[np.ndarray, np.ndarray]:
+        """Positions of all (src, dst) members with ``op(src, dst)``"""
+
+        values = self.sets[dim]
+        return np.nonzero(op(values[:, None], values[None, :]))
+
+    def _broadcast(self, table: Table, space: Space) -> Table:
+        for dim, positions in zip(space.dims, space.positions):
+            if dim not in table:
+                table = _cross(table, {dim: positions})
+        return table
+
+    def columns(
+        self, var: str, table: Table, rename: Optional[dict[str, str]] = None
+    ) -> np.ndarray:
+        """Column keys of a variable at the table entries"""
+
+        rename = rename or {}
+        dims = VARIABLES[var]
+        index = tuple(table[rename.get(x, x)] for x in dims)
+        return self.offsets[var] + np.ravel_multi_index(index, self.shape(dims))
+
+    def terms(
+        self,
+        space: Space,
+        var: str,
+        table: Table,
+        rename: Optional[dict[str, str]] = None,
+    ) -> Expression:
+        """Terms of a variable at the table entries, summed onto the rows"""
+
+        table = self._broadcast(table, space)
+        keep = space.contains(table)
+        if not keep.all():
+            table = _take(table, keep)
+
+        rows = space.ravel(table)
+        cols = self.columns(var, table, rename)
+        if "VALUE" in table:
+            coefs = table["VALUE"].astype(float)
+        else:
+            coefs = np.ones(len(rows))
+        return Expression(space, [(rows, cols, coefs)])
+
+    def constant(self, space: Space, table: Table) -> np.ndarray:
+        """Table values summed onto the rows"""
+
+        table = self._broadcast(table, space)
+        table = _take(table, space.contains(table))
+        return np.bincount(
+            space.ravel(table), weights=table["VALUE"], minlength=space.size
+        )
+
+    def var(self, name: str, space: Space, **shifted: np.ndarray) -> Expression:
+        """Variable at every row, summed over its indices not in the space
+
+        The position of an index can be shifted per row, ie. to the previous
+        season. Rows shifted out of the set have no term.
+        """
+
+        table = dict(space.grid)
+        rename = {}
+        keep = np.ones(space.size, dtype=bool)
+        for dim, positions in shifted.items():
+            table[f"{dim}'"] = positions
+            rename[dim] = f"{dim}'"
+            keep &= positions >= 0
+        if not keep.all():
+            table = _take(table, keep)
+
+        for dim in VARIABLES[name]:
+            if dim not in table:
+                table = _cross(table, {dim: np.arange(len(self.sets[dim]))})
+        return self.terms(space, name, table, rename)
+
+    def capacity(
+        self, space: Space, factors: Iterable[str] = (), storage: bool = False
+    ) -> Expression:
+        """New capacity within its operational life plus the residual capacity
+
+        Arguments
+        ---------
+        space: Space
+            Rows of the expressions. Technologies not in the space are summed.
+        factors: Iterable[str]
+            Parameters multiplied with the capacity of each technology
+        storage: bool
+            Storage capacity rather than technology capacity
+        """
+
+        if storage:
+            unit, var = S, "NewStorageCapacity"
+            life, residual = "OperationalLifeStorage", "ResidualStorageCapacity"
+        else:
+            unit, var = T, "NewCapacity"
+            life, residual = "OperationalLife", "ResidualCapacity"
+
+        dims = (R, unit, Y)
+        base = dict(Space(self, dims, space.subsets(dims)).grid)
+        base["VALUE"] = np.ones(_size(base))
+        for name in factors:
+            base["VALUE"] = base["VALUE"] * self.lookup(name, base)
+
+        constant = dict(base)
+        constant["VALUE"] = base["VALUE"] * self.lookup(residual, base)
+
+        years = self.sets[Y].astype(float)
+        window = _cross(base, {"yy": np.arange(len(years))})
+        age = years[window[Y]] - years[window["yy"]]
+        window = _take(window, (age >= 0) & (age < self.lookup(life, window)))
+
+        expression = self.terms(space, var, window, rename={Y: "yy"})
+        return expression + self.constant(space, constant)
+
+    def activity(
+        self,
+        space: Space,
+        ratio: Optional[str] = None,
+        factors: Iterable[str] = (),
+        divisors: Iterable[str] = (),
+    ) -> Expression:
+        """Rate of activity summed over the indices not in the space
+
+        Arguments
+        ---------
+        space: Space
+            Rows of the expressions
+        ratio: Optional[str]
+            Activity ratio parameter, ie. OutputActivityRatio. Only the modes of
+            operation with a non-zero ratio are included. If not given, all
+            modes of operation of each technology are included.
+        factors: Iterable[str]
+            Parameters multiplied with each term
+        divisors: Iterable[str]
+            Parameters each term is divided by
+        """
+
+        if ratio is None:
+            techs, modes = np.nonzero(self.modes)
+            table = {T: techs, M: modes, "VALUE": np.ones(len(techs))}
+        else:
+            table = self.entries(ratio)
+            table = _take(table, self.modes[table[T], table[M]])
+        table = _take(table, space.contains(table))
+
+        for dim in VARIABLES["RateOfActivity"]:
+            if dim not in table:
+                positions = space.subsets([dim]).get(dim)
+                if positions is None:
+                    positions = np.arange(len(self.sets[dim]))
+                table = _cross(table, {dim: positions})
+
+        for name in factors:
+            table["VALUE"] = table["VALUE"] * self.lookup(name, table)
+        for name in divisors:
+            table["VALUE"] = table["VALUE"] / self.lookup(name, table)
+
+        return self.terms(space, "RateOfActivity", table)
+
+    @cached_property
+    def timeslices(self) -> Table:
+        """Timeslices of each season, day type and daily time bracket"""
+
+        _, ls = self.dense("Conversionls")
+        _, ld = self.dense("Conversionld")
+        _, lh = self.dense("Conversionlh")
+        member = (
+            (ls[:, :, None, None] == 1)
+            & (ld[:, None, :, None] == 1)
+            & (lh[:, None, None, :] == 1)
+        )
+        return dict(zip((L, LS, LD, LH), np.nonzero(member)))
+
+    def storage_links(self, space: Space, name: str) -> Table:
+        """Activity charging (or discharging) storage per timeslice
+
+        Arguments
+        ---------
+        space: Space
+            Rows the table is for, to limit the years
+        name: str
+            TechnologyToStorage or TechnologyFromStorage
+        """
+
+        table = self.entries(name, positive=True)
+        table = _take(table, self.modes[table[T], table[M]])
+        table = _take(table, space.contains(table))
+        table = _cross(table, self.timeslices)
+        return _cross(table, {Y: space.subsets([Y])[Y]})
+
+    def net_storage(self, space: Space) -> Table:
+        """Activity charging storage less activity discharging storage"""
+
+        charge = self.storage_links(space, "TechnologyToStorage")
+        discharge = self.storage_links(space, "TechnologyFromStorage")
+        discharge["VALUE"] = -discharge["VALUE"]
+        return _concat(charge, discharge)
+
+
+def _format_numbers(values: np.ndarray) -> np.ndarray:
+    uniques, inverse = np.unique(values, return_inverse=True)
+    text = np.array([f"{x:.15g}" for x in uniques], dtype=object)
+    return text[inverse.ravel()]
+
+
+def _format_coefficients(values: np.ndarray) -> np.ndarray:
+    uniques, inverse = np.unique(values, return_inverse=True)
+    text = []
+    for x in uniques:
+        sign = "+" if x > 0 else "-"
+        text.append(f" {sign} " if abs(x) == 1 else f" {sign} {abs(x):.15g} ")
+    return np.array(text, dtype=object)[inverse.ravel()]
+
+
+class LPWriter:
+    """Writes the objective and constraint rows in the CPLEX LP format
+
+    Arguments
+    ---------
+    model: Model
+        Sets of the scenario, to name rows and columns
+    handle: TextIO
+        LP file
+    """
+
+    def __init__(self, model: Model, handle: TextIO):
+        self.model = model
+        self.handle = handle
+        self.used = {x: [] for x in FREE_VARIABLES + INTEGER_VARIABLES}
+        self.zero = None
+
+    def row_names(self, name: str, space: Space, rows: np.ndarray) -> np.ndarray:
+        index = np.unravel_index(rows, space.shape)
+        names = np.full(len(rows), f"{name}(", dtype=object)
+        for i, (dim, positions) in enumerate(zip(space.dims, space.positions)):
+            end = ")" if i == len(space.dims) - 1 else ","
+            names = names + self.model.labels[dim][positions[index[i]]] + end
+        return names
+
+    def column_names(self, keys: np.ndarray) -> np.ndarray:
+        names = np.empty(len(keys), dtype=object)
+        variables = list(VARIABLES)
+        owner = np.searchsorted(self.model._starts, keys, "right") - 1
+
+        for i in np.unique(owner):
+            var = variables[i]
+            mask = owner == i
+            dims = VARIABLES[var]
+            index = np.unravel_index(
+                keys[mask] - self.model.offsets[var], self.model.shape(dims)
+            )
+            part = np.full(mask.sum(), f"{var}(", dtype=object)
+            for j, dim in enumerate(dims):
+                end = ")" if j == len(dims) - 1 else ","
+                part = part + self.model.labels[dim][index[j]] + end
+            names[mask] = part
+
+            if var in self.used:
+                self.used[var].append(keys[mask])
+        return names
+
+    def _terms(self, coefs: np.ndarray, names: np.ndarray) -> np.ndarray:
+        return _format_coefficients(coefs) + names
+
+    def objective(self, name: str, expressions: Iterable[Expression]) -> None:
+        """Writes the objective to minimise"""
+
+        keys, coefs = [], []
+        constant = 0.0
+        for expression in expressions:
+            for _, cols, values in expression.terms:
+                uniques, inverse = np.unique(cols, return_inverse=True)
+                keys.append(uniques)
+                coefs.append(np.bincount(inverse, weights=values))
+            constant += np.sum(expression.constant)
+
+        keys, inverse = np.unique(np.concatenate(keys), return_inverse=True)
+        coefs = np.bincount(inverse, weights=np.concatenate(coefs))
+        keys, coefs = keys[coefs != 0], coefs[coefs != 0]
+
+        names = self.column_names(keys)
+        self.zero = names[0]
+
+        self.handle.write(f"Minimize\n {name}:")
+        for start in range(0, len(keys), WRITE_CHUNK * LINE_TERMS):
+            stop = start + WRITE_CHUNK * LINE_TERMS
+            terms = self._terms(coefs[start:stop], names[start:stop])
+            terms[LINE_TERMS::LINE_TERMS] = "\n" + terms[LINE_TERMS::LINE_TERMS]
+            self.handle.write("".join(terms.tolist()))
+        self.handle.write("\n")
+        if constant:
+            self.handle.write(f"\\* constant term = {constant:.15g} *\\\n")
+        self.handle.write("\nSubject To\n")
+
+    def rows(self, name: str, space: Space, row: Row) -> None:
+        """Writes a family of rows"""
+
+        lhs, sense, rhs, where = row
+        expression = Expression(space, constant=lhs) if not isinstance(
+            lhs, Expression
+        ) else lhs
+        expression = expression - rhs
+
+        if where is None:
+            where = np.ones(space.size, dtype=bool)
+        rows = np.flatnonzero(where)
+        if not len(rows):
+            return
+        position = np.full(space.size, -1)
+        position[rows] = np.arange(len(rows))
+
+        bound = -(np.zeros(space.size) + expression.constant)[rows]
+
+        if expression.terms:
+            row_ids = np.concatenate([x[0] for x in expression.terms])
+            keys = np.concatenate([x[1] for x in expression.terms])
+            coefs = np.concatenate([x[2] for x in expression.terms])
+            keep = where[row_ids]
+            row_ids, keys, coefs = row_ids[keep], keys[keep], coefs[keep]
+        else:
+            row_ids = keys = np.array([], dtype=int)
+            coefs = np.array([])
+
+        keys, inverse = np.unique(keys, return_inverse=True)
+        matrix = sparse.csr_matrix(
+            (coefs, (position[row_ids], inverse.ravel())),
+            shape=(len(rows), len(keys)),
+        )
+        matrix.sum_duplicates()
+        matrix.eliminate_zeros()
+
+        used = np.unique(matrix.indices)
+        names = np.empty(len(keys), dtype=object)
+        names[used] = self.column_names(keys[used])
+
+        row_names = self.row_names(name, space, rows)
+        for start in range(0, len(rows), WRITE_CHUNK):
+            stop = min(start + WRITE_CHUNK, len(rows))
+            self._write_rows(
+                row_names[start:stop],
+                matrix[start:stop],
+                names,
+                sense,
+                bound[start:stop],
+            )
+
+    def _write_rows(
+        self,
+        row_names: np.ndarray,
+        matrix: sparse.csr_matrix,
+        names: np.ndarray,
+        sense: str,
+        bound: np.ndarray,
+    ) -> None:
+        n = len(row_names)
+        indptr = matrix.indptr
+        counts = np.diff(indptr)
+
+        heads = " " + row_names + ":"
+        empty = counts == 0
+        if empty.any():
+            heads[empty] = heads[empty] + f" 0 {self.zero}"
+        tails = f" {sense} " + _format_numbers(bound) + "\n"
+
+        terms = self._terms(matrix.data, names[matrix.indices])
+        position = np.arange(len(terms)) - np.repeat(indptr[:-1], counts)
+        wrap = (position > 0) & (position % LINE_TERMS == 0)
+        terms[wrap] = "\n" + terms[wrap]
+
+        pieces = np.empty(len(terms) + 2 * n, dtype=object)
+        offset = 2 * np.arange(n)
+        pieces[indptr[:-1] + offset] = heads
+        pieces[indptr[1:] + offset + 1] = tails
+        pieces[np.arange(len(terms)) + 2 * np.repeat(np.arange(n), counts) + 1] = terms
+        self.handle.write("".join(pieces.tolist()))
+
+    def close(self) -> None:
+        """Writes the bounds of free variables and the integer variables"""
+
+        free = [x for x in FREE_VARIABLES if self.used[x]]
+        if free:
+            self.handle.write("\nBounds\n")
+        for var in free:
+            keys = np.unique(np.concatenate(self.used[var]))
+            names = self.column_names(keys)
+            self.handle.write("".join((" " + names + " free\n").tolist()))
+
+        integer = [x for x in INTEGER_VARIABLES if self.used[x]]
+        if integer:
+            self.handle.write("\nGenerals\n")
+        for var in integer:
+            keys = np.unique(np.concatenate(self.used[var]))
+            names = self.column_names(keys)
+            self.handle.write("".join((" " + names + "\n").tolist()))
+
+        self.handle.write("\nEnd\n")
+
+
+#####################
+# Objective         #
+#####################
+
+
+def cost(m: Model, chunk_size: int) -> Iterable[Expression]:
+    """Discounted technology and storage costs, in chunks of years"""
+
+    for tech in m.spaces((R, T, Y), chunk_size):
+        storage = Space(m, (R, S, Y), tech.subsets([Y]))
+
+        operating = m.capacity(tech) * m.param("FixedCost", tech) + m.activity(
+            tech, factors=("YearSplit", "VariableCost")
+        )
+        yield operating / m.param("DiscountFactorMid", tech)
+
+        investment = (
+            m.param("CapitalCost", tech)
+            * m.param("CapitalRecoveryFactor", tech)
+            * m.param("PvAnnuity", tech)
+            / m.param("DiscountFactor", tech)
+        )
+        yield m.var("NewCapacity", tech) * investment
+        yield m.var("DiscountedTechnologyEmissionsPenalty", tech)
+        yield -m.var("DiscountedSalvageValue", tech)
+
+        investment = m.param("CapitalCostStorage", storage) / m.param(
+            "DiscountFactor", storage
+        )
+        yield m.var("NewStorageCapacity", storage) * investment
+        yield -m.var("DiscountedSalvageValueStorage", storage)
+
+
+#####################
+# Constraints       #
+#####################
+
+# name, indices and builder of each constraint family, in model file order
+CONSTRAINTS: list[tuple[str, tuple[str, ...], Callable[[Model, Space], Row]]] = []
+
+
+def constraint(name: str, dims: tuple[str, ...]) -> Callable:
+    def register(func: Callable[[Model, Space], Row]) -> Callable:
+        CONSTRAINTS.append((name, dims, func))
+        return func
+
+    return register
+
+
+#########               Capacity Adequacy A                     #############
+
+
+@constraint("CAa2_TotalAnnualCapacity", (R, T, Y))
+def _total_annual_capacity(m: Model, space: Space) -> Row:
+    return Row(m.capacity(space), "=", m.var("TotalCapacityAnnual", space))
+
+
+@constraint("CAa4_Constraint_Capacity", (R, L, T, Y))
+def _constraint_capacity(m: Model, space: Space) -> Row:
+    capacity = (
+        m.capacity(space)
+        * m.param("CapacityFactor", space)
+        * m.param("CapacityToActivityUnit", space)
+    )
+    return Row(m.activity(space), "<=", capacity)
+
+
+@constraint("CAa5_TotalNewCapacity", (R, T, Y))
+def _total_new_capacity(m: Model, space: Space) -> Row:
+    unit = m.param("CapacityOfOneTechnologyUnit", space)
+    return Row(
+        m.var("NumberOfNewTechnologyUnits", space) * unit,
+        "=",
+        m.var("NewCapacity", space),
+        unit != 0,
+    )
+
+
+#########               Capacity Adequacy B                         #############
+
+
+@constraint("CAb1_PlannedMaintenance", (R, T, Y))
+def _planned_maintenance(m: Model, space: Space) -> Row:
+    capacity = (
+        m.capacity(space)
+        * m.param("AnnualCapacityFactor", space)
+        * m.param("AvailabilityFactor", space)
+        * m.param("CapacityToActivityUnit", space)
+    )
+    return Row(m.activity(space, factors=("YearSplit",)), "<=", capacity)
+
+
+#########                Energy Balance A                     #############
+
+# EBa10_EnergyBalanceEachTS4 has no rows without trade routes
+
+
+@constraint("EBa11_EnergyBalanceEachTS5", (R, L, F, Y))
+def _energy_balance_each_ts(m: Model, space: Space) -> Row:
+    demand = m.param("SpecifiedAnnualDemand", space) * m.param(
+        "SpecifiedDemandProfile", space
+    )
+    return Row(
+        m.activity(space, "OutputActivityRatio", ("YearSplit",)),
+        ">=",
+        demand + m.activity(space, "InputActivityRatio", ("YearSplit",)),
+    )
+
+
+#########                Energy Balance B                         #############
+
+
+@constraint("EBb4_EnergyBalanceEachYear4", (R, F, Y))
+def _energy_balance_each_year(m: Model, space: Space) -> Row:
+    return Row(
+        m.activity(space, "OutputActivityRatio", ("YearSplit",)),
+        ">=",
+        m.activity(space, "InputActivityRatio", ("YearSplit",))
+        + m.param("AccumulatedAnnualDemand", space),
+    )
+
+
+#########                Storage Equations                        #############
+
+
+def _intraday_charge(m: Model, space: Space, before: bool) -> Expression:
+    """Net charge in the daily time brackets before (or after) each bracket"""
+
+    table = m.net_storage(space)
+    table["VALUE"] = table["VALUE"] * m.lookup("DaySplit", table)
+    src, dst = m.pairs(LH, np.less if before else np.greater)
+    table = _remap(table, LH, src, dst)
+    return m.terms(space, "RateOfActivity", table)
+
+
+@constraint("S3_NetChargeWithinYear", (R, S, LS, LD, LH, Y))
+def _net_charge_within_year(m: Model, space: Space) -> Row:
+    table = m.net_storage(space)
+    table["VALUE"] = table["VALUE"] * m.lookup("YearSplit", table)
+    return Row(
+        m.terms(space, "RateOfActivity", table),
+        "=",
+        m.var("NetChargeWithinYear", space),
+    )
+
+
+@constraint("S4_NetChargeWithinDay", (R, S, LS, LD, LH, Y))
+def _net_charge_within_day(m: Model, space: Space) -> Row:
+    table = m.net_storage(space)
+    table["VALUE"] = table["VALUE"] * m.lookup("DaySplit", table)
+    return Row(
+        m.terms(space, "RateOfActivity", table),
+        "=",
+        m.var("NetChargeWithinDay", space),
+    )
+
+
+@constraint("S9_and_S10_StorageLevelSeasonStart", (R, S, LS, Y))
+def _storage_level_season_start(m: Model, space: Space) -> Row:
+    first = m.is_first(space, LS)
+
+    # net charge of the previous season
+    table = m.net_storage(space)
+    table["VALUE"] = table["VALUE"] * m.lookup("YearSplit", table)
+    table = m.shift_table(table, LS, 1)
+
+    previous = m.var("StorageLevelSeasonStart", space, **{LS: m.shift(space, LS, -1)})
+    level = m.var("StorageLevelYearStart", space).where(first) + (
+        previous + m.terms(space, "RateOfActivity", table)
+    ).where(~first)
+    return Row(level, "=", m.var("StorageLevelSeasonStart", space))
+
+
+@constraint("S11_and_S12_StorageLevelDayTypeStart", (R, S, LS, LD, Y))
+def _storage_level_day_type_start(m: Model, space: Space) -> Row:
+    first = m.is_first(space, LD)
+
+    # net charge of the previous day type
+    table = m.net_storage(space)
+    table["VALUE"] = (
+        table["VALUE"]
+        * m.lookup("DaySplit", table)
+        * m.lookup("DaysInDayType", table)
+    )
+    table = m.shift_table(table, LD, 1)
+
+    previous = m.var("StorageLevelDayTypeStart", space, **{LD: m.shift(space, LD, -1)})
+    level = m.var("StorageLevelSeasonStart", space).where(first) + (
+        previous + m.terms(space, "RateOfActivity", table)
+    ).where(~first)
+    return Row(level, "=", m.var("StorageLevelDayTypeStart", space))
+
+
+@constraint("S30_StorageLevelYearStart2", (R, S, Y, L))
+def _storage_level_year_start(m: Model, space: Space) -> Row:
+    return Row(
+        m.var("StorageLevelYearStart", space),
+        "=",
+        m.var("AccumulatedNewStorageCapacity", space) * 0.5,
+    )
+
+
+@constraint("S39_StorageIntraday", (R, S, LS, LD, Y))
+def _storage_intraday(m: Model, space: Space) -> Row:
+    return Row(m.var("NetChargeWithinDay", space), "=", 0)
+
+
+@constraint("S39_StorageIntrayear", (R, S, Y))
+def _storage_intrayear(m: Model, space: Space) -> Row:
+    return Row(m.var("NetChargeWithinYear", space), "=", 0)
+
+
+##########                Storage Constraints                        #############
+
+
+@constraint("SC1_LowerLimit", (R, S, LS, LD, LH, Y))
+def _sc1_lower_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeStart", space) + _intraday_charge(m, space, True)
+    minimum = m.capacity(space, storage=True) * m.param("MinStorageCharge", space)
+    return Row(0, "<=", level - minimum)
+
+
+@constraint("SC1_UpperLimit", (R, S, LS, LD, LH, Y))
+def _sc1_upper_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeStart", space) + _intraday_charge(m, space, True)
+    return Row(level - m.capacity(space, storage=True), "<=", 0)
+
+
+@constraint("SC2_LowerLimit", (R, S, LS, LD, LH, Y))
+def _sc2_lower_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeStart", space) - _intraday_charge(m, space, False)
+    minimum = m.capacity(space, storage=True) * m.param("MinStorageCharge", space)
+    return Row(0, "<=", (level - minimum).where(~m.is_first(space, LD)))
+
+
+@constraint("SC2_UpperLimit", (R, S, LS, LD, LH, Y))
+def _sc2_upper_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeStart", space) - _intraday_charge(m, space, False)
+    return Row(
+        (level - m.capacity(space, storage=True)).where(~m.is_first(space, LD)),
+        "<=",
+        0,
+    )
+
+
+@constraint("SC3_LowerLimit", (R, S, LS, LD, LH, Y))
+def _sc3_lower_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeFinish", space) - _intraday_charge(
+        m, space, False
+    )
+    minimum = m.capacity(space, storage=True) * m.param("MinStorageCharge", space)
+    return Row(0, "<=", level - minimum)
+
+
+@constraint("SC3_UpperLimit", (R, S, LS, LD, LH, Y))
+def _sc3_upper_limit(m: Model, space: Space) -> Row:
+    level = m.var("StorageLevelDayTypeFinish", space) - _intraday_charge(
+        m, space, False
+    )
+    return Row(level - m.capacity(space, storage=True), "<=", 0)
+
+
+@constraint("SC4_LowerLimit", (R, S, LS, LD, LH, Y))
+def _sc4_lower_limit(m: Model, space: Space) -> Row:
+    previous = m.var("StorageLevelDayTypeFinish", space, **{LD: m.shift(space, LD, -1)})
+    level = previous + _intraday_charge(m, space, True)
+    minimum = m.capacity(space, storage=True) * m.param("MinStorageCharge", space)
+    return Row(0, "<=", (level - minimum).where(~m.is_first(space, LD)))
+
+
+@constraint("SC4_UpperLimit", (R, S, LS, LD, LH, Y))
+def _sc4_upper_limit(m: Model, space: Space) -> Row:
+    previous = m.var("StorageLevelDayTypeFinish", space, **{LD: m.shift(space, LD, -1)})
+    level = previous + _intraday_charge(m, space, True)
+    return Row(
+        (level - m.capacity(space, storage=True)).where(~m.is_first(space, LD)),
+        "<=",
+        0,
+    )
+
+
+@constraint("SC5_MaxChargeConstraint", (R, S, LS, LD, LH, Y))
+def _max_charge(m: Model, space: Space) -> Row:
+    table = m.storage_links(space, "TechnologyToStorage")
+    return Row(
+        m.terms(space, "RateOfActivity", table),
+        "<=",
+        m.param("StorageMaxChargeRate", space),
+    )
+
+
+@constraint("SC6_MaxDischargeConstraint", (R, S, LS, LD, LH, Y))
+def _max_discharge(m: Model, space: Space) -> Row:
+    table = m.storage_links(space, "TechnologyFromStorage")
+    return Row(
+        m.terms(space, "RateOfActivity", table),
+        "<=",
+        m.param("StorageMaxDischargeRate", space),
+    )
+
+
+#########                Storage Investments                        #############
+
+
+def _beyond_horizon(m: Model, space: Space, life: str) -> np.ndarray:
+    """Mask of rows with capacity built in the year still operating after the horizon"""
+
+    years = m.values(Y, space)
+    return years + m.param(life, space) - 1 > m.sets[Y].max()
+
+
+@constraint("SI6_SalvageValueStorageAtEndOfPeriod1", (R, S, Y))
+def _salvage_value_storage_1(m: Model, space: Space) -> Row:
+    within = ~_beyond_horizon(m, space, "OperationalLifeStorage")
+    return Row(0, "=", m.var("SalvageValueStorage", space), within)
+
+
+@constraint("SI7_SalvageValueStorageAtEndOfPeriod2", (R, S, Y))
+def _salvage_value_storage_2(m: Model, space: Space) -> Row:
+    beyond = _beyond_horizon(m, space, "OperationalLifeStorage")
+    method = m.param("DepreciationMethod", space)
+    rate = m.param("DiscountRateStorage", space)
+    where = ((method == 1) & beyond & (rate == 0)) | ((method == 2) & beyond)
+
+    remaining = m.sets[Y].max() - m.values(Y, space) + 1
+    value = m.param("CapitalCostStorage", space) * (
+        1 - remaining / m.param("OperationalLifeStorage", space)
+    )
+    return Row(
+        m.var("NewStorageCapacity", space) * value,
+        "=",
+        m.var("SalvageValueStorage", space),
+        where,
+    )
+
+
+@constraint("SI8_SalvageValueStorageAtEndOfPeriod3", (R, S, Y))
+def _salvage_value_storage_3(m: Model, space: Space) -> Row:
+    beyond = _beyond_horizon(m, space, "OperationalLifeStorage")
+    method = m.param("DepreciationMethod", space)
+    rate = m.param("DiscountRateStorage", space)
+    where = (method == 1) & beyond & (rate > 0)
+
+    remaining = m.sets[Y].max() - m.values(Y, space) + 1
+    life = m.param("OperationalLifeStorage", space)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = m.param("CapitalCostStorage", space) * (
+            1 - (((1 + rate) ** remaining - 1) / ((1 + rate) ** life - 1))
+        )
+    return Row(
+        m.var("NewStorageCapacity", space) * value,
+        "=",
+        m.var("SalvageValueStorage", space),
+        where,
+    )
+
+
+@constraint("SI1_StorageUpperLimit", (R, S, Y))
+def _storage_upper_limit(m: Model, space: Space) -> Row:
+    return Row(
+        m.capacity(space, storage=True), "=", m.var("StorageUpperLimit", space)
+    )
+
+
+@constraint("SI2_StorageLowerLimit", (R, S, Y))
+def _storage_lower_limit(m: Model, space: Space) -> Row:
+    return Row(
+        m.capacity(space, storage=True) * m.param("MinStorageCharge", space),
+        "=",
+        m.var("StorageLowerLimit", space),
+    )
+
+
+@constraint("SI3_TotalNewStorage", (R, S, Y))
+def _total_new_storage(m: Model, space: Space) -> Row:
+    capacity = m.capacity(space, storage=True)
+    capacity.constant = 0.0
+    return Row(capacity, "=", m.var("AccumulatedNewStorageCapacity", space))
+
+
+@constraint("SI4_UndiscountedCapitalInvestmentStorage", (R, S, Y))
+def _capital_investment_storage(m: Model, space: Space) -> Row:
+    return Row(
+        m.var("NewStorageCapacity", space) * m.param("CapitalCostStorage", space),
+        "=",
+        m.var("CapitalInvestmentStorage", space),
+    )
+
+
+@constraint("SI5_DiscountingCapitalInvestmentStorage", (R, S, Y))
+def _discounted_capital_investment_storage(m: Model, space: Space) -> Row:
+    investment = m.var("NewStorageCapacity", space) * m.param(
+        "CapitalCostStorage", space
+    )
+    return Row(
+        investment / m.param("DiscountFactorStorage", space),
+        "=",
+        m.var("DiscountedCapitalInvestmentStorage", space),
+    )
+
+
+@constraint("SI9_SalvageValueStorageDiscountedToStartYear", (R, S, Y))
+def _discounted_salvage_value_storage(m: Model, space: Space) -> Row:
+    years = m.sets[Y]
+    discount = (1 + m.param("DiscountRate", space)) ** (years.max() - years.min() + 1)
+    return Row(
+        m.var("SalvageValueStorage", space) / discount,
+        "=",
+        m.var("DiscountedSalvageValueStorage", space),
+    )
+
+
+@constraint("SI10_TotalDiscountedCostByStorage", (R, S, Y))
+def _total_discounted_cost_by_storage(m: Model, space: Space) -> Row:
+    investment = (
+        m.var("NewStorageCapacity", space)
+        * m.param("CapitalCostStorage", space)
+        / m.param("DiscountFactorStorage", space)
+    )
+    return Row(
+        investment - investment, "=", m.var("TotalDiscountedStorageCost", space)
+    )
+
+
+#########               Capital Costs                              #############
+
+
+@constraint("CC1_UndiscountedCapitalInvestment", (R, T, Y))
+def _capital_investment(m: Model, space: Space) -> Row:
+    return Row(
+        m.var("NewCapacity", space) * m.param("CapitalCost", space),
+        "=",
+        m.var("CapitalInvestment", space),
+    )
+
+
+#########           Salvage Value                    #############
+
+
+def _annualised_investment(m: Model, space: Space) -> np.ndarray:
+    return (
+        m.param("CapitalCost", space)
+        * m.param("CapitalRecoveryFactor", space)
+        * m.param("PvAnnuity", space)
+    )
+
+
+@constraint("SV1_SalvageValueAtEndOfPeriod1", (R, T, Y))
+def _salvage_value_1(m: Model, space: Space) -> Row:
+    rate = m.param("DiscountRate", space)
+    where = _beyond_horizon(m, space, "OperationalLife") & (rate > 0)
+
+    remaining = m.sets[Y].max() - m.values(Y, space) + 1
+    life = m.param("OperationalLife", space)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = _annualised_investment(m, space) * (
+            1 - (((1 + rate) ** remaining - 1) / ((1 + rate) ** life - 1))
+        )
+    return Row(
+        m.var("SalvageValue", space),
+        "=",
+        m.var("NewCapacity", space) * value,
+        where,
+    )
+
+
+@constraint("SV2_SalvageValueAtEndOfPeriod2", (R, T, Y))
+def _salvage_value_2(m: Model, space: Space) -> Row:
+    rate = m.param("DiscountRate", space)
+    where = _beyond_horizon(m, space, "OperationalLife") & (rate == 0)
+
+    remaining = m.sets[Y].max() - m.values(Y, space) + 1
+    value = _annualised_investment(m, space) * (
+        1 - remaining / m.param("OperationalLife", space)
+    )
+    return Row(
+        m.var("SalvageValue", space),
+        "=",
+        m.var("NewCapacity", space) * value,
+        where,
+    )
+
+
+@constraint("SV3_SalvageValueAtEndOfPeriod3", (R, T, Y))
+def _salvage_value_3(m: Model, space: Space) -> Row:
+    within = ~_beyond_horizon(m, space, "OperationalLife")
+    return Row(m.var("SalvageValue", space), "=", 0, within)
+
+
+@constraint("SV4_SalvageValueDiscountedToStartYear", (R, T, Y))
+def _discounted_salvage_value(m: Model, space: Space) -> Row:
+    years = m.sets[Y]
+    discount = (1 + m.param("DiscountRate", space)) ** (1 + years.max() - years.min())
+    return Row(
+        m.var("DiscountedSalvageValue", space),
+        "=",
+        m.var("SalvageValue", space) / discount,
+    )
+
+
+#########                Operating Costs                          #############
+
+
+@constraint("OC3_OperatingCostsTotalAnnual", (R, T, Y))
+def _operating_costs(m: Model, space: Space) -> Row:
+    operating = m.capacity(space) * m.param("FixedCost", space) + m.activity(
+        space, factors=("YearSplit", "VariableCost")
+    )
+    return Row(operating, "=", m.var("OperatingCost", space))
+
+
+#########                      Total Capacity Constraints         ##############
+
+
+@constraint("TCC1_TotalAnnualMaxCapacityConstraint", (R, T, Y))
+def _max_capacity(m: Model, space: Space) -> Row:
+    limit = m.param("TotalAnnualMaxCapacity", space)
+    return Row(m.capacity(space), "<=", limit, limit != -1)
+
+
+@constraint("TCC2_TotalAnnualMinCapacityConstraint", (R, T, Y))
+def _min_capacity(m: Model, space: Space) -> Row:
+    limit = m.param("TotalAnnualMinCapacity", space)
+    return Row(m.capacity(space), ">=", limit, limit > 0)
+
+
+#########                    New Capacity Constraints          ##############
+
+
+@constraint("NCC1_TotalAnnualMaxNewCapacityConstraint", (R, T, Y))
+def _max_new_capacity(m: Model, space: Space) -> Row:
+    limit = m.param("TotalAnnualMaxCapacityInvestment", space)
+    return Row(m.var("NewCapacity", space), "<=", limit, limit != -1)
+
+
+@constraint("NCC2_TotalAnnualMinNewCapacityConstraint", (R, T, Y))
+def _min_new_capacity(m: Model, space: Space) -> Row:
+    limit = m.param("TotalAnnualMinCapacityInvestment", space)
+    return Row(m.var("NewCapacity", space), ">=", limit, limit > 0)
+
+
+#########                   Annual Activity Constraints        ##############
+
+
+@constraint("AAC2_TotalAnnualTechnologyActivityUpperLimit", (R, T, Y))
+def _annual_activity_upper_limit(m: Model, space: Space) -> Row:
+    limit = m.param("TotalTechnologyAnnualActivityUpperLimit", space)
+    activity = m.activity(space, factors=("YearSplit",))
+    return Row(activity, "<=", limit, limit != -1)
+
+
+@constraint("AAC3_TotalAnnualTechnologyActivityLowerLimit", (R, T, Y))
+def _annual_activity_lower_limit(m: Model, space: Space) -> Row:
+    limit = m.param("TotalTechnologyAnnualActivityLowerLimit", space)
+    activity = m.activity(space, factors=("YearSplit",))
+    return Row(activity, ">=", limit, limit > 0)
+
+
+#########                    Total Activity Constraints         ##############
+
+
+@constraint("TAC2_TotalModelHorizonTechnologyActivityUpperLimit", (R, T))
+def _period_activity_upper_limit(m: Model, space: Space) -> Row:
+    limit = m.param("TotalTechnologyModelPeriodActivityUpperLimit", space)
+    activity = m.activity(space, factors=("YearSplit",))
+    return Row(activity, "<=", limit, limit != -1)
+
+
+@constraint("TAC3_TotalModelHorizenTechnologyActivityLowerLimit", (R, T))
+def _period_activity_lower_limit(m: Model, space: Space) -> Row:
+    limit = m.param("TotalTechnologyModelPeriodActivityLowerLimit", space)
+    activity = m.activity(space, factors=("YearSplit",))
+    return Row(activity, ">=", limit, limit > 0)
+
+
+#########                   Reserve Margin Constraint        ##############
+
+
+@constraint("RM3_ReserveMargin_Constraint", (R, L, Y))
+def _reserve_margin(m: Model, space: Space) -> Row:
+    demand = m.activity(
+        space, "OutputActivityRatio", ("ReserveMarginTagFuel", "ReserveMargin")
+    )
+    capacity = m.capacity(
+        space, ("ReserveMarginTagTechnology", "CapacityToActivityUnit")
+    )
+    return Row(demand, "<=", capacity)
+
+
+#########                   RE Production Target                ##############
+
+
+@constraint("RE4_EnergyConstraint", (R, Y))
+def _re_energy(m: Model, space: Space) -> Row:
+    target = m.activity(space, "OutputActivityRatio", ("RETagFuel",)) * m.param(
+        "REMinProductionTarget", space
+    )
+    production = m.activity(
+        space, "OutputActivityRatio", ("YearSplit", "RETagTechnology")
+    )
+    return Row(target, "<=", production)
+
+
+#########                   Emissions Accounting                ##############
+
+
+@constraint("E5_DiscountedEmissionsPenaltyByTechnology", (R, T, Y))
+def _discounted_emissions_penalty(m: Model, space: Space) -> Row:
+    penalty = m.activity(
+        space,
+        "EmissionActivityRatio",
+        ("YearSplit", "EmissionsPenalty"),
+        ("DiscountFactorMid",),
+    )
+    return Row(penalty, "=", m.var("DiscountedTechnologyEmissionsPenalty", space))
+
+
+@constraint("E8_AnnualEmissionsLimit", (R, E, Y))
+def _annual_emissions_limit(m: Model, space: Space) -> Row:
+    limit = m.param("AnnualEmissionLimit", space)
+    emissions = m.activity(space, "EmissionActivityRatio", ("YearSplit",))
+    emissions += m.param("AnnualExogenousEmission", space)
+    return Row(emissions, "<=", limit, limit != -1)
+
+
+@constraint("E9_ModelPeriodEmissionsLimit", (R, E))
+def _period_emissions_limit(m: Model, space: Space) -> Row:
+    limit = m.param("ModelPeriodEmissionLimit", space)
+    emissions = m.activity(space, "EmissionActivityRatio", ("YearSplit",))
+    emissions += m.param("ModelPeriodExogenousEmission", space)
+    return Row(emissions, "<=", limit, limit != -1)
+
+
+@constraint("E4_EmissionsPenaltyByTechnology", (R, T, Y))
+def _emissions_penalty(m: Model, space: Space) -> Row:
+    penalty = m.activity(
+        space, "EmissionActivityRatio", ("YearSplit", "EmissionsPenalty")
+    )
+    return Row(penalty, "=", m.var("AnnualTechnologyEmissionsPenalty", space))
+
+
+def write_lp(
+    data: dict[str, Any],
+    config: dict[str, dict[str, Any]],
+    lp_file: str,
+    chunk_size: int = 1_000_000,
+) -> None:
+    """Writes the LP file of the model
+
+    Arguments
+    ---------
+    data: dict[str, pd.DataFrame]
+        Sets and parameters, as read by ``write_data_file.read_data``
+    config: dict[str, dict[str, Any]]
+        Set and parameter definitions of the otoole config
+    lp_file: str
+        Path of the LP file
+    chunk_size: int
+        Approximate number of rows of a family built at once
+    """
+
+    model = Model(data, config)
+    model.check()
+
+    with open(lp_file, "w", newline="\n") as f:
+        f.write("\\* Problem: osemosys_fast_preprocessed *\\\n\n")
+
+        writer = LPWriter(model, f)
+        writer.objective("cost", cost(model, chunk_size))
+
+        for name, dims, build in CONSTRAINTS:
+            logger.info(f"Writing {name}")
+            for space in model.spaces(dims, chunk_size):
+                writer.rows(name, space, build(model, space))
+
+        writer.close()
+
+
+if __name__ == "__main__":
+    if "snakemake" in globals():
+        otoole_yaml = snakemake.input.otoole_config
+        csv_dir = snakemake.params.csv_dir
+        lp_file = snakemake.output.lp_file
+    else:
+        otoole_yaml = "resources/otoole.yaml"
+        csv_dir = "results/India/data"
+        lp_file = "results/India/India.lp"
+
+    config = read_otoole_config(otoole_yaml)
+    data = read_data(csv_dir, config)
+    write_lp(data, config, lp_file)
+
+    logging.info(f"LP file written to {lp_file}")
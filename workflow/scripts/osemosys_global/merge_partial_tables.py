@@ -0,0 +1,120 @@
+"""Merges the partial parameter tables of the powerplant, transmission and
+storage rules
+
+Each rule writes the part of a shared parameter (such as ``CapitalCost``) it
+is responsible for into its own data directory, so the rules can run in
+parallel. The partial tables are concatenated in the order the data
+directories are given, and duplicate index entries are dropped keeping the
+last entry.
+
+Tables are read and merged with the compact types of ``dtypes``, as the
+activity ratio tables are the largest of the workflow.
+"""
+
+import pandas as pd
+from pathlib import Path
+
+from osemosys_global.dtypes import CODES, compact_dtypes, log_memory_report
+from osemosys_global.param_io import read_table, table_path, write_table
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def merge_tables(tables: list[pd.DataFrame], name: str) -> pd.DataFrame:
+    """Unions partial tables of a set or parameter
+
+    Arguments
+    ---------
+    tables: list[pd.DataFrame]
+        Partial tables, in order of precedence (last takes precedence)
+    name: str
+        Name of the set or parameter
+    """
+
+    # aligned categoricals are concatenated without decoding
+    tables = [CODES.align(x) for x in tables if not x.empty]
+    if not tables:
+        return pd.DataFrame()
+
+    df = pd.concat(tables, ignore_index=True)
+    df = compact_dtypes(df)
+
+    if list(df.columns) == ["VALUE"]:
+        return df.drop_duplicates(keep="last")
+
+    index = [x for x in df.columns if x != "VALUE"]
+    return df.drop_duplicates(subset=index, keep="last")
+
+
+def merge_partial_tables(
+    data_dirs: list[str], name: str, data_format: str = "csv"
+) -> pd.DataFrame:
+    """Reads and merges the partial tables of a set or parameter
+
+    Data directories without a table for the set or parameter are skipped.
+
+    Arguments
+    ---------
+    data_dirs: list[str]
+        Data directories, in order of precedence (last takes precedence)
+    name: str
+        Name of the set or parameter
+    data_format: str
+        One of "csv" or "parquet"
+
+    Returns
+    -------
+    pd.DataFrame
+        Merged table, with the columns of the partial tables
+    """
+
+    tables = []
+    columns = None
+    for data_dir in data_dirs:
+        path = table_path(data_dir, name, data_format)
+        if not Path(path).exists():
+            continue
+        df = read_table(path, compact=True)
+        columns = list(df.columns)
+        tables.append(df)
+
+    if columns is None:
+        raise FileNotFoundError(f"No partial tables found for {name}")
+
+    df = merge_tables(tables, name)
+    if df.empty:
+        df = pd.DataFrame(columns=columns)
+
+    logger.info(f"Merged {len(tables)} partial tables for {name}")
+
+    return df[columns]
+
+
+if __name__ == "__main__":
+
+    logging.basicConfig(format="%(levelname)s:%(message)s", level=logging.INFO)
+
+    if "snakemake" in globals():
+        data_dirs = snakemake.params.data_dirs
+        data_format = snakemake.params.data_format
+        output_data_dir = snakemake.params.output_data_dir
+        names = snakemake.params.names
+    else:
+        data_dirs = [
+            "results/data/powerplant",
+            "results/data/transmission",
+            "results/data/storage",
+        ]
+        data_format = "csv"
+        output_data_dir = "results/data"
+        names = ["CapitalCost", "FUEL", "TECHNOLOGY"]
+
+    for name in names:
+
+        df = merge_partial_tables(data_dirs, name, data_format)
+        write_table(df, table_path(output_data_dir, name, data_format))
+
+        if name in ("InputActivityRatio", "OutputActivityRatio"):
+            log_memory_report({name: df})
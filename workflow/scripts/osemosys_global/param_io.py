@@ -0,0 +1,286 @@
+"""Read and write helpers for intermediate parameter data
+
+Intermediate set and parameter data in ``results/data`` is stored as either
+CSV (default) or Parquet, following the ``intermediate_data_format`` config
+option. The format is taken from the file suffix, so each stage only needs to
+pass paths built with ``table_path`` through ``read_table`` and
+``write_table``. CSVs are always materialised for otoole once the geographic
+filter is applied.
+
+Parquet files are stored with the compact types of ``dtypes``, so set columns
+are dictionary encoded, as the same few thousand codes are repeated across
+millions of rows. Stages that pass tables through without string processing
+can read them with the compact types as well.
+
+Parameters in ``YEAR_INVARIANT`` take the same values in every model year.
+They are written without a YEAR column and are only expanded over the model
+years as the filtered CSVs are written, see ``year_chunks``.
+"""
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from osemosys_global.dtypes import (
+    CATEGORICAL_COLUMNS,
+    compact_dtypes,
+    expand_dtypes,
+    expand_floats,
+)
+
+FORMATS = {"csv": ".csv", "parquet": ".parquet"}
+
+# parameters written without a YEAR column, as the values of every year are
+# the same. The YEAR column comes right before the VALUE column of each.
+YEAR_INVARIANT = [
+    "CapacityFactor",
+    "DaySplit",
+    "DaysInDayType",
+    "SpecifiedDemandProfile",
+    "YearSplit",
+]
+
+
+def table_path(directory: str, name: str, data_format: str = "csv") -> str:
+    """Gets the path to a set or parameter file
+
+    Arguments
+    ---------
+    directory: str
+        Directory holding the data, such as "results/data"
+    name: str
+        Name of the set or parameter, such as "CapacityFactor"
+    data_format: str
+        One of "csv" or "parquet"
+    """
+
+    try:
+        suffix = FORMATS[data_format]
+    except KeyError:
+        raise ValueError(
+            f"{data_format} is not a valid data format. Valid formats are "
+            f"{list(FORMATS)}"
+        )
+    return str(Path(directory, f"{name}{suffix}"))
+
+
+def _is_parquet(path: str) -> bool:
+    return Path(path).suffix == FORMATS["parquet"]
+
+
+def read_table(path: str, compact: bool = False, **kwargs) -> pd.DataFrame:
+    """Reads a set or parameter file
+
+    By default, compact columns are decoded to the plain types, so the
+    returned dataframe is the same as if the data was read from a CSV.
+
+    Arguments
+    ---------
+    path: str
+        Path to a ".csv" or ".parquet" file
+    compact: bool
+        Return the data with the compact types of ``dtypes.compact_dtypes``
+    **kwargs
+        Passed to ``pd.read_csv`` if reading a CSV
+    """
+
+    if not _is_parquet(path):
+        if not compact:
+            return pd.read_csv(path, **kwargs)
+        # set columns are parsed straight into categoricals
+        kwargs.setdefault("dtype", {x: "category" for x in CATEGORICAL_COLUMNS})
+        return compact_dtypes(pd.read_csv(path, **kwargs))
+
+    df = pd.read_parquet(path)
+    return compact_dtypes(df) if compact else expand_dtypes(df)
+
+
+def write_table(
+    df: pd.DataFrame | pd.Series, path: str, index: bool = False
+) -> None:
+    """Writes a set or parameter file
+
+    Arguments
+    ---------
+    df: pd.DataFrame | pd.Series
+        Data to write
+    path: str
+        Path to a ".csv" or ".parquet" file
+    index: bool
+        Write the (multi) index as columns, as with ``to_csv(index=True)``
+    """
+
+    if not _is_parquet(path):
+        if isinstance(df, pd.DataFrame):
+            df = expand_floats(df)
+        df.to_csv(path, index=index)
+        return
+
+    if isinstance(df, pd.Series):
+        df = df.to_frame()
+
+    if index:
+        df = df.reset_index()
+
+    compact_dtypes(df).to_parquet(path, index=False)
+
+
+def product_chunks(
+    df: pd.DataFrame,
+    index: list[str],
+    years: Optional[list[int]],
+    chunk_rows: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """Expands values over the product of their index and years, in chunks
+
+    Rows are in the order of ``itertools.product`` of the unique values of
+    each index column and the years, with the value of each index looked up
+    once, as when joining values onto the product. Indices without a value
+    are NaN. Only one chunk of rows is built at a time.
+
+    Without years, the values are only expanded over the product of their
+    index, as for the parameters in ``YEAR_INVARIANT``.
+
+    Arguments
+    ---------
+    df: pd.DataFrame
+        Index columns and a VALUE column, one row per index
+    index: list[str]
+        Index columns, ie. ["TIMESLICE", "TECHNOLOGY"]
+    years: Optional[list[int]]
+        Years to expand the values over, or None to leave out the YEAR column
+    chunk_rows: Optional[int]
+        Rows per chunk. Defaults to the rows of one year.
+
+    Yields
+    ------
+    pd.DataFrame
+        Index columns, YEAR and VALUE. An empty frame is yielded if there
+        are no rows.
+    """
+
+    uniques = [pd.unique(df[x]) for x in index]
+    shape = tuple(len(x) for x in uniques)
+    codes = [pd.Index(x).get_indexer(df[col]) for x, col in zip(uniques, index)]
+
+    values = np.full(int(np.prod(shape)), np.nan)
+    if len(df):
+        values[np.ravel_multi_index(codes, shape)] = df["VALUE"].to_numpy(dtype=float)
+
+    invariant = years is None
+    years = np.zeros(1, dtype=int) if invariant else np.asarray(years)
+    total = len(values) * len(years)
+    chunk_rows = chunk_rows or len(values) or 1
+
+    for start in range(0, max(total, 1), chunk_rows):
+        position = np.arange(start, min(start + chunk_rows, total))
+        flat, year = np.divmod(position, len(years))
+        positions = np.unravel_index(flat, shape)
+        chunk = {col: x[i] for col, x, i in zip(index, uniques, positions)}
+        if not invariant:
+            chunk["YEAR"] = years[year]
+        chunk["VALUE"] = values[flat]
+        yield pd.DataFrame(chunk)
+
+
+def is_year_invariant(name: str, df: pd.DataFrame) -> bool:
+    """Checks if a parameter is held without its YEAR column"""
+    return name in YEAR_INVARIANT and "YEAR" not in df.columns
+
+
+def year_chunks(
+    df: pd.DataFrame, years: list[int], chunk_rows: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Expands a year invariant parameter over the model years, in chunks
+
+    Each row is repeated for every year, with the YEAR column inserted
+    before the VALUE column. This gives the rows of the parameter as if it
+    was expanded with ``itertools.product(..., years)`` when written.
+
+    Arguments
+    ---------
+    df: pd.DataFrame
+        Index columns and a VALUE column, without a YEAR column
+    years: list[int]
+        Model years
+    chunk_rows: Optional[int]
+        Rows per chunk. Defaults to the rows of one year.
+
+    Yields
+    ------
+    pd.DataFrame
+        Index columns, YEAR and VALUE. An empty frame is yielded if there
+        are no rows.
+    """
+
+    if "YEAR" in df.columns:
+        raise ValueError("Parameter already has a YEAR column")
+
+    years = np.asarray(years)
+    columns = [x for x in df.columns if x != "VALUE"]
+    total = len(df) * len(years)
+    chunk_rows = chunk_rows or len(df) or 1
+
+    for start in range(0, max(total, 1), chunk_rows):
+        position = np.arange(start, min(start + chunk_rows, total))
+        row, year = np.divmod(position, len(years))
+        chunk = df[columns].iloc[row].reset_index(drop=True)
+        chunk["YEAR"] = years[year]
+        if "VALUE" in df.columns:
+            chunk["VALUE"] = df["VALUE"].to_numpy()[row]
+        yield chunk
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], path: str) -> int:
+    """Writes a set or parameter file from chunks of rows
+
+    Chunks are appended to the file as they are produced, so only one chunk
+    is held in memory at a time. Chunks must have the same columns. Parquet
+    chunks are written with the plain types of the first chunk with rows.
+
+    Arguments
+    ---------
+    chunks: Iterable[pd.DataFrame]
+        Rows of the table, ie. from a generator
+    path: str
+        Path to a ".csv" or ".parquet" file
+
+    Returns
+    -------
+    int
+        Number of rows written
+    """
+
+    rows = 0
+    empty = None
+    writer = None
+    try:
+        for chunk in chunks:
+            if chunk.empty:
+                empty = chunk if empty is None else empty
+                continue
+
+            if not _is_parquet(path):
+                expand_floats(chunk).to_csv(
+                    path, index=False, header=not rows, mode="a" if rows else "w"
+                )
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+
+                # plain types, as dictionaries of chunks differ in width
+                table = pa.Table.from_pandas(
+                    expand_dtypes(chunk), preserve_index=False
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table.cast(writer.schema))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if not rows:
+        write_table(empty if empty is not None else pd.DataFrame(), path)
+    return rows
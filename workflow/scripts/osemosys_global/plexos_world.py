@@ -0,0 +1,180 @@
+"""Object model of the PLEXOS-World 2015 workbook
+
+The demand and powerplant stages both take their generators, nodes and
+regions from the Memberships and Properties sheets of
+``PLEXOS_World_2015_Gold_V1.1.xlsx``. ``PlexosWorld`` ingests the two sheets
+once, with the class, collection, object and property columns as
+categoricals, and indexes
+
+- memberships by collection, ie. "Nodes" or "Region"
+- properties by child class, ie. "Generator"
+
+so each lookup only touches the rows it returns. The ingested model is
+persisted as a snapshot keyed by ``SCHEMA_VERSION`` and the digest of the
+workbook, which is shared by all stages reading the same workbook.
+"""
+
+import os
+import tempfile
+import pandas as pd
+from pathlib import Path
+from typing import Optional
+
+import logging
+
+from osemosys_global.excel_cache import read_excel, workbook_digest
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "results/cache/plexos"
+
+# part of the snapshot key, increase when the attributes of PlexosWorld
+# change so snapshots pickled by earlier versions are not read
+SCHEMA_VERSION = 1
+
+# columns held as categoricals
+KEY_COLUMNS = [
+    "parent_class",
+    "child_class",
+    "collection",
+    "parent_object",
+    "child_object",
+    "property",
+]
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.reset_index(drop=True)
+    for col in KEY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _positions(df: pd.DataFrame, column: str) -> dict:
+    if column not in df.columns or df.empty:
+        return {}
+    return df.groupby(column, observed=True, sort=False).indices
+
+
+def _select(df: pd.DataFrame, positions) -> pd.DataFrame:
+    """Rows at the positions, in sheet order, with plain string columns"""
+
+    selected = df.iloc[sorted(positions)].reset_index(drop=True)
+    for col in selected.columns:
+        if isinstance(selected[col].dtype, pd.CategoricalDtype):
+            selected[col] = selected[col].astype(object)
+    return selected
+
+
+class PlexosWorld:
+    """Memberships and properties of the PLEXOS-World objects
+
+    Arguments
+    ---------
+    memberships: pd.DataFrame
+        Memberships sheet, with parent_class, child_class, collection,
+        parent_object and child_object columns
+    properties: pd.DataFrame
+        Properties sheet, with child_class, child_object, property and value
+        columns
+    """
+
+    def __init__(self, memberships: pd.DataFrame, properties: pd.DataFrame):
+        self._memberships = _typed(memberships)
+        self._properties = _typed(properties)
+        self._collections = _positions(self._memberships, "collection")
+        self._classes = _positions(self._properties, "child_class")
+
+    @classmethod
+    def from_workbook(
+        cls, path: str, cache_dir: Optional[str] = CACHE_DIR
+    ) -> "PlexosWorld":
+        """Loads the model of a workbook, from its snapshot if one exists
+
+        Arguments
+        ---------
+        path: str
+            Path to the PLEXOS-World workbook
+        cache_dir: Optional[str]
+            Directory of the snapshots. The workbook is always ingested if
+            None.
+        """
+
+        # the snapshot holds both sheets, so they are not cached separately
+        if cache_dir is not None:
+            key = f"v{SCHEMA_VERSION}-{workbook_digest(path)[:16]}"
+            snapshot = Path(cache_dir, f"{Path(path).stem}-{key}.pkl")
+            if snapshot.exists():
+                return pd.read_pickle(snapshot)
+
+        model = cls(
+            read_excel(path, sheet_name="Memberships", cache_dir=None),
+            read_excel(path, sheet_name="Properties", cache_dir=None),
+        )
+        if cache_dir is None:
+            return model
+
+        # written to a temporary file first, so a concurrent stage never
+        # reads a partially written snapshot
+        snapshot.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=snapshot.parent) as tmp_dir:
+            tmp_file = Path(tmp_dir, snapshot.name)
+            pd.to_pickle(model, tmp_file)
+            os.replace(tmp_file, snapshot)
+        logger.info(f"Stored object model of {Path(path).name}")
+
+        return model
+
+    @property
+    def collections(self) -> list[str]:
+        """Collections of the memberships"""
+        return list(self._collections)
+
+    @property
+    def classes(self) -> list[str]:
+        """Child classes of the properties"""
+        return list(self._classes)
+
+    def memberships(
+        self, collection: str | list[str], parent_class: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Gets the memberships of one or more collections
+
+        Arguments
+        ---------
+        collection: str | list[str]
+            Collection, ie. "Nodes" for the node of each generator
+        parent_class: Optional[str]
+            Class of the parent objects, ie. "Generator"
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of the Memberships sheet, in the order of the sheet
+        """
+
+        collections = [collection] if isinstance(collection, str) else collection
+        positions = [
+            x for name in collections for x in self._collections.get(name, [])
+        ]
+        df = _select(self._memberships, positions)
+        if parent_class is not None:
+            df = df[df["parent_class"] == parent_class].reset_index(drop=True)
+        return df
+
+    def properties(self, child_class: str) -> pd.DataFrame:
+        """Gets the properties of the objects of a class
+
+        Arguments
+        ---------
+        child_class: str
+            Class of the objects, ie. "Generator"
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of the Properties sheet, in the order of the sheet
+        """
+
+        return _select(self._properties, self._classes.get(child_class, []))
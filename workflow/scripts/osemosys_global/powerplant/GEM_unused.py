@@ -4,6 +4,7 @@ import pandas as pd
 import os
 from scipy import spatial
 import numpy as np
+from osemosys_global.excel_cache import read_excel
 
 from constants import (
     start_year,
@@ -21,7 +22,7 @@ def gem_cap(df_gen_base, tech_code_dict, op_life_dict):
                                                   "gem_region_mapping.csv"), encoding = "ISO-8859-1")
     
     # pull locations from existing powerplants in PLEXOS-World dataset
-    gen_locationsinput = pd.read_excel(os.path.join(input_data_dir, 
+    gen_locationsinput = read_excel(os.path.join(input_data_dir, 
                                          "PLEXOS_World_2015_Gold_V1.1.xlsx"), 
                             sheet_name = "Attributes")
     
@@ -65,12 +66,12 @@ def gem_cap(df_gen_base, tech_code_dict, op_life_dict):
     old_criteria = ['mothballed', 'retired', 'operating']# operating added because currently operating plants can already have an intended retirement year added
     
     # Import gem Datasets
-    gem_coal = pd.read_excel(os.path.join(input_data_dir, 
+    gem_coal = read_excel(os.path.join(input_data_dir, 
                                                      'Global-Coal-Plant-Tracker-Jan-2022.xlsx'),
                                         sheet_name = 'Units', usecols = gem_coal_col.keys())
     
     
-    gem_gas = pd.read_excel(os.path.join(input_data_dir, 
+    gem_gas = read_excel(os.path.join(input_data_dir, 
                                                      'Global-Gas-Plant-Tracker-Feb-2022.xlsx'),
                                         sheet_name = 'Gas Units', usecols = gem_gas_col.keys())
     
@@ -18,13 +18,17 @@ from data import(
     create_pwr_techs, 
     duplicate_plexos_techs,
     new_iar,
-    get_years
+    get_years,
+    in_geographic_scope
     )
 
 from utils import apply_dtypes
 
+from osemosys_global.set_codes import code_field, code_slice
+
 def activity_master_start(df_gen_base, duplicate_techs, mode_list,
-                          custom_nodes, start_year, end_year):
+                          custom_nodes, start_year, end_year,
+                          geographic_scope=None, remove_nodes=None):
 
     # ### Add input and output activity ratios
 
@@ -40,6 +44,12 @@ def activity_master_start(df_gen_base, duplicate_techs, mode_list,
         else:
             node_list.append("".join(each_node.split('-')[1:]))
 
+    # Only build rows for nodes in the geographic scope
+    node_list = pd.Series(node_list)
+    node_list = list(node_list.loc[in_geographic_scope(node_list,
+                                                       geographic_scope,
+                                                       remove_nodes)])
+
     master_fuel_list = list(df_gen_base['tech_code'].unique())
     master_fuel_list.append('CCS')
 
@@ -59,14 +69,14 @@ def activity_output_pwr(df_ratios, region_name):
 
     # #### OutputActivityRatio - Power Generation Technologies
     df_pwr_oar_base = df_ratios.copy()
-    mask = df_pwr_oar_base['TECHNOLOGY'].apply(lambda x: x[3:6] in THERMAL_FUEL_LIST_OAR)
+    mask = code_field(df_pwr_oar_base['TECHNOLOGY'], "TECH").isin(THERMAL_FUEL_LIST_OAR)
     df_pwr_oar_base['FUEL'] = 0
     df_pwr_oar_base.loc[mask, "FUEL"] = 1
     
     df_pwr_oar_base = df_pwr_oar_base.loc[~((df_pwr_oar_base['MODE_OF_OPERATION'] > 1) &
                           (df_pwr_oar_base['FUEL'] == 0))]
     df_pwr_oar_base['FUEL'] = ('ELC' + 
-                      df_pwr_oar_base['TECHNOLOGY'].str[6:11] + 
+                      code_field(df_pwr_oar_base['TECHNOLOGY'], "NODE").astype(object) + 
                       '01'
                      )
     df_pwr_oar_base['VALUE'] = 1
@@ -94,50 +104,55 @@ def activity_input_pwr(df_pwr_iar_base, renewables_list, df_eff_node,
     df_pwr_iar_base['FUEL'] = 0
     df_pwr_iar_base['FUEL'] = df_pwr_iar_base['FUEL'].astype(str)
 
+    # Technology and country of each row, decoded once per unique technology
+    techs = df_pwr_iar_base['TECHNOLOGY']
+    tech = code_field(techs, "TECH")
+    country = code_field(techs, "COUNTRY").astype(object)
+
     # Deal with GAS techs first...  OCG and CCG
     # OCG Mode 1: Domestic GAS
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 1) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['OCG'])),
-               'FUEL'] = 'GAS'+df_pwr_iar_base['TECHNOLOGY'].str[6:9]
+               (tech.isin(['OCG'])),
+               'FUEL'] = 'GAS'+country
     # OCG Mode 2: International GAS
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 2) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['OCG'])),
+               (tech.isin(['OCG'])),
                'FUEL'] = 'GASINT'
 
     # CCG Mode 1: Domestic GAS
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 1) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['CCG'])),
-               'FUEL'] = 'GAS'+df_pwr_iar_base['TECHNOLOGY'].str[6:9]
+               (tech.isin(['CCG'])),
+               'FUEL'] = 'GAS'+country
 
     # CCG Mode 2: International GAS
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 2) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['CCG'])),
+               (tech.isin(['CCG'])),
                'FUEL'] = 'GASINT'
     
     # CCS Mode 1: Domestic COA
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 1) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['CCS'])),
-               'FUEL'] = 'COA'+df_pwr_iar_base['TECHNOLOGY'].str[6:9]
+               (tech.isin(['CCS'])),
+               'FUEL'] = 'COA'+country
 
     # CCS Mode 2: International COA
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 2) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(['CCS'])),
+               (tech.isin(['CCS'])),
                'FUEL'] = 'COAINT'
 
     # For non-GAS thermal fuels, domestic fuel input by country in mode 1 and 
     # 'international' fuel input in mode 2
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 1) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(THERMAL_FUEL_LIST_IAR)),
-               'FUEL'] = df_pwr_iar_base['TECHNOLOGY'].str[3:9]
+               (tech.isin(THERMAL_FUEL_LIST_IAR)),
+               'FUEL'] = code_slice(techs, 3, 9).astype(object)
 
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 2) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(THERMAL_FUEL_LIST_IAR)),
-               'FUEL'] = df_pwr_iar_base['TECHNOLOGY'].str[3:6] + 'INT'
+               (tech.isin(THERMAL_FUEL_LIST_IAR)),
+               'FUEL'] = tech.astype(object) + 'INT'
 
     # For renewable fuels, input by node in mode 1
     df_pwr_iar_base.loc[(df_pwr_iar_base['MODE_OF_OPERATION'] == 1) &
-               (df_pwr_iar_base['TECHNOLOGY'].str[3:6].isin(renewables_list)),
-               'FUEL'] = df_pwr_iar_base['TECHNOLOGY'].str[3:11]
+               (tech.isin(renewables_list)),
+               'FUEL'] = code_slice(techs, 3, 11).astype(object)
 
     # Remove mode 2 when not used
     df_pwr_iar_base = df_pwr_iar_base.loc[df_pwr_iar_base['FUEL'] != 0]
@@ -185,13 +200,16 @@ def activity_upstream(df_pwr_iar_final, renewables_list):
     # All mining and resource technologies have an OAR of 1...
     df_oar_upstream['VALUE'] = 1
     
+    fuel_type = code_field(df_oar_upstream['FUEL'], "PREFIX", "FUEL")
+    fuel_country = code_field(df_oar_upstream['FUEL'], "COUNTRY", "FUEL")
+
     # Renewables - set the technology as RNW + FUEL
-    df_oar_upstream.loc[df_oar_upstream['FUEL'].str[0:3].isin(renewables_list),
+    df_oar_upstream.loc[fuel_type.isin(renewables_list),
                'TECHNOLOGY'] = 'RNW'+df_oar_upstream['FUEL']
     
     # If the fuel is a thermal fuel, we need to create the OAR for the mining technology... BUT NOT FOR THE INT FUELS...
-    df_oar_upstream.loc[df_oar_upstream['FUEL'].str[0:3].isin(THERMAL_FUEL_LIST_MINING) & 
-                        ~(df_oar_upstream['FUEL'].str[3:6] == "INT"),
+    df_oar_upstream.loc[fuel_type.isin(THERMAL_FUEL_LIST_MINING) & 
+                        ~(fuel_country == "INT"),
                'TECHNOLOGY'] = 'MIN'+df_oar_upstream['FUEL']
     
     # Above should get all the outputs for the MIN technologies, but we need to adjust the mode 2 ones to just the fuel code (rather than MINCOAINT)
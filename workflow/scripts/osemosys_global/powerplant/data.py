@@ -4,6 +4,8 @@ import pandas as pd
 from datetime import datetime
 import logging
 
+from osemosys_global.plexos_world import PlexosWorld
+
 from constants import (
     NODES_EXTRA_LIST,
     AVG_CSP_EFF,
@@ -13,19 +15,42 @@ from constants import (
 def get_years(start: int, end: int) -> range:
     return range(start, end + 1)
 
-def set_generator_table(plexos_prop: pd.DataFrame, plexos_memb: pd.DataFrame, 
+def in_geographic_scope(node_codes: pd.Series, geographic_scope: list[str],
+                        remove_nodes: list[str]) -> pd.Series:
+    """Flags node codes that are part of the modelled geographic scope.
+
+    Mirrors the node logic of the geographic filter, so data outside the
+    scope is never created rather than removed at the end of the workflow.
+    An empty scope, or a scope of only international fuels ("INT"), keeps
+    all nodes.
+
+    Arguments:
+        node_codes = series of 5 letter node codes [INDWE, BTNXX, ...]
+        geographic_scope = list of 3 letter country codes [IND, BTN, INT, ...]
+        remove_nodes = list of 5 letter node codes to remove [INDNO, ...]
+
+    Returns:
+        Boolean series aligned with node_codes
+    """
+    mask = pd.Series(True, index=node_codes.index)
+    countries = [x for x in geographic_scope or [] if x != "INT"]
+    if countries:
+        mask &= node_codes.str[:3].isin(countries)
+    if remove_nodes:
+        mask &= ~node_codes.isin(remove_nodes)
+    return mask
+
+def set_generator_table(plexos: PlexosWorld, 
                         op_life_dict: dict[str, int], tech_code_dict: dict[str, str],
                         start_year: int, end_year: int) -> pd.DataFrame:
     """Sets the main generator table derived from the PLEXOS-World model.    
     """
 
     # Create main generator table
-    gen_cols_1 = ["child_class", "child_object", "property", "value"]
-    df_gen = plexos_prop.copy()[gen_cols_1]
+    gen_cols_1 = ["child_object", "property", "value"]
+    df_gen = plexos.properties("Generator")[gen_cols_1]
     
-    df_gen = df_gen[df_gen["child_class"] == "Generator"]
     df_gen.rename(columns={"child_object": "powerplant"}, inplace=True)
-    df_gen.drop("child_class", axis=1, inplace=True)
     df_gen = pd.pivot_table(df_gen,
                             index="powerplant",
                             columns="property",
@@ -40,14 +65,14 @@ def set_generator_table(plexos_prop: pd.DataFrame, plexos_memb: pd.DataFrame,
     gen_cols_base = ["Commission Date", "Heat Rate", "Max Capacity", "total_capacity"]
     df_gen_base = df_gen[gen_cols_base]
 
-    df_dict = plexos_memb[plexos_memb["parent_class"] == "Generator"].rename(
+    ## Compile dataframe with powerplants, nodes, and fuels
+    df_dict_fuel = plexos.memberships("Fuels", parent_class="Generator").rename(
         {"parent_object": "powerplant"}, axis=1
         )
-
-    ## Compile dataframe with powerplants, nodes, and fuels
-    df_dict_fuel = df_dict[df_dict["collection"] == "Fuels"]
     df_dict_fuel = df_dict_fuel[["powerplant", "child_object"]]
-    df_dict_nodes = df_dict[df_dict["collection"] == "Nodes"]
+    df_dict_nodes = plexos.memberships("Nodes", parent_class="Generator").rename(
+        {"parent_object": "powerplant"}, axis=1
+        )
     df_dict_nodes = df_dict_nodes[["powerplant", "child_object"]]
     df_dict_2 = pd.merge(df_dict_fuel, df_dict_nodes, how="outer", on="powerplant")
     
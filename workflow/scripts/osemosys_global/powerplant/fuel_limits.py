@@ -1,6 +1,11 @@
 """Applies fuel limits to mining technologies"""
 
+import numpy as np
 import pandas as pd
+import sys
+from osemosys_global.param_io import read_table, write_table
+from osemosys_global.utils import interpolate_years
+from osemosys_global.stage_cache import StageCache
 from typing import Optional
 
 
@@ -13,7 +18,7 @@ def import_fuel_limits(f: str) -> pd.DataFrame:
 
 
 def import_set(f: str) -> pd.Series:
-    s = pd.read_csv(f).squeeze()
+    s = read_table(f).squeeze()
     if isinstance(s, pd.Series):
         return s
     else:
@@ -48,36 +53,42 @@ def get_user_fuel_limits(
     assert len(r) == 1
     r = r[0]
 
-    if fuel_limits.empty:
+    if fuel_limits is None or fuel_limits.empty:
         return pd.Series()
 
     # format limits dataframe
     limits = fuel_limits.copy()
     limits = limits[limits.VALUE > 0.001].copy()  # assume these are zero
     limits["TECHNOLOGY"] = "MIN" + limits.FUEL + limits.COUNTRY
-    limits = limits[["TECHNOLOGY", "YEAR", "VALUE"]].set_index(["TECHNOLOGY", "YEAR"])
+    limits = limits[["TECHNOLOGY", "YEAR", "VALUE"]]
 
-    techs = limits.index.get_level_values("TECHNOLOGY").unique()
-
-    dfs = []
-
-    # need to interpolate each tehnology seperatly, as same years are not guaranteed
-    for tech in techs:
-        df = limits.loc[tech]
-        idx = pd.Index(range(min(df.index), max(df.index) + 1))
-        df = df.reindex(idx)
-        df["VALUE"] = df.VALUE.interpolate(
-            method="linear", limit_direction="both"
-        ).round(1)
-        df = df.reset_index().rename(columns={"index": "YEAR"})
-        df["TECHNOLOGY"] = tech
-        dfs.append(df[["TECHNOLOGY", "YEAR", "VALUE"]])
-
-    final = pd.concat(dfs)
+    if limits.empty:
+        return pd.Series()
 
-    final["REGION"] = r
+    # same years are not guaranteed, so all technologies are interpolated
+    # over all years at once and each is kept within its own years
+    tech, techs = pd.factorize(limits.TECHNOLOGY)
+    year = limits.YEAR.to_numpy()
+    years = np.arange(year.min(), year.max() + 1)
+
+    values = np.full((len(techs), len(years)), np.nan)
+    values[tech, year - years[0]] = limits.VALUE.to_numpy(dtype=float)
+    values = interpolate_years(values).round(1)
+
+    first = np.full(len(techs), year.max())
+    last = np.full(len(techs), year.min())
+    np.minimum.at(first, tech, year)
+    np.maximum.at(last, tech, year)
+    in_range = (years >= first[:, None]) & (years <= last[:, None])
+
+    # rows by technology, with years ascending
+    tech, year = np.nonzero(in_range)
+    idx = pd.MultiIndex.from_arrays(
+        [np.full(len(tech), r, dtype=object), techs[tech], years[year]],
+        names=["REGION", "TECHNOLOGY", "YEAR"],
+    )
 
-    return final.set_index(["REGION", "TECHNOLOGY", "YEAR"]).squeeze()
+    return pd.Series(values[tech, year], index=idx, name="VALUE")
 
 
 def merge_template_user_limits(
@@ -103,6 +114,9 @@ def merge_template_user_limits(
 if __name__ == "__main__":
 
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         technology_csv = snakemake.input.technology_csv
         fuel_limit_csv = snakemake.input.fuel_limit_csv
         region_csv = snakemake.input.region_csv
@@ -125,4 +139,7 @@ if __name__ == "__main__":
 
     activity_upper_limit = merge_template_user_limits(template, user_limits, years)
 
-    activity_upper_limit.to_csv(activity_upper_limit_csv, index=True)
+    write_table(activity_upper_limit, activity_upper_limit_csv, index=True)
+
+    if "snakemake" in globals():
+        stage_cache.store()
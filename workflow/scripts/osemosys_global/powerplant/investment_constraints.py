@@ -4,7 +4,8 @@ import itertools
 
 from data import(
     get_years,
-    get_max_value_per_technology
+    get_max_value_per_technology,
+    in_geographic_scope
     )
 
 from utils import apply_dtypes
@@ -12,7 +13,8 @@ from utils import apply_dtypes
 def set_renewable_limits(res_limits, tech_code_dict,
                          custom_nodes, custom_nodes_res_limits,
                          residual_capacity, start_year, 
-                         end_year, region_name):
+                         end_year, region_name,
+                         geographic_scope=None, remove_nodes=None):
     
     years = get_years(start_year, end_year)
 
@@ -48,12 +50,19 @@ def set_renewable_limits(res_limits, tech_code_dict,
         df_reslimit_final["node"].str.split("-").str[1:].str.join("")
     )
 
+    df_reslimit_final = df_reslimit_final.loc[
+        in_geographic_scope(df_reslimit_final["node_code"], geographic_scope, remove_nodes)
+    ].copy()
+
     df_reslimit_final["TECHNOLOGY"] = (
         "PWR" + df_reslimit_final["powerplant"] + df_reslimit_final["node_code"] + "01"
     )
     cap_addition_limit = df_reslimit_final.set_index("TECHNOLOGY").to_dict()["VALUE"]
 
     # Update custom values
+    custom_nodes_res_limits = custom_nodes_res_limits.loc[
+        in_geographic_scope(custom_nodes_res_limits["CUSTOM_NODE"], geographic_scope, remove_nodes)
+    ].copy()
     custom_nodes_res_limits["TECHNOLOGY"] = (
         "PWR"
         + custom_nodes_res_limits["FUEL_TYPE"]
@@ -198,63 +207,47 @@ def set_fossil_capacity_constraints(tech_list, fossil_targets,
     
     df_min_capacity.columns = ["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
     
-    if fossil_targets:
-        
-        # Loop through targets and apply
-        for param in fossil_targets:
-            region = param[0]
-            fuel = param[1]
-            technology = 'PWR' + fuel + region
-            first_year = param[2]
-            last_year = param[3]
-            sense = param[4]
-            value = param[5]
-            
-            years = get_years(first_year, last_year)
-            
-            # Pull residual capacity for OCG/CCG '00' technologies
-            res_cap = df_residual_capacity.loc[
-                (df_residual_capacity['TECHNOLOGY'] == technology + '00')
-                ]
-            
-            res_cap.loc[
-                res_cap['TECHNOLOGY'].str.contains('00'), 'TECHNOLOGY'
-                ] = res_cap['TECHNOLOGY'].str.replace('00', '01') 
-                                  
-            if sense == 'ABS' or sense == 'MAX':
-                    
-                    custom_max_cap = pd.DataFrame(
-                        list(itertools.product([region_name], [technology + '01'], 
-                                               years, [value])), 
-                        columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
-                    )
-                    
-                    # Substract residual capacity for OCG/CCG '00' technologies if applicable
-                    if not res_cap.empty:
-                        custom_max_cap = pd.merge(custom_max_cap, res_cap[['YEAR', 'VALUE']], 
-                                                  left_on = 'YEAR', right_on = 'YEAR')
-                        custom_max_cap['VALUE'] = custom_max_cap['VALUE_x'
-                                                                 ] - custom_max_cap['VALUE_y']
-                    
-                    df_max_capacity = pd.concat([df_max_capacity, custom_max_cap], 
-                                                join = 'inner').reset_index(drop = True)
-                          
-            if sense == 'ABS' or sense == 'MIN':
-                    
-                    custom_min_cap = pd.DataFrame(
-                        list(itertools.product([region_name], [technology + '01'], 
-                                               years, [value])), 
-                        columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
-                    )
-                    
-                    # Substract residual capacity for OCG/CCG '00' technologies if applicable
-                    if not res_cap.empty:
-                        custom_min_cap = pd.merge(custom_min_cap, res_cap[['YEAR', 'VALUE']], 
-                                                  left_on = 'YEAR', right_on = 'YEAR')
-                        custom_min_cap['VALUE'] = custom_min_cap['VALUE_x'
-                                                                 ] - custom_min_cap['VALUE_y']
-                    
-                    df_min_capacity = pd.concat([df_min_capacity, custom_min_cap],
-                                                join = 'inner').reset_index(drop = True)
+    if not fossil_targets:
+        return df_max_capacity, df_min_capacity
+
+    # Compile all targets into one table with a row per target and year.
+    targets = pd.DataFrame(fossil_targets, columns=["NODE", "FUEL", "START_YEAR",
+                                                    "END_YEAR", "SENSE", "VALUE"])
+    targets = targets.loc[targets.index.repeat(
+        (targets["END_YEAR"] + 1 - targets["START_YEAR"]).clip(lower=0))]
+    targets["YEAR"] = targets.groupby(level=0).cumcount() + targets["START_YEAR"]
+    targets = targets.rename_axis("POSITION").reset_index()
+
+    technology = 'PWR' + targets["FUEL"] + targets["NODE"]
+    targets["REGION"] = region_name
+    targets["TECHNOLOGY"] = technology + '01'
+    targets["RESIDUAL"] = technology + '00'
+
+    # Substract residual capacity for OCG/CCG '00' technologies if applicable.
+    # Targets with residual capacity only keep the years with residual capacity.
+    res_cap = df_residual_capacity.loc[
+        df_residual_capacity['TECHNOLOGY'].isin(targets["RESIDUAL"]),
+        ['TECHNOLOGY', 'YEAR', 'VALUE']
+        ].rename(columns={'TECHNOLOGY': 'RESIDUAL', 'VALUE': 'RES_CAP'})
+
+    has_res_cap = targets["RESIDUAL"].isin(res_cap["RESIDUAL"])
+    targets_res_cap = pd.merge(targets.loc[has_res_cap], res_cap,
+                               on=["RESIDUAL", "YEAR"])
+    targets_res_cap["VALUE"] = targets_res_cap["VALUE"] - targets_res_cap["RES_CAP"]
+
+    targets = pd.concat([targets.loc[~has_res_cap], targets_res_cap])
+    targets = targets.sort_values("POSITION", kind="stable")
+
+    columns = ["REGION", "TECHNOLOGY", "YEAR", "VALUE"]
+    custom_max_cap = targets.loc[targets["SENSE"].isin(['ABS', 'MAX']), columns]
+    custom_min_cap = targets.loc[targets["SENSE"].isin(['ABS', 'MIN']), columns]
+
+    if not custom_max_cap.empty:
+        df_max_capacity = pd.concat([df_max_capacity, custom_max_cap], 
+                                    join = 'inner').reset_index(drop = True)
+
+    if not custom_min_cap.empty:
+        df_min_capacity = pd.concat([df_min_capacity, custom_min_cap],
+                                    join = 'inner').reset_index(drop = True)
     
-    return df_max_capacity, df_min_capacity
\ No newline at end of file
+    return df_max_capacity, df_min_capacity
@@ -1,5 +1,9 @@
 import pandas as pd
+import sys
 import os
+from osemosys_global.param_io import table_path, write_table
+from osemosys_global.plexos_world import PlexosWorld
+from osemosys_global.stage_cache import StageCache
 
 from read import(
     import_plexos_2015,
@@ -25,6 +29,7 @@ from constants import(
 from data import(
     set_generator_table,
     average_efficiency,
+    in_geographic_scope,
     )
 
 from residual_capacity import(
@@ -77,8 +82,7 @@ from calibration import apply_calibration
 from backstop import get_backstop_data
 
 def main(
-    plexos_prop: pd.DataFrame,
-    plexos_memb: pd.DataFrame,
+    plexos: PlexosWorld,
     res_limit: pd.DataFrame,
     build_rates: pd.DataFrame,
     weo_costs: pd.DataFrame,
@@ -95,15 +99,25 @@ def main(
     # CALL FUNCTIONS
     
     # return generator_table
-    gen_table = set_generator_table(plexos_prop, plexos_memb, default_op_life, 
+    gen_table = set_generator_table(plexos, default_op_life, 
                                     tech_code_dict, start_year, end_year)
 
     # Calculate average technology efficiencies.
     df_eff_node, df_eff_tech = average_efficiency(gen_table)
 
-    # Create master table for activity ratios.
+    # Create master table for activity ratios for nodes in the geographic scope.
     df_ratios = activity_master_start(gen_table, DUPLICATE_TECHS, MODE_LIST,
-                                      custom_nodes, start_year, end_year)
+                                      custom_nodes, start_year, end_year,
+                                      geographic_scope, remove_nodes)
+
+    # Efficiencies and the technology list above use all generators, the
+    # remaining data is only built for generators in the geographic scope.
+    gen_table = gen_table.loc[in_geographic_scope(gen_table['node_code'],
+                                                  geographic_scope,
+                                                  remove_nodes)]
+    custom_res_cap = custom_res_cap.loc[in_geographic_scope(custom_res_cap['CUSTOM_NODE'],
+                                                            geographic_scope,
+                                                            remove_nodes)]
     
     # Set OutputActivitiyRatio for powerplants and set df structure for InputActivityRatio.
     df_pwr_oar_final, df_pwr_iar_base = activity_output_pwr(df_ratios, region_name)
@@ -199,7 +213,8 @@ def main(
     df_max_capacity = set_renewable_limits(res_limit, PW2050_TECH_DICT,
                                            custom_nodes, custom_res_potentials,
                                            df_res_cap, start_year, 
-                                           end_year, region_name)
+                                           end_year, region_name,
+                                           geographic_scope, remove_nodes)
     
     # Add user defined build rates to TotalAnnualMaxCapacityInvestment
     df_max_cap_invest = set_build_rates(build_rates, tech_set, df_max_cap_invest, 
@@ -242,55 +257,50 @@ def main(
     
     # OUTPUT CSV's USED AS INPUT FOR TRANSMISSION RULE
     
-    df_res_cap.to_csv(os.path.join(powerplant_data_dir, "ResidualCapacity.csv"), index=None)
+    write_table(df_res_cap, table_path(powerplant_data_dir, "ResidualCapacity", data_format))
     
-    df_oar_final.to_csv(os.path.join(powerplant_data_dir, "OutputActivityRatio.csv"), index=None)
+    write_table(df_oar_final, table_path(powerplant_data_dir, "OutputActivityRatio", data_format))
     
-    df_iar_final.to_csv(os.path.join(powerplant_data_dir, "InputActivityRatio.csv"), index=None)
+    write_table(df_iar_final, table_path(powerplant_data_dir, "InputActivityRatio", data_format))
 
-    df_cap_cost_final.to_csv(os.path.join(powerplant_data_dir, "CapitalCost.csv"), index = None)
+    write_table(df_cap_cost_final, table_path(powerplant_data_dir, "CapitalCost", data_format))
     
-    df_fix_cost_final.to_csv(os.path.join(powerplant_data_dir, "FixedCost.csv"), index = None)
+    write_table(df_fix_cost_final, table_path(powerplant_data_dir, "FixedCost", data_format))
     
-    df_capact_final.to_csv(os.path.join(powerplant_data_dir, "CapacityToActivityUnit.csv"), index = None)
+    write_table(df_capact_final, table_path(powerplant_data_dir, "CapacityToActivityUnit", data_format))
     
-    df_op_life.to_csv(os.path.join(powerplant_data_dir, "OperationalLife.csv"), index = None)
+    write_table(df_op_life, table_path(powerplant_data_dir, "OperationalLife", data_format))
     
-    df_max_cap_invest.to_csv(os.path.join(powerplant_data_dir, 
-                                            'TotalAnnualMaxCapacityInvestment.csv'),
-                                        index = None)
+    write_table(df_max_cap_invest, table_path(powerplant_data_dir, "TotalAnnualMaxCapacityInvestment", data_format))
     
-    df_min_cap_invest.to_csv(os.path.join(powerplant_data_dir, 
-                                            'TotalAnnualMinCapacityInvestment.csv'),
-                                        index = None)
+    write_table(df_min_cap_invest, table_path(powerplant_data_dir, "TotalAnnualMinCapacityInvestment", data_format))
     
-    tech_set.to_csv(os.path.join(powerplant_data_dir, "TECHNOLOGY.csv"), index = None)
+    write_table(tech_set, table_path(powerplant_data_dir, "TECHNOLOGY", data_format))
     
-    fuel_set.to_csv(os.path.join(powerplant_data_dir, "FUEL.csv"), index = None)
+    write_table(fuel_set, table_path(powerplant_data_dir, "FUEL", data_format))
     
     # OUTPUT CSV's NOT USED AS INPUT FOR TRANMISSION RULE
     
-    df_max_capacity.to_csv(os.path.join(output_data_dir, "TotalAnnualMaxCapacity.csv"), 
-                           index = None)
+    write_table(df_max_capacity, table_path(output_data_dir, "TotalAnnualMaxCapacity", data_format))
     
-    df_accumulated_annual_demand.to_csv(os.path.join(output_data_dir, 
-                                                     "AccumulatedAnnualDemand.csv"), 
-                                        index=None)
+    write_table(df_accumulated_annual_demand, table_path(output_data_dir, "AccumulatedAnnualDemand", data_format))
     
-    df_min_capacity.to_csv(os.path.join(output_data_dir, "TotalAnnualMinCapacity.csv"), 
-                                        index=None)
+    write_table(df_min_capacity, table_path(output_data_dir, "TotalAnnualMinCapacity", data_format))
     
-    df_af_final.to_csv(os.path.join(output_data_dir, 'AvailabilityFactor.csv'), index=None)
+    write_table(df_af_final, table_path(output_data_dir, "AvailabilityFactor", data_format))
     
-    years_set.to_csv(os.path.join(output_data_dir, "YEAR.csv"), index = None)
+    write_table(years_set, table_path(output_data_dir, "YEAR", data_format))
     
-    mode_list_set.to_csv(os.path.join(output_data_dir, "MODE_OF_OPERATION.csv"), index = None)
+    write_table(mode_list_set, table_path(output_data_dir, "MODE_OF_OPERATION", data_format))
     
-    regions_set.to_csv(os.path.join(output_data_dir, "REGION.csv"), index = None)
+    write_table(regions_set, table_path(output_data_dir, "REGION", data_format))
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_plexos = snakemake.input.plexos
         file_res_limit = snakemake.input.res_limit
         file_build_rates = snakemake.input.build_rates
@@ -312,9 +322,10 @@ if __name__ == "__main__":
         fossil_capacity_targets = snakemake.params.fossil_capacity_targets      
         calibration = snakemake.params.calibration
         output_data_dir = snakemake.params.output_data_dir
+        data_format = snakemake.params.data_format
         input_data_dir = snakemake.params.input_data_dir
         powerplant_data_dir = snakemake.params.powerplant_data_dir  
-        file_specified_annual_demand = f'{output_data_dir}/SpecifiedAnnualDemand.csv'  
+        file_specified_annual_demand = table_path(output_data_dir, "SpecifiedAnnualDemand", data_format)  
         file_custom_res_cap = snakemake.input.custom_res_cap
         file_custom_res_potentials = snakemake.input.custom_res_potentials
             
@@ -353,15 +364,15 @@ if __name__ == "__main__":
                                    ["INDSO", 'OCG', 2025, 2050, 'MAX', 25]]
         calibration = {'OCG': [50, "IND", 2021]}
         output_data_dir = 'results/data'
+        data_format = 'csv'
         input_data_dir = 'resources/data'
         powerplant_data_dir = 'results/data/powerplant'
-        file_specified_annual_demand = f'{output_data_dir}/SpecifiedAnnualDemand.csv'
+        file_specified_annual_demand = table_path(output_data_dir, "SpecifiedAnnualDemand", data_format)
         file_custom_res_cap = 'resources/data/custom/residual_capacity.csv'
         file_custom_res_potentials = 'resources/data/custom/RE_potentials.csv' 
 
     # SET INPUT DATA
-    plexos_prop = import_plexos_2015(file_plexos, "prop")
-    plexos_memb = import_plexos_2015(file_plexos, "memb")
+    plexos = import_plexos_2015(file_plexos)
     
     res_limit = import_res_limit(file_res_limit)
     build_rates = import_build_rates(file_build_rates)
@@ -388,8 +399,7 @@ if __name__ == "__main__":
     custom_res_potentials = import_custom_res_potentials(file_custom_res_potentials)
     
     input_data = {
-        "plexos_prop": plexos_prop,
-        "plexos_memb": plexos_memb,
+        "plexos": plexos,
         "res_limit" : res_limit,
         "build_rates" : build_rates,
         "weo_costs": weo_costs,
@@ -404,4 +414,7 @@ if __name__ == "__main__":
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
@@ -1,21 +1,17 @@
 """Module for reading in data sources"""
 
 import pandas as pd
+from osemosys_global.excel_cache import read_excel
+from osemosys_global.param_io import read_table
+from osemosys_global.plexos_world import PlexosWorld
 
 
-def import_plexos_2015(f: str, metric: str) -> dict[str, pd.DataFrame]:
-    """Imports PLEXOS-World 2015 model file.
+def import_plexos_2015(f: str) -> PlexosWorld:
+    """Imports PLEXOS-World 2015 model file as an indexed object model.
 
     PLEXOS_World_2015_Gold_V1.1.xlsx
     """
-    if metric.lower() == "memb":
-        sheet_name = "Memberships"
-    elif metric.lower() == "prop":
-        sheet_name = "Properties"
-    else:
-        raise NotImplementedError
-
-    return pd.read_excel(f, sheet_name=sheet_name)
+    return PlexosWorld.from_workbook(f)
 
 def import_res_limit(f: str) -> pd.DataFrame:
     """Imports the PLEXOS-World MESSAGix soft link model file for 
@@ -23,7 +19,7 @@ def import_res_limit(f: str) -> pd.DataFrame:
     
     PLEXOS_World_MESSAGEix_GLOBIOM_Softlink.xlsx
     """
-    return pd.read_excel(f, sheet_name = 'Properties')
+    return read_excel(f, sheet_name = 'Properties')
 
 def import_build_rates(f: str) -> pd.DataFrame:
     """Imports user defined build rates for powerplant technologies.
@@ -91,7 +87,7 @@ def import_cmo_forecasts(f: str) -> pd.DataFrame:
 
     CMO-October-2024-Forecasts.csv
     """
-    return pd.read_excel(
+    return read_excel(
         f,
         header=1,
         skiprows=([i for i in range(1, 3)] + [j for j in range(4, 25)]),
@@ -110,10 +106,10 @@ def import_specified_annual_demand(f: str) -> pd.DataFrame:
     
     SpecifiedAnnualDemand.csv
     """
-    return pd.read_csv(f)
+    return read_table(f)
 
 def import_set(f: str) -> pd.Series:
-    s = pd.read_csv(f).squeeze()
+    s = read_table(f).squeeze()
     if isinstance(s, pd.Series):
         return s
     else:
@@ -1,224 +1,211 @@
 """Function to set renewable targets."""
+import numpy as np
 import pandas as pd
-import itertools
 
-from data import get_years
+from osemosys_global.set_codes import decode
 
-def apply_re_pct_targets(re_targets, geographic_scope, remove_nodes, oar_df, 
+# Columns of the compiled targets, in the order of the re_targets config
+# parameter: TARGET: [COUNTRY/NODE, [TECHNOLOGY], TYPE, START_YEAR, END_YEAR, VALUE]
+TARGET_COLUMNS = ["TARGET", "GEO", "TECHNOLOGIES", "TYPE", "START_YEAR",
+                  "END_YEAR", "VALUE"]
+
+def compile_re_targets(re_targets):
+
+    """Compiles the configured targets into one table, with one row per
+    target in the configured order. GEO is the country or node code of the
+    target, or empty for targets over the whole geographic scope."""
+
+    if not re_targets:
+        return pd.DataFrame(columns=TARGET_COLUMNS)
+
+    targets = pd.DataFrame(
+        [[target, *target_params] for target, target_params in re_targets.items()],
+        columns=TARGET_COLUMNS)
+    targets["GEO"] = targets["GEO"].astype(str)
+
+    return targets
+
+def expand_target_years(targets):
+
+    """Repeats each target for every year from its first to its final year."""
+
+    years = (targets["END_YEAR"] + 1 - targets["START_YEAR"]).clip(lower=0)
+    df = targets.loc[targets.index.repeat(years)]
+    df["YEAR"] = df.groupby(level=0).cumcount() + df["START_YEAR"]
+
+    return df.reset_index(drop=True)
+
+def _get_target_techs(targets, oar_df, renewables_list, geographic_scope):
+
+    """Matches the targets against the unique technologies of the OAR. Gets
+    the position of the target and the technology of each match."""
+
+    techs = pd.Series(oar_df["TECHNOLOGY"].unique(), dtype=object)
+    parts = decode(techs, fields=["PREFIX", "TECH", "COUNTRY", "NODE"])
+    parts = parts.astype(object).assign(TECHNOLOGY=techs)
+    parts = parts.loc[parts["PREFIX"] == "PWR"]
+
+    # Check for a technology subset for the target.
+    target_techs = targets[["GEO"]].assign(
+        TECH=[x if x else renewables_list for x in targets["TECHNOLOGIES"]]
+    ).explode("TECH").rename_axis("POSITION").reset_index()
+
+    df = target_techs.merge(parts, on="TECH")
+
+    # Only keep the relevant country or node techs.
+    levels = df["GEO"].str.len()
+    keep = np.select(
+        [levels == 3, levels == 5, levels == 0],
+        [df["COUNTRY"] == df["GEO"], df["NODE"] == df["GEO"],
+         df["COUNTRY"].isin(geographic_scope)],
+        default=False)
+
+    return df.loc[keep, ["POSITION", "TECHNOLOGY"]].drop_duplicates()
+
+def _get_target_demand(specified_demand_df, levels, geographic_scope,
+                       remove_nodes):
+
+    """Sums SpecifiedAnnualDemand per year over the countries, nodes or the
+    whole geographic scope, as used by the targets."""
+
+    sp_demand_df = specified_demand_df.copy()
+    parts = decode(sp_demand_df["FUEL"], "FUEL", fields=["COUNTRY", "NODE"])
+
+    sp_demand_df["COUNTRY"] = parts["COUNTRY"].astype(object)
+    sp_demand_df["NODE"] = parts["NODE"].astype(object)
+    sp_demand_df = sp_demand_df.loc[~(sp_demand_df["NODE"].isin(remove_nodes))]
+
+    demand = []
+    for level in levels:
+        if level == 3:
+            df = sp_demand_df.assign(GEO=sp_demand_df["COUNTRY"])
+        elif level == 5:
+            df = sp_demand_df.assign(GEO=sp_demand_df["NODE"])
+        else:
+            df = sp_demand_df.loc[sp_demand_df["COUNTRY"].isin(geographic_scope)]
+            df = df.assign(GEO='')
+
+        df = df.groupby(["YEAR", "GEO"], as_index=False)["VALUE"].sum()
+        df["LEVEL"] = level
+        demand.append(df)
+
+    demand = pd.concat(demand, ignore_index=True)
+
+    return demand.rename(columns={"VALUE": "DEMAND"})
+
+def apply_re_pct_targets(re_targets, geographic_scope, remove_nodes, oar_df,
                          renewables_list, fuel_set, specified_demand_df, region_name):
-    
-    """Apply Renewable Energy targets by country, year and technology in 
-    relative terms compared to overall generation (= specified demand)."""
-    
+
+    """Apply Renewable Energy targets by country, year and technology in
+    relative terms compared to overall generation (= specified demand).
+
+    All targets are compiled into one table and matched against the OAR
+    technologies at once, so the dummy commodities, fuels and
+    AccumulatedAnnualDemand of all targets come out in a single pass."""
+
     if not remove_nodes:
         remove_nodes = []
-        
-    node_dict = {}
-    target_techs_dict = {}
-    type_dict = {}
-    first_year_dict = {}
-    final_year_dict = {}
-    value_dict = {}    
-    accumulated_annual_demand = pd.DataFrame(columns = ["REGION", "FUEL", 
+
+    accumulated_annual_demand = pd.DataFrame(columns = ["REGION", "FUEL",
                                                         "YEAR", "VALUE"])
-    
-    # Check if any targets are defined.
-    if not re_targets is None:
-        # Get transmission parameters from config file.
-        for target, target_params in re_targets.items():
-            node_dict[target] = target_params[0]
-            target_techs_dict[target] = target_params[1]
-            type_dict[target] = target_params[2]
-            first_year_dict[target] = target_params[3]
-            final_year_dict[target] = target_params[4]
-            value_dict[target] = target_params[5]
-        
-        # Per entry check if they are relative targets ('PCT').
-        for target in re_targets:
-            if type_dict[target] == 'PCT':
-                # Check for a technology subset for the target.
-                if not target_techs_dict[target]:
-                    tech_filter = renewables_list
-                else:
-                    tech_filter = target_techs_dict[target]
-                 
-                # Filter OAR df to only keep the relevant country techs.
-                if len(str(node_dict[target])) == 3:
-                    re_df = oar_df.loc[
-                        (oar_df["TECHNOLOGY"].str.startswith("PWR"))
-                        & (oar_df["TECHNOLOGY"].str[3:6].isin(tech_filter))
-                        & (oar_df["TECHNOLOGY"].str[6:9] == node_dict[target])
-                    ].copy()
-                
-                elif len(str(node_dict[target])) == 5:
-                    re_df = oar_df.loc[
-                        (oar_df["TECHNOLOGY"].str.startswith("PWR"))
-                        & (oar_df["TECHNOLOGY"].str[3:6].isin(tech_filter))
-                        & (oar_df["TECHNOLOGY"].str[6:11] == node_dict[target])
-                    ].copy()
-                    
-                elif len(str(node_dict[target])) == 0:
-                    re_df = oar_df.loc[
-                        (oar_df["TECHNOLOGY"].str.startswith("PWR"))
-                        & (oar_df["TECHNOLOGY"].str[3:6].isin(tech_filter))
-                        & (oar_df["TECHNOLOGY"].str[6:9].isin(geographic_scope))
-                    ].copy()
-                
-                # Create dummy commodity for the target.
-                re_df["FUEL"] = target + node_dict[target]
-                
-                # Add dummy commodity to OAR.
-                oar_df = pd.concat([oar_df, re_df]).drop_duplicates()
-            
-                # Add dummy commodity to fuel list.
-                fuels_ren_df = re_df[["FUEL"]].copy()
-                fuels_ren_df.rename(columns={"FUEL": "VALUE"}, inplace=True)
-    
-                fuel_set = pd.concat([fuel_set, fuels_ren_df]).dropna()
-                fuel_set.drop_duplicates(inplace=True)
-     
-                # Create dataframe template to calculate AccumulatedAnnualDemand
-                target_years = get_years(first_year_dict[target], final_year_dict[target])
-                re_targets_df = pd.DataFrame(
-                    list(itertools.product(target + node_dict[target], target_years)), 
-                    columns=["FUEL", "YEAR"]
-                )
-                re_targets_df["GEO"] = node_dict[target]
-                re_targets_df = re_targets_df[["GEO", "YEAR"]]
-                
-                re_targets_df['VALUE'] = value_dict[target] / 100
-                re_targets_df.drop_duplicates(inplace=True)
-    
-                re_targets_df = re_targets_df.pivot(
-                    index=["YEAR"], columns=["GEO"], values="VALUE"
-                ).reset_index()
-                re_targets_df = re_targets_df.interpolate()
-        
-                # Drop all columns with only NaN
-                re_targets_df.dropna(axis=1, how="all", inplace=True)
-        
-                # Melt to get 'COUNTRY' column and remove all rows with NaN
-                re_targets_df = pd.melt(
-                    re_targets_df,
-                    id_vars=["YEAR"],
-                    value_vars=[x for x in re_targets_df.columns if x not in ["YEAR"]],
-                    var_name="GEO",
-                    value_name="VALUE",
-                )
-                re_targets_df.dropna(axis=0, inplace=True)
-        
-                # Read 'SpecifiedAnnualDemand' as output from the demand_projection rule.
-                sp_demand_df = specified_demand_df.loc[
-                    ~(specified_demand_df["FUEL"].str[3:8].isin(remove_nodes))
-                ]
-                  
-                if len(str(node_dict[target])) == 3:
-                    sp_demand_df["GEO"] = sp_demand_df["FUEL"].str[3:6]
-                    
-                elif len(str(node_dict[target])) == 5:
-                    sp_demand_df["GEO"] = sp_demand_df["FUEL"].str[3:8]
-                    
-                elif len(str(node_dict[target])) == 0:
-                    sp_demand_df["GEO"] = ''
-                    sp_demand_df = sp_demand_df.loc[sp_demand_df["FUEL"
-                                                                 ].str[3:6].isin(
-                                                                     geographic_scope)]
-                    
-                sp_demand_df = sp_demand_df.groupby(["YEAR", "GEO"], as_index=False)[
-                    "VALUE"
-                ].sum()
-                sp_demand_df.rename(columns={"VALUE": "DEMAND"}, inplace=True)
-                
-                # Merge RE targets and SpecifiedAnnualDemand tables
-                re_targets_df = pd.merge(
-                    re_targets_df, sp_demand_df, how="left", on=["GEO", "YEAR"]
-                )
-                
-                # Calculate the target for the dummy RES commodity
-                re_targets_df["VALUE"] = re_targets_df["VALUE"] * re_targets_df["DEMAND"]
-                re_targets_df["FUEL"] = target + re_targets_df["GEO"]
-                re_targets_df["REGION"] = region_name
-                re_targets_df = re_targets_df[["REGION", "FUEL", "YEAR", "VALUE"]]
-                
-                if accumulated_annual_demand.empty:
-                
-                    accumulated_annual_demand = re_targets_df
-                
-                else:
-                    accumulated_annual_demand = pd.concat([
-                        accumulated_annual_demand, 
-                        re_targets_df])
+
+    # Per entry check if they are relative targets ('PCT').
+    targets = compile_re_targets(re_targets)
+    targets = targets.loc[targets["TYPE"] == 'PCT'].reset_index(drop=True)
+
+    if targets.empty:
+        return fuel_set, oar_df, accumulated_annual_demand
+
+    levels = targets["GEO"].str.len()
+    if not levels.isin([0, 3, 5]).all():
+        raise ValueError(
+            f'PCT targets must be set for a country (e.g. IND), a node (e.g. '
+            f'INDSO) or the whole geographic scope (""). '
+            f'{targets.loc[~levels.isin([0, 3, 5]), "TARGET"].tolist()} '
+            f'are incorrectly set.')
+
+    # Dummy commodity of each target.
+    target_fuels = targets["TARGET"] + targets["GEO"]
+
+    # Copy the OAR rows of the matched technologies, target by target in the
+    # order of the OAR, to output the dummy commodity.
+    target_techs = _get_target_techs(targets, oar_df, renewables_list,
+                                     geographic_scope)
+    rows = oar_df[["TECHNOLOGY"]].reset_index(drop=True).rename_axis("ROW")
+    rows = target_techs.merge(rows.reset_index(), on="TECHNOLOGY")
+    rows = rows.sort_values(["POSITION", "ROW"], kind="stable")
+
+    re_df = oar_df.iloc[rows["ROW"].to_numpy()].copy()
+    re_df["FUEL"] = target_fuels.to_numpy()[rows["POSITION"].to_numpy()]
+
+    # Add dummy commodities to OAR.
+    oar_df = pd.concat([oar_df, re_df]).drop_duplicates()
+
+    # Add dummy commodities to fuel list.
+    fuels_ren_df = re_df[["FUEL"]].rename(columns={"FUEL": "VALUE"})
+    fuel_set = pd.concat([fuel_set, fuels_ren_df]).dropna()
+    fuel_set.drop_duplicates(inplace=True)
+
+    # Calculate the AccumulatedAnnualDemand of the dummy commodities as the
+    # target share of the SpecifiedAnnualDemand of each country or node.
+    re_targets_df = expand_target_years(targets.assign(LEVEL=levels))
+    re_targets_df["VALUE"] = re_targets_df["VALUE"] / 100
+
+    sp_demand_df = _get_target_demand(specified_demand_df, levels.unique(),
+                                      geographic_scope, remove_nodes)
+
+    re_targets_df = pd.merge(
+        re_targets_df, sp_demand_df, how="left", on=["LEVEL", "GEO", "YEAR"]
+    )
+
+    re_targets_df["VALUE"] = re_targets_df["VALUE"] * re_targets_df["DEMAND"]
+    re_targets_df["FUEL"] = re_targets_df["TARGET"] + re_targets_df["GEO"]
+    re_targets_df["REGION"] = region_name
+
+    if not re_targets_df.empty:
+        accumulated_annual_demand = re_targets_df[["REGION", "FUEL", "YEAR", "VALUE"]]
 
     return fuel_set, oar_df, accumulated_annual_demand
 
 def apply_re_abs_targets(re_targets, remove_nodes, region_name):
-    
+
     """Apply Renewable Energy targets by country, year and technology
     in absolute terms (GW)."""
-    
+
     if not remove_nodes:
         remove_nodes = []
-        
-    node_dict = {}
-    target_techs_dict = {}
-    type_dict = {}
-    first_year_dict = {}
-    final_year_dict = {}
-    value_dict = {}
-        
-    total_annual_min_capacity = pd.DataFrame(columns = ["REGION", "TECHNOLOGY", 
+
+    total_annual_min_capacity = pd.DataFrame(columns = ["REGION", "TECHNOLOGY",
                                                         "YEAR", "VALUE"])
-    # Check if any targets are defined.
-    if not re_targets is None:
-        # Get transmission parameters from config file.
-        for target, target_params in re_targets.items():
-            node_dict[target] = target_params[0]
-            target_techs_dict[target] = target_params[1]
-            type_dict[target] = target_params[2]
-            first_year_dict[target] = target_params[3]
-            final_year_dict[target] = target_params[4]
-            value_dict[target] = target_params[5]
-
-        # Per entry check if they are absolute targets ('ABS').
-        for target in re_targets:
-            if type_dict[target] == 'ABS':
-                target_years = get_years(first_year_dict[target], 
-                                         final_year_dict[target])
-                # Check to make sure only one tech is defined per 'ABS' target.
-                if len(target_techs_dict[target]) != 1:
-                    raise Exception(
-                        f'Only one tech can be defined per ABS target as entered \
-                            in the re_targets config parameter. {target} is \
-                                incorrectly set.')
-
-                # Check to make sure 'ABS' target is defined at the nodal level.
-                if len(str(node_dict[target])) != 5:
-                    raise Exception(
-                        f'ABS targets can only be set at the nodal level \
-                            in the re_targets config parameter (e.g. INDSO). \
-                                {target} is incorrectly set.')
-                
-                # Set target specific data
-                data = pd.DataFrame(
-                    list(itertools.product(target_years)), 
-                    columns=[["YEAR"]])
-                
-                data['REGION'] = region_name
-                data['TECHNOLOGY'] = 'PWR' + target_techs_dict[
-                    target][0] + node_dict[target] + '01'
-                data['VALUE'] = value_dict[target]
-                
-                # Combine data
-                if total_annual_min_capacity.empty:
-                
-                    total_annual_min_capacity = data
-                
-                else:
-                    total_annual_min_capacity = pd.concat([
-                        total_annual_min_capacity, 
-                        data])
-    
+
+    # Per entry check if they are absolute targets ('ABS').
+    targets = compile_re_targets(re_targets)
+    targets = targets.loc[targets["TYPE"] == 'ABS'].reset_index(drop=True)
+
+    for target, techs, node in zip(targets["TARGET"], targets["TECHNOLOGIES"],
+                                   targets["GEO"]):
+        # Check to make sure only one tech is defined per 'ABS' target.
+        if len(techs) != 1:
+            raise Exception(
+                f'Only one tech can be defined per ABS target as entered \
+                    in the re_targets config parameter. {target} is \
+                        incorrectly set.')
+
+        # Check to make sure 'ABS' target is defined at the nodal level.
+        if len(node) != 5:
+            raise Exception(
+                f'ABS targets can only be set at the nodal level \
+                    in the re_targets config parameter (e.g. INDSO). \
+                        {target} is incorrectly set.')
+
+    data = expand_target_years(targets)
+
+    if not data.empty:
+        data['REGION'] = region_name
+        data['TECHNOLOGY'] = 'PWR' + data['TECHNOLOGIES'].str[0] + data['GEO'] + '01'
+        total_annual_min_capacity = data
+
     total_annual_min_capacity = total_annual_min_capacity[["REGION", "TECHNOLOGY",
                                                           "YEAR", "VALUE"]]
-    
-    return total_annual_min_capacity  
\ No newline at end of file
+
+    return total_annual_min_capacity
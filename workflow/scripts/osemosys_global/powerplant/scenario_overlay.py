@@ -0,0 +1,111 @@
+"""Applies the renewable targets of a scenario to the shared base data.
+
+When several scenarios are run, the powerplant rule is run once without
+renewable targets. This script adds the target commodities of one scenario to
+the base OutputActivityRatio, FUEL, AccumulatedAnnualDemand and
+TotalAnnualMinCapacity. The overlay tables replace the base tables in the
+geographic filter of the scenario.
+"""
+
+import pandas as pd
+from osemosys_global.param_io import read_table, table_path, write_table
+
+from constants import RENEWABLES_LIST
+
+from read import import_specified_annual_demand
+
+from renewable_targets import(
+    apply_re_pct_targets,
+    apply_re_abs_targets,
+    )
+
+def _concat(dfs: list[pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+    dfs = [x for x in dfs if not x.empty]
+    if not dfs:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(dfs, ignore_index=True)[columns]
+
+def main(
+    oar_base: pd.DataFrame,
+    fuel_set_base: pd.DataFrame,
+    accumulated_annual_demand_base: pd.DataFrame,
+    min_capacity_base: pd.DataFrame,
+    specified_demand: pd.DataFrame,
+):
+
+    # Set OAR, FUEL and AccumulatedAnnualDemand based on the scenario RES
+    # generation targets.
+    (fuel_set,
+     df_oar_final,
+     df_accumulated_annual_demand) = apply_re_pct_targets(res_targets,
+                                                          geographic_scope,
+                                                          remove_nodes,
+                                                          oar_base,
+                                                          RENEWABLES_LIST,
+                                                          fuel_set_base,
+                                                          specified_demand,
+                                                          region_name)
+
+    # Base demand holds the calibration commodities, which follow the targets.
+    df_accumulated_annual_demand = _concat([df_accumulated_annual_demand,
+                                            accumulated_annual_demand_base],
+                                           list(accumulated_annual_demand_base.columns))
+
+    # Base min capacity holds the fossil capacity constraints, which follow
+    # the targets.
+    df_min_capacity = _concat([apply_re_abs_targets(res_targets, remove_nodes,
+                                                    region_name),
+                               min_capacity_base],
+                              list(min_capacity_base.columns))
+
+    write_table(df_oar_final,
+                table_path(overlay_dir, "OutputActivityRatio", data_format))
+
+    write_table(fuel_set, table_path(overlay_dir, "FUEL", data_format))
+
+    write_table(df_accumulated_annual_demand,
+                table_path(overlay_dir, "AccumulatedAnnualDemand", data_format))
+
+    write_table(df_min_capacity,
+                table_path(overlay_dir, "TotalAnnualMinCapacity", data_format))
+
+if __name__ == "__main__":
+
+    if "snakemake" in globals():
+        res_targets = snakemake.params.res_targets
+        geographic_scope = snakemake.params.geographic_scope
+        remove_nodes = snakemake.params.remove_nodes
+        region_name = snakemake.params.region_name
+        input_data_dir = snakemake.params.input_data_dir
+        overlay_dir = snakemake.params.overlay_dir
+        data_format = snakemake.params.data_format
+
+    # The below else statement defines variables if the 'powerplant/scenario_overlay'
+    # script is to be run locally outside the snakemake workflow. This is relevant
+    # for testing purposes only!
+
+    else:
+        res_targets = {'T01': ["", [], "PCT", 2048, 2050, 95],
+                       'T02': ["IND", [], "PCT", 2030, 2040, 60],
+                       'T04': ["INDSO", ['WOF'], "ABS", 2040, 2050, 100]
+                      }
+        geographic_scope = ['IND']
+        remove_nodes = []
+        region_name = 'GLOBAL'
+        input_data_dir = 'results/data'
+        overlay_dir = 'results/India/overlay'
+        data_format = 'csv'
+
+    input_data = {
+        "oar_base": read_table(
+            table_path(input_data_dir, "OutputActivityRatio", data_format)),
+        "fuel_set_base": read_table(table_path(input_data_dir, "FUEL", data_format)),
+        "accumulated_annual_demand_base": read_table(
+            table_path(input_data_dir, "AccumulatedAnnualDemand", data_format)),
+        "min_capacity_base": read_table(
+            table_path(input_data_dir, "TotalAnnualMinCapacity", data_format)),
+        "specified_demand": import_specified_annual_demand(
+            table_path(input_data_dir, "SpecifiedAnnualDemand", data_format)),
+    }
+
+    main(**input_data)
@@ -4,9 +4,16 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+import numpy as np
 import pandas as pd
+import sys
 from typing import Optional
 
+from osemosys_global.param_io import write_table
+from osemosys_global.set_codes import code_field
+from osemosys_global.utils import interpolate_years
+from osemosys_global.stage_cache import StageCache
+
 from read import (
     import_cmo_forecasts,
     import_fuel_prices,
@@ -110,59 +117,70 @@ def expand_cmo_data(
     countries: list[str],
     international_cost_multiplier: Optional[int | float] = None,
 ) -> pd.DataFrame:
-    """Expands CMO data to match user defined years and all countries"""
+    """Expands CMO data to match user defined years and all countries
 
-    df_template = cmo.copy()
+    The international rows keep the country of the CMO data, with the prices
+    scaled by the international cost multiplier. Every fuel is then repeated
+    for each country with the unscaled price.
+    """
 
-    for year in years:
-        df_template[str(year)] = df_template["VALUE"]
-    df_template = df_template.drop(columns="VALUE").set_index(
-        ["FUEL", "COUNTRY", "UNIT", "ENERGY_CONTENT"]
-    )
+    keys = ["FUEL", "COUNTRY", "UNIT", "ENERGY_CONTENT"]
+    values = cmo["VALUE"].to_numpy(dtype=float)
 
-    df_international = df_template.copy()
+    international = cmo[keys].reset_index(drop=True)
+    international_values = values
     if international_cost_multiplier:
-        df_international = df_international.mul(international_cost_multiplier)
+        international_values = values * international_cost_multiplier
+
+    country = cmo[keys].iloc[np.repeat(np.arange(len(cmo)), len(countries))]
+    country = country.reset_index(drop=True)
+    country["COUNTRY"] = np.tile(np.asarray(countries, dtype=object), len(cmo))
 
-    df_country = df_template.copy().droplevel("COUNTRY")
-    df_country["COUNTRY"] = [countries] * len(df_country)
-    df_country = df_country.explode("COUNTRY")
-    df_country = df_country.reset_index().set_index(
-        ["FUEL", "COUNTRY", "UNIT", "ENERGY_CONTENT"]
+    df = pd.concat([international, country], ignore_index=True)
+    prices = np.concatenate(
+        [international_values, np.repeat(values, len(countries))]
     )
 
-    return pd.concat([df_international, df_country]).reset_index()
+    # same price in every year
+    df_years = pd.DataFrame(
+        np.repeat(prices[:, np.newaxis], len(years), axis=1),
+        columns=[str(x) for x in years],
+    )
+    return pd.concat([df, df_years], axis=1)
 
 
 def expand_merged_data(costs: pd.DataFrame, modelled_years: list[int]) -> pd.DataFrame:
-    """Expands cmo/user merged data to interpolate values over all model years"""
+    """Expands cmo/user merged data to interpolate values over all model years
 
-    df = costs.copy()
-    df["YEAR"] = df.YEAR.astype(int)
+    Prices are held as a dense fuel by country by year array, in sorted fuel
+    and country order, and interpolated along the year axis in one call.
+    """
+
+    year = costs.YEAR.astype(int).to_numpy()
 
     # get year bounds as interpolation can use years outside model scope
-    min_year = min(min(modelled_years), min(costs.YEAR.astype(int)))
-    max_year = max(max(modelled_years), max(costs.YEAR.astype(int)))
+    min_year = min(min(modelled_years), year.min())
+    max_year = max(max(modelled_years), year.max())
+    years = np.arange(min_year, max_year + 1)
 
-    df = df.set_index(["FUEL", "COUNTRY", "YEAR"])
+    fuel, fuels = pd.factorize(costs["FUEL"], sort=True)
+    country, countries = pd.factorize(costs["COUNTRY"], sort=True)
 
-    # new index parameters
-    fules = df.index.get_level_values("FUEL").unique()
-    years = range(min_year, max_year + 1)
-    countries = df.index.get_level_values("COUNTRY").unique()
+    prices = np.full((len(fuels), len(countries), len(years)), np.nan)
+    prices[fuel, country, year - min_year] = costs["VALUE"].to_numpy(dtype=float)
+    prices = interpolate_years(prices)
 
-    # interpolate over years
-    idx = pd.MultiIndex.from_product(
-        [fules, countries, years], names=["FUEL", "COUNTRY", "YEAR"]
-    )
-    df = df.reindex(idx)
-    df = df.groupby(level=["FUEL", "COUNTRY"])["VALUE"].apply(
-        lambda x: x.interpolate(method="linear", limit_direction="both")
+    return pd.DataFrame(
+        {
+            "FUEL": np.repeat(np.asarray(fuels), len(countries) * len(years)),
+            "COUNTRY": np.tile(
+                np.repeat(np.asarray(countries), len(years)), len(fuels)
+            ),
+            "YEAR": np.tile(years, len(fuels) * len(countries)),
+            "VALUE": prices.ravel(),
+        }
     )
 
-    # drop level to get rid of the grouping key
-    return df.droplevel([0, 1]).reset_index()
-
 
 def get_user_fuel_years(user_fuel_prices: pd.DataFrame) -> list[int]:
     """Gets years that user fuel prices are defined over"""
@@ -245,9 +263,8 @@ def get_countries_from_techs(technologies: pd.Series) -> list[str]:
 
     techs = technologies.copy()
     techs = techs[techs.str.startswith("PWR")]
-    techs = techs.map(lambda x: x[6:9])
 
-    return techs.unique().tolist()
+    return code_field(techs, "COUNTRY").astype(object).unique().tolist()
 
 
 def get_nodes_from_techs(technologies: pd.Series) -> list[str]:
@@ -255,9 +272,8 @@ def get_nodes_from_techs(technologies: pd.Series) -> list[str]:
 
     techs = technologies.copy()
     techs = techs[techs.str.startswith("PWR")]
-    techs = techs.map(lambda x: x[6:11])
 
-    return techs.unique().tolist()
+    return code_field(techs, "NODE").astype(object).unique().tolist()
 
 
 def filter_var_cost_technologies(
@@ -434,6 +450,9 @@ def main(
 if __name__ == "__main__":
 
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_cmo_forecasts = snakemake.input.cmo_forecasts
         file_fuel_prices = snakemake.input.fuel_prices
         file_regions = snakemake.input.regions
@@ -469,4 +488,7 @@ if __name__ == "__main__":
 
     df = main(**input_data)
 
-    df.to_csv(file_var_costs, index=True)
+    write_table(df, file_var_costs, index=True)
+
+    if "snakemake" in globals():
+        stage_cache.store()
@@ -0,0 +1,214 @@
+"""Memory mapped store of hourly profiles
+
+The hourly demand and renewable profiles are wide CSV files of 8760 rows with
+a column per node. They are converted once into a float32 array of nodes x
+hours, with a JSON catalogue of the node columns and the timestamps. Profiles
+are then read from the mapped array for the nodes in the geographic scope
+only, without parsing any text.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = "resources/data/profiles"
+
+DTYPE = "float32"
+
+
+def store_paths(store_dir: str, name: str) -> tuple[Path, Path]:
+    """Gets the paths of the array and the catalogue of a profile"""
+
+    return Path(store_dir, f"{name}.f32"), Path(store_dir, f"{name}.json")
+
+
+def node_codes(columns: list[str]) -> list[str]:
+    """Gets the node codes of profile columns
+
+    Follows the naming of the nodes in TS_data, ie. "AS-IND-EA" -> "INDEA"
+    and "AS-BTN" -> "BTNXX". Custom node columns, ie. "BTNXX", are kept.
+    """
+
+    codes = []
+    for column in columns:
+        if len(column) == 6:
+            codes.append("".join(column.split("-")[1:]) + "XX")
+        elif len(column) > 6:
+            codes.append("".join(column.split("-")[1:]))
+        else:
+            codes.append(column)
+    return codes
+
+
+def in_scope(
+    codes: list[str],
+    geographic_scope: Optional[list[str]] = None,
+    custom_nodes: Optional[list[str]] = None,
+) -> np.ndarray:
+    """Flags nodes in the geographic scope
+
+    Arguments
+    ---------
+    codes: list[str]
+        Node codes, or names starting with the country code
+    geographic_scope: Optional[list[str]]
+        Country codes. All nodes are in an empty scope.
+    custom_nodes: Optional[list[str]]
+        Node codes kept in addition to the scope
+
+    Returns
+    -------
+    np.ndarray
+        Boolean mask aligned with the codes
+    """
+
+    codes = pd.Series(codes, dtype=str)
+    if not geographic_scope:
+        return np.ones(len(codes), dtype=bool)
+
+    mask = codes.str[:3].isin(geographic_scope)
+    if custom_nodes:
+        mask |= codes.isin(custom_nodes)
+    return mask.to_numpy()
+
+
+def write_profiles(csv_files: list[str], store_dir: str, name: str) -> None:
+    """Converts hourly profile CSVs into the store
+
+    The node columns of all files are stored in order, as if the files were
+    concatenated side by side. Timestamps are taken from the first file.
+
+    Arguments
+    ---------
+    csv_files: list[str]
+        Profiles with a Datetime column and a column per node
+    store_dir: str
+        Directory of the store
+    name: str
+        Name of the profile, ie. "SPV"
+    """
+
+    frames = [pd.read_csv(x, encoding="latin-1") for x in csv_files]
+
+    hours = len(frames[0])
+    for csv_file, df in zip(csv_files, frames):
+        if len(df) != hours:
+            raise ValueError(f"{csv_file} has {len(df)} hours rather than {hours}")
+
+    columns = [x for df in frames for x in df.columns if x != "Datetime"]
+
+    data_file, catalogue_file = store_paths(store_dir, name)
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+
+    # one row per node, so the hours of a node are read in a single block
+    with open(data_file, "wb") as f:
+        for df in frames:
+            df.drop(columns="Datetime").to_numpy(dtype=DTYPE).T.tofile(f)
+
+    catalogue = {
+        "dtype": DTYPE,
+        "hours": hours,
+        "nodes": [
+            {"column": x, "code": y} for x, y in zip(columns, node_codes(columns))
+        ],
+        "datetime": frames[0]["Datetime"].astype(str).tolist(),
+    }
+    with open(catalogue_file, "w") as f:
+        json.dump(catalogue, f)
+
+    logger.info(f"Stored {len(columns)} {name} profiles of {hours} hours")
+
+
+def read_catalogue(store_dir: str, name: str) -> dict[str, Any]:
+    """Reads the catalogue of a profile"""
+
+    with open(store_paths(store_dir, name)[1]) as f:
+        return json.load(f)
+
+
+def read_profiles(
+    store_dir: str,
+    name: str,
+    geographic_scope: Optional[list[str]] = None,
+    custom_nodes: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """Reads profiles from the store
+
+    Arguments
+    ---------
+    store_dir: str
+        Directory of the store
+    name: str
+        Name of the profile, ie. "SPV"
+    geographic_scope: Optional[list[str]]
+        Country codes to read the nodes of. All nodes are read for an empty
+        scope.
+    custom_nodes: Optional[list[str]]
+        Node codes read in addition to the scope
+
+    Returns
+    -------
+    pd.DataFrame
+        Datetime column and a float32 column per node, in the order of the
+        CSV columns
+    """
+
+    catalogue = read_catalogue(store_dir, name)
+    nodes = pd.DataFrame(catalogue["nodes"], columns=["column", "code"])
+    keep = np.flatnonzero(in_scope(nodes["code"], geographic_scope, custom_nodes))
+
+    shape = (len(nodes), catalogue["hours"])
+    if len(nodes):
+        values = np.memmap(
+            store_paths(store_dir, name)[0],
+            dtype=catalogue["dtype"],
+            mode="r",
+            shape=shape,
+        )
+        values = np.asarray(values[keep]).T
+    else:
+        values = np.empty((catalogue["hours"], 0), dtype=catalogue["dtype"])
+
+    df = pd.DataFrame(values, columns=nodes["column"].iloc[keep].tolist())
+    df.insert(0, "Datetime", catalogue["datetime"])
+    return df
+
+
+if __name__ == "__main__":
+    if "snakemake" in globals():
+        store_dir = snakemake.params.store_dir
+        profiles = {
+            "demand": snakemake.input.demand,
+            "CSP": snakemake.input.csp,
+            "SPV": snakemake.input.spv,
+            "WON": snakemake.input.won,
+            "WOF": snakemake.input.wof,
+        }
+    else:
+        store_dir = sys.argv[1] if len(sys.argv) > 1 else STORE_DIR
+        default_dir = "resources/data/default"
+        custom_dir = "resources/data/custom"
+        profiles = {
+            "demand": [f"{default_dir}/All_Demand_UTC_2015.csv"],
+            "CSP": [f"{default_dir}/CSP 2015.csv", f"{custom_dir}/RE_profiles_CSP.csv"],
+            "SPV": [
+                f"{default_dir}/SolarPV 2015.csv",
+                f"{custom_dir}/RE_profiles_SPV.csv",
+            ],
+            "WON": [f"{default_dir}/Won 2015.csv", f"{custom_dir}/RE_profiles_WON.csv"],
+            "WOF": [
+                f"{default_dir}/Woff 2015.csv",
+                f"{custom_dir}/RE_profiles_WOF.csv",
+            ],
+        }
+
+    for name, csv_files in profiles.items():
+        write_profiles(list(csv_files), store_dir, name)
@@ -1,5 +1,7 @@
 import pandas as pd
-import os
+import sys
+from osemosys_global.param_io import table_path, write_table
+from osemosys_global.stage_cache import StageCache
 
 from read import(
     import_technologies,
@@ -29,28 +31,27 @@ def main(tech_set_base: pd.DataFrame,
     # OUTPUT CSV's
     
     
-    df_reserve_margin.to_csv(os.path.join(output_data_dir, 'ReserveMargin.csv'), 
-                             index = None)
+    write_table(df_reserve_margin, table_path(output_data_dir, "ReserveMargin", data_format))
     
-    df_reserve_margin_tag_fuel.to_csv(os.path.join(output_data_dir, 
-                                                   'ReserveMarginTagFuel.csv'), 
-                             index = None)
+    write_table(df_reserve_margin_tag_fuel, table_path(output_data_dir, "ReserveMarginTagFuel", data_format))
     
-    df_reserve_margin_tag_tech.to_csv(os.path.join(output_data_dir, 
-                                                   'ReserveMarginTagTechnology.csv'), 
-                             index = None) 
+    write_table(df_reserve_margin_tag_tech, table_path(output_data_dir, "ReserveMarginTagTechnology", data_format)) 
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():     
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         start_year = snakemake.params.start_year
         end_year = snakemake.params.end_year
         region_name = snakemake.params.region_name
         margins = snakemake.params.reserve_margin
         margins_technologies = snakemake.params.reserve_margin_technologies
         output_data_dir = snakemake.params.output_data_dir
-        file_tech_set = f'{output_data_dir}/TECHNOLOGY.csv'
-        file_fuel_set = f'{output_data_dir}/FUEL.csv'  
+        data_format = snakemake.params.data_format
+        file_tech_set = table_path(output_data_dir, "TECHNOLOGY", data_format)
+        file_fuel_set = table_path(output_data_dir, "FUEL", data_format)  
         
     # The below else statement defines variables if the 'transmission/main' script is to be run locally
     # outside the snakemake workflow. This is relevant for testing purposes only! User inputs when running 
@@ -85,8 +86,9 @@ if __name__ == "__main__":
             'SDS' : 69,
             'LDS' : 77}
         output_data_dir = 'results/data'
-        file_tech_set = f'{output_data_dir}/TECHNOLOGY.csv'
-        file_fuel_set = f'{output_data_dir}/FUEL.csv'
+        data_format = 'csv'
+        file_tech_set = table_path(output_data_dir, "TECHNOLOGY", data_format)
+        file_fuel_set = table_path(output_data_dir, "FUEL", data_format)
 
     # SET INPUT DATA
     
@@ -99,4 +101,7 @@ if __name__ == "__main__":
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
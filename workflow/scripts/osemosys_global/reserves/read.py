@@ -1,11 +1,12 @@
 """Module for reading in data sources"""
 
 import pandas as pd
+from osemosys_global.param_io import read_table
 
 def import_technologies(f: str) -> pd.DataFrame:
     """Imports TECHNOLOGY.csv as output from the Storage rule."""
-    return pd.read_csv(f)
+    return read_table(f)
 
 def import_fuels(f: str) -> pd.DataFrame:
     """Imports FUEL.csv as output from the Storage rule."""
-    return pd.read_csv(f)
\ No newline at end of file
+    return read_table(f)
\ No newline at end of file
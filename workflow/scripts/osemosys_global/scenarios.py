@@ -0,0 +1,89 @@
+"""Scenario overlays sharing one base preprocessing
+
+Besides the default ``scenario``, more scenarios can be listed under the
+``scenarios`` config option. A scenario only overrides the config options in
+``SCENARIO_KEYS``. These do not change the expensive base data in
+``results/data``, so it is built once and each scenario only runs its own
+overlay and geographic filter stages.
+
+For the base data to fit every scenario, the powerplant stage is run with the
+union of the scenario geographic scopes, only the nodes removed in all
+scenarios and no renewable targets. The targets are applied per scenario.
+"""
+
+import re
+from typing import Any
+
+# config options a scenario can override
+SCENARIO_KEYS = [
+    "geographic_scope",
+    "nodes_to_remove",
+    "re_targets",
+    "emission_penalty",
+    "emission_limit",
+]
+
+# matches the scenario wildcard constraint
+SCENARIO_NAME = re.compile(r"[A-Za-z0-9]+")
+
+
+def get_scenarios(config: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Gets the overrides of each scenario, including the default scenario
+
+    Arguments
+    ---------
+    config: dict[str, Any]
+        Workflow configuration
+    """
+
+    scenarios = {config["scenario"]: {}}
+
+    for name, overrides in (config.get("scenarios") or {}).items():
+        if not SCENARIO_NAME.fullmatch(str(name)):
+            raise ValueError(f"Scenario name {name} must be alpha-numeric")
+        if name in scenarios:
+            raise ValueError(f"Scenario {name} is defined more than once")
+
+        overrides = overrides or {}
+        invalid = [x for x in overrides if x not in SCENARIO_KEYS]
+        if invalid:
+            raise ValueError(
+                f"Scenario {name} overrides {invalid}. Scenarios can only "
+                f"override {SCENARIO_KEYS}"
+            )
+        scenarios[name] = overrides
+
+    return scenarios
+
+
+def get_scenario_config(config: dict[str, Any], scenario: str) -> dict[str, Any]:
+    """Gets the config of a scenario, with its overrides applied"""
+
+    return {**config, **get_scenarios(config)[scenario]}
+
+
+def get_base_config(config: dict[str, Any]) -> dict[str, Any]:
+    """Gets the config of the preprocessing shared by all scenarios"""
+
+    if not config.get("scenarios"):
+        return config
+
+    scenarios = [get_scenario_config(config, x) for x in get_scenarios(config)]
+
+    # an empty scope is the whole world
+    scopes = [x["geographic_scope"] or [] for x in scenarios]
+    if all(scopes):
+        geographic_scope = sorted(set().union(*scopes))
+    else:
+        geographic_scope = []
+
+    nodes_to_remove = set.intersection(
+        *[set(x["nodes_to_remove"] or []) for x in scenarios]
+    )
+
+    return {
+        **config,
+        "geographic_scope": geographic_scope,
+        "nodes_to_remove": sorted(nodes_to_remove),
+        "re_targets": None,
+    }
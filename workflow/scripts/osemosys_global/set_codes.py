@@ -0,0 +1,181 @@
+"""Decoder of the fixed width TECHNOLOGY, FUEL and STORAGE codes
+
+Set codes are built from fixed width parts, ie.
+
+- PWRCOAINDNO01: PWR prefix, COA technology, IND country, INDNO node and 01
+  suffix
+- TRNINDNOINDSO: transmission from node INDNO to node INDSO
+- ELCINDNO01 or COAIND: ELC or COA prefix, IND country and INDNO node
+
+Rather than slicing the string of every row, ie. ``df.TECHNOLOGY.str[3:6]``,
+the codes are factorized, each unique code is sliced once, and the parts are
+broadcast back to the rows by their integer codes. Parts are returned as
+categoricals; ``.astype(object)`` gives the plain strings where they are
+concatenated or grouped.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# parts of the codes, as start and stop positions
+FIELDS = {
+    "TECHNOLOGY": {
+        "PREFIX": (0, 3),
+        "TECH": (3, 6),
+        "COUNTRY": (6, 9),
+        "NODE": (6, 11),
+        "SUFFIX": (11, 13),
+    },
+    "FUEL": {
+        "PREFIX": (0, 3),
+        "COUNTRY": (3, 6),
+        "NODE": (3, 8),
+        "SUFFIX": (8, 10),
+    },
+    "STORAGE": {
+        "PREFIX": (0, 3),
+        "COUNTRY": (3, 6),
+        "NODE": (3, 8),
+        "SUFFIX": (8, 10),
+    },
+}
+
+# parts of the transmission technologies, missing for other technologies
+TRN_FIELDS = {
+    "FROM_COUNTRY": (3, 6),
+    "FROM_NODE": (3, 8),
+    "TO_COUNTRY": (8, 11),
+    "TO_NODE": (8, 13),
+}
+
+
+def _factorize(values: pd.Series | pd.Index) -> tuple[np.ndarray, pd.Index]:
+    """Integer codes of the values and the unique values, as strings"""
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # the categorical codes are used as they are, only the categories of
+        # the rows are decoded
+        codes = np.asarray(values.array.codes)
+        categories = values.dtype.categories
+        used = np.bincount(codes[codes >= 0], minlength=len(categories)) > 0
+        remap = np.append(np.cumsum(used) - 1, -1)
+        return remap[codes], pd.Index(categories[used], dtype=object).astype(str)
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    return codes, pd.Index(uniques, dtype=object).astype(str)
+
+
+def _broadcast(
+    codes: np.ndarray, parts: pd.Index, values: pd.Series | pd.Index, name: str
+) -> pd.Series | pd.Index:
+    """Maps the parts of the unique values back to the rows of the values"""
+
+    part_codes, categories = pd.factorize(parts)
+    # missing values are factorized to -1, which maps to the appended -1
+    part_codes = np.append(part_codes, -1)[codes]
+    part = pd.Categorical.from_codes(part_codes, categories=categories)
+
+    if isinstance(values, pd.Index):
+        return pd.CategoricalIndex(part, name=name)
+    return pd.Series(part, index=values.index, name=name)
+
+
+def code_slice(
+    values: pd.Series | pd.Index, start: int, stop: Optional[int] = None
+) -> pd.Series | pd.Index:
+    """Slices the codes, the same as ``values.str[start:stop]``
+
+    Arguments
+    ---------
+    values: pd.Series | pd.Index
+        TECHNOLOGY, FUEL or STORAGE codes
+    start: int
+        Start position of the part
+    stop: Optional[int]
+        Stop position of the part, the end of the code if None
+
+    Returns
+    -------
+    pd.Series | pd.Index
+        Categorical of the parts, aligned to the values
+    """
+
+    codes, uniques = _factorize(values)
+    return _broadcast(codes, uniques.str[start:stop], values, values.name)
+
+
+def _positions(kind: str) -> dict[str, tuple[int, int]]:
+    positions = dict(FIELDS[kind])
+    if kind == "TECHNOLOGY":
+        positions.update(TRN_FIELDS)
+    return positions
+
+
+def _parts(uniques: pd.Index, field: str, kind: str) -> pd.Index:
+    """Slices a part of each unique code"""
+
+    start, stop = _positions(kind)[field]
+    parts = uniques.str[start:stop]
+    if field in TRN_FIELDS:
+        parts = parts.where(uniques.str.startswith("TRN"))
+    return parts
+
+
+def code_field(
+    values: pd.Series | pd.Index, field: str, kind: str = "TECHNOLOGY"
+) -> pd.Series | pd.Index:
+    """Gets one part of the codes, ie. the "TECH" of technologies
+
+    Arguments
+    ---------
+    values: pd.Series | pd.Index
+        Codes of the set
+    field: str
+        Name of the part, see FIELDS and TRN_FIELDS
+    kind: str
+        One of "TECHNOLOGY", "FUEL" or "STORAGE"
+
+    Returns
+    -------
+    pd.Series | pd.Index
+        Categorical of the parts, aligned to the values
+    """
+
+    codes, uniques = _factorize(values)
+    return _broadcast(codes, _parts(uniques, field, kind), values, field)
+
+
+def decode(
+    values: pd.Series | pd.Index,
+    kind: str = "TECHNOLOGY",
+    fields: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """Decodes the codes into their parts
+
+    Arguments
+    ---------
+    values: pd.Series | pd.Index
+        Codes of the set
+    kind: str
+        One of "TECHNOLOGY", "FUEL" or "STORAGE"
+    fields: Optional[list[str]]
+        Parts to decode, all parts of the set if None. Technologies also have
+        the FROM_NODE, TO_NODE, FROM_COUNTRY and TO_COUNTRY of transmission.
+
+    Returns
+    -------
+    pd.DataFrame
+        Categorical column per part, with the index of the values if a series
+    """
+
+    if fields is None:
+        fields = list(_positions(kind))
+
+    codes, uniques = _factorize(values)
+    rows = values if isinstance(values, pd.Series) else pd.Series(codes)
+
+    return pd.DataFrame(
+        {x: _broadcast(codes, _parts(uniques, x, kind), rows, x) for x in fields},
+        index=rows.index,
+    )
@@ -0,0 +1,79 @@
+"""Solves the LP file and records solver telemetry
+
+The solver output is written to the rule log and parsed into a telemetry
+record under results/{scenario}/logs.
+"""
+
+import subprocess
+
+import logging
+
+from osemosys_global.solver_telemetry import run_solver, write_record
+
+logger = logging.getLogger(__name__)
+
+
+def get_command(
+    solver: str, lp_file: str, solution: str, json: str, ilp: str, duals: str
+) -> list[str]:
+    """Gets the command line of a solver"""
+
+    if solver == "gurobi":
+        return [
+            "gurobi_cl",
+            "Method=2",
+            f"ResultFile={solution}",
+            f"ResultFile={duals}",
+            f"ResultFile={json}",
+            f"ResultFile={ilp}",
+            lp_file,
+        ]
+    elif solver == "cplex":
+        return [
+            "cplex",
+            "-c",
+            f"read {lp_file}",
+            "display problem stats",
+            "optimize",
+            f"write {solution}",
+        ]
+    elif solver == "cbc":
+        return ["cbc", lp_file, "solve", "-sec", "1500", "-solu", solution]
+    else:
+        raise ValueError(f"Solver {solver} is not supported")
+
+
+if __name__ == "__main__":
+    if "snakemake" in globals():
+        solver = snakemake.params.solver
+        scenario = snakemake.wildcards.scenario
+        lp_file = snakemake.input.lp_file
+        solution = snakemake.output.solution
+        telemetry_json = snakemake.output.telemetry_json
+        telemetry_csv = snakemake.output.telemetry_csv
+        json = snakemake.params.json
+        ilp = snakemake.params.ilp
+        duals = snakemake.params.duals
+        log_file = snakemake.log.log
+    else:
+        solver = "cbc"
+        scenario = "India"
+        lp_file = "results/India/India.lp"
+        solution = "results/India/India.sol"
+        telemetry_json = "results/India/logs/solver_telemetry.json"
+        telemetry_csv = "results/India/logs/solver_telemetry.csv"
+        json = "results/India/India.json"
+        ilp = "results/India/India.ilp"
+        duals = "results/India/India.attr"
+        log_file = "results/India/logs/solve_lp.log"
+
+    command = get_command(solver, lp_file, solution, json, ilp, duals)
+    record = run_solver(command, log_file, solver, lp_file)
+    record["scenario"] = scenario
+
+    write_record(record, telemetry_json, telemetry_csv)
+
+    if record["returncode"] != 0:
+        raise subprocess.CalledProcessError(record["returncode"], command)
+
+    logger.info(f"Solved {scenario} in {record['wall_time']}s ({record['status']})")
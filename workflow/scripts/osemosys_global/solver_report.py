@@ -0,0 +1,51 @@
+"""Combines the solver telemetry of all scenarios into one report
+
+Each run is compared with the previous run of the scenario in the telemetry
+history, which is appended to after the report is written.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+import logging
+
+from osemosys_global.solver_telemetry import FIELDS, compare_records, read_records
+
+logger = logging.getLogger(__name__)
+
+
+def main(telemetry_files: list[str], history_file: str, report_file: str) -> None:
+
+    records = read_records(telemetry_files)
+
+    if Path(history_file).exists():
+        history = pd.read_csv(history_file)
+    else:
+        history = pd.DataFrame(columns=FIELDS)
+
+    report = compare_records(records, history)
+    report.to_csv(report_file, index=False)
+
+    regressions = report.loc[report["regression"], "scenario"].tolist()
+    if regressions:
+        logger.warning(f"Solver performance regressed for {regressions}")
+
+    new = records[~records["timestamp"].isin(history["timestamp"])]
+    Path(history_file).parent.mkdir(parents=True, exist_ok=True)
+    new.to_csv(
+        history_file, mode="a", header=not Path(history_file).exists(), index=False
+    )
+
+
+if __name__ == "__main__":
+    if "snakemake" in globals():
+        telemetry_files = snakemake.input.telemetry
+        history_file = snakemake.params.history
+        report_file = snakemake.output.report
+    else:
+        telemetry_files = ["results/India/logs/solver_telemetry.json"]
+        history_file = "results/logs/solver_history.csv"
+        report_file = "results/solver_report.csv"
+
+    main(telemetry_files, history_file, report_file)
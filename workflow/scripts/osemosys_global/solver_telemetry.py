@@ -0,0 +1,280 @@
+"""Parses solver logs into performance records
+
+Each record holds the model size before and after presolve, the timings the
+solver reports for reading, presolve and the solve, the solution status and
+the resource usage of the solver process. Records are written as JSON and as
+a single row CSV per scenario, and combined into a cross scenario report.
+"""
+
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+FIELDS = [
+    "scenario",
+    "solver",
+    "solver_version",
+    "status",
+    "objective",
+    "rows",
+    "columns",
+    "nonzeros",
+    "presolved_rows",
+    "presolved_columns",
+    "presolved_nonzeros",
+    "read_time",
+    "presolve_time",
+    "solve_time",
+    "iterations",
+    "barrier_iterations",
+    "wall_time",
+    "user_time",
+    "system_time",
+    "peak_memory_mb",
+    "lp_file_mb",
+    "returncode",
+    "timestamp",
+]
+
+# relative increase of wall time or peak memory reported as a regression
+REGRESSION_THRESHOLD = 0.2
+
+_NUMBER = r"([-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+
+# field, pattern and type of each value parsed from a log. The last match of a
+# pattern is used, ie. the objective after crossover rather than after barrier.
+PATTERNS = {
+    "gurobi": [
+        ("solver_version", r"Gurobi Optimizer version (\S+)", str),
+        ("rows", rf"Optimize a model with {_NUMBER} rows", int),
+        ("columns", rf"Optimize a model with \d+ rows, {_NUMBER} columns", int),
+        ("nonzeros", rf"rows, \d+ columns and {_NUMBER} nonzeros", int),
+        ("presolved_rows", rf"Presolved: {_NUMBER} rows", int),
+        ("presolved_columns", rf"Presolved: \d+ rows, {_NUMBER} columns", int),
+        (
+            "presolved_nonzeros",
+            rf"Presolved: \d+ rows, \d+ columns, {_NUMBER} nonzeros",
+            int,
+        ),
+        ("presolve_time", rf"Presolve time: {_NUMBER}s", float),
+        ("read_time", rf"Reading time = {_NUMBER} seconds", float),
+        ("barrier_iterations", rf"Barrier solved model in {_NUMBER} iterations", int),
+        ("iterations", rf"Solved in {_NUMBER} iterations", int),
+        ("solve_time", rf"Solved in \d+ iterations and {_NUMBER} seconds", float),
+        ("objective", rf"Optimal objective\s+{_NUMBER}", float),
+    ],
+    "cplex": [
+        ("solver_version", r"CPLEX\S* Interactive Optimizer (\S+)", str),
+        ("rows", rf"Linear constraints\s*:\s*{_NUMBER}", int),
+        ("columns", rf"Variables\s*:\s*{_NUMBER}", int),
+        ("nonzeros", rf"Linear constraints.*\n\s*Nonzeros\s*:\s*{_NUMBER}", int),
+        ("presolved_rows", rf"Reduced LP has {_NUMBER} rows", int),
+        ("presolved_columns", rf"Reduced LP has \d+ rows, {_NUMBER} columns", int),
+        (
+            "presolved_nonzeros",
+            rf"Reduced LP has \d+ rows, \d+ columns, and {_NUMBER} nonzeros",
+            int,
+        ),
+        ("read_time", rf"Read time = {_NUMBER} sec", float),
+        ("presolve_time", rf"Presolve time = {_NUMBER} sec", float),
+        ("barrier_iterations", rf"Barrier time = .*\n.*Iterations = {_NUMBER}", int),
+        ("solve_time", rf"Solution time =\s*{_NUMBER} sec", float),
+        ("iterations", rf"Solution time =.*Iterations = {_NUMBER}", int),
+        ("objective", rf"Optimal:\s+Objective =\s+{_NUMBER}", float),
+    ],
+    "cbc": [
+        ("solver_version", r"Version: (\S+)", str),
+        # size of the model as read, before presolve
+        ("rows", rf"Problem .*has {_NUMBER} rows", int),
+        ("columns", rf"Problem .*has \d+ rows, {_NUMBER} columns", int),
+        (
+            "nonzeros",
+            rf"Problem .*has \d+ rows, \d+ columns and {_NUMBER} elements",
+            int,
+        ),
+        ("presolved_rows", rf"Presolve {_NUMBER} \(-?\d+\) rows", int),
+        (
+            "presolved_columns",
+            rf"Presolve \d+ \(-?\d+\) rows, {_NUMBER} \(-?\d+\) columns",
+            int,
+        ),
+        ("presolved_nonzeros", rf"columns and {_NUMBER} \(-?\d+\) elements", int),
+        ("presolve_time", rf"Optimal objective .* Presolve {_NUMBER}", float),
+        ("iterations", rf"{_NUMBER} iterations time", int),
+        ("solve_time", rf"iterations time {_NUMBER}", float),
+        ("objective", rf"Optimal objective {_NUMBER}", float),
+    ],
+}
+
+# status of the solution and the log lines it is parsed from, in order of precedence
+STATUS = [
+    ("infeasible_or_unbounded", r"Infeasible or unbounded|infeasible or unbounded"),
+    (
+        "infeasible",
+        r"Infeasible model|Infeasible\.|[Pp]roblem is infeasible"
+        r"|Problem proven infeasible",
+    ),
+    ("unbounded", r"Unbounded model|Unbounded\.|[Pp]roblem is unbounded"),
+    ("time_limit", r"Time limit reached|time limit exceeded|Stopped on time"),
+    ("optimal", r"Optimal objective|Optimal:\s+Objective|Optimal - objective"),
+]
+
+
+def parse_log(text: str, solver: str) -> dict[str, Any]:
+    """Parses the model size, timings and status from a solver log
+
+    Arguments
+    ---------
+    text: str
+        Solver log
+    solver: str
+        One of "gurobi", "cplex" or "cbc"
+
+    Returns
+    -------
+    dict[str, Any]
+        Parsed fields; fields not found in the log are None
+    """
+
+    if solver not in PATTERNS:
+        raise ValueError(f"No log parser for solver {solver}")
+
+    record = {x: None for x in FIELDS}
+    record["solver"] = solver
+
+    for field, pattern, dtype in PATTERNS[solver]:
+        matches = re.findall(pattern, text)
+        if matches:
+            record[field] = dtype(matches[-1])
+
+    record["status"] = "unknown"
+    for status, pattern in STATUS:
+        if re.search(pattern, text):
+            record["status"] = status
+            break
+
+    return record
+
+
+def run_solver(
+    command: list[str], log_file: str, solver: str, lp_file: Optional[str] = None
+) -> dict[str, Any]:
+    """Runs a solver, logging its output, and parses the log
+
+    The wall time, CPU time and peak memory are taken from the resource usage
+    of the solver process, rather than from the log.
+
+    Arguments
+    ---------
+    command: list[str]
+        Solver command
+    log_file: str
+        Path the solver output is written to
+    solver: str
+        One of "gurobi", "cplex" or "cbc"
+    lp_file: Optional[str]
+        LP file, to record its size
+
+    Returns
+    -------
+    dict[str, Any]
+        Telemetry record of the solve
+    """
+
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
+    start = time.perf_counter()
+    with open(log_file, "w") as log:
+        process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    wall_time = time.perf_counter() - start
+
+    record = parse_log(Path(log_file).read_text(errors="replace"), solver)
+    record["wall_time"] = round(wall_time, 3)
+    record["user_time"] = round(usage.ru_utime, 3)
+    record["system_time"] = round(usage.ru_stime, 3)
+    # ru_maxrss is in kilobytes on linux
+    record["peak_memory_mb"] = round(usage.ru_maxrss / 1e3, 1)
+    record["returncode"] = process.returncode
+    record["timestamp"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    if lp_file:
+        record["lp_file_mb"] = round(Path(lp_file).stat().st_size / 1e6, 1)
+
+    return record
+
+
+def write_record(record: dict[str, Any], json_file: str, csv_file: str) -> None:
+    """Writes a telemetry record as JSON and as a single row CSV"""
+
+    with open(json_file, "w") as f:
+        json.dump(record, f, indent=4)
+
+    pd.DataFrame([record], columns=FIELDS).to_csv(csv_file, index=False)
+
+
+def read_records(json_files: list[str]) -> pd.DataFrame:
+    """Reads telemetry records, one row per file"""
+
+    records = []
+    for json_file in json_files:
+        with open(json_file) as f:
+            records.append(json.load(f))
+    return pd.DataFrame(records, columns=FIELDS)
+
+
+def compare_records(records: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """Compares records with the previous record of each scenario and solver
+
+    Arguments
+    ---------
+    records: pd.DataFrame
+        Current telemetry records
+    history: pd.DataFrame
+        Records of earlier runs
+
+    Returns
+    -------
+    pd.DataFrame
+        Records with the previous wall time and peak memory, their relative
+        change, and whether either increased beyond REGRESSION_THRESHOLD
+    """
+
+    keys = ["scenario", "solver"]
+    previous = history[~history["timestamp"].isin(records["timestamp"])]
+    previous = (
+        previous.sort_values("timestamp")
+        .groupby(keys, as_index=False)
+        .last()[keys + ["wall_time", "peak_memory_mb"]]
+        .rename(
+            columns={
+                "wall_time": "previous_wall_time",
+                "peak_memory_mb": "previous_peak_memory_mb",
+            }
+        )
+    )
+
+    report = records.merge(previous, on=keys, how="left")
+    for column in ("previous_wall_time", "previous_peak_memory_mb"):
+        report[column] = report[column].astype(float)
+    report["wall_time_change"] = (
+        report["wall_time"] / report["previous_wall_time"] - 1
+    ).round(3)
+    report["peak_memory_change"] = (
+        report["peak_memory_mb"] / report["previous_peak_memory_mb"] - 1
+    ).round(3)
+    report["regression"] = (report["wall_time_change"] > REGRESSION_THRESHOLD) | (
+        report["peak_memory_change"] > REGRESSION_THRESHOLD
+    )
+    return report
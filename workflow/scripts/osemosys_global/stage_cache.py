@@ -0,0 +1,256 @@
+"""Content addressed cache of preprocessing stage outputs
+
+The ``onsuccess`` handler removes the shared preprocessing data in
+``results/data`` after every run. To avoid regenerating all of it from the
+raw data, each preprocessing stage stores its outputs under a key built from
+
+- the rule parameters (which hold the config sections the stage uses)
+- the digests of the input files
+- the digests of the scripts in the stage's package
+
+If a later run computes the same key, the outputs are copied back and the
+stage is skipped. As the inputs of downstream stages are the outputs of
+upstream ones, a change only invalidates the stages that depend on it.
+
+When run as a script, the status of the stages run in the workflow is
+written to ``results/cache/report.csv``.
+"""
+
+import hashlib
+import json
+import shutil
+import sys
+import time
+import pandas as pd
+from pathlib import Path
+from typing import Any, Optional
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "results/cache"
+
+# cached entries kept per stage
+MAX_ENTRIES = 3
+
+PACKAGE_DIR = Path(__file__).parent
+
+
+def file_digest(path: str) -> str:
+    """Gets the sha256 digest of a file"""
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def code_digest(script_dir: str) -> str:
+    """Gets a single digest of the scripts a stage can import
+
+    This is all modules in the stage's directory, plus the shared modules in
+    the ``osemosys_global`` package.
+    """
+
+    scripts = set(Path(script_dir).glob("*.py")) | set(PACKAGE_DIR.glob("*.py"))
+
+    h = hashlib.sha256()
+    for script in sorted(scripts, key=lambda x: (x.parent.name, x.name)):
+        h.update(f"{script.parent.name}/{script.name}".encode())
+        h.update(file_digest(script).encode())
+    return h.hexdigest()
+
+
+class StageCache:
+    """Stores and restores the outputs of one preprocessing stage
+
+    Arguments
+    ---------
+    stage: str
+        Name of the stage, such as "powerplant"
+    params: dict[str, Any]
+        Parameters of the stage. Must be JSON serializable, or have a
+        meaningful string representation.
+    inputs: list[str]
+        Input files of the stage
+    outputs: list[str]
+        Output files of the stage
+    script_dir: str
+        Directory of the stage's scripts
+    cache_dir: str
+        Root directory of the cache
+    enabled: bool
+        If False, nothing is restored or stored
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        params: dict[str, Any],
+        inputs: list[str],
+        outputs: list[str],
+        script_dir: str,
+        cache_dir: str = CACHE_DIR,
+        enabled: bool = True,
+    ):
+        self.stage = stage
+        self.params = params
+        self.inputs = [str(x) for x in inputs]
+        self.outputs = [str(x) for x in outputs]
+        self.script_dir = script_dir
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self._key = None
+
+    @classmethod
+    def from_snakemake(cls, snakemake: Any, cache_dir: str = CACHE_DIR):
+        """Creates the cache for the rule calling the script"""
+
+        return cls(
+            stage=snakemake.rule,
+            params=dict(snakemake.params.items()),
+            inputs=list(snakemake.input),
+            outputs=list(snakemake.output),
+            script_dir=snakemake.scriptdir,
+            cache_dir=cache_dir,
+            enabled=snakemake.config.get("preprocessing_cache", True),
+        )
+
+    @property
+    def key(self) -> str:
+        if not self._key:
+            content = {
+                "stage": self.stage,
+                "params": self.params,
+                "inputs": [[x, file_digest(x)] for x in self.inputs],
+                "code": code_digest(self.script_dir),
+            }
+            dumped = json.dumps(content, sort_keys=True, default=str)
+            self._key = hashlib.sha256(dumped.encode()).hexdigest()
+        return self._key
+
+    @property
+    def stage_dir(self) -> Path:
+        return Path(self.cache_dir, "stages", self.stage)
+
+    @property
+    def entry_dir(self) -> Path:
+        return Path(self.stage_dir, self.key)
+
+    def restore(self) -> bool:
+        """Copies cached outputs into place
+
+        Returns True if all outputs were restored, in which case the stage
+        does not need to be run.
+        """
+
+        if not self.enabled:
+            return False
+
+        manifest = Path(self.entry_dir, "manifest.json")
+        if not manifest.exists():
+            self._write_status("rebuilt")
+            return False
+
+        with open(manifest) as f:
+            cached = json.load(f)
+
+        if sorted(cached) != sorted(self.outputs):
+            self._write_status("rebuilt")
+            return False
+
+        for output, stored in cached.items():
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(Path(self.entry_dir, stored), output)
+
+        # marks the entry as recently used for pruning
+        manifest.touch()
+
+        logger.info(f"Restored {self.stage} outputs from {self.entry_dir}")
+        self._write_status("reused")
+        return True
+
+    def store(self) -> None:
+        """Copies the stage outputs into the cache"""
+
+        if not self.enabled:
+            return
+
+        if self.entry_dir.exists():
+            return
+
+        tmp_dir = Path(self.stage_dir, f".{self.key}.tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        manifest = {}
+        for num, output in enumerate(self.outputs):
+            stored = f"{num}{Path(output).suffix}"
+            shutil.copyfile(output, Path(tmp_dir, stored))
+            manifest[output] = stored
+
+        with open(Path(tmp_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        tmp_dir.rename(self.entry_dir)
+        logger.info(f"Stored {self.stage} outputs in {self.entry_dir}")
+
+        self._prune()
+
+    def _prune(self) -> None:
+        """Removes the least recently used entries of the stage"""
+
+        entries = [
+            x for x in self.stage_dir.iterdir()
+            if Path(x, "manifest.json").exists()
+        ]
+        entries.sort(key=lambda x: Path(x, "manifest.json").stat().st_mtime)
+        for entry in entries[:-MAX_ENTRIES]:
+            shutil.rmtree(entry)
+
+    def _write_status(self, status: str) -> None:
+        status_dir = Path(self.cache_dir, "status")
+        status_dir.mkdir(parents=True, exist_ok=True)
+        with open(Path(status_dir, f"{self.stage}.json"), "w") as f:
+            json.dump(
+                {
+                    "STAGE": self.stage,
+                    "STATUS": status,
+                    "KEY": self.key,
+                    "TIME": time.strftime("%Y-%m-%d %H:%M:%S"),
+                },
+                f,
+            )
+
+
+def get_report(cache_dir: str = CACHE_DIR) -> Optional[pd.DataFrame]:
+    """Collects the status of the stages run since the last report"""
+
+    status_files = sorted(Path(cache_dir, "status").glob("*.json"))
+    if not status_files:
+        return None
+
+    statuses = []
+    for status_file in status_files:
+        with open(status_file) as f:
+            statuses.append(json.load(f))
+        status_file.unlink()
+
+    return pd.DataFrame(statuses).sort_values("TIME").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+
+    cache_dir = sys.argv[1] if len(sys.argv) > 1 else CACHE_DIR
+
+    report = get_report(cache_dir)
+    if report is not None:
+        report.to_csv(Path(cache_dir, "report.csv"), index=False)
+
+        reused = report.loc[report.STATUS == "reused", "STAGE"].to_list()
+        rebuilt = report.loc[report.STATUS == "rebuilt", "STAGE"].to_list()
+        print("\nPreprocessing stages reused from cache:", ", ".join(reused) or "None")
+        print("Preprocessing stages rebuilt:", ", ".join(rebuilt) or "None")
@@ -5,7 +5,7 @@ import itertools
 
 from data import get_years
 
-def activity_storage(storage_set, df_iar_base, df_oar_base, storage_param,
+def activity_storage(storage_set, storage_param,
                      start_year, end_year, region_name):
     
     efficiency_dict = {}
@@ -29,7 +29,7 @@ def activity_storage(storage_set, df_iar_base, df_oar_base, storage_param,
         ["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR", "VALUE"]
     ]
     
-    df_iar = pd.concat([df_iar_base, df_storage_iar])
+    df_iar = df_storage_iar
 
     # OutputActivityRatio
     df_storage_oar = pd.DataFrame(
@@ -48,14 +48,14 @@ def activity_storage(storage_set, df_iar_base, df_oar_base, storage_param,
         ["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR", "VALUE"]
     ]
     
-    df_oar = pd.concat([df_oar_base, df_storage_oar])
+    df_oar = df_storage_oar
     
     return df_iar, df_oar
 
-def create_storage_capacity_activity(storage_set: pd.DataFrame, df_capact_base: pd.DataFrame, 
+def create_storage_capacity_activity(storage_set: pd.DataFrame, 
                                      value: Optional[float] = 31.536, 
                                      region: Optional[str] = "GLOBAL") -> pd.DataFrame:
-    """Creates and concats storage to activity unit data
+    """Creates storage capacity to activity unit data
     """
     
     data = []
@@ -64,6 +64,4 @@ def create_storage_capacity_activity(storage_set: pd.DataFrame, df_capact_base:
         
     data = pd.DataFrame(data, columns=["REGION", "TECHNOLOGY", "VALUE"])
         
-    data = pd.concat([df_capact_base, data])
-        
     return data
\ No newline at end of file
@@ -7,8 +7,8 @@ from data import(
     )
 
 def set_storage_capex_costs(storage_set, storage_param, 
-                            cap_cost_base, start_year, 
-                            end_year, region_name):
+                            start_year, end_year, 
+                            region_name):
 
     capex_dict = {}
     duration_dict = {}
@@ -51,12 +51,9 @@ def set_storage_capex_costs(storage_set, storage_param,
         df_cap_cost.loc[df_cap_cost['TECHNOLOGY'].str[3:6] == tech,
                    'VALUE'] = capex_dict[tech] / 2
     
-    df_cap_cost = pd.concat([cap_cost_base, df_cap_cost])
-    
     return df_cap_cost, df_cap_cost_storage
 
 def set_storage_operating_costs(storage_set, storage_param,
-                                fom_base, var_base,
                                 start_year, end_year, 
                                 region_name):
 
@@ -89,8 +86,6 @@ def set_storage_operating_costs(storage_set, storage_param,
                    'VALUE'] = fom_dict[tech] / duration_dict[tech]
         
     df_fom_storage['TECHNOLOGY'] = 'PWR' + df_fom_storage['TECHNOLOGY']
-        
-    df_fom_storage = pd.concat([fom_base, df_fom_storage])
     
     # VariableCost
     df_var_storage = pd.DataFrame(
@@ -108,7 +103,5 @@ def set_storage_operating_costs(storage_set, storage_param,
                    'VALUE'] = round(var_dict[tech] / duration_dict[tech] / 3.6 , 4)
         
     df_var_storage['TECHNOLOGY'] = 'PWR' + df_var_storage['TECHNOLOGY']
-        
-    df_var_storage = pd.concat([var_base, df_var_storage])
     
     return df_fom_storage, df_var_storage
@@ -9,8 +9,7 @@ from data import(
 
 from utils import apply_dtypes
 
-def cap_investment_constraints_sto(storage_set, df_max_cap_invest_base,
-                                   build_rates, no_investment_techs, 
+def cap_investment_constraints_sto(storage_set, build_rates, no_investment_techs, 
                                    start_year, end_year, region_name):
     
     techs = storage_set['VALUE'].str[:3].unique()
@@ -55,11 +54,5 @@ def cap_investment_constraints_sto(storage_set, df_max_cap_invest_base,
     
     # filter for storages defined in config
     df_max_cap_invest_sto = df_max_cap_invest_sto[df_max_cap_invest_sto.TECHNOLOGY.isin('PWR' + storage_set.VALUE)]
-    
-    # Add to existing TotalAnnualMaxCapacityInvestment data
-    if not df_max_cap_invest_sto.empty:
-        df_max_cap_invest_sto = pd.concat([df_max_cap_invest_base, df_max_cap_invest_sto])
-    else:
-        df_max_cap_invest_sto = df_max_cap_invest_base.copy()
 
     return df_max_cap_invest_sto
\ No newline at end of file
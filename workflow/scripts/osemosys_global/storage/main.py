@@ -1,5 +1,7 @@
 import pandas as pd
-import os
+import sys
+from osemosys_global.param_io import table_path, write_table
+from osemosys_global.stage_cache import StageCache
 
 from typing import Optional, Any
 
@@ -12,16 +14,6 @@ from read import(
     import_op_life,
     import_GESDB_project_data,
     import_GESDB_regional_mapping,
-    import_iar_base,
-    import_oar_base,
-    import_capact_base,
-    import_cap_cost_base,
-    import_fix_cost_base,
-    import_var_cost_base,
-    import_op_life_base,
-    import_max_cap_invest_base,
-    import_min_cap_invest_base,
-    import_res_cap_base,
     import_set_base
 )
 
@@ -68,40 +60,35 @@ def main(
     default_op_life: dict[str, int],
     gesdb_data: pd.DataFrame,
     gesdb_mapping: pd.DataFrame,
-    iar_base: pd.DataFrame,
-    oar_base: pd.DataFrame,
-    capact_base: pd.DataFrame,
-    cap_cost_base: pd.DataFrame,
-    fix_cost_base: pd.DataFrame,
-    var_cost_base: pd.DataFrame,    
-    op_life_base: pd.DataFrame,
-    max_cap_invest_base: pd.DataFrame,
-    min_cap_invest_base: pd.DataFrame,
-    res_cap_base: pd.DataFrame,
-    tech_set_base: pd.DataFrame,
     fuel_set_base: pd.DataFrame,
     tech_capacity_storage: Optional[dict[str, list[Any]]] = None
 ):
+    """Creates the storage data
+
+    Parameters shared with the powerplant and transmission data are written
+    to the storage data directory, holding only the storage part. These are
+    combined in the merge_partial_tables rule.
+    """
     
     if not unique_sto_techs:
         
         logger.warning("No storage added to the system. Populate 'storage_parameters' in config file.")
         
-        oar_storage = oar_base.copy()
-        iar_storage = iar_base.copy()
-        cap_activity_storage = capact_base.copy()
+        oar_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR", "VALUE"])
+        iar_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "FUEL", "MODE_OF_OPERATION", "YEAR", "VALUE"])
+        cap_activity_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "VALUE"])
         cap_cost_storage = pd.DataFrame(columns=["REGION", "STORAGE", "YEAR", "VALUE"])
-        cap_cost = cap_cost_base.copy()
-        fix_cost_storage = fix_cost_base.copy() 
-        var_cost_storage = var_cost_base.copy()
-        op_life = op_life_base.copy()
+        cap_cost = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
+        fix_cost_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
+        var_cost_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "MODE_OF_OPERATION", "YEAR", "VALUE"])
+        op_life = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "VALUE"])
         op_life_storage = pd.DataFrame(columns=["REGION", "STORAGE", "VALUE"])
-        max_cap_invest_storage = max_cap_invest_base.copy()
-        tech_set = tech_set_base.copy()
+        max_cap_invest_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
+        tech_set = pd.DataFrame(columns=["VALUE"])
         storage_set = pd.DataFrame(columns=["VALUE"])
         tech_to_storage = pd.DataFrame(columns=["REGION","TECHNOLOGY","STORAGE","MODE_OF_OPERATION", "VALUE"])
         tech_from_storage = pd.DataFrame(columns=["REGION","TECHNOLOGY","STORAGE","MODE_OF_OPERATION", "VALUE"])
-        res_cap = res_cap_base.copy()
+        res_cap = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
         res_cap_storage = pd.DataFrame(columns=["REGION", "STORAGE", "YEAR", "VALUE"])
         storage_level_start = pd.DataFrame(columns=["REGION", "STORAGE", "VALUE"])
         tech_capacity_storage = None
@@ -119,7 +106,6 @@ def main(
         # Set capital costs for storage.
         cap_cost, cap_cost_storage = set_storage_capex_costs(storage_set, 
                                                             storage_parameters,
-                                                            cap_cost_base,
                                                             start_year,
                                                             end_year,
                                                             region_name)
@@ -127,27 +113,23 @@ def main(
         # Set fixed and variable operating costs for storage.
         fix_cost_storage, var_cost_storage = set_storage_operating_costs(storage_set,
                                                                         storage_parameters,
-                                                                        fix_cost_base,
-                                                                        var_cost_base,
                                                                         start_year,
                                                                         end_year,
                                                                         region_name)
         
         # Set activity ratios for storage.
-        iar_storage, oar_storage = activity_storage(storage_set, iar_base, oar_base, 
-                                                    storage_parameters, start_year, 
-                                                    end_year, region_name)
+        iar_storage, oar_storage = activity_storage(storage_set, storage_parameters, 
+                                                    start_year, end_year, region_name)
         
         # assign capacity to activity unit to storage.
-        cap_activity_storage = create_storage_capacity_activity(storage_set, capact_base)
+        cap_activity_storage = create_storage_capacity_activity(storage_set)
         
         # Set operational life for storage.
         op_life, op_life_storage = set_op_life_storage(storage_set, default_op_life, 
-                                                    op_life_base, region_name)
+                                                       region_name)
         
         # Set annual capacity investment constraints.
         max_cap_invest_storage = cap_investment_constraints_sto(storage_set, 
-                                                                max_cap_invest_base,
                                                                 build_rates,
                                                                 no_investment_techs, 
                                                                 start_year, 
@@ -156,7 +138,7 @@ def main(
         
         # Set residual capacity ('PWR') and residual capacity storage.
         res_cap, res_cap_storage = res_capacity_storage(gesdb_data, gesdb_mapping, 
-                                                        res_cap_base, storage_existing, 
+                                                        storage_existing, 
                                                         storage_planned, op_life_dict, 
                                                         storage_parameters,
                                                         GESDB_TECH_MAP, DURATION_TYPE,
@@ -182,7 +164,6 @@ def main(
                 tech_capacity_sto, 
                 storage_parameters,
                 default_op_life, 
-                min_cap_invest_base, 
                 max_cap_invest_storage, 
                 res_cap,
                 res_cap_storage,
@@ -197,58 +178,49 @@ def main(
                 )  
 
         # get new additions to technology sets
-        new_techs = set_unique_technologies(storage_set)
-        tech_set = pd.concat([tech_set_base, new_techs])
+        tech_set = set_unique_technologies(storage_set)
         
     # OUTPUT CSV's
     
-    oar_storage.to_csv(os.path.join(output_data_dir, "OutputActivityRatio.csv"), index=None)
+    write_table(oar_storage, table_path(storage_data_dir, "OutputActivityRatio", data_format))
     
-    iar_storage.to_csv(os.path.join(output_data_dir, "InputActivityRatio.csv"), index=None)
+    write_table(iar_storage, table_path(storage_data_dir, "InputActivityRatio", data_format))
 
-    cap_activity_storage.to_csv(os.path.join(output_data_dir, "CapacityToActivityUnit.csv"), index = None)
+    write_table(cap_activity_storage, table_path(storage_data_dir, "CapacityToActivityUnit", data_format))
     
-    cap_cost_storage.to_csv(os.path.join(output_data_dir, "CapitalCostStorage.csv"), index = None)
-    cap_cost.to_csv(os.path.join(output_data_dir, "CapitalCost.csv"), index = None)
+    write_table(cap_cost_storage, table_path(output_data_dir, "CapitalCostStorage", data_format))
+    write_table(cap_cost, table_path(storage_data_dir, "CapitalCost", data_format))
     
-    fix_cost_storage.to_csv(os.path.join(output_data_dir, "FixedCost.csv"), index = None)
-    var_cost_storage.to_csv(os.path.join(output_data_dir, "VariableCost.csv"), index = None)
+    write_table(fix_cost_storage, table_path(storage_data_dir, "FixedCost", data_format))
+    write_table(var_cost_storage, table_path(storage_data_dir, "VariableCost", data_format))
     
-    op_life_storage.to_csv(os.path.join(output_data_dir, "OperationalLifeStorage.csv"), index = None)
-    op_life.to_csv(os.path.join(output_data_dir, "OperationalLife.csv"), index = None)
+    write_table(op_life_storage, table_path(output_data_dir, "OperationalLifeStorage", data_format))
+    write_table(op_life, table_path(storage_data_dir, "OperationalLife", data_format))
     
-    max_cap_invest_storage.to_csv(os.path.join(output_data_dir, 
-                                            'TotalAnnualMaxCapacityInvestment.csv'),
-                                        index = None)
+    write_table(max_cap_invest_storage, table_path(storage_data_dir, "TotalAnnualMaxCapacityInvestment", data_format))
 
-    tech_set.to_csv(os.path.join(output_data_dir, "TECHNOLOGY.csv"), index = None)
-    storage_set.to_csv(os.path.join(output_data_dir, "STORAGE.csv"), index = None)
+    write_table(tech_set, table_path(storage_data_dir, "TECHNOLOGY", data_format))
+    write_table(storage_set, table_path(output_data_dir, "STORAGE", data_format))
     
-    tech_to_storage.to_csv(os.path.join(output_data_dir, "TechnologyToStorage.csv"), index=None)
-    tech_from_storage.to_csv(os.path.join(output_data_dir, "TechnologyFromStorage.csv"), index=None)
+    write_table(tech_to_storage, table_path(output_data_dir, "TechnologyToStorage", data_format))
+    write_table(tech_from_storage, table_path(output_data_dir, "TechnologyFromStorage", data_format))
         
-    res_cap.to_csv(os.path.join(output_data_dir, 'ResidualCapacity.csv'), 
-                           index = None)   
+    write_table(res_cap, table_path(storage_data_dir, "ResidualCapacity", data_format))   
   
-    res_cap_storage.to_csv(os.path.join(output_data_dir, 'ResidualStorageCapacity.csv'), 
-                           index = None)   
+    write_table(res_cap_storage, table_path(output_data_dir, "ResidualStorageCapacity", data_format))   
 
-    storage_level_start.to_csv(os.path.join(output_data_dir, 'StorageLevelStart.csv'), 
-                           index = None)      
+    write_table(storage_level_start, table_path(output_data_dir, "StorageLevelStart", data_format))      
     
-    if tech_capacity_storage is not None:
-        min_cap_invest_storage.to_csv(os.path.join(output_data_dir, 
-                                                'TotalAnnualMinCapacityInvestment.csv'),
-                                            index = None)
-        
-    else:
-        min_cap_invest_base.to_csv(os.path.join(output_data_dir, 
-                                                'TotalAnnualMinCapacityInvestment.csv'),
-                                            index = None)
+    if tech_capacity_storage is None:
+        min_cap_invest_storage = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
+    write_table(min_cap_invest_storage, table_path(storage_data_dir, "TotalAnnualMinCapacityInvestment", data_format))
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_storage_build_rates = snakemake.input.storage_build_rates 
         file_default_op_life = snakemake.input.default_op_life
         file_gesdb_project_data = snakemake.input.gesdb_project_data
@@ -263,19 +235,10 @@ if __name__ == "__main__":
         no_investment_techs = snakemake.params.no_investment_techs      
         storage_parameters = snakemake.params.storage_parameters           
         output_data_dir = snakemake.params.output_data_dir
-        transmission_data_dir = snakemake.params.transmission_data_dir            
-        file_iar_base = f'{transmission_data_dir}/InputActivityRatio.csv'
-        file_oar_base = f'{transmission_data_dir}/OutputActivityRatio.csv'
-        file_capact_base = f'{transmission_data_dir}/CapacityToActivityUnit.csv' 
-        file_cap_cost_base = f'{transmission_data_dir}/CapitalCost.csv'             
-        file_fix_cost_base = f'{transmission_data_dir}/FixedCost.csv'
-        file_var_cost_base = f'{transmission_data_dir}/VariableCost.csv'   
-        file_op_life_base = f'{transmission_data_dir}/OperationalLife.csv'          
-        file_max_cap_invest_base = f'{transmission_data_dir}/TotalAnnualMaxCapacityInvestment.csv'
-        file_min_cap_invest_base = f'{transmission_data_dir}/TotalAnnualMinCapacityInvestment.csv'
-        file_res_cap_base = f'{transmission_data_dir}/ResidualCapacity.csv'
-        file_tech_set = f'{transmission_data_dir}/TECHNOLOGY.csv'        
-        file_fuel_set = f'{output_data_dir}/FUEL.csv'
+        data_format = snakemake.params.data_format
+        powerplant_data_dir = snakemake.params.powerplant_data_dir
+        storage_data_dir = snakemake.params.storage_data_dir
+        file_fuel_set = table_path(powerplant_data_dir, "FUEL", data_format)
         
     # The below else statement defines variables if the 'transmission/main' script is to be run locally
     # outside the snakemake workflow. This is relevant for testing purposes only! User inputs when running 
@@ -302,19 +265,11 @@ if __name__ == "__main__":
                               'LDS': [3794, 20.2, 0.58, 80, 10]}
 
         output_data_dir = 'results/data'
-        transmission_data_dir = 'results/data/transmission'        
-        file_iar_base = f'{transmission_data_dir}/InputActivityRatio.csv'
-        file_oar_base = f'{transmission_data_dir}/OutputActivityRatio.csv'
-        file_capact_base = f'{transmission_data_dir}/CapacityToActivityUnit.csv'
-        file_cap_cost_base = f'{transmission_data_dir}/CapitalCost.csv'        
-        file_fix_cost_base = f'{transmission_data_dir}/FixedCost.csv'
-        file_var_cost_base = f'{transmission_data_dir}/VariableCost.csv'
-        file_op_life_base = f'{transmission_data_dir}/OperationalLife.csv'        
-        file_max_cap_invest_base = f'{transmission_data_dir}/TotalAnnualMaxCapacityInvestment.csv'
-        file_min_cap_invest_base = f'{transmission_data_dir}/TotalAnnualMinCapacityInvestment.csv'
-        file_res_cap_base = f'{transmission_data_dir}/ResidualCapacity.csv'
-        file_tech_set = f'{transmission_data_dir}/TECHNOLOGY.csv'
-        file_fuel_set = f'{output_data_dir}/FUEL.csv'
+
+        data_format = 'csv'
+        powerplant_data_dir = 'results/data/powerplant'
+        storage_data_dir = 'results/data/storage'
+        file_fuel_set = table_path(powerplant_data_dir, "FUEL", data_format)
 
     # SET INPUT DATA
     
@@ -332,17 +287,6 @@ if __name__ == "__main__":
     gesdb_project_data = import_GESDB_project_data(file_gesdb_project_data)
     gesdb_regional_mapping = import_GESDB_regional_mapping(file_gesdb_regional_mapping)
     
-    iar_base = import_iar_base(file_iar_base)
-    oar_base = import_oar_base(file_oar_base)
-    capact_base = import_capact_base(file_capact_base)
-    cap_cost_base = import_cap_cost_base(file_cap_cost_base)    
-    fix_cost_base = import_fix_cost_base(file_fix_cost_base)
-    var_cost_base = import_var_cost_base(file_var_cost_base)
-    op_life_base = import_op_life_base(file_op_life_base)       
-    max_cap_invest_base = import_max_cap_invest_base(file_max_cap_invest_base)
-    min_cap_invest_base = import_min_cap_invest_base(file_min_cap_invest_base)
-    res_cap_base = import_res_cap_base(file_res_cap_base)  
-    tech_set_base = import_set_base(file_tech_set)  
     fuel_set_base = import_set_base(file_fuel_set)  
     
     input_data = {
@@ -351,20 +295,12 @@ if __name__ == "__main__":
         "gesdb_data": gesdb_project_data,
         "gesdb_mapping" : gesdb_regional_mapping,
         "build_rates" : build_rates,
-        "iar_base" : iar_base,
-        "oar_base" : oar_base,
-        "capact_base" : capact_base,
-        "cap_cost_base" : cap_cost_base,        
-        "fix_cost_base" : fix_cost_base,
-        "var_cost_base" : var_cost_base,
-        "op_life_base" : op_life_base,
-        "max_cap_invest_base" : max_cap_invest_base,
-        "min_cap_invest_base" : min_cap_invest_base,
-        "res_cap_base" : res_cap_base, 
-        "tech_set_base" : tech_set_base,
         "fuel_set_base" : fuel_set_base,
         "tech_capacity_storage": tech_capacity_sto
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
@@ -4,8 +4,7 @@ import pandas as pd
 
 from utils import apply_dtypes
 
-def set_op_life_storage(storage_set, op_life_dict, 
-                        op_life_base, region_name):
+def set_op_life_storage(storage_set, op_life_dict, region_name):
 
     # Create Operational Life data
     op_life_techs = list(storage_set['VALUE'].unique())
@@ -21,7 +20,6 @@ def set_op_life_storage(storage_set, op_life_dict,
     op_life_storage_final = pd.DataFrame(op_life_storage_out, columns = ['REGION', 'STORAGE', 'VALUE'])
     
     op_life_final = pd.DataFrame(op_life_out, columns = ['REGION', 'TECHNOLOGY', 'VALUE'])
-    op_life_final = pd.concat([op_life_base, op_life_final])
     
     op_life_storage_final = apply_dtypes(op_life_storage_final, "OperationalLife")
     op_life_final = apply_dtypes(op_life_final, "OperationalLife")
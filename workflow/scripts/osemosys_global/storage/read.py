@@ -1,6 +1,7 @@
 """Module for reading in data sources"""
 
 import pandas as pd
+from osemosys_global.param_io import read_table
 
 def import_storage_build_rates(f: str) -> pd.DataFrame:
     """Imports storage technology and nodal specific user defined max build rates."""
@@ -29,76 +30,6 @@ def import_GESDB_regional_mapping(f: str) -> pd.DataFrame:
     """
     return pd.read_csv(f)
     
-def import_iar_base(f: str) -> pd.DataFrame:
-    """Imports InputActivityRatio.csv as output from the Transmission rule.
-    
-    InputActivityRatio.csv
-    """
-    return pd.read_csv(f)
-
-def import_oar_base(f: str) -> pd.DataFrame:
-    """Imports OutputActivityRatio.csv as output from the Transmission rule.
-    
-    OutputActivityRatio.csv
-    """
-    return pd.read_csv(f)
-
-def import_capact_base(f: str) -> pd.DataFrame:
-    """Imports CapacityToActivityUnit.csv as output from the Transmission rule.
-    
-    CapacityToActivityUnit.csv
-    """
-    return pd.read_csv(f)
-
-def import_fix_cost_base(f: str) -> pd.DataFrame:
-    """Imports FixedCost.csv as output from the Transmission rule.
-    
-    FixedCost.csv
-    """
-    return pd.read_csv(f)
-
-def import_var_cost_base(f: str) -> pd.DataFrame:
-    """Imports VariableCost.csv as output from the Transmission rule.
-    
-    FixedCost.csv
-    """
-    return pd.read_csv(f)
-
-def import_max_cap_invest_base(f: str) -> pd.DataFrame:
-    """Imports TotalAnnualMaxCapacityInvestment.csv as output from the Transmission rule.
-    
-    TotalAnnualMaxCapacityInvestment.csv
-    """
-    return pd.read_csv(f)
-
-def import_min_cap_invest_base(f: str) -> pd.DataFrame:
-    """Imports TotalAnnualMinCapacityInvestment.csv as output from the Transmission rule.
-    
-    TotalAnnualMinCapacityInvestment.csv
-    """
-    return pd.read_csv(f)
-
-def import_res_cap_base(f: str) -> pd.DataFrame:
-    """Imports ResidualCapacity.csv as output from the Transmission rule.
-    
-    ResidualCapacity.csv
-    """
-    return pd.read_csv(f)
-
-def import_op_life_base(f: str) -> pd.DataFrame:
-    """Imports OperationalLife.csv as output from the Transmission rule.
-    
-    OperationalLife.csv
-    """
-    return pd.read_csv(f)
-
-def import_cap_cost_base(f: str) -> pd.DataFrame:
-    """Imports CapitalCost.csv as output from the Transmission rule.
-    
-    CapitalCost.csv
-    """
-    return pd.read_csv(f)
-
 def import_set_base(f: str) -> pd.DataFrame:
     """Imports a set csv"""
-    return pd.read_csv(f)
\ No newline at end of file
+    return read_table(f)
\ No newline at end of file
@@ -9,7 +9,6 @@ from data import(
 
 def res_capacity_storage(gesdb_data, 
                          gesdb_regional_mapping,
-                         res_cap_base,
                          storage_existing,
                          storage_planned,
                          op_life_dict,
@@ -168,12 +167,9 @@ def res_capacity_storage(gesdb_data,
         # Convert from kWh to PJ
         residual_storage_capacity['VALUE'] = round(residual_storage_capacity['VALUE'
                                                                              ] / 277777777.77778, 5)
-     
-        # Combine residual capacity df's.
-        residual_capacity = pd.concat([res_cap_base, residual_capacity]).reset_index(drop = True)
         
     else:
-        residual_capacity = res_cap_base.copy()
+        residual_capacity = pd.DataFrame(columns = ['REGION', 'TECHNOLOGY', 'YEAR','VALUE'])
         residual_storage_capacity = pd.DataFrame(columns = ['REGION', 'STORAGE', 'YEAR','VALUE'])
 
     return residual_capacity, residual_storage_capacity
\ No newline at end of file
@@ -8,15 +8,14 @@ from data import get_years
 def set_user_defined_capacity_sto(tech_capacity_sto,
                                   storage_param,
                                   op_life_dict, 
-                                  min_cap_invest_base, 
-                                  max_cap_invest_base, 
-                                  res_cap_base,
-                                  res_cap_sto_base,
-                                  df_oar_base,
-                                  cap_cost_base,
-                                  cap_cost_sto_base, 
-                                  fix_cost_base, 
-                                  var_cost_base,
+                                  max_cap_invest_storage, 
+                                  res_cap,
+                                  res_cap_storage,
+                                  oar_storage,
+                                  cap_cost,
+                                  cap_cost_storage, 
+                                  fix_cost_storage, 
+                                  var_cost_storage,
                                   start_year, 
                                   end_year, 
                                   region_name
@@ -51,8 +50,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
     
     tech_capacity_sto_df['REGION'] = region_name
     
-    df_min_cap_inv = pd.concat([min_cap_invest_base, tech_capacity_sto_df])
-    df_min_cap_inv.drop_duplicates(inplace=True)
+    df_min_cap_inv = tech_capacity_sto_df.drop_duplicates()
     
     max_cap_techs_df = pd.DataFrame(list(itertools.product(list(tech_capacity_sto_df['idx']),
                                              get_years(start_year, end_year))
@@ -87,7 +85,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                                          'VALUE']]
     
     # Append existing TotalAnnualMaxCapacityInvestment data with MAX_BUILD
-    df_max_cap_inv = pd.concat([max_cap_invest_base, max_cap_techs_df]).drop_duplicates()
+    df_max_cap_inv = pd.concat([max_cap_invest_storage, max_cap_techs_df]).drop_duplicates()
 
     # Print TotalAnnualMaxCapacityInvestment.csv with MAX_BUILD
     df_max_cap_inv.drop_duplicates(subset=['REGION', 
@@ -125,7 +123,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                                                'YEAR',
                                                'VALUE']]
     
-    df_res_cap = pd.concat([res_cap_base, df_res_cap_ud_final 
+    df_res_cap = pd.concat([res_cap, df_res_cap_ud_final 
                             if not df_res_cap_ud_final.empty else None])
 
     # Group residual capacities in case user defined technology entries already exist.
@@ -145,8 +143,8 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                 df_res_cap_sto_ud_final['STORAGE'].str.startswith(tech), 'VALUE'] * \
                     duration / 277.777778
     
-    if not res_cap_sto_base.empty:
-        df_res_sto_cap = pd.concat([res_cap_sto_base, df_res_cap_sto_ud_final 
+    if not res_cap_storage.empty:
+        df_res_sto_cap = pd.concat([res_cap_storage, df_res_cap_sto_ud_final 
                                 if not df_res_cap_sto_ud_final.empty else None])
     else:
         df_res_sto_cap = df_res_cap_sto_ud_final.copy()
@@ -167,14 +165,14 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                                    inplace=True)
 
     # Update OAR with user-defined efficiencies by storage technology
-    df_oar = df_oar_base.copy()
+    df_oar = oar_storage.copy()
 
     for idx, tech_params in tech_capacity_sto.items():
         df_oar.loc[df_oar['TECHNOLOGY'] == tech_params[0],
                    'VALUE'] = round(efficiency_dict[idx] / 100, 3)
     
     # Update CapitalCostStorage with user-defined capex costs by storage technology
-    df_cap_cost_sto = cap_cost_sto_base.copy()
+    df_cap_cost_sto = cap_cost_storage.copy()
     
     ''' Sets capital cost by taking the defined capital cost (m$/GW) divided by the storage 
     duration (=Storage Capacity (GWh)/Storage Power Rating (GW)) to get to GWh values followed 
@@ -188,7 +186,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                              tech_params[0][3:6]] / 0.0036 / 2
     
     # Update CapitalCost with user-defined capex costs by storage technology
-    df_cap_cost = cap_cost_base.copy()
+    df_cap_cost = cap_cost.copy()
     
     ''' Sets capital cost by taking the defined capital cost (m$/GW) divided by 2 to split
     the costs of the overall technology between the charging/discharging component ('PWR') and
@@ -198,7 +196,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                          'VALUE'] = capex_dict[idx] / 2
         
     # Update FixedCost with user-defined fixed costs by storage technology
-    df_fix_cost = fix_cost_base.copy()
+    df_fix_cost = fix_cost_storage.copy()
 
     ''' Sets fixed cost by taking the defined fixed cost (m$/GW/yr) divided by the storage 
     duration (=Storage Capacity (GWh)/Storage Power Rating (GW)) to mimic fixed costs for storage
@@ -208,7 +206,7 @@ def set_user_defined_capacity_sto(tech_capacity_sto,
                    'VALUE'] = fom_dict[idx] / duration_dict[tech_params[0][3:6]]
         
     # Update VariableCosts with user-defined variable costs by storage technology
-    df_var_cost = var_cost_base.copy()
+    df_var_cost = var_cost_storage.copy()
 
     ''' Sets variable cost by taking the defined variable cost ($/MWh) divided by the storage 
     duration (=Storage Capacity (GWh)/Storage Power Rating (GW)) to mimic variable costs for storage
@@ -2,6 +2,8 @@
 
 import pandas as pd
 
+from osemosys_global.set_codes import code_field, decode
+
 
 def calc_trn_capacity(
     total_capacity_annual: pd.DataFrame, country: bool
@@ -11,13 +13,14 @@ def calc_trn_capacity(
 
     df = df[df.index.get_level_values("TECHNOLOGY").str.startswith("TRN")]
 
+    techs = df.index.get_level_values("TECHNOLOGY")
     if country:
-        df["FROM"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
-        df["TO"] = df.index.get_level_values("TECHNOLOGY").str[8:11]
+        df["FROM"] = code_field(techs, "FROM_COUNTRY").astype(object)
+        df["TO"] = code_field(techs, "TO_COUNTRY").astype(object)
         df = df.loc[df['FROM'] != df['TO']]  # intercountry
     else:
-        df["FROM"] = df.index.get_level_values("TECHNOLOGY").str[3:8]
-        df["TO"] = df.index.get_level_values("TECHNOLOGY").str[8:13]
+        df["FROM"] = code_field(techs, "FROM_NODE").astype(object)
+        df["TO"] = code_field(techs, "TO_NODE").astype(object)
 
     if df.empty:
         return pd.DataFrame(columns=["FROM", "TO", "YEAR", "VALUE"]).set_index(
@@ -42,14 +45,10 @@ def calc_pwr_capacity(
         & ~(df.index.get_level_values("TECHNOLOGY").str.contains("TRN"))
     ]
 
-    df["TECH"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
-
-    if country:
-        r = "COUNTRY"
-        df[r] = df.index.get_level_values("TECHNOLOGY").str[6:9]
-    else:
-        r = "NODE"
-        df[r] = df.index.get_level_values("TECHNOLOGY").str[6:11]
+    r = "COUNTRY" if country else "NODE"
+    parts = decode(df.index.get_level_values("TECHNOLOGY"), fields=["TECH", r])
+    df["TECH"] = parts["TECH"].astype(object).to_numpy()
+    df[r] = parts[r].astype(object).to_numpy()
 
     return (
         df.reset_index()[["TECH", r, "YEAR", "VALUE"]]
@@ -7,6 +7,8 @@ reported at country levels.
 import pandas as pd
 from typing import Optional
 
+from osemosys_global.set_codes import code_slice, decode
+
 
 def format_production(
     production: pd.DataFrame,
@@ -21,8 +23,9 @@ def format_production(
         & ~(df.index.get_level_values("TECHNOLOGY").str.contains("TRN"))
     ].copy()
 
-    df["TECH"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
-    df["COUNTRY"] = df.index.get_level_values("TECHNOLOGY").str[6:9]
+    parts = decode(df.index.get_level_values("TECHNOLOGY"), fields=["TECH", "COUNTRY"])
+    df["TECH"] = parts["TECH"].to_numpy()
+    df["COUNTRY"] = parts["COUNTRY"].astype(object).to_numpy()
 
     if exclude:
         df = df[~df.TECH.isin(exclude)].copy()
@@ -38,7 +41,7 @@ def format_emissions(annual_emissions: pd.DataFrame) -> pd.DataFrame:
 
     df = annual_emissions.copy().reset_index()
 
-    df["COUNTRY"] = df.EMISSION.str[3:6]
+    df["COUNTRY"] = code_slice(df.EMISSION, 3, 6).astype(object)
     return df.groupby(["REGION", "EMISSION", "COUNTRY", "YEAR"]).sum()
 
 def format_global_values(production: pd.DataFrame, emissions: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
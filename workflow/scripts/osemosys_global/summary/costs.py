@@ -3,6 +3,8 @@
 import pandas as pd
 from pathlib import Path
 
+from osemosys_global.set_codes import code_field
+
 
 def get_tech_cost(discounted_cost_tech: pd.DataFrame, country: bool) -> pd.DataFrame:
     """Only of power generation technologies"""
@@ -14,12 +16,8 @@ def get_tech_cost(discounted_cost_tech: pd.DataFrame, country: bool) -> pd.DataF
         & ~(df.index.get_level_values("TECHNOLOGY").str.contains("TRN"))
     ]
 
-    if country:
-        r = "COUNTRY"
-        df[r] = df.index.get_level_values("TECHNOLOGY").str[6:9]
-    else:
-        r = "NODE"
-        df[r] = df.index.get_level_values("TECHNOLOGY").str[6:11]
+    r = "COUNTRY" if country else "NODE"
+    df[r] = code_field(df.index.get_level_values("TECHNOLOGY"), r).astype(object)
 
     return (
         df.reset_index()[["REGION", r, "YEAR", "VALUE"]]
@@ -34,12 +32,9 @@ def get_storage_cost(
 
     df = discounted_cost_storage.copy()
 
-    if country:
-        r = "COUNTRY"
-        df[r] = df.index.get_level_values("STORAGE").str[3:6]
-    else:
-        r = "NODE"
-        df[r] = df.index.get_level_values("STORAGE").str[3:8]
+    r = "COUNTRY" if country else "NODE"
+    storages = df.index.get_level_values("STORAGE")
+    df[r] = code_field(storages, r, "STORAGE").astype(object)
 
     return (
         df.reset_index()[["REGION", r, "YEAR", "VALUE"]]
@@ -55,23 +50,16 @@ def get_transmission_cost(discounted_cost_tech: pd.DataFrame, country: bool) ->
         (df.index.get_level_values("TECHNOLOGY").str.startswith("TRN"))
     ].copy()
 
-    if country:
-        r = "COUNTRY"
-        df1[r] = df1.index.get_level_values("TECHNOLOGY").str[3:6]
-    else:
-        r = "NODE"
-        df1[r] = df1.index.get_level_values("TECHNOLOGY").str[3:8]
+    r = "COUNTRY" if country else "NODE"
+    techs = df1.index.get_level_values("TECHNOLOGY")
+    df1[r] = code_field(techs, f"FROM_{r}").astype(object)
     
     df2 = df.copy()[
         (df.index.get_level_values("TECHNOLOGY").str.startswith("TRN"))
     ]
 
-    if country:
-        r = "COUNTRY"
-        df2[r] = df2.index.get_level_values("TECHNOLOGY").str[8:11]
-    else:
-        r = "NODE"
-        df2[r] = df2.index.get_level_values("TECHNOLOGY").str[8:13]
+    techs = df2.index.get_level_values("TECHNOLOGY")
+    df2[r] = code_field(techs, f"TO_{r}").astype(object)
         
     for df in [df1, df2]:
         df['VALUE'] = df['VALUE'] / 2
@@ -90,12 +78,8 @@ def get_demand(demand: pd.DataFrame, country: bool) -> pd.DataFrame:
 
     df = df[df.index.get_level_values("FUEL").str.startswith("ELC")]
 
-    if country:
-        r = "COUNTRY"
-        df[r] = df.index.get_level_values("FUEL").str[3:6]
-    else:
-        r = "NODE"
-        df[r] = df.index.get_level_values("FUEL").str[3:8]
+    r = "COUNTRY" if country else "NODE"
+    df[r] = code_field(df.index.get_level_values("FUEL"), r, "FUEL").astype(object)
 
     return (
         df.reset_index()[["REGION", r, "YEAR", "VALUE"]]
@@ -4,6 +4,8 @@ import pandas as pd
 from typing import Optional
 from constants import CLEAN, RENEWABLES, FOSSIL
 
+from osemosys_global.set_codes import code_field, decode
+
 
 def _get_gen_by_node(
     production: pd.DataFrame,
@@ -16,8 +18,9 @@ def _get_gen_by_node(
 
     assert "TECHNOLOGY" in df.index.names
 
-    df["TECH"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
-    df["NODE"] = df.index.get_level_values("TECHNOLOGY").str[6:11]
+    parts = decode(df.index.get_level_values("TECHNOLOGY"), fields=["TECH", "NODE"])
+    df["TECH"] = parts["TECH"].to_numpy()
+    df["NODE"] = parts["NODE"].astype(object).to_numpy()
 
     if exclude:
         df = df[~df.TECH.isin(exclude)].copy()
@@ -43,8 +46,9 @@ def _get_gen_by_country(
 
     assert "TECHNOLOGY" in df.index.names
 
-    df["TECH"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
-    df["COUNTRY"] = df.index.get_level_values("TECHNOLOGY").str[6:9]
+    parts = decode(df.index.get_level_values("TECHNOLOGY"), fields=["TECH", "COUNTRY"])
+    df["TECH"] = parts["TECH"].to_numpy()
+    df["COUNTRY"] = parts["COUNTRY"].astype(object).to_numpy()
 
     if exclude:
         df = df[~df.TECH.isin(exclude)].copy()
@@ -69,7 +73,7 @@ def _get_gen_global(
 
     assert "TECHNOLOGY" in df.index.names
 
-    df["TECH"] = df.index.get_level_values("TECHNOLOGY").str[3:6]
+    df["TECH"] = code_field(df.index.get_level_values("TECHNOLOGY"), "TECH")
     #df["COUNTRY"] = df.index.get_level_values("TECHNOLOGY").str[6:9]
 
     if exclude:
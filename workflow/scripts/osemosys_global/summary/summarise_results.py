@@ -7,6 +7,7 @@ from configuration import ConfigFile, ConfigPaths
 from osemosys_global.visualisation.utils import transform_ts, powerplant_filter
 from osemosys_global.visualisation.constants import DAYS_PER_MONTH, MONTH_NAMES
 from osemosys_global.utils import apply_timeshift
+from osemosys_global.timeseries import TimesliceHours
 pd.set_option('mode.chained_assignment', None)
 
 
@@ -346,115 +347,25 @@ def generation_by_node_summary(input_data: Dict[str,pd.DataFrame], result_data:
 
     # Generation
     df_gen_by_node = result_data["ProductionByTechnology"]
-    # GET TECHS TO PLOT
-    generation = list(df_gen_by_node.TECHNOLOGY.unique())
     df_gen_by_node['NODE'] = (df_gen_by_node['TECHNOLOGY'].str[6:11])
     df_gen_by_node = powerplant_filter(df_gen_by_node, country=None)
     df_gen_by_node = df_gen_by_node.loc[df_gen_by_node['FUEL'].str.startswith('ELC')]
 
     # GET TIMESLICE DEFINITION
 
-    seasons_raw = config.get('seasons')
-    seasonsData = []
-
-    for s, months in seasons_raw.items():
-        for month in months:
-            seasonsData.append([month, s]) 
-    seasons_df = pd.DataFrame(seasonsData, 
-                              columns=['month', 'season'])
-    seasons_df = seasons_df.sort_values(by=['month']).reset_index(drop=True)
-    dayparts_raw = config.get('dayparts')
-    daypartData = []
-    for dp, hr in dayparts_raw.items():
-        daypartData.append([dp, hr[0], hr[1]])
-    dayparts_df = pd.DataFrame(daypartData,
-                               columns=['daypart', 'start_hour', 'end_hour'])
-    timeshift = config.get('timeshift')
-    dayparts_df['start_hour'] = dayparts_df['start_hour'].map(lambda x: apply_timeshift(x, timeshift))
-    dayparts_df['end_hour'] = dayparts_df['end_hour'].map(lambda x: apply_timeshift(x, timeshift))
-
-    month_names = MONTH_NAMES
-    days_per_month = DAYS_PER_MONTH
-
-    seasons_df['month_name'] = seasons_df['month'].map(month_names)
-    seasons_df['days'] = seasons_df['month_name'].map(days_per_month)
-    seasons_df_grouped = seasons_df.groupby(['season'],
-                                            as_index=False)['days'].sum()
-    days_dict = dict(zip(list(seasons_df_grouped['season']),
-                         list(seasons_df_grouped['days'])
-                         )
-                     )
-    seasons_df['days'] = seasons_df['season'].map(days_dict)
-
+    # as saved by the timeslice rule, for grid and representative timeslices
+    timeslices = TimesliceHours.read(os.path.join('results', 'timeslice_hours.csv'))
+    months = timeslices.months.tolist()
     years = config.get_years()
 
-    seasons_dict = dict(zip(list(seasons_df['month']),
-                            list(seasons_df['season'])
-                            )
-                        )
-
-    dayparts_dict = {i: [j, k]
-                     for i, j, k
-                     in zip(list(dayparts_df['daypart']),
-                            list(dayparts_df['start_hour']),
-                            list(dayparts_df['end_hour'])
-                            )
-                     }
-
-    hours_dict = {i: abs(k-j)
-                  for i, j, k
-                  in zip(list(dayparts_df['daypart']),
-                         list(dayparts_df['start_hour']),
-                         list(dayparts_df['end_hour'])
-                         )
-                  }
-
-    months = list(seasons_dict)
-    hours = list(range(1, 25))
-
     # APPLY TRANSFORMATION
-    df_ts_template = pd.DataFrame(list(itertools.product(generation,
-                                                         months,
-                                                         hours,
-                                                         years)
-                                       ),
-                                  columns=['TECHNOLOGY',
-                                           'MONTH',
-                                           'HOUR',
-                                           'YEAR']
-                                  )
 
-    df_ts_template = df_ts_template.sort_values(by=['TECHNOLOGY', 'YEAR'])
-    df_ts_template['SEASON'] = df_ts_template['MONTH'].map(seasons_dict)
-    df_ts_template['DAYS'] = df_ts_template['SEASON'].map(days_dict)
-    df_ts_template['YEAR'] = df_ts_template['YEAR'].astype(int)
-    df_ts_template = powerplant_filter(df_ts_template)
-
-    for daypart in dayparts_dict:
-        if dayparts_dict[daypart][0] > dayparts_dict[daypart][1]: # loops over 24hrs
-            df_ts_template.loc[(df_ts_template['HOUR'] >= dayparts_dict[daypart][0]) |
-                          (df_ts_template['HOUR'] < dayparts_dict[daypart][1]),
-                          'DAYPART'] = daypart
-        else:
-            df_ts_template.loc[(df_ts_template['HOUR'] >= dayparts_dict[daypart][0]) &
-                               (df_ts_template['HOUR'] < dayparts_dict[daypart][1]),
-                               'DAYPART'] = daypart
-
-    df_ts_template = df_ts_template.drop_duplicates()
-
-    df_gen_by_node['SEASON'] = df_gen_by_node['TIMESLICE'].str[0:2]
-    df_gen_by_node['DAYPART'] = df_gen_by_node['TIMESLICE'].str[2:]
     df_gen_by_node['YEAR'] = df_gen_by_node['YEAR'].astype(int)
-    df_gen_by_node.drop(['REGION', 'TIMESLICE'],
+    df_gen_by_node = df_gen_by_node.loc[df_gen_by_node['YEAR'].isin(years)]
+    df_gen_by_node.drop(['REGION'],
                         axis=1,
                         inplace=True)
-
-    df_gen_by_node = pd.merge(df_gen_by_node,
-                              df_ts_template,
-                              how='left',
-                              on=['LABEL', 'SEASON', 'DAYPART', 'YEAR']).dropna()
-    df_gen_by_node['HOUR_COUNT'] = df_gen_by_node['DAYPART'].map(hours_dict)
-    df_gen_by_node['VALUE'] = (df_gen_by_node['VALUE'].mul(1e6))/(df_gen_by_node['DAYS']*df_gen_by_node['HOUR_COUNT'].mul(3600))
+    df_gen_by_node = timeslices.to_hours(df_gen_by_node.dropna())
 
     df_gen_by_node = df_gen_by_node.pivot_table(index=['MONTH', 'HOUR', 'YEAR', 'NODE'],
                                               columns='LABEL',
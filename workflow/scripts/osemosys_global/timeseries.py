@@ -0,0 +1,757 @@
+"""Functions for hourly timeseries data"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import fcluster, linkage
+
+# PLEXOS timestamps, ie. "01/01/2015 1:00". Midnight is written as "01/01/2015".
+TIMESTAMP = r"^(\d{1,2})/(\d{1,2})/(\d{4})(?: (\d{1,2}):(\d{2}))?$"
+
+CALENDAR_FIELDS = ["Year", "Month", "Day", "Hour"]
+
+
+def parse_timestamps(values: pd.Series) -> pd.DataFrame:
+    """Decodes "dd/mm/YYYY H:MM" timestamps into calendar fields
+
+    Each unique timestamp is decoded once with a single regular expression,
+    rather than trying each format per row.
+
+    Arguments
+    ---------
+    values: pd.Series
+        Timestamps, where midnight may be written without the time
+
+    Returns
+    -------
+    pd.DataFrame
+        Datetime, and Year, Month, Day and Hour as integers, in the order and
+        with the index of the values
+    """
+
+    codes, uniques = pd.factorize(values)
+    if (codes < 0).any():
+        raise ValueError("Timestamps can not be missing")
+
+    fields = pd.Series(uniques, dtype=str).str.extract(TIMESTAMP)
+
+    invalid = fields[0].isna().to_numpy()
+    if invalid.any():
+        raise ValueError(f"Can not parse timestamp {uniques[invalid][0]}")
+
+    fields = fields.fillna(0).astype(int).to_numpy()
+    day, month, year, hour, minute = (fields[:, i] for i in range(5))
+
+    datetime = pd.to_datetime(
+        pd.DataFrame(
+            {"year": year, "month": month, "day": day, "hour": hour, "minute": minute}
+        )
+    )
+
+    return pd.DataFrame(
+        {
+            "Datetime": datetime.to_numpy()[codes],
+            "Year": year[codes],
+            "Month": month[codes],
+            "Day": day[codes],
+            "Hour": hour[codes],
+        },
+        index=values.index,
+    )
+
+
+class HourlyIndex:
+    """Parsed hourly timestamps, shared by frames with the same timestamps
+
+    The demand and renewable profile files hold the same hours of the year, so
+    the timestamps are only parsed for the first frame and then looked up.
+    """
+
+    def __init__(self):
+        self._parsed = []
+
+    def __call__(self, values: pd.Series) -> pd.DataFrame:
+        """Gets the parsed timestamps, see parse_timestamps"""
+
+        raw = values.to_numpy()
+        for known, parsed in self._parsed:
+            if len(known) == len(raw) and np.array_equal(known, raw):
+                return parsed.set_axis(values.index)
+
+        parsed = parse_timestamps(values)
+        self._parsed.append((raw, parsed))
+        return parsed
+
+
+DAYS_PER_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+DAYTYPES = ["WD", "WE"]
+
+
+def _shift(hours: np.ndarray, timeshift: int) -> np.ndarray:
+    """Applies the timeshift to hours between 0-24, see utils.apply_timeshift"""
+
+    hours = np.asarray(hours) + timeshift
+    return np.where(hours > 23, hours - 24, np.where(hours < 0, hours + 24, hours))
+
+
+class Timeslices:
+    """Timeslices of seasons, day types and dayparts
+
+    Holds the timeslices of a season x day type x daypart grid as integer
+    codes into `names`, with -1 for hours outside of all timeslices, and
+    aggregates hourly values to them. The hours of the year are assigned to
+    timeslices by the subclasses, see TimesliceMapper and
+    RepresentativeMapper.
+
+    Arguments
+    ---------
+    dayparts: dict[str, list[int]]
+        Start and end hour of each daypart, ie. {"D1": [1, 7], ...}
+    timeshift: int
+        Offset of the dayparts from UTC
+    """
+
+    def __init__(self, dayparts: dict[str, list[int]], timeshift: int = 0):
+        self.timeshift = timeshift
+        self.seasons = []
+        self.dayparts = list(dayparts)
+        self.daytypes = [""]
+
+        # days of a week in each day type
+        self.daytype_days = np.array([7])
+
+        # the later daypart wins where dayparts overlap
+        self._daypart = np.full(25, -1)
+        hours = np.arange(25)
+        hour_count = []
+        for code, (start, end) in enumerate(dayparts.values()):
+            start, end = _shift([start, end], timeshift)
+            if start > end:  # loops over 24hrs
+                self._daypart[(hours >= start) | (hours < end)] = code
+            else:
+                self._daypart[(hours >= start) & (hours < end)] = code
+            hour_count.append((end - start - 1) % 24 + 1)
+        self._hour_count = np.array(hour_count, dtype=int)
+        # hour 24 is midnight, as hour 0
+        self._daypart[24] = self._daypart[0]
+
+        self._season_days = np.zeros(0, dtype=int)
+
+    def _set_timeslices(self) -> None:
+        """Builds the names, days and hours of each timeslice
+
+        Timeslices are ordered by season, day type and daypart. The season,
+        day type and daypart of each timeslice are kept as codes for the
+        Conversion tables.
+        """
+
+        self.season_index, self.daytype_index, self.daypart_index = (
+            x.ravel()
+            for x in np.meshgrid(
+                np.arange(len(self.seasons)),
+                np.arange(len(self.daytypes)),
+                np.arange(len(self.dayparts)),
+                indexing="ij",
+            )
+        )
+        self.names = np.array(
+            [
+                self.seasons[s] + self.daytypes[d] + self.dayparts[p]
+                for s, d, p in zip(
+                    self.season_index, self.daytype_index, self.daypart_index
+                )
+            ],
+            dtype=object,
+        )
+        self.days = self._season_days[self.season_index]
+        self.hour_count = self._hour_count[self.daypart_index]
+        self._names = pd.Index(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def codes(self, timeslices: pd.Series) -> np.ndarray:
+        """Gets the codes of timeslice names, -1 for unknown names"""
+        return self._names.get_indexer(timeslices)
+
+    def counts(self, codes: np.ndarray) -> np.ndarray:
+        """Number of hours in each timeslice"""
+        return np.bincount(codes[codes >= 0], minlength=len(self))
+
+    def aggregate(
+        self, codes: np.ndarray, values: np.ndarray, how: str = "sum"
+    ) -> np.ndarray:
+        """Aggregates hourly values to timeslices
+
+        Rows are sorted by timeslice once and each timeslice is reduced over
+        all columns at the same time. Missing values are skipped.
+
+        Arguments
+        ---------
+        codes: np.ndarray
+            Timeslice code of each hour
+        values: np.ndarray
+            Hours x columns matrix, ie. a column per node
+        how: str
+            "sum" or "mean"
+
+        Returns
+        -------
+        np.ndarray
+            Timeslices x columns matrix, NaN for timeslices without hours
+        """
+
+        if how not in ("sum", "mean"):
+            raise ValueError(f"Can not aggregate timeslices by {how}")
+
+        values = np.asarray(values, dtype=float)
+        valid = codes >= 0
+        order = np.argsort(codes[valid], kind="stable")
+        codes = codes[valid][order]
+        values = values[valid][order]
+
+        aggregated = np.full((len(self), values.shape[1]), np.nan)
+        if not len(codes):
+            return aggregated
+
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        missing = np.isnan(values)
+        sums = np.add.reduceat(np.where(missing, 0, values), starts, axis=0)
+        if how == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                sums = sums / np.add.reduceat(~missing, starts, axis=0)
+        aggregated[codes[starts]] = sums
+        return aggregated
+
+    def to_frame(
+        self, aggregated: np.ndarray, columns: list[str], value_name: str
+    ) -> pd.DataFrame:
+        """Melts aggregated timeslice values into a long frame
+
+        Arguments
+        ---------
+        aggregated: np.ndarray
+            Timeslices x columns matrix, see aggregate
+        columns: list[str]
+            Name of each column, ie. the nodes
+        value_name: str
+            Name of the value column
+
+        Returns
+        -------
+        pd.DataFrame
+            TIMESLICE, node and value columns, sorted by timeslice and node,
+            for the timeslices with values
+        """
+
+        present = ~np.isnan(aggregated).all(axis=1)
+        df = pd.DataFrame(
+            aggregated[present], index=self.names[present], columns=columns
+        )
+        df = df.sort_index().sort_index(axis=1)
+        return pd.DataFrame(
+            {
+                "TIMESLICE": np.repeat(df.index.to_numpy(), df.shape[1]),
+                "node": np.tile(df.columns.to_numpy(), df.shape[0]),
+                value_name: df.to_numpy().ravel(),
+            }
+        )
+
+    def days_in_daytype(self) -> pd.DataFrame:
+        """Days of a week in each day type of each season
+
+        Arguments to DaysInDayType, as the storage balance counts each day
+        type once per day of the week it stands for. The days of each season
+        add up to a week.
+
+        Returns
+        -------
+        pd.DataFrame
+            SEASON, DAYTYPE and VALUE columns, with seasons and day types
+            numbered from 1
+        """
+
+        season, daytype = np.meshgrid(
+            np.arange(len(self.seasons)),
+            np.arange(len(self.daytypes)),
+            indexing="ij",
+        )
+        return pd.DataFrame(
+            {
+                "SEASON": season.ravel() + 1,
+                "DAYTYPE": daytype.ravel() + 1,
+                "VALUE": self.daytype_days[daytype.ravel()].astype(float),
+            }
+        )
+
+    def month_hours(
+        self, codes: np.ndarray, months: np.ndarray, hours: np.ndarray
+    ) -> pd.DataFrame:
+        """Counts the hours of each timeslice by month and hour of the day
+
+        Arguments
+        ---------
+        codes: np.ndarray
+            Timeslice code of each hour
+        months: np.ndarray
+            Month of each hour, 1-12
+        hours: np.ndarray
+            Hour of the day of each hour, in UTC
+
+        Returns
+        -------
+        pd.DataFrame
+            TIMESLICE, MONTH, HOUR and HOURS columns, sorted by timeslice,
+            month and hour. HOUR is 1-24 and shifted as the dayparts, as
+            returned by to_hours, see TimesliceHours.
+        """
+
+        hours = _shift(np.asarray(hours, dtype=int), self.timeshift)
+        df = pd.DataFrame(
+            {
+                "CODE": np.asarray(codes),
+                "MONTH": np.asarray(months, dtype=int),
+                "HOUR": np.where(hours == 0, 24, hours),
+            }
+        )
+        df = df.loc[df["CODE"] >= 0]
+        df = df.groupby(["CODE", "MONTH", "HOUR"]).size().reset_index(name="HOURS")
+        df.insert(0, "TIMESLICE", self.names[df.pop("CODE")])
+        return df
+
+    def approximation_error(
+        self,
+        codes: np.ndarray,
+        sample_codes: np.ndarray,
+        values: np.ndarray,
+        columns: list[str],
+    ) -> pd.DataFrame:
+        """Compares hourly values with their timeslice approximation
+
+        Each hour is approximated by the mean of its timeslice over the
+        sampled hours, ie. the value the model sees in that hour.
+
+        Arguments
+        ---------
+        codes: np.ndarray
+            Timeslice code of each hour
+        sample_codes: np.ndarray
+            Timeslice code of the hours the timeslice values are taken from,
+            -1 for the other hours
+        values: np.ndarray
+            Hours x columns matrix, ie. a column per node
+        columns: list[str]
+            Name of each column
+
+        Returns
+        -------
+        pd.DataFrame
+            Mean, standard deviation and peak of the hourly and approximated
+            values of each column, and the RMSE of the hourly values and of
+            the duration curves relative to the hourly mean
+        """
+
+        values = np.asarray(values, dtype=float)
+        approximated = self.aggregate(sample_codes, values, "mean")
+        approximated = np.where(
+            (codes >= 0)[:, None], approximated[np.maximum(codes, 0)], np.nan
+        )
+        missing = np.isnan(values) | np.isnan(approximated)
+        values = np.where(missing, np.nan, values)
+        approximated = np.where(missing, np.nan, approximated)
+
+        # missing values are sorted last in both duration curves
+        duration = np.sort(-values, axis=0)
+        approximated_duration = np.sort(-approximated, axis=0)
+
+        with warnings.catch_warnings(), np.errstate(divide="ignore", invalid="ignore"):
+            warnings.simplefilter("ignore", RuntimeWarning)
+            mean = np.nanmean(values, axis=0)
+            report = pd.DataFrame(
+                {
+                    "column": columns,
+                    "mean": mean,
+                    "mean_approximated": np.nanmean(approximated, axis=0),
+                    "std": np.nanstd(values, axis=0),
+                    "std_approximated": np.nanstd(approximated, axis=0),
+                    "peak": np.nanmax(values, axis=0),
+                    "peak_approximated": np.nanmax(approximated, axis=0),
+                    "hourly_nrmse": np.sqrt(
+                        np.nanmean((approximated - values) ** 2, axis=0)
+                    )
+                    / mean,
+                    "duration_nrmse": np.sqrt(
+                        np.nanmean((approximated_duration - duration) ** 2, axis=0)
+                    )
+                    / mean,
+                }
+            )
+        return report
+
+
+class TimesliceMapper(Timeslices):
+    """Maps the hours of the year to timeslices
+
+    The seasons, dayparts, day types and timeshift of the configuration are
+    compiled once into lookup tables of month -> season and hour -> daypart,
+    so hours are assigned a timeslice by indexing rather than by a mask per
+    daypart.
+
+    Arguments
+    ---------
+    seasons: dict[str, list[int]]
+        Months of each season, ie. {"S1": [1, 2, 3, 4, 5, 6], ...}
+    dayparts: dict[str, list[int]]
+        Start and end hour of each daypart, ie. {"D1": [1, 7], ...}
+    timeshift: int
+        Offset of the dayparts from UTC
+    daytype: bool
+        Whether timeslices are split into weekdays and weekends
+    """
+
+    def __init__(
+        self,
+        seasons: dict[str, list[int]],
+        dayparts: dict[str, list[int]],
+        timeshift: int = 0,
+        daytype: bool = False,
+    ):
+        super().__init__(dayparts, timeshift)
+        self.seasons = list(seasons)
+        if daytype:
+            self.daytypes = DAYTYPES
+            self.daytype_days = np.array([5, 2])
+
+        self._season = np.full(13, -1)
+        for code, months in enumerate(seasons.values()):
+            self._season[months] = code
+
+        self._season_days = np.zeros(len(self.seasons), dtype=int)
+        months = np.flatnonzero(self._season >= 0)
+        np.add.at(
+            self._season_days,
+            self._season[months],
+            np.array(DAYS_PER_MONTH)[months - 1],
+        )
+
+        self._set_timeslices()
+
+    @property
+    def months(self) -> np.ndarray:
+        """Months within a season"""
+        return np.flatnonzero(self._season >= 0)
+
+    def index(
+        self,
+        months: np.ndarray,
+        hours: np.ndarray,
+        weekdays: np.ndarray = None,
+        shift: bool = True,
+    ) -> np.ndarray:
+        """Gets the timeslice of each hour
+
+        Arguments
+        ---------
+        months: np.ndarray
+            Month of each hour, 1-12
+        hours: np.ndarray
+            Hour of the day
+        weekdays: np.ndarray
+            Day of the week of each hour, Monday being 0. Only needed with
+            day types
+        shift: bool
+            Whether the hours are shifted by the timeshift, as for hours in
+            UTC. Hours already local to the dayparts are not shifted.
+
+        Returns
+        -------
+        np.ndarray
+            Timeslice code of each hour
+        """
+
+        months = np.asarray(months, dtype=int)
+        hours = np.asarray(hours, dtype=int)
+        if shift:
+            hours = _shift(hours, self.timeshift)
+
+        season = np.where(
+            (months >= 0) & (months < 13), self._season[np.clip(months, 0, 12)], -1
+        )
+        daypart = np.where(
+            (hours >= 0) & (hours < 25), self._daypart[np.clip(hours, 0, 24)], -1
+        )
+
+        if len(self.daytypes) > 1:
+            if weekdays is None:
+                raise ValueError("Weekdays are needed to assign day types")
+            daytype = (np.asarray(weekdays) >= 5).astype(int)
+        else:
+            daytype = 0
+
+        codes = (season * len(self.daytypes) + daytype) * len(self.dayparts) + daypart
+        return np.where((season < 0) | (daypart < 0), -1, codes)
+
+
+class TimesliceHours:
+    """Hours of the year in each timeslice, by month and hour of the day
+
+    Saved by the timeslice rule, see Timeslices.month_hours, so results can
+    be spread over the hours of the year without rebuilding the timeslices
+    from the configuration. Where several timeslices share a month and hour,
+    as day types and representative periods do, each is weighted by its
+    share of the hours of that month and hour.
+
+    Arguments
+    ---------
+    hours: pd.DataFrame
+        TIMESLICE, MONTH, HOUR and HOURS columns
+    """
+
+    def __init__(self, hours: pd.DataFrame):
+        self.hours = hours.sort_values(["MONTH", "HOUR"], kind="stable").reset_index(
+            drop=True
+        )
+
+    @classmethod
+    def read(cls, path: str) -> "TimesliceHours":
+        """Reads the hours saved by the timeslice rule"""
+        return cls(pd.read_csv(path, dtype={"TIMESLICE": str}))
+
+    @property
+    def months(self) -> np.ndarray:
+        """Months within a timeslice"""
+        return np.unique(self.hours["MONTH"])
+
+    def to_hours(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Spreads timesliced energy over the hours of the day of each month
+
+        Arguments
+        ---------
+        df: pd.DataFrame
+            Data with TIMESLICE and VALUE columns, in PJ per timeslice
+
+        Returns
+        -------
+        pd.DataFrame
+            Data with MONTH and HOUR (1-24) columns instead of TIMESLICE, one
+            row per hour of the day and month of the timeslice, with VALUE as
+            the average power of the timeslice over the hours of the month
+            and hour it covers. Rows of timeslices sharing a month and hour
+            add up to the average power in that hour.
+        """
+
+        hours = self.hours
+        timeslice_hours = hours.groupby("TIMESLICE")["HOURS"].transform("sum")
+        month_hours = hours.groupby(["MONTH", "HOUR"])["HOURS"].transform("sum")
+        weights = hours[["TIMESLICE", "MONTH", "HOUR"]].assign(
+            WEIGHT=hours["HOURS"] / (timeslice_hours * month_hours)
+        )
+
+        df = df.reset_index(drop=True)
+        rows = df[["TIMESLICE"]].reset_index().merge(weights, on="TIMESLICE")
+
+        hourly = df.loc[rows["index"]].drop(columns="TIMESLICE").reset_index(drop=True)
+        hourly["MONTH"] = rows["MONTH"].to_numpy()
+        hourly["HOUR"] = rows["HOUR"].to_numpy()
+        hourly["VALUE"] = (hourly["VALUE"].to_numpy() * 1e6) / 3600 * rows[
+            "WEIGHT"
+        ].to_numpy()
+        return hourly
+
+
+PERIOD_DAYS = {"day": 1, "week": 7}
+
+
+def elapsed_hours(datetimes: pd.Series) -> np.ndarray:
+    """Hours since the first of the datetimes"""
+
+    datetimes = pd.Series(pd.to_datetime(datetimes))
+    return ((datetimes - datetimes.min()) // pd.Timedelta(hours=1)).to_numpy()
+
+
+def cluster_periods(
+    matrix: np.ndarray, period_hours: int, count: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Clusters the periods of an hourly matrix into representative periods
+
+    Each full period is a point of its hourly values of all columns, with
+    columns scaled to their peak so demand and capacity factors weigh alike.
+    Periods are grouped by Ward's hierarchical clustering, and each cluster
+    is represented by its medoid, the member period closest to the cluster
+    mean.
+
+    Arguments
+    ---------
+    matrix: np.ndarray
+        Hours x columns matrix in chronological order, ie. a column per
+        node and profile
+    period_hours: int
+        Hours in a period, ie. 24 for days
+    count: int
+        Number of representative periods
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Cluster of each full period, and the medoid period of each cluster.
+        Clusters are ordered by their medoid.
+    """
+
+    matrix = np.asarray(matrix, dtype=float)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        peak = np.nanmax(np.abs(matrix), axis=0)
+    peak = np.where(np.isfinite(peak) & (peak > 0), peak, 1)
+    matrix = np.nan_to_num(matrix / peak)
+
+    periods = len(matrix) // period_hours
+    if not 0 < count <= periods:
+        raise ValueError(f"Can not pick {count} representative periods of {periods}")
+
+    features = matrix[: periods * period_hours].reshape(periods, -1)
+    if count == periods:
+        labels = np.arange(periods)
+    else:
+        labels = fcluster(linkage(features, "ward"), count, "maxclust")
+        # fewer clusters are returned where periods are identical
+        labels = np.unique(labels, return_inverse=True)[1]
+
+    medoids = []
+    for cluster in range(labels.max() + 1):
+        members = np.flatnonzero(labels == cluster)
+        distance = ((features[members] - features[members].mean(axis=0)) ** 2).sum(
+            axis=1
+        )
+        medoids.append(members[np.argmin(distance)])
+    medoids = np.array(medoids)
+
+    order = np.argsort(medoids)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[labels], medoids[order]
+
+
+class RepresentativeMapper(Timeslices):
+    """Maps the hours of the year to timeslices of representative periods
+
+    Every period of the year is assigned the representative period of its
+    cluster, see cluster_periods. A season is made per representative period,
+    named R01, R02, ..., a day type per day of a representative week, named
+    Y1 to Y7, and the dayparts are as configured. Timeslice values are taken
+    from the hours of the representative periods only, and weighted by the
+    periods they represent through the timeslice counts.
+
+    Arguments
+    ---------
+    dayparts: dict[str, list[int]]
+        Start and end hour of each daypart, ie. {"D1": [1, 7], ...}
+    labels: np.ndarray
+        Cluster of each full period of the year
+    medoids: np.ndarray
+        Period representing each cluster
+    period: str
+        "day" or "week"
+    timeshift: int
+        Offset of the dayparts from UTC
+    """
+
+    def __init__(
+        self,
+        dayparts: dict[str, list[int]],
+        labels: np.ndarray,
+        medoids: np.ndarray,
+        period: str = "day",
+        timeshift: int = 0,
+    ):
+        if period not in PERIOD_DAYS:
+            raise ValueError(f"Representative periods can not be a {period}")
+
+        super().__init__(dayparts, timeshift)
+        self.period_days = PERIOD_DAYS[period]
+        self.labels = np.asarray(labels)
+        self.medoids = np.asarray(medoids)
+
+        self.seasons = [f"R{x + 1:02d}" for x in range(len(self.medoids))]
+        if self.period_days > 1:
+            self.daytypes = [f"Y{x + 1}" for x in range(self.period_days)]
+            self.daytype_days = np.ones(self.period_days, dtype=int)
+
+        # days of the year on which each timeslice occurs
+        self._season_days = np.bincount(self.labels, minlength=len(self.medoids))
+        self._set_timeslices()
+
+    @classmethod
+    def from_profiles(
+        cls,
+        datetimes: pd.Series,
+        values: np.ndarray,
+        dayparts: dict[str, list[int]],
+        period: str = "day",
+        count: int = 12,
+        timeshift: int = 0,
+    ) -> "RepresentativeMapper":
+        """Picks representative periods of hourly profiles
+
+        Arguments
+        ---------
+        datetimes: pd.Series
+            Hours of the profiles, in UTC
+        values: np.ndarray
+            Hours x columns matrix, ie. the demand and capacity factor of
+            each node
+        dayparts: dict[str, list[int]]
+            Start and end hour of each daypart
+        period: str
+            "day" or "week"
+        count: int
+            Number of representative periods
+        timeshift: int
+            Offset of the dayparts from UTC
+        """
+
+        if period not in PERIOD_DAYS:
+            raise ValueError(f"Representative periods can not be a {period}")
+
+        elapsed = elapsed_hours(datetimes)
+        values = np.asarray(values, dtype=float)
+        matrix = np.full((elapsed.max() + 1, values.shape[1]), np.nan)
+        matrix[elapsed] = values
+
+        labels, medoids = cluster_periods(matrix, 24 * PERIOD_DAYS[period], count)
+        return cls(dayparts, labels, medoids, period, timeshift)
+
+    def index_periods(self, datetimes: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Gets the timeslice of each hour
+
+        Hours after the last full period are assigned the cluster of the last
+        full period.
+
+        Arguments
+        ---------
+        datetimes: pd.Series
+            Hours of the year, in UTC
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray]
+            Timeslice code of each hour, and the timeslice code of the hours
+            of the representative periods with -1 for all other hours
+        """
+
+        elapsed = elapsed_hours(datetimes)
+        period_hours = 24 * self.period_days
+        period = np.minimum(elapsed // period_hours, len(self.labels) - 1)
+        season = self.labels[period]
+
+        daypart = self._daypart[_shift(pd.Series(datetimes).dt.hour, self.timeshift)]
+        daytype = (elapsed // 24) % self.period_days
+
+        codes = (season * len(self.daytypes) + daytype) * len(self.dayparts) + daypart
+        codes = np.where(daypart < 0, -1, codes)
+
+        sampled = (period == self.medoids[season]) & (
+            elapsed < len(self.labels) * period_hours
+        )
+        return codes, np.where(sampled, codes, -1)
@@ -46,8 +46,13 @@ def set_transmission_losses(df_exist_corrected, df_planned_corrected,
     
     return eff_df
 
-def activity_transmission(df_iar_base, df_oar_base, df_eff,
+def activity_transmission(df_oar_base, df_eff,
                           start_year, end_year, region_name):
+    """Sets activity ratios for transmission technologies
+
+    Powerplant output activity ratios are only used to get the nodes to
+    connect. The returned activity ratios only hold transmission data.
+    """
 
     # #### Downstream Activity Ratios
     
@@ -111,7 +116,6 @@ def activity_transmission(df_iar_base, df_oar_base, df_eff,
     
     df_oar_trn_final = pd.concat(
             [
-                df_oar_base,
                 df_oar_trn,
                 df_int_trn_oar,
             ]
@@ -119,7 +123,6 @@ def activity_transmission(df_iar_base, df_oar_base, df_eff,
     
     df_iar_trn_final = pd.concat(
             [
-                df_iar_base,
                 df_iar_trn,
                 df_int_trn_iar,
             ]
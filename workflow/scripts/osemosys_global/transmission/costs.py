@@ -8,8 +8,7 @@ from data import(
     )
 
 def get_transmission_costs(df_exist_corrected, df_planned_corrected,
-                           df_pp_capex_base, df_pp_fix_base,
-                           df_pp_var_base, centerpoints_dict, 
+                           centerpoints_dict, 
                            trn_param, start_year, end_year, 
                            region_name, subsea_lines):
     '''Gets electrical transmission capital, fixed and variable cost per technology. 
@@ -82,10 +81,4 @@ def get_transmission_costs(df_exist_corrected, df_planned_corrected,
     df_fix = df_fix[['REGION', 'TECHNOLOGY', 'YEAR', 'VALUE']]
     df_var = df_var[['REGION', 'TECHNOLOGY', 'MODE_OF_OPERATION', 'YEAR', 'VALUE']]    
     
-    # Add transmission costs dfs to powerplant costs dfs.
-    
-    df_capex = pd.concat([df_pp_capex_base, df_capex])
-    df_fix = pd.concat([df_pp_fix_base, df_fix])
-    df_var = pd.concat([df_pp_var_base, df_var])    
-    
     return df_capex, df_fix, df_var
\ No newline at end of file
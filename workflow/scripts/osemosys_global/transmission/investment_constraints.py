@@ -9,8 +9,7 @@ from data import(
 
 from utils import apply_dtypes
 
-def cap_investment_constraints_trn(df_iar_trn_final, df_max_cap_invest_base,
-                                   build_rates, no_investment_techs, 
+def cap_investment_constraints_trn(df_iar_trn_final, build_rates, no_investment_techs, 
                                    start_year, end_year, region_name):
     
     # Set max annual investments to 0 in case no expansion is allowed.
@@ -27,9 +26,6 @@ def cap_investment_constraints_trn(df_iar_trn_final, df_max_cap_invest_base,
         df_max_cap_invest_trn = pd.DataFrame(max_cap_invest_data,
                                              columns = ['REGION', 'TECHNOLOGY', 
                                                         'YEAR', 'VALUE'])
-        
-        df_max_cap_invest_trn = pd.concat([df_max_cap_invest_base, 
-                                           df_max_cap_invest_trn], join = 'inner')
 
     # Set pathway specific max annual investments if defined.
     elif not build_rates.empty:
@@ -46,11 +42,12 @@ def cap_investment_constraints_trn(df_iar_trn_final, df_max_cap_invest_base,
 
         df_max_cap_invest_trn['REGION'] = region_name
         
-        df_max_cap_invest_trn = pd.concat([df_max_cap_invest_base, 
-                                           df_max_cap_invest_trn], join = 'inner')
+        df_max_cap_invest_trn = df_max_cap_invest_trn[['REGION', 'TECHNOLOGY', 
+                                                       'YEAR', 'VALUE']]
     
     else:
-        df_max_cap_invest_trn = df_max_cap_invest_base.copy()
+        df_max_cap_invest_trn = pd.DataFrame(columns = ['REGION', 'TECHNOLOGY', 
+                                                        'YEAR', 'VALUE'])
         
     df_max_cap_invest_trn = apply_dtypes(df_max_cap_invest_trn, 
                                          "TotalAnnualMaxCapacityInvestment")
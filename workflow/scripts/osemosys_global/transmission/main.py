@@ -1,5 +1,7 @@
 import pandas as pd
-import os
+import sys
+from osemosys_global.param_io import table_path, write_table
+from osemosys_global.stage_cache import StageCache
 
 from read import(
     import_gtd_existing,
@@ -8,17 +10,7 @@ from read import(
     import_centerpoints,
     import_transmission_build_rates,
     import_op_life,
-    import_iar_base,
     import_oar_base,
-    import_capact_base,
-    import_cap_cost_base,
-    import_fix_cost_base,
-    import_var_cost_base,    
-    import_op_life_base,
-    import_max_cap_invest_base,
-    import_min_cap_invest_base,
-    import_res_cap_base,
-    import_set_base
 )
 
 from constants import(
@@ -64,19 +56,13 @@ def main(
     gtd_mapping: dict[str, str],
     centerpoints_mapping: list,
     build_rates: pd.DataFrame, 
-    iar_base: pd.DataFrame,
     oar_base: pd.DataFrame,
-    capact_base: pd.DataFrame,
-    cap_cost_base: pd.DataFrame,
-    fix_cost_base: pd.DataFrame,
-    var_cost_base: pd.DataFrame,    
-    op_life_base: pd.DataFrame,
-    max_cap_invest_base: pd.DataFrame,
-    min_cap_invest_base: pd.DataFrame,
-    res_cap_base: pd.DataFrame,
-    tech_set_base: pd.DataFrame,
-    fuel_set_base: pd.DataFrame
 ):
+    """Creates the transmission data
+
+    Only the transmission part of each parameter is written out. The
+    powerplant and storage data are added in the merge_partial_tables rule.
+    """
     
     # CALL FUNCTIONS
     
@@ -91,9 +77,6 @@ def main(
     # Set capital, fixed and variable transmission costs.
     cap_cost_trn, fix_cost_trn, var_cost_trn = get_transmission_costs(gtd_exist_corrected, 
                                                                       gtd_planned_corrected,
-                                                                      cap_cost_base,
-                                                                      fix_cost_base,
-                                                                      var_cost_base,
                                                                       centerpoints_mapping, 
                                                                       transmission_parameters, 
                                                                       start_year, end_year, 
@@ -104,7 +87,7 @@ def main(
                                       centerpoints_mapping, transmission_parameters, SUBSEA_LINES)
     
     # Set activity ratios for transmission.
-    iar_trn, oar_trn = activity_transmission(iar_base, oar_base, 
+    iar_trn, oar_trn = activity_transmission(oar_base, 
                                              eff_trn, start_year, 
                                              end_year, region_name)
     
@@ -112,11 +95,10 @@ def main(
     activity_limit_trn = activity_transmission_limit(cross_border_trade, oar_trn)
     
     # Set operational life for transmission.
-    op_life_trn = set_op_life_transmission(oar_trn, default_op_life, op_life_base, region_name)
+    op_life_trn = set_op_life_transmission(oar_trn, default_op_life, region_name)
     
     # Set annual capacity investment constraints.
     max_cap_invest_trn = cap_investment_constraints_trn(iar_trn, 
-                                                        max_cap_invest_base, 
                                                         build_rates,
                                                         no_investment_techs, 
                                                         start_year, 
@@ -126,7 +108,7 @@ def main(
     # Set residual capacity.
     res_cap_trn = res_capacity_transmission(gtd_exist_corrected, gtd_planned_corrected,
                                             transmission_existing, transmission_planned,
-                                            res_cap_base, op_life_dict, 
+                                            op_life_dict, 
                                             start_year, end_year, region_name,
                                             RETIREMENT_YEAR_TRANSMISSION, 
                                             PLANNED_BUILD_YEAR_TRANSMISSION)
@@ -145,7 +127,6 @@ def main(
          ) = set_user_defined_capacity_trn(
             tech_capacity_trn, 
             default_op_life, 
-            min_cap_invest_base, 
             max_cap_invest_trn, 
             res_cap_trn,
             iar_trn,
@@ -160,64 +141,55 @@ def main(
             )  
 
     # get new additions to fuel and technology sets
-    existing_techs = tech_set_base.VALUE.to_list()
     iar_techs = get_unique_technologies(iar_trn)
     oar_techs = get_unique_technologies(oar_trn)
-    tech_set = create_set_from_iterators(existing_techs, iar_techs, oar_techs)
+    tech_set = create_set_from_iterators(iar_techs, oar_techs)
     
-    existing_fuels = fuel_set_base.VALUE.to_list()
     iar_fuels = get_unique_fuels(iar_trn)
     oar_fuels = get_unique_fuels(oar_trn)
-    fuel_set = create_set_from_iterators(existing_fuels, iar_fuels, oar_fuels)
+    fuel_set = create_set_from_iterators(iar_fuels, oar_fuels)
     
     # assign capacity to activity unit to transmission + distribution techs
-    cap_activity_trn = create_trn_dist_capacity_activity(iar_trn, oar_trn)
-    cap_activity = pd.concat([capact_base, cap_activity_trn]
-                             ).drop_duplicates(subset=["REGION", "TECHNOLOGY"], keep="last")
+    cap_activity = create_trn_dist_capacity_activity(iar_trn, oar_trn)
     
     # OUTPUT CSV's
     
-    oar_trn.to_csv(os.path.join(transmission_data_dir, "OutputActivityRatio.csv"), index=None)
+    write_table(oar_trn, table_path(transmission_data_dir, "OutputActivityRatio", data_format))
     
-    iar_trn.to_csv(os.path.join(transmission_data_dir, "InputActivityRatio.csv"), index=None)
+    write_table(iar_trn, table_path(transmission_data_dir, "InputActivityRatio", data_format))
     
-    activity_limit_trn.to_csv(os.path.join(output_data_dir,
-                                            "TotalTechnologyModelPeriodActivityUpperLimit.csv"),
-                                index = None)
+    write_table(activity_limit_trn, table_path(output_data_dir, "TotalTechnologyModelPeriodActivityUpperLimit", data_format))
     
-    cap_activity.to_csv(os.path.join(transmission_data_dir, "CapacityToActivityUnit.csv"), index = None)
+    write_table(cap_activity, table_path(transmission_data_dir, "CapacityToActivityUnit", data_format))
     
-    cap_cost_trn.to_csv(os.path.join(transmission_data_dir, "CapitalCost.csv"), index = None)
+    write_table(cap_cost_trn, table_path(transmission_data_dir, "CapitalCost", data_format))
     
-    fix_cost_trn.to_csv(os.path.join(transmission_data_dir, "FixedCost.csv"), index = None)
+    write_table(fix_cost_trn, table_path(transmission_data_dir, "FixedCost", data_format))
     
-    var_cost_trn.to_csv(os.path.join(transmission_data_dir, "VariableCost.csv"), index = None)    
+    write_table(var_cost_trn, table_path(transmission_data_dir, "VariableCost", data_format))    
     
-    op_life_trn.to_csv(os.path.join(transmission_data_dir, "OperationalLife.csv"), index = None)
+    write_table(op_life_trn, table_path(transmission_data_dir, "OperationalLife", data_format))
     
-    max_cap_invest_trn.to_csv(os.path.join(transmission_data_dir, 
-                                            'TotalAnnualMaxCapacityInvestment.csv'),
-                                        index = None)
+    write_table(max_cap_invest_trn, table_path(transmission_data_dir, "TotalAnnualMaxCapacityInvestment", data_format))
 
-    tech_set.to_csv(os.path.join(transmission_data_dir, "TECHNOLOGY.csv"), index = None)
-    fuel_set.to_csv(os.path.join(output_data_dir, "FUEL.csv"), index = None)
+    write_table(tech_set, table_path(transmission_data_dir, "TECHNOLOGY", data_format))
+    write_table(fuel_set, table_path(transmission_data_dir, "FUEL", data_format))
         
-    res_cap_trn.to_csv(os.path.join(transmission_data_dir, 'ResidualCapacity.csv'),
-                       index = None)       
+    write_table(res_cap_trn, table_path(transmission_data_dir, "ResidualCapacity", data_format))       
     
     if tech_capacity_trn is not None:
-        min_cap_invest_trn.to_csv(os.path.join(transmission_data_dir, 
-                                                'TotalAnnualMinCapacityInvestment.csv'),
-                                            index = None)
+        write_table(min_cap_invest_trn, table_path(transmission_data_dir, "TotalAnnualMinCapacityInvestment", data_format))
         
     else:
-        min_cap_invest_base.to_csv(os.path.join(transmission_data_dir, 
-                                                'TotalAnnualMinCapacityInvestment.csv'),
-                                            index = None)
+        min_cap_invest_trn = pd.DataFrame(columns=["REGION", "TECHNOLOGY", "YEAR", "VALUE"])
+        write_table(min_cap_invest_trn, table_path(transmission_data_dir, "TotalAnnualMinCapacityInvestment", data_format))
 
 if __name__ == "__main__":
     
     if "snakemake" in globals():
+        stage_cache = StageCache.from_snakemake(snakemake)
+        if stage_cache.restore():
+            sys.exit()
         file_gtd_existing = snakemake.input.gtd_existing
         file_gtd_planned = snakemake.input.gtd_planned
         file_gtd_mapping = snakemake.input.gtd_mapping
@@ -234,20 +206,10 @@ if __name__ == "__main__":
         transmission_existing = snakemake.params.transmission_existing
         transmission_planned = snakemake.params.transmission_planned
         output_data_dir = snakemake.params.output_data_dir
+        data_format = snakemake.params.data_format
         powerplant_data_dir = snakemake.params.powerplant_data_dir  
         transmission_data_dir = snakemake.params.transmission_data_dir 
-        file_iar_base = f'{powerplant_data_dir}/InputActivityRatio.csv'
-        file_oar_base = f'{powerplant_data_dir}/OutputActivityRatio.csv'
-        file_capact_base = f'{powerplant_data_dir}/CapacityToActivityUnit.csv'      
-        file_cap_cost_base = f'{powerplant_data_dir}/CapitalCost.csv'
-        file_fix_cost_base = f'{powerplant_data_dir}/FixedCost.csv'
-        file_var_cost_base = f'{powerplant_data_dir}/VariableCost.csv'        
-        file_op_life_base = f'{powerplant_data_dir}/OperationalLife.csv'
-        file_max_cap_invest_base = f'{powerplant_data_dir}/TotalAnnualMaxCapacityInvestment.csv'
-        file_min_cap_invest_base = f'{powerplant_data_dir}/TotalAnnualMinCapacityInvestment.csv'
-        file_res_cap_base = f'{powerplant_data_dir}/ResidualCapacity.csv'
-        file_tech_set = f'{powerplant_data_dir}/TECHNOLOGY.csv'        
-        file_fuel_set = f'{powerplant_data_dir}/FUEL.csv'
+        file_oar_base = table_path(powerplant_data_dir, "OutputActivityRatio", data_format)
         
     # The below else statement defines variables if the 'transmission/main' script is to be run locally
     # outside the snakemake workflow. This is relevant for testing purposes only! User inputs when running 
@@ -282,20 +244,10 @@ if __name__ == "__main__":
         transmission_existing = True
         transmission_planned = True
         output_data_dir = 'results/data'
+        data_format = 'csv'
         powerplant_data_dir = 'results/data/powerplant'
         transmission_data_dir = 'results/data/transmission'
-        file_iar_base = f'{powerplant_data_dir}/InputActivityRatio.csv'
-        file_oar_base = f'{powerplant_data_dir}/OutputActivityRatio.csv'
-        file_capact_base = f'{powerplant_data_dir}/CapacityToActivityUnit.csv'
-        file_cap_cost_base = f'{powerplant_data_dir}/CapitalCost.csv'
-        file_fix_cost_base = f'{powerplant_data_dir}/FixedCost.csv'
-        file_var_cost_base = f'{powerplant_data_dir}/VariableCost.csv'        
-        file_op_life_base = f'{powerplant_data_dir}/OperationalLife.csv'
-        file_max_cap_invest_base = f'{powerplant_data_dir}/TotalAnnualMaxCapacityInvestment.csv'
-        file_min_cap_invest_base = f'{powerplant_data_dir}/TotalAnnualMinCapacityInvestment.csv'
-        file_res_cap_base = f'{powerplant_data_dir}/ResidualCapacity.csv'
-        file_tech_set = f'{powerplant_data_dir}/TECHNOLOGY.csv'
-        file_fuel_set = f'{powerplant_data_dir}/FUEL.csv'
+        file_oar_base = table_path(powerplant_data_dir, "OutputActivityRatio", data_format)
 
     # SET INPUT DATA
     gtd_exist = format_gtd_existing(import_gtd_existing(file_gtd_existing))
@@ -314,18 +266,7 @@ if __name__ == "__main__":
     op_life_dict = dict(zip(list(op_life['tech']),
                             list(op_life['years'])))
 
-    iar_base = import_iar_base(file_iar_base)
     oar_base = import_oar_base(file_oar_base)
-    capact_base = import_capact_base(file_capact_base)
-    cap_cost_base = import_cap_cost_base(file_cap_cost_base)
-    fix_cost_base = import_fix_cost_base(file_fix_cost_base)
-    var_cost_base = import_var_cost_base(file_var_cost_base)    
-    op_life_base = import_op_life_base(file_op_life_base)
-    max_cap_invest_base = import_max_cap_invest_base(file_max_cap_invest_base)
-    min_cap_invest_base = import_min_cap_invest_base(file_min_cap_invest_base)
-    res_cap_base = import_res_cap_base(file_res_cap_base)
-    tech_set_base = import_set_base(file_tech_set)  
-    fuel_set_base = import_set_base(file_fuel_set)
     
     input_data = {
         "default_op_life": op_life_dict,
@@ -334,19 +275,11 @@ if __name__ == "__main__":
         "gtd_mapping" : gtd_mapping_dict,
         "centerpoints_mapping" : centerpoints_dict,
         "build_rates" : build_rates,
-        "iar_base" : iar_base,
         "oar_base" : oar_base,
-        "capact_base" : capact_base,
-        "cap_cost_base" : cap_cost_base,
-        "fix_cost_base" : fix_cost_base,
-        "var_cost_base" : var_cost_base,        
-        "op_life_base" : op_life_base,
-        "max_cap_invest_base" : max_cap_invest_base,
-        "min_cap_invest_base" : min_cap_invest_base,
-        "res_cap_base" : res_cap_base, 
-        "tech_set_base" : tech_set_base,
-        "fuel_set_base" : fuel_set_base
     }
     
     # CALL MAIN
-    main(**input_data)
\ No newline at end of file
+    main(**input_data)
+
+    if "snakemake" in globals():
+        stage_cache.store()
@@ -4,8 +4,7 @@ import pandas as pd
 
 from utils import apply_dtypes
 
-def set_op_life_transmission(df_oar_final, op_life_dict, 
-                             op_life_base, region_name):
+def set_op_life_transmission(df_oar_final, op_life_dict, region_name):
 
     # Create Operational Life data
     op_life_techs = list(df_oar_final['TECHNOLOGY'].unique())
@@ -22,7 +21,5 @@ def set_op_life_transmission(df_oar_final, op_life_dict,
                                                              'TECHNOLOGY', 'VALUE'])
 
     op_life_trn_final = apply_dtypes(op_life_trn_final, "OperationalLife")
-    
-    op_life_trn_final = pd.concat([op_life_base, op_life_trn_final])
 
     return op_life_trn_final
\ No newline at end of file
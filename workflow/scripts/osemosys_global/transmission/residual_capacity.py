@@ -5,7 +5,7 @@ from data import get_years
 
 def res_capacity_transmission(df_exist_corrected, df_plan_corrected, 
                               transmission_existing, transmission_planned,
-                              res_cap_base, op_life_dict, 
+                              op_life_dict, 
                               start_year, end_year, region_name,
                               retirement_year_transmission, 
                               planned_build_year_transmission):
@@ -61,10 +61,7 @@ def res_capacity_transmission(df_exist_corrected, df_plan_corrected,
         df_res_cap['REGION'] = region_name
         df_res_cap = df_res_cap[['REGION', 'TECHNOLOGY', 'YEAR', 'VALUE']]
         
-        # Combine powerplant and transmission resisdual capacity df's.
-        df_res_cap = pd.concat([res_cap_base, df_res_cap]).reset_index(drop = True)
-        
     else:
-        df_res_cap = res_cap_base.copy()
+        df_res_cap = pd.DataFrame(columns = ['REGION', 'TECHNOLOGY', 'YEAR', 'VALUE'])
 
     return df_res_cap
\ No newline at end of file
@@ -7,9 +7,9 @@ import itertools
 from data import get_years
 
 def set_user_defined_capacity_trn(tech_capacity_trn, op_life_dict, 
-                                  df_min_cap_invest, df_max_cap_invest, df_res_cap,
-                                  df_iar_final, df_oar_final, op_life_base,
-                                  cap_cost_base, fix_cost_base, var_cost_base, 
+                                  df_max_cap_invest, df_res_cap,
+                                  df_iar_final, df_oar_final, df_op_life,
+                                  df_cap_cost, df_fix_cost, df_var_cost, 
                                   start_year, end_year, region_name):
     
     techCapacity_trn = []
@@ -38,8 +38,7 @@ def set_user_defined_capacity_trn(tech_capacity_trn, op_life_dict,
     
     tech_capacity_trn_df['REGION'] = region_name
     
-    df_min_cap_inv = pd.concat([df_min_cap_invest, tech_capacity_trn_df])
-    df_min_cap_inv.drop_duplicates(inplace=True)
+    df_min_cap_inv = tech_capacity_trn_df.drop_duplicates()
     
     max_cap_techs_df = pd.DataFrame(columns = ['idx', 'REGION', 'TECHNOLOGY', 'YEAR', 'VALUE'])
 
@@ -217,7 +216,7 @@ def set_user_defined_capacity_trn(tech_capacity_trn, op_life_dict,
                                      'TECHNOLOGY',
                                      'VALUE']]
 
-    op_life = pd.concat([op_life_base, op_life_custom])
+    op_life = pd.concat([df_op_life, op_life_custom])
     op_life.drop_duplicates(subset=['REGION', 
                                     'TECHNOLOGY'],
                             keep='last',
@@ -253,17 +252,17 @@ def set_user_defined_capacity_trn(tech_capacity_trn, op_life_dict,
     var_cost_trn['MODE_OF_OPERATION'] = [[1,2] for x in range(len(var_cost_trn))]
     var_cost_trn = var_cost_trn.explode('MODE_OF_OPERATION')
 
-    cap_cost = pd.concat([cap_cost_base, cap_cost_trn])
+    cap_cost = pd.concat([df_cap_cost, cap_cost_trn])
     cap_cost.drop_duplicates(subset=['REGION', 'TECHNOLOGY', 'YEAR'],
                              keep="last",
                              inplace=True)
     
-    fix_cost = pd.concat([fix_cost_base, fix_cost_trn])
+    fix_cost = pd.concat([df_fix_cost, fix_cost_trn])
     fix_cost.drop_duplicates(subset=['REGION', 'TECHNOLOGY', 'YEAR'],
                              keep="last",
                              inplace=True)
     
-    var_cost = pd.concat([var_cost_base, var_cost_trn])
+    var_cost = pd.concat([df_var_cost, var_cost_trn])
     var_cost.drop_duplicates(subset=['REGION', 'TECHNOLOGY', 'MODE_OF_OPERATION', 'YEAR'],
                              keep="last",
                              inplace=True)
@@ -1,12 +1,14 @@
 """Utility Functions"""
 
-import pandas as pd
-from typing import Optional
-from constants import SET_DTYPES
+import numpy as np
+
+from osemosys_global.dtypes import apply_dtypes  # noqa: F401
 
 import logging 
 logging.basicConfig(format='%(levelname)s:%(message)s', level=logging.INFO)
 
+__all__ = ["apply_dtypes", "apply_timeshift", "interpolate_years"]
+
 def apply_timeshift(x, timeshift):
     """Applies timeshift to organize dayparts.
     
@@ -22,15 +24,35 @@ def apply_timeshift(x, timeshift):
     else:
         return x
 
-def apply_dtypes(df:pd.DataFrame, name: Optional[str]) -> pd.DataFrame:
-    """Sets datatypes on dataframe"""
-    
-    for col in df.columns:
-        try:
-            df[col] = df[col].astype(SET_DTYPES[col])
-        except KeyError:
-            if name:
-                logging.info(f"Can not set dtype for {name} on {col}")
-            else:
-                logging.info(f"Can not set dtype on {col}")
-    return df
+
+def interpolate_years(values: np.ndarray) -> np.ndarray:
+    """Interpolates values along the last axis, over consecutive years
+
+    Missing years between two years with a value are linearly interpolated,
+    and years before the first or after the last value take the nearest
+    value, as ``Series.interpolate(method="linear", limit_direction="both")``
+    on each row. Rows without any value stay missing.
+    """
+
+    steps = values.shape[-1]
+    position = np.arange(steps)
+    valid = ~np.isnan(values)
+
+    # nearest year with a value at or before, and at or after, each year
+    previous = np.maximum.accumulate(np.where(valid, position, -1), axis=-1)
+    following = np.flip(
+        np.minimum.accumulate(np.flip(np.where(valid, position, steps), -1), axis=-1),
+        -1,
+    )
+    previous = np.where(previous < 0, following, previous)
+    following = np.where(following == steps, previous, following)
+
+    low = np.take_along_axis(values, previous.clip(0, steps - 1), axis=-1)
+    high = np.take_along_axis(values, following.clip(0, steps - 1), axis=-1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = (high - low) / (following - previous)
+        interpolated = slope * (position - previous) + low
+    interpolated = np.where(following == previous, low, interpolated)
+
+    return np.where(valid, values, interpolated)
@@ -49,9 +49,7 @@ def get_generation_annual_data(data: Dict[str,pd.DataFrame], country:str =None):
     return df
 
 def get_generation_ts_data(
-        seasons, 
-        dayparts,
-        timeshift,
+        timeslice_hours,
         start_year,
         end_year,
         input_data: Dict[str,pd.DataFrame], 
@@ -74,9 +72,7 @@ def get_generation_ts_data(
     df = result_data["ProductionByTechnology"]
     df = powerplant_filter(df, country)
     df.VALUE = df.VALUE.astype('float64')
-    df = transform_ts(seasons, 
-                      dayparts,
-                      timeshift,
+    df = transform_ts(timeslice_hours,
                       start_year,
                       end_year,
                       input_data, 
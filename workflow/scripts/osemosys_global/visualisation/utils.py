@@ -2,10 +2,9 @@
 
 import pandas as pd
 from typing import Dict, List, Union, Tuple
-import itertools
 from pathlib import Path
-from constants import DAYS_PER_MONTH, MONTH_NAMES
-from osemosys_global.utils import apply_timeshift
+from osemosys_global.timeseries import TimesliceHours
+from osemosys_global.set_codes import decode
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import matplotlib.pyplot as plt
@@ -66,9 +65,11 @@ def powerplant_filter(df: pd.DataFrame, country:str = None) -> pd.DataFrame:
     """
 
     filtered_df = df[~df.TECHNOLOGY.str.contains('TRN')]
-    filtered_df = filtered_df.loc[filtered_df.TECHNOLOGY.str[0:3] == 'PWR']
-    filtered_df['TYPE'] = filtered_df.TECHNOLOGY.str[3:6]
-    filtered_df['COUNTRY'] = filtered_df.TECHNOLOGY.str[6:9]
+    parts = decode(filtered_df.TECHNOLOGY, fields=["PREFIX", "TECH", "COUNTRY"])
+    pwr = (parts["PREFIX"] == 'PWR').to_numpy()
+    filtered_df = filtered_df.loc[pwr]
+    filtered_df['TYPE'] = parts["TECH"].astype(object).to_numpy()[pwr]
+    filtered_df['COUNTRY'] = parts["COUNTRY"].astype(object).to_numpy()[pwr]
 
     if country:
         filtered_df = filtered_df.loc[filtered_df['COUNTRY'] == country]
@@ -81,9 +82,7 @@ def powerplant_filter(df: pd.DataFrame, country:str = None) -> pd.DataFrame:
             inplace=True)
     return filtered_df
 
-def transform_ts(seasons, 
-                 dayparts,
-                 timeshift,
+def transform_ts(timeslice_hours: TimesliceHours,
                  start_year,
                  end_year,
                  data:Dict[str, pd.DataFrame], 
@@ -91,6 +90,8 @@ def transform_ts(seasons,
     """Adds month, hour, year columns to timesliced data. 
     
     Arguments:
+        timeslice_hours: TimesliceHours
+            Hours of each timeslice, as saved by the timeslice rule
         data: dict[str, pd.DataFrame]
             Input datastore 
         df: pd.DataFrame
@@ -101,114 +102,24 @@ def transform_ts(seasons,
     """
 
     generation = list(data["TECHNOLOGY"]["VALUE"].unique())
-
-    seasonsData = []
-
-    for s, months in seasons.items():
-        for month in months:
-            seasonsData.append([month, s]) 
-    seasons_df = pd.DataFrame(seasonsData, 
-                              columns=['month', 'season'])
-    seasons_df = seasons_df.sort_values(by=['month']).reset_index(drop=True)
-
-    daypartData = []
-    for dp, hr in dayparts.items():
-        daypartData.append([dp, hr[0], hr[1]])
-    dayparts_df = pd.DataFrame(daypartData,
-                               columns=['daypart', 'start_hour', 'end_hour'])
-
-    dayparts_df['start_hour'] = dayparts_df['start_hour'].map(lambda x: apply_timeshift(x, timeshift))
-    dayparts_df['end_hour'] = dayparts_df['end_hour'].map(lambda x: apply_timeshift(x, timeshift))
-
-    month_names = MONTH_NAMES
-    days_per_month = DAYS_PER_MONTH
-
-    seasons_df['month_name'] = seasons_df['month'].map(month_names)
-    seasons_df['days'] = seasons_df['month_name'].map(days_per_month)
-    seasons_df_grouped = seasons_df.groupby(['season'],
-                                            as_index=False)['days'].sum()
-    days_dict = dict(zip(list(seasons_df_grouped['season']),
-                         list(seasons_df_grouped['days'])
-                         )
-                     )
-    seasons_df['days'] = seasons_df['season'].map(days_dict)
-
+    labels = powerplant_filter(pd.DataFrame({"TECHNOLOGY": generation}))["LABEL"]
     years = get_years(start_year, end_year[0])
 
-    seasons_dict = dict(zip(list(seasons_df['month']),
-                            list(seasons_df['season'])
-                            )
-                        )
-
-    dayparts_dict = {i: [j, k]
-                     for i, j, k
-                     in zip(list(dayparts_df['daypart']),
-                            list(dayparts_df['start_hour']),
-                            list(dayparts_df['end_hour'])
-                            )
-                     }
-
-    hours_dict = {i: abs(k-j)
-                  for i, j, k
-                  in zip(list(dayparts_df['daypart']),
-                         list(dayparts_df['start_hour']),
-                         list(dayparts_df['end_hour'])
-                         )
-                  }
-
-    months = list(seasons_dict)
-    hours = list(range(1, 25))
+    months = timeslice_hours.months.tolist()
 
     # APPLY TRANSFORMATION
 
-    df_ts_template = pd.DataFrame(list(itertools.product(generation,
-                                                         months,
-                                                         hours,
-                                                         years)
-                                       ),
-                                  columns=['TECHNOLOGY',
-                                           'MONTH',
-                                           'HOUR',
-                                           'YEAR']
-                                  )
-    
-    df_ts_template = df_ts_template.sort_values(by=['TECHNOLOGY', 'YEAR'])
-    df_ts_template['SEASON'] = df_ts_template['MONTH'].map(seasons_dict)
-    df_ts_template['DAYS'] = df_ts_template['SEASON'].map(days_dict)
-    df_ts_template['YEAR'] = df_ts_template['YEAR'].astype(int)
-    df_ts_template = powerplant_filter(df_ts_template)
-
-    for daypart in dayparts_dict:
-        if dayparts_dict[daypart][0] > dayparts_dict[daypart][1]: # loops over 24hrs
-            df_ts_template.loc[(df_ts_template['HOUR'] >= dayparts_dict[daypart][0]) |
-                          (df_ts_template['HOUR'] < dayparts_dict[daypart][1]),
-                          'DAYPART'] = daypart
-        else:
-            df_ts_template.loc[(df_ts_template['HOUR'] >= dayparts_dict[daypart][0]) &
-                      (df_ts_template['HOUR'] < dayparts_dict[daypart][1]),
-                      'DAYPART'] = daypart
-
-    df_ts_template = df_ts_template.drop_duplicates()
-    df['SEASON'] = df['TIMESLICE'].str[0:2]
-    df['DAYPART'] = df['TIMESLICE'].str[2:]
     df['YEAR'] = df['YEAR'].astype(int)
-    df.drop(['REGION', 'FUEL', 'TIMESLICE'],
-            axis=1,
-            inplace=True)
-
-    df = df.groupby(['LABEL', 'SEASON', 'DAYPART', 'YEAR'],
+    df = df.loc[df['LABEL'].isin(labels) & df['YEAR'].isin(years)]
+    df = df.groupby(['LABEL', 'TIMESLICE', 'YEAR'],
                     as_index=False)['VALUE'].sum()
-    df = pd.merge(df,
-                  df_ts_template,
-                  how='left',
-                  on=['LABEL', 'SEASON', 'DAYPART', 'YEAR']).dropna()
-    df['HOUR_COUNT'] = df['DAYPART'].map(hours_dict)
-    df['VALUE'] = (df['VALUE'].mul(1e6))/(df['DAYS']*df['HOUR_COUNT'].mul(3600))
+    df = timeslice_hours.to_hours(df)
 
+    # timeslices sharing a month and hour add up
     df = df.pivot_table(index=['MONTH', 'HOUR', 'YEAR'],
                         columns='LABEL',
                         values='VALUE',
-                        aggfunc='mean').reset_index().fillna(0)
+                        aggfunc='sum').reset_index().fillna(0)
     df['MONTH'] = pd.Categorical(df['MONTH'],
                                  categories=months,
                                  ordered=True)
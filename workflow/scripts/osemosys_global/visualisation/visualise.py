@@ -7,6 +7,8 @@ from typing import List
 from sklearn.preprocessing import MinMaxScaler
 from typing import Dict
 
+from osemosys_global.timeseries import TimesliceHours
+
 from utils import (
     read_csv,
     filter_transmission_techs,
@@ -30,9 +32,7 @@ def main(
     result_data: pd.DataFrame,
     centerpoints: pd.DataFrame,
     color_codes: pd.DataFrame,
-    seasons: dict,
-    dayparts: dict,
-    timeshift: int,
+    timeslice_hours: TimesliceHours,
     start_year: int,
     custom_nodes: List[str],
     custom_nodes_centerpoints: pd.DataFrame,
@@ -53,9 +53,7 @@ def main(
     plot_total_capacity(result_data, scenario_figs_dir, country=None)
     plot_generation_annual(color_codes, result_data, scenario_figs_dir, country=None)
     plot_generation_hourly(
-        seasons,
-        dayparts,
-        timeshift,
+        timeslice_hours,
         start_year,
         end_year,
         color_codes,
@@ -197,9 +195,7 @@ def plot_generation_annual(
 
 
 def plot_generation_hourly(
-    seasons,
-    dayparts,
-    timeshift,
+    timeslice_hours,
     start_year,
     end_year,
     color_codes,
@@ -219,9 +215,7 @@ def plot_generation_hourly(
     """
 
     df = get_generation_ts_data(
-        seasons,
-        dayparts,
-        timeshift,
+        timeslice_hours,
         start_year,
         end_year,
         result_input_data,
@@ -530,9 +524,7 @@ if __name__ == "__main__":
             snakemake.input.custom_nodes_centerpoints
         )
         color_codes = pd.read_csv(snakemake.input.color_codes)
-        seasons = snakemake.params.seasons
-        dayparts = snakemake.params.dayparts
-        timeshift = snakemake.params.timeshift
+        timeslice_hours = TimesliceHours.read(snakemake.input.timeslice_hours)
 
     else:
 
@@ -549,18 +541,14 @@ if __name__ == "__main__":
             "resources/data/custom/centerpoints.csv"
         )
         color_codes = pd.read_csv("resources/data/custom/color_codes.csv")
-        seasons = {"S1": [1, 2, 3, 4, 5, 6], "S2": [7, 8, 9, 10, 11, 12]}
-        dayparts = {"D1": [1, 7], "D2": [7, 13], "D3": [13, 19], "D4": [19, 25]}
-        timeshift = 0
+        timeslice_hours = TimesliceHours.read("results/timeslice_hours.csv")
 
     main(
         result_input_data,
         result_data,
         centerpoints,
         color_codes,
-        seasons,
-        dayparts,
-        timeshift,
+        timeslice_hours,
         start_year,
         custom_nodes,
         custom_nodes_centerpoints,
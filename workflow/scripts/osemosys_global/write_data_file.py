@@ -0,0 +1,213 @@
+"""Writes the pre-processed MathProg data file directly from parameter CSVs
+
+This replaces the chain of ``otoole convert`` followed by
+``resources/preprocess_data.py``. The sets and parameters are written in the
+same layout otoole uses (alphabetical order, default values omitted) and the
+pre-processing sets (``MODEperTECHNOLOGY``, ``MODExTECHNOLOGYperFUELin/out``,
+``MODExTECHNOLOGYperSTORAGEto/from`` and ``MODExTECHNOLOGYperEMISSION``) are
+derived with grouped operations on the activity ratio and storage tables,
+rather than by re-parsing the written data file.
+"""
+
+import yaml
+import pandas as pd
+from typing import Any, TextIO
+from pathlib import Path
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+HEADER = "# Model file written by osemosys_global\n"
+
+DTYPES = {"float": float, "int": int, "str": str}
+
+
+def read_otoole_config(otoole_config: str) -> dict[str, dict[str, Any]]:
+    """Reads set and parameter definitions from the otoole config"""
+
+    with open(otoole_config) as f:
+        otoole = yaml.safe_load(f)
+
+    return {x: otoole[x] for x in otoole if otoole[x]["type"] in ("param", "set")}
+
+
+def read_data(
+    csv_dir: str, config: dict[str, dict[str, Any]]
+) -> dict[str, pd.DataFrame]:
+    """Reads in set and parameter CSVs with datatypes from the otoole config"""
+
+    data = {}
+
+    for name, details in config.items():
+        csv = Path(csv_dir, f"{name}.csv")
+
+        if details["type"] == "set":
+            columns = ["VALUE"]
+            dtypes = {"VALUE": DTYPES[details["dtype"]]}
+        else:
+            columns = details["indices"] + ["VALUE"]
+            dtypes = {x: DTYPES[config[x]["dtype"]] for x in details["indices"]}
+            dtypes["VALUE"] = DTYPES[details["dtype"]]
+
+        if csv.exists():
+            df = pd.read_csv(csv, dtype=dtypes)
+        else:
+            logger.info(f"No data found for {name}")
+            df = pd.DataFrame(columns=columns).astype(dtypes)
+
+        data[name] = df[columns]
+
+    return data
+
+
+def _group_combinations(
+    df: pd.DataFrame, set_column: str, mode_only: bool = False
+) -> pd.Series:
+    """Joins the unique mode (and technology) entries of each set element
+
+    Returns a series indexed by set element holding the formatted members,
+    ie. ``(1, PWRCOAINDWE01) (2, PWRCOAINDWE01)`` or ``1 2`` if ``mode_only``.
+    """
+
+    if mode_only:
+        df = df[[set_column, "MODE_OF_OPERATION"]].drop_duplicates()
+        members = df["MODE_OF_OPERATION"].astype(str)
+    else:
+        df = df[[set_column, "MODE_OF_OPERATION", "TECHNOLOGY"]].drop_duplicates()
+        members = (
+            "(" + df["MODE_OF_OPERATION"].astype(str) + ", " + df["TECHNOLOGY"] + ")"
+        )
+
+    return members.groupby(df[set_column], sort=False).agg(" ".join)
+
+
+def get_mode_sets(data: dict[str, pd.DataFrame]) -> dict[str, pd.Series]:
+    """Derives the pre-processing sets from the parameter tables
+
+    Only non-zero activity ratios and positive storage links are included,
+    matching ``resources/preprocess_data.py``.
+    """
+
+    def non_zero(name: str) -> pd.DataFrame:
+        df = data[name]
+        return df.loc[df["VALUE"] != 0]
+
+    def positive(name: str) -> pd.DataFrame:
+        df = data[name]
+        return df.loc[df["VALUE"] > 0]
+
+    oar = non_zero("OutputActivityRatio")
+    iar = non_zero("InputActivityRatio")
+    ear = non_zero("EmissionActivityRatio")
+
+    tech_modes = pd.concat(
+        [df[["TECHNOLOGY", "MODE_OF_OPERATION"]] for df in (iar, oar, ear)]
+    )
+
+    return {
+        "MODExTECHNOLOGYperFUELout": _group_combinations(oar, "FUEL"),
+        "MODExTECHNOLOGYperFUELin": _group_combinations(iar, "FUEL"),
+        "MODEperTECHNOLOGY": _group_combinations(
+            tech_modes, "TECHNOLOGY", mode_only=True
+        ),
+        "MODExTECHNOLOGYperSTORAGEto": _group_combinations(
+            positive("TechnologyToStorage"), "STORAGE"
+        ),
+        "MODExTECHNOLOGYperSTORAGEfrom": _group_combinations(
+            positive("TechnologyFromStorage"), "STORAGE"
+        ),
+        "MODExTECHNOLOGYperEMISSION": _group_combinations(ear, "EMISSION"),
+    }
+
+
+def _write_set(df: pd.DataFrame, name: str, handle: TextIO) -> None:
+    handle.write(f"set {name} :=\n")
+    df.to_csv(handle, sep=" ", header=False, index=False, lineterminator="\n")
+    handle.write(";\n")
+
+
+def _write_parameter(
+    df: pd.DataFrame, name: str, default: float, handle: TextIO
+) -> None:
+    df = df.loc[df["VALUE"] != default]
+    handle.write(f"param default {default} : {name} :=\n")
+    df.to_csv(
+        handle,
+        sep=" ",
+        header=False,
+        index=False,
+        float_format="%g",
+        lineterminator="\n",
+    )
+    handle.write(";\n")
+
+
+def _write_mode_set(
+    members: pd.Series, name: str, set_list: pd.Series, handle: TextIO
+) -> None:
+    """Writes one indexed set per element of ``set_list``"""
+
+    if set_list.empty:
+        return
+
+    set_list = set_list.astype(str)
+    members = (" " + members).reindex(set_list).fillna("")
+    lines = f"set {name}[" + set_list + "]:=" + members.to_numpy() + ";\n"
+    handle.write("".join(lines))
+
+
+def write_data_file(
+    data: dict[str, pd.DataFrame],
+    config: dict[str, dict[str, Any]],
+    data_file: str,
+) -> None:
+    """Writes the pre-processed data file"""
+
+    mode_sets = get_mode_sets(data)
+
+    with open(data_file, "w", newline="") as f:
+        f.write(HEADER)
+
+        for name in sorted(data):
+            if config[name]["type"] == "set":
+                _write_set(data[name], name, f)
+            else:
+                _write_parameter(data[name], name, config[name]["default"], f)
+
+        fuels = data["FUEL"]["VALUE"]
+        techs = data["TECHNOLOGY"]["VALUE"]
+        storages = data["STORAGE"]["VALUE"]
+        emissions = data["EMISSION"]["VALUE"]
+
+        _write_mode_set(mode_sets["MODExTECHNOLOGYperFUELout"],
+                        "MODExTECHNOLOGYperFUELout", fuels, f)
+        _write_mode_set(mode_sets["MODExTECHNOLOGYperFUELin"],
+                        "MODExTECHNOLOGYperFUELin", fuels, f)
+        _write_mode_set(mode_sets["MODEperTECHNOLOGY"],
+                        "MODEperTECHNOLOGY", techs, f)
+        _write_mode_set(mode_sets["MODExTECHNOLOGYperSTORAGEto"],
+                        "MODExTECHNOLOGYperSTORAGEto", storages, f)
+        _write_mode_set(mode_sets["MODExTECHNOLOGYperSTORAGEfrom"],
+                        "MODExTECHNOLOGYperSTORAGEfrom", storages, f)
+        _write_mode_set(mode_sets["MODExTECHNOLOGYperEMISSION"],
+                        "MODExTECHNOLOGYperEMISSION", emissions, f)
+
+        f.write("end;")
+
+
+if __name__ == "__main__":
+    if "snakemake" in globals():
+        otoole_yaml = snakemake.input.otoole_config
+        csv_dir = snakemake.params.csv_dir
+        data_file = snakemake.output.data_file
+    else:
+        otoole_yaml = "resources/otoole.yaml"
+        csv_dir = "results/India/data"
+        data_file = "results/India/PreProcessed_India.txt"
+
+    config = read_otoole_config(otoole_yaml)
+    data = read_data(csv_dir, config)
+    write_data_file(data, config, data_file)
+
+    logging.info(f"Data file written to {data_file}")